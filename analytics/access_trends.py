@@ -6,11 +6,14 @@ Analyzes temporal and usage trends in access control data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass
 import logging
 from scipy import stats
-from sklearn.linear_model import LinearRegression
+
+from .forecasting import SeasonalForecaster, build_series_matrix, get_forecaster
+from .rolling_stats import rolling_frame, rolling_mean, rolling_slope, rolling_std
+from .time_cube import get_time_cube
 
 @dataclass
 class TrendMetrics:
@@ -25,8 +28,12 @@ class TrendMetrics:
 class AccessTrendsAnalyzer:
     """Advanced access trends analysis"""
     
-    def __init__(self):
+    def __init__(self, forecaster: Optional[SeasonalForecaster] = None,
+                 rolling_window: int = 14):
         self.logger = logging.getLogger(__name__)
+        self.forecaster = forecaster or get_forecaster()
+        # Trailing window (in days) for rolling statistics and recent trends
+        self.rolling_window = rolling_window
         
     def analyze_trends(self, df: pd.DataFrame, 
                        comparison_period_days: int = 30) -> Dict[str, Any]:
@@ -70,29 +77,29 @@ class AccessTrendsAnalyzer:
     def _analyze_temporal_trends(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze temporal trends (hourly, daily, weekly)"""
         
+        cube = get_time_cube(df)
+        
         # Hourly trends
-        hourly_data = df.groupby('hour').agg({
-            'event_id': 'count',
-            'access_result': lambda x: (x == 'Granted').mean() * 100
-        }).rename(columns={'event_id': 'event_count', 'access_result': 'success_rate'})
+        hourly_data = self._profile(cube.totals('hour'), lambda idx: idx.hour).rename(
+            columns={'count': 'event_count'})
         
         # Daily trends
-        daily_data = df.groupby('date').agg({
-            'event_id': 'count',
-            'person_id': 'nunique',
-            'door_id': 'nunique',
-            'access_result': lambda x: (x == 'Granted').mean() * 100
+        daily = self._daily_totals(df)
+        daily_data = pd.DataFrame({
+            'event_id': daily['event_count'],
+            'person_id': daily['unique_users'],
+            'door_id': daily['unique_doors'],
+            'access_result': daily['success_rate']
         })
         
         # Weekly trends
-        weekly_data = df.groupby('day_of_week').agg({
-            'event_id': 'count',
-            'access_result': lambda x: (x == 'Granted').mean() * 100
-        })
+        weekly_data = self._profile(cube.totals('day'), lambda idx: idx.day_name()).rename(
+            columns={'count': 'event_id', 'success_rate': 'access_result'})
         
         # Calculate trend directions
         hourly_trend = self._calculate_trend_direction(hourly_data['event_count'].values)
-        daily_trend = self._calculate_trend_direction(daily_data['event_id'].values)
+        daily_trend = self._calculate_trend_direction(daily_data['event_id'].values,
+                                                      window=self.rolling_window)
         
         return {
             'hourly_distribution': hourly_data.to_dict(),
@@ -108,11 +115,8 @@ class AccessTrendsAnalyzer:
         """Analyze access volume trends over time"""
         
         # Daily volume analysis
-        daily_volumes = df.groupby('date').agg({
-            'event_id': 'count',
-            'person_id': 'nunique',
-            'door_id': 'nunique'
-        }).rename(columns={'event_id': 'total_events', 'person_id': 'unique_users', 'door_id': 'unique_doors'})
+        daily_volumes = self._daily_totals(df)[['event_count', 'unique_users', 'unique_doors']].rename(
+            columns={'event_count': 'total_events'})
         
         # Rolling averages
         daily_volumes['7day_avg'] = daily_volumes['total_events'].rolling(window=7).mean()
@@ -122,13 +126,20 @@ class AccessTrendsAnalyzer:
         daily_volumes['daily_growth'] = daily_volumes['total_events'].pct_change() * 100
         daily_volumes['weekly_growth'] = daily_volumes['7day_avg'].pct_change(periods=7) * 100
         
+        # Trailing-window statistics (z-score against the preceding window, OLS slope)
+        rolling = rolling_frame(daily_volumes['total_events'], self.rolling_window)
+        daily_volumes['ewma'] = rolling['ewma']
+        daily_volumes['rolling_zscore'] = rolling['rolling_zscore']
+        daily_volumes['rolling_slope'] = rolling['rolling_slope']
+        
         # Volume statistics
         volume_stats = {
             'avg_daily_events': daily_volumes['total_events'].mean(),
             'max_daily_events': daily_volumes['total_events'].max(),
             'min_daily_events': daily_volumes['total_events'].min(),
             'std_daily_events': daily_volumes['total_events'].std(),
-            'trend_direction': self._calculate_trend_direction(daily_volumes['total_events'].values),
+            'trend_direction': self._calculate_trend_direction(daily_volumes['total_events'].values,
+                                                               window=self.rolling_window),
             'volatility': daily_volumes['total_events'].std() / daily_volumes['total_events'].mean()
         }
         
@@ -210,7 +221,7 @@ class AccessTrendsAnalyzer:
     def _calculate_growth_metrics(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate various growth metrics"""
         
-        daily_data = df.groupby('date')['event_id'].count()
+        daily_data = self._daily_totals(df)['event_count']
         
         # Period-over-period growth
         if len(daily_data) >= 14:
@@ -271,36 +282,58 @@ class AccessTrendsAnalyzer:
         }
     
     def _generate_forecasts(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Generate simple trend-based forecasts"""
+        """Generate seasonal forecasts with prediction intervals"""
         
-        daily_data = df.groupby('date')['event_id'].count()
+        cube = get_time_cube(df)
+        daily_matrix = cube.series('day', fill=True).to_frame('all').T
         
-        if len(daily_data) < 7:
+        if daily_matrix.shape[1] < 7:
             return {'forecast_available': False, 'reason': 'insufficient_data'}
         
-        # Simple linear regression for trend
-        X = np.arange(len(daily_data)).reshape(-1, 1)
-        y = daily_data.values
-        
-        model = LinearRegression()
-        model.fit(X, y)
-        
-        # Forecast next 7 days
-        future_X = np.arange(len(daily_data), len(daily_data) + 7).reshape(-1, 1)
-        forecast = model.predict(future_X)
-        
-        # Calculate confidence based on R-squared
-        r_squared = model.score(X, y)
+        # Daily horizon: next 7 days with weekly seasonality
+        daily = self.forecaster.forecast_matrix(daily_matrix, horizon=7, freq='D')
+        forecast = daily.mean[0]
+        r_squared = float(daily.state.r_squared[0])
         confidence = 'high' if r_squared > 0.7 else 'medium' if r_squared > 0.4 else 'low'
         
-        return {
+        result = {
             'forecast_available': True,
+            'method': daily.state.method,
             'next_7_days_forecast': forecast.tolist(),
-            'trend_slope': model.coef_[0],
+            'next_7_days_lower': daily.lower[0].tolist(),
+            'next_7_days_upper': daily.upper[0].tolist(),
+            'forecast_dates': [d.strftime('%Y-%m-%d') for d in daily.index],
+            'trend_slope': float(daily.state.trend[0]),
             'confidence_level': confidence,
             'r_squared': r_squared,
-            'forecast_summary': self._summarize_forecast(forecast, daily_data.mean())
+            'forecast_summary': self._summarize_forecast(forecast, daily_matrix.iloc[0].mean())
         }
+        
+        # Hourly horizon: next 24 hours with daily seasonality
+        hourly_matrix = cube.series('hour', fill=True).to_frame('all').T
+        if hourly_matrix.shape[1] >= 24:
+            hourly = self.forecaster.forecast_matrix(hourly_matrix, horizon=24, freq='H')
+            result['next_24_hours_forecast'] = hourly.mean[0].tolist()
+            result['next_24_hours_lower'] = hourly.lower[0].tolist()
+            result['next_24_hours_upper'] = hourly.upper[0].tolist()
+        
+        return result
+    
+    def forecast_by_entity(self, df: pd.DataFrame, entity_column: str = 'door_id',
+                           freq: str = 'D', horizon: int = 7) -> pd.DataFrame:
+        """Forecast event counts for every door (or other entity) in one batch
+        
+        Returns a long-format frame with ``series_id``, ``timestamp``,
+        ``forecast``, ``lower`` and ``upper`` columns.
+        """
+        if entity_column == 'door_id' and freq in ('H', 'D'):
+            level = 'hour' if freq == 'H' else 'day'
+            matrix = get_time_cube(df).matrix(level)
+        else:
+            matrix = build_series_matrix(df, freq=freq, key=entity_column)
+        if matrix.empty:
+            return pd.DataFrame(columns=['series_id', 'timestamp', 'forecast', 'lower', 'upper'])
+        return self.forecaster.forecast_matrix(matrix, horizon=horizon, freq=freq).to_frame()
     
     def _generate_trend_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate comprehensive trend summary"""
@@ -310,7 +343,7 @@ class AccessTrendsAnalyzer:
         daily_average = total_events / max(date_range, 1)
         
         # Key trend indicators
-        daily_data = df.groupby('date')['event_id'].count()
+        daily_data = self._daily_totals(df)['event_count']
         trend_direction = self._calculate_trend_direction(daily_data.values)
         
         # Usage intensity
@@ -333,17 +366,42 @@ class AccessTrendsAnalyzer:
         }
     
     # Helper methods
-    def _calculate_trend_direction(self, values: np.ndarray) -> Dict[str, Any]:
-        """Calculate trend direction using linear regression"""
+    def _daily_totals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Per-day events, unique users, active doors and success rate from the time cube"""
+        daily = get_time_cube(df).totals('day')
+        return pd.DataFrame({
+            'event_count': daily['count'],
+            'unique_users': daily['unique_people'],
+            'unique_doors': daily['doors'],
+            'success_rate': daily['granted'] / daily['count'] * 100
+        }).set_axis(pd.Index(daily.index.date, name='date'))
+    
+    def _profile(self, totals: pd.DataFrame, key) -> pd.DataFrame:
+        """Event count and success rate of cube totals grouped by ``key(index)``"""
+        grouped = totals[['count', 'granted']].groupby(key(totals.index)).sum()
+        grouped['success_rate'] = grouped['granted'] / grouped['count'] * 100
+        return grouped[['count', 'success_rate']]
+    
+    def _calculate_trend_direction(self, values: np.ndarray,
+                                   window: Optional[int] = None) -> Dict[str, Any]:
+        """Calculate trend direction using least-squares regression
+        
+        With ``window`` only the most recent ``window`` values are used so a
+        regime change is not averaged away by older history.
+        """
+        values = np.asarray(values, dtype=float)
+        if window is not None and len(values) > window:
+            values = values[-window:]
         if len(values) < 2:
             return {'direction': 'insufficient_data', 'strength': 0}
         
-        X = np.arange(len(values)).reshape(-1, 1)
-        model = LinearRegression()
-        model.fit(X, values)
-        
-        slope = model.coef_[0]
-        r_squared = model.score(X, values)
+        x = np.arange(len(values), dtype=float)
+        x_centered = x - x.mean()
+        y_centered = values - values.mean()
+        slope = float((x_centered @ y_centered) / (x_centered @ x_centered))
+        ss_tot = float(y_centered @ y_centered)
+        residuals = y_centered - slope * x_centered
+        r_squared = 1 - float(residuals @ residuals) / ss_tot if ss_tot > 0 else 1.0
         
         if abs(slope) < 0.1:
             direction = 'stable'
@@ -397,23 +455,23 @@ class AccessTrendsAnalyzer:
         }
     
     def _detect_volume_anomalies(self, daily_volumes: pd.DataFrame) -> List[Dict]:
-        """Detect volume anomalies using statistical methods"""
+        """Detect volume anomalies against a trailing window baseline"""
         volumes = daily_volumes['total_events']
-        mean_vol = volumes.mean()
-        std_vol = volumes.std()
+        if 'rolling_zscore' in daily_volumes.columns:
+            z_scores = daily_volumes['rolling_zscore']
+        else:
+            z_scores = rolling_frame(volumes, self.rolling_window)['rolling_zscore']
         
-        # Z-score based anomalies
-        z_scores = np.abs((volumes - mean_vol) / std_vol)
         anomalies = []
+        flagged = z_scores[z_scores.abs() > 2.5]  # 2.5 standard deviations
         
-        for date, z_score in z_scores.items():
-            if z_score > 2.5:  # 2.5 standard deviations
-                anomalies.append({
-                    'date': str(date),
-                    'volume': volumes[date],
-                    'z_score': z_score,
-                    'type': 'high' if volumes[date] > mean_vol else 'low'
-                })
+        for date, z_score in flagged.items():
+            anomalies.append({
+                'date': str(date),
+                'volume': volumes[date],
+                'z_score': abs(z_score),
+                'type': 'high' if z_score > 0 else 'low'
+            })
         
         return anomalies
     
@@ -463,23 +521,27 @@ class AccessTrendsAnalyzer:
         return peak_value / average_value if average_value > 0 else 1.0
     
     def _analyze_peak_consistency(self, df: pd.DataFrame) -> Dict[str, float]:
-        """Analyze how consistent peak times are across days"""
+        """Analyze how consistent peak times are across recent days"""
         
-        # Group by date and hour to see daily hourly patterns
-        daily_hourly = df.groupby(['date', 'hour'])['event_id'].count().unstack(fill_value=0)
+        # Hourly counts for every active day (dates x hours)
+        hourly = get_time_cube(df).series('hour')
+        daily_hourly = hourly.groupby([hourly.index.date, hourly.index.hour]).sum().unstack(fill_value=0)
         
         if daily_hourly.empty:
             return {'consistency_score': 0, 'peak_hour_stability': 0}
         
-        # Calculate coefficient of variation for each hour across days
-        hourly_cv = daily_hourly.std() / daily_hourly.mean()
-        hourly_cv = hourly_cv.fillna(0)
+        # Coefficient of variation for each hour over the trailing window of days
+        matrix = daily_hourly.to_numpy(dtype=float)
+        window_mean = rolling_mean(matrix, self.rolling_window)[-1]
+        window_std = rolling_std(matrix, self.rolling_window)[-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hourly_cv = np.nan_to_num(window_std / window_mean)
         
         # Overall consistency (lower CV = more consistent)
         consistency_score = 1 - (hourly_cv.mean() / 2)  # Normalize roughly to 0-1
         
         # Peak hour stability (how often the same hour is the peak)
-        daily_peaks = daily_hourly.idxmax(axis=1)
+        daily_peaks = daily_hourly.tail(self.rolling_window).idxmax(axis=1)
         peak_mode = daily_peaks.mode()
         peak_stability = (daily_peaks == peak_mode.iloc[0]).mean() if len(peak_mode) > 0 else 0
         
@@ -506,17 +568,20 @@ class AccessTrendsAnalyzer:
         }
     
     def _calculate_growth_acceleration(self, daily_data: pd.Series) -> float:
-        """Calculate growth acceleration (second derivative)"""
-        if len(daily_data) < 3:
+        """Calculate growth acceleration as the recent change in trend slope"""
+        values = daily_data.to_numpy(dtype=float)
+        if len(values) < 3:
             return 0
         
-        # Calculate first differences (velocity)
-        velocity = daily_data.diff()
+        window = self.rolling_window
+        if len(values) <= window:
+            # Mean second difference (telescoped) when there is no full window
+            return (values[-1] - values[-2] - (values[1] - values[0])) / (len(values) - 2)
         
-        # Calculate second differences (acceleration)
-        acceleration = velocity.diff()
-        
-        return acceleration.mean()
+        # Change in the trailing OLS slope per day over the most recent window
+        slopes = rolling_slope(values, window)
+        lag = min(window, len(values) - window)
+        return float((slopes[-1] - slopes[-1 - lag]) / lag)
     
     def _calculate_seasonal_strength(self, df: pd.DataFrame) -> float:
         """Calculate strength of seasonal patterns"""
@@ -545,9 +610,7 @@ class AccessTrendsAnalyzer:
     
     def _analyze_success_rate_trend(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze trends in access success rates"""
-        daily_success = df.groupby('date').agg({
-            'access_result': lambda x: (x == 'Granted').mean() * 100
-        })['access_result']
+        daily_success = self._daily_totals(df)['success_rate']
         
         trend = self._calculate_trend_direction(daily_success.values)
         
@@ -560,11 +623,7 @@ class AccessTrendsAnalyzer:
     def _calculate_overall_trend_strength(self, df: pd.DataFrame) -> float:
         """Calculate overall trend strength across multiple metrics"""
         
-        daily_data = df.groupby('date').agg({
-            'event_id': 'count',
-            'person_id': 'nunique',
-            'access_result': lambda x: (x == 'Granted').mean() * 100
-        })
+        daily_data = self._daily_totals(df)[['event_count', 'unique_users', 'success_rate']]
         
         # Calculate trend strength for each metric
         strengths = []
@@ -625,9 +684,9 @@ class AccessTrendsAnalyzer:
         }
 
 # Factory function
-def create_trends_analyzer() -> AccessTrendsAnalyzer:
+def create_trends_analyzer(**kwargs) -> AccessTrendsAnalyzer:
     """Create access trends analyzer instance"""
-    return AccessTrendsAnalyzer()
+    return AccessTrendsAnalyzer(**kwargs)
 
 # Export
 __all__ = ['AccessTrendsAnalyzer', 'TrendMetrics', 'create_trends_analyzer']
@@ -8,7 +8,7 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Callable
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import json
@@ -19,6 +19,10 @@ from .access_trends import AccessTrendsAnalyzer, create_trends_analyzer
 from .user_behavior import UserBehaviorAnalyzer, create_behavior_analyzer
 from .anomaly_detection import AnomalyDetector, create_anomaly_detector
 from .interactive_charts import SecurityChartsGenerator, create_charts_generator
+from .chart_data import ChartDataConfig
+from core.figure_serialization import get_figure_serializer
+from core.performance import profiler
+from core.sampling_profiler import SamplingProfiler
 
 @dataclass
 class AnalyticsConfig:
@@ -28,10 +32,35 @@ class AnalyticsConfig:
     enable_user_behavior: bool = True
     enable_anomaly_detection: bool = True
     enable_interactive_charts: bool = True
+    # Render charts only when requested by id (get_chart) instead of with
+    # every analysis; off until a page renders charts by id
+    lazy_charts: bool = False
     anomaly_sensitivity: float = 0.95
+    # Anomaly detector selection; None enables every registered detector
+    enabled_anomaly_detectors: Optional[List[str]] = None
+    disabled_anomaly_detectors: List[str] = field(default_factory=list)
+    # Per-detector time budgets in seconds, keyed by detector name
+    anomaly_detector_budgets: Dict[str, float] = field(default_factory=dict)
+    # Anomalies kept per type for presentation; the rest are only counted
+    anomaly_top_k: int = 100
+    # Trailing window (days) for rolling trend and anomaly statistics
+    rolling_window_days: int = 14
+    # Chart payload limits: points per time series, histogram bins, bar categories
+    chart_max_points: int = 2000
+    chart_downsample_method: str = 'lttb'
+    chart_histogram_bins: int = 20
+    chart_top_n: int = 20
+    chart_max_scatter_points: int = 5000
+    # Per-chart point budget overrides, keyed by chart id
+    chart_point_budgets: Dict[str, int] = field(default_factory=dict)
     parallel_processing: bool = True
     cache_results: bool = True
     cache_duration_minutes: int = 30
+    # Statistical profiling of analyze_all; also enabled per call with profile=True
+    profiling_enabled: bool = False
+    profile_interval_ms: float = 10.0
+    profile_dir: str = "profiles"
+    profile_top_n: int = 20
 
 @dataclass
 class AnalyticsResult:
@@ -46,6 +75,8 @@ class AnalyticsResult:
     generated_at: datetime
     status: str
     errors: List[str]
+    # Hot functions and flamegraph files when the run was profiled
+    profile: Optional[Dict[str, Any]] = None
 
 class AnalyticsController:
     """Unified controller for all analytics operations"""
@@ -56,10 +87,28 @@ class AnalyticsController:
         
         # Initialize analyzers
         self.security_analyzer = create_security_analyzer() if self.config.enable_security_patterns else None
-        self.trends_analyzer = create_trends_analyzer() if self.config.enable_access_trends else None
+        self.trends_analyzer = create_trends_analyzer(
+            rolling_window=self.config.rolling_window_days
+        ) if self.config.enable_access_trends else None
         self.behavior_analyzer = create_behavior_analyzer() if self.config.enable_user_behavior else None
-        self.anomaly_detector = create_anomaly_detector() if self.config.enable_anomaly_detection else None
-        self.charts_generator = create_charts_generator() if self.config.enable_interactive_charts else None
+        self.anomaly_detector = create_anomaly_detector(
+            enabled_detectors=self.config.enabled_anomaly_detectors,
+            disabled_detectors=self.config.disabled_anomaly_detectors,
+            detector_budgets=self.config.anomaly_detector_budgets,
+            parallel=self.config.parallel_processing,
+            top_k=self.config.anomaly_top_k,
+            rolling_window=self.config.rolling_window_days
+        ) if self.config.enable_anomaly_detection else None
+        self.charts_generator = create_charts_generator(
+            data_config=ChartDataConfig(
+                max_points=self.config.chart_max_points,
+                downsample_method=self.config.chart_downsample_method,
+                histogram_bins=self.config.chart_histogram_bins,
+                top_n_categories=self.config.chart_top_n,
+                max_scatter_points=self.config.chart_max_scatter_points,
+                point_budgets=self.config.chart_point_budgets
+            )
+        ) if self.config.enable_interactive_charts else None
         
         # Cache for results
         self._cache = {}
@@ -98,11 +147,42 @@ class AnalyticsController:
                 self.logger.error(f"Callback error for {event}: {e}")
     
     def analyze_all(self, df: pd.DataFrame, 
-                    analysis_id: Optional[str] = None) -> AnalyticsResult:
-        """Run complete analytics analysis"""
-        
+                    analysis_id: Optional[str] = None,
+                    profile: Optional[bool] = None) -> AnalyticsResult:
+        """Run complete analytics analysis
+
+        With ``profile`` (or ``AnalyticsConfig.profiling_enabled``) the run is
+        sampled and bypasses the result cache; flamegraph files are written
+        to ``profile_dir`` and summarized in ``AnalyticsResult.profile``.
+        """
+        analysis_id = analysis_id or f"analysis_{int(datetime.now().timestamp())}"
+        if not (self.config.profiling_enabled if profile is None else profile):
+            return self._analyze_all(df, analysis_id)
+        
+        sampler = SamplingProfiler(interval=self.config.profile_interval_ms / 1000)
+        with sampler:
+            result = self._analyze_all(df, analysis_id, use_cache=False)
+        # Copy so a cached result does not carry this run's profile
+        return replace(result, profile=self._export_profile(sampler, analysis_id))
+    
+    def _export_profile(self, sampler: SamplingProfiler, analysis_id: str) -> Dict[str, Any]:
+        """Write flamegraph files and register the samples with the profiler"""
+        files: Dict[str, str] = {}
+        try:
+            files = sampler.write(self.config.profile_dir, analysis_id)
+        except OSError as e:
+            self.logger.warning(f"Could not write profile for {analysis_id}: {e}")
+        profiler.record_sampled_profile(analysis_id, sampler, files, self.config.profile_top_n)
+        self.logger.info(f"Profiled {analysis_id}: {sum(sampler.samples.values())} samples")
+        return {
+            'session': analysis_id,
+            'files': files,
+            'hot_functions': sampler.hot_functions(self.config.profile_top_n),
+        }
+    
+    def _analyze_all(self, df: pd.DataFrame, analysis_id: str,
+                     use_cache: bool = True) -> AnalyticsResult:
         start_time = datetime.now()
-        analysis_id = analysis_id or f"analysis_{int(start_time.timestamp())}"
         errors = []
         
         try:
@@ -110,7 +190,7 @@ class AnalyticsController:
             self._trigger_callbacks('on_analysis_start', analysis_id, df)
             
             # Check cache first
-            if self.config.cache_results:
+            if self.config.cache_results and use_cache:
                 cached_result = self._get_cached_result(df)
                 if cached_result:
                     self.logger.info("Returning cached analytics result")
@@ -251,9 +331,7 @@ class AnalyticsController:
             )
         
         if self.charts_generator:
-            futures['interactive_charts'] = self._executor.submit(
-                self.charts_generator.generate_all_charts, df
-            )
+            futures['interactive_charts'] = self._executor.submit(self._generate_charts, df)
         
         # Collect results as they complete
         total_tasks = len(futures)
@@ -290,7 +368,7 @@ class AnalyticsController:
             analyses.append(('anomaly_detection', 
                             lambda df: self.anomaly_detector.detect_anomalies(df, self.config.anomaly_sensitivity)))
         if self.charts_generator:
-            analyses.append(('interactive_charts', self.charts_generator.generate_all_charts))
+            analyses.append(('interactive_charts', self._generate_charts))
         
         # Run each analysis sequentially
         total_analyses = len(analyses)
@@ -310,6 +388,39 @@ class AnalyticsController:
         
         return results
     
+    def _generate_charts(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Build all charts, or register the dataset for on-demand rendering"""
+        if not self.config.lazy_charts:
+            return self.charts_generator.generate_all_charts(df)
+        return {
+            'lazy': True,
+            'dataset_id': self.charts_generator.register_dataset(df),
+            'chart_ids': self.charts_generator.available_charts()
+        }
+    
+    def get_chart(self, chart_id: str, dataset_id: Optional[str] = None,
+                  df: Optional[pd.DataFrame] = None, compact: bool = False) -> Any:
+        """Render one chart (``group.chart``) for an analyzed dataset
+        
+        ``dataset_id`` comes from ``AnalyticsResult.interactive_charts``; a
+        raw ``df`` may be passed instead when the dataset has expired.  With
+        ``compact`` the figure is returned as a dict with base64 typed arrays,
+        cached per chart and dataset, ready to return from a Dash callback.
+        Returns ``None`` when the dataset has been evicted and no ``df`` is
+        given; the caller has to re-run the analysis.
+        """
+        if not self.charts_generator:
+            return None
+        if df is not None:
+            dataset_id = self.charts_generator.register_dataset(self._prepare_data(df))
+        elif not self.charts_generator.has_dataset(dataset_id):
+            self.logger.warning(f"Chart dataset {dataset_id} expired; cannot render {chart_id}")
+            return None
+        figure = self.charts_generator.render_chart(chart_id, dataset_id)
+        if compact and figure is not None:
+            return get_figure_serializer().to_dict(figure, f"{dataset_id}:{chart_id}")
+        return figure
+    
     def _prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare and validate data for analytics"""
         
@@ -443,6 +554,8 @@ class AnalyticsController:
         """Clear analytics cache"""
         self._cache.clear()
         self._cache_timestamps.clear()
+        if self.charts_generator:
+            self.charts_generator.clear_cache()
     
     def get_analytics_status(self) -> Dict[str, Any]:
         """Get status of analytics modules"""
@@ -466,7 +579,11 @@ class AnalyticsController:
                 'parallel_processing': self.config.parallel_processing,
                 'cache_enabled': self.config.cache_results,
                 'cache_duration_minutes': self.config.cache_duration_minutes,
-                'anomaly_sensitivity': self.config.anomaly_sensitivity
+                'anomaly_sensitivity': self.config.anomaly_sensitivity,
+                'lazy_charts': self.config.lazy_charts,
+                'anomaly_detectors': [
+                    detector.name for detector in self.anomaly_detector.get_active_detectors()
+                ] if self.anomaly_detector else []
             },
             'cache_stats': {
                 'cached_results': len(self._cache),
@@ -557,6 +674,8 @@ class AnalyticsController:
         """Cleanup resources"""
         if self._executor:
             self._executor.shutdown(wait=True)
+        if self.anomaly_detector:
+            self.anomaly_detector.shutdown()
 
 # Convenience factory functions
 def create_analytics_controller(config: Optional[AnalyticsConfig] = None) -> AnalyticsController:
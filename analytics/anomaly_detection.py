@@ -6,14 +6,34 @@ Advanced anomaly detection using multiple algorithms and techniques
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Union
 from dataclasses import dataclass
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from scipy import stats
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 from sklearn.svm import OneClassSVM
 import warnings
+
+from .anomaly_sink import AnomalySink, AnomalyBatch
+from .rolling_stats import rolling_zscore
+from .time_cube import get_time_cube
+from .anomaly_detectors import (
+    AnomalyDetectorRegistry,
+    AnomalySubDetector,
+    COST_ORDER,
+    get_detector_registry,
+)
+
+try:
+    from core.performance import get_performance_monitor, MetricType
+except ImportError:  # pragma: no cover - optional dependency
+    get_performance_monitor = None
+    MetricType = None
+
 warnings.filterwarnings('ignore')
 
 @dataclass
@@ -30,12 +50,51 @@ class Anomaly:
     recommended_action: str
 
 class AnomalyDetector:
-    """Advanced anomaly detection with multiple algorithms"""
-    
-    def __init__(self):
+    """Advanced anomaly detection with multiple algorithms
+
+    Detector families are looked up in an :class:`AnomalyDetectorRegistry`
+    and run concurrently over the same prepared frame.  Individual detectors
+    can be enabled or disabled and given a time budget in seconds; a detector
+    that exceeds its budget contributes no anomalies to the result.  Only the
+    ``top_k`` highest ranked anomalies of each type are kept for presentation;
+    the remainder are reflected in the summary counts.
+    """
+
+    RESULT_CATEGORIES = [
+        'statistical_anomalies',
+        'temporal_anomalies',
+        'behavioral_anomalies',
+        'security_anomalies',
+        'pattern_anomalies',
+        'machine_learning_anomalies',
+    ]
+
+    def __init__(self,
+                 enabled_detectors: Optional[List[str]] = None,
+                 disabled_detectors: Optional[List[str]] = None,
+                 detector_budgets: Optional[Dict[str, float]] = None,
+                 parallel: bool = True,
+                 max_workers: Optional[int] = None,
+                 registry: Optional[AnomalyDetectorRegistry] = None,
+                 top_k: int = 100,
+                 rolling_window: int = 14):
         self.logger = logging.getLogger(__name__)
         self.scaler = StandardScaler()
-        
+        self.registry = registry or get_detector_registry()
+        self.enabled_detectors = enabled_detectors
+        self.disabled_detectors = list(disabled_detectors or [])
+        self.detector_budgets = dict(detector_budgets or {})
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.top_k = top_k
+        self.rolling_window = rolling_window
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get_active_detectors(self) -> List[AnomalySubDetector]:
+        """Return enabled detectors ordered with the most expensive first"""
+        detectors = self.registry.select(self.enabled_detectors, self.disabled_detectors)
+        return sorted(detectors, key=lambda d: COST_ORDER.get(d.cost_class, len(COST_ORDER)))
+
     def detect_anomalies(self, df: pd.DataFrame, 
                          sensitivity: float = 0.95) -> Dict[str, Any]:
         """Main anomaly detection function using multiple approaches"""
@@ -45,28 +104,121 @@ class AnomalyDetector:
             
             df = self._prepare_data(df)
             
-            anomalies = {
-                'statistical_anomalies': self._detect_statistical_anomalies(df, sensitivity),
-                'temporal_anomalies': self._detect_temporal_anomalies(df),
-                'behavioral_anomalies': self._detect_behavioral_anomalies(df),
-                'security_anomalies': self._detect_security_anomalies(df),
-                'pattern_anomalies': self._detect_pattern_anomalies(df),
-                'machine_learning_anomalies': self._detect_ml_anomalies(df, sensitivity),
-                'anomaly_summary': {},
-                'risk_assessment': {}
-            }
+            # Consolidate detector output into a bounded, aggregated sink
+            sink = self._consolidate_anomalies(self._run_detectors(df, sensitivity))
             
-            # Generate comprehensive summary
-            all_anomalies = self._consolidate_anomalies(anomalies)
-            anomalies['anomaly_summary'] = self._generate_anomaly_summary(all_anomalies)
-            anomalies['risk_assessment'] = self._assess_overall_risk(all_anomalies)
+            anomalies = {category: sink.records(category) for category in self.RESULT_CATEGORIES}
+            anomalies['anomaly_summary'] = self._generate_anomaly_summary(sink)
+            anomalies['risk_assessment'] = self._assess_overall_risk(sink)
             
             return anomalies
             
         except Exception as e:
             self.logger.error(f"Anomaly detection failed: {e}")
             return self._empty_result()
-    
+
+    def _run_detectors(self, df: pd.DataFrame,
+                       sensitivity: float) -> Dict[str, List[Dict[str, Any]]]:
+        """Run all active detectors over the prepared frame"""
+
+        detectors = []
+        for detector in self.get_active_detectors():
+            missing = detector.missing_columns(df)
+            if missing:
+                self.logger.warning(f"Skipping detector {detector.name}: missing columns {missing}")
+                continue
+            detectors.append(detector)
+
+        if not self.parallel or len(detectors) < 2:
+            return {d.name: self._run_detector(d, df, sensitivity) for d in detectors}
+
+        executor = self._get_executor(len(detectors))
+        submitted_at = time.perf_counter()
+        # One latency sample per run: whoever takes the claim first records it
+        claims = {d.name: threading.Lock() for d in detectors}
+        futures = {
+            d.name: executor.submit(self._run_detector, d, df, sensitivity, claims[d.name])
+            for d in detectors
+        }
+
+        results = {}
+        timed_out = False
+        for detector in detectors:
+            budget = self.detector_budgets.get(detector.name)
+            timeout = None
+            if budget is not None:
+                timeout = max(0.0, budget - (time.perf_counter() - submitted_at))
+            try:
+                results[detector.name] = futures[detector.name].result(timeout=timeout)
+            except FutureTimeoutError:
+                # The worker thread cannot be interrupted; its result is discarded
+                self.logger.warning(
+                    f"Anomaly detector {detector.name} exceeded its {budget}s budget"
+                )
+                futures[detector.name].cancel()
+                if claims[detector.name].acquire(blocking=False):
+                    self._record_detector_latency(detector, budget, 'timeout', len(df))
+                results[detector.name] = []
+                timed_out = True
+        if timed_out:
+            # Leave the stuck threads to finish in the old pool so the next
+            # analysis does not queue behind them
+            self.shutdown()
+        return results
+
+    def _run_detector(self, detector: AnomalySubDetector, df: pd.DataFrame,
+                      sensitivity: float,
+                      claim: Optional[threading.Lock] = None) -> List[Dict[str, Any]]:
+        """Run a single detector, recording its latency
+
+        No latency is recorded when ``claim`` was already taken by a caller
+        that gave up on the detector.
+        """
+        start = time.perf_counter()
+        status = 'success'
+        try:
+            return detector.detect(self, df, sensitivity)
+        except Exception as e:
+            status = 'error'
+            self.logger.error(f"Anomaly detector {detector.name} failed: {e}")
+            return []
+        finally:
+            if claim is None or claim.acquire(blocking=False):
+                self._record_detector_latency(detector, time.perf_counter() - start,
+                                              status, len(df))
+
+    def _record_detector_latency(self, detector: AnomalySubDetector, duration: float,
+                                 status: str, row_count: int) -> None:
+        """Record per-detector latency with the performance monitor"""
+        if get_performance_monitor is None:
+            return
+        try:
+            get_performance_monitor().record_metric(
+                f"anomaly_detection.{detector.name}",
+                duration,
+                MetricType.EXECUTION_TIME,
+                duration=duration,
+                metadata={'status': status, 'rows': row_count},
+                tags={'detector': detector.name, 'cost_class': detector.cost_class}
+            )
+        except Exception as e:  # pragma: no cover - monitoring must never break detection
+            self.logger.debug(f"Failed to record detector latency: {e}")
+
+    def _get_executor(self, detector_count: int) -> ThreadPoolExecutor:
+        """Return the thread pool used to run detectors concurrently"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers or max(1, detector_count),
+                thread_name_prefix='anomaly-detector'
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Release the detector thread pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
     def _prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare and validate data for anomaly detection"""
         df = df.copy()
@@ -90,10 +242,10 @@ class AnomalyDetector:
         
         anomalies = []
         
-        # Volume anomalies (Z-score based)
+        # Volume anomalies (Z-score against the trailing window of days)
         daily_volumes = df.groupby('date')['event_id'].count()
         if len(daily_volumes) > 2:
-            z_scores = np.abs(stats.zscore(daily_volumes))
+            z_scores = np.abs(rolling_zscore(daily_volumes.to_numpy(), self.rolling_window))
             threshold = stats.norm.ppf(sensitivity)
             
             for date, z_score in zip(daily_volumes.index, z_scores):
@@ -114,7 +266,7 @@ class AnomalyDetector:
         })['access_result']
         
         if len(daily_success_rates) > 2:
-            sr_z_scores = np.abs(stats.zscore(daily_success_rates))
+            sr_z_scores = np.abs(rolling_zscore(daily_success_rates.to_numpy(), self.rolling_window))
             sr_threshold = stats.norm.ppf(sensitivity)
             
             for date, z_score in zip(daily_success_rates.index, sr_z_scores):
@@ -151,7 +303,7 @@ class AnomalyDetector:
         
         return anomalies
     
-    def _detect_temporal_anomalies(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_temporal_anomalies(self, df: pd.DataFrame) -> List[Union[Dict[str, Any], pd.DataFrame]]:
         """Detect temporal pattern anomalies"""
         
         anomalies = []
@@ -191,11 +343,11 @@ class AnomalyDetector:
         
         # Time clustering anomalies (unusual time patterns)
         time_anomalies = self._detect_time_clustering_anomalies(df)
-        anomalies.extend(time_anomalies)
+        self._collect(anomalies, time_anomalies)
         
         # Sequential time anomalies
         sequential_anomalies = self._detect_sequential_anomalies(df)
-        anomalies.extend(sequential_anomalies)
+        self._collect(anomalies, sequential_anomalies)
         
         return anomalies
     
@@ -210,15 +362,15 @@ class AnomalyDetector:
         
         rapid_attempts = df_sorted[df_sorted['time_diff'] < pd.Timedelta(seconds=30)]
         if len(rapid_attempts) > 0:
-            for user_id in rapid_attempts['person_id'].unique():
-                user_rapid = rapid_attempts[rapid_attempts['person_id'] == user_id]
+            rapid_counts = rapid_attempts.groupby('person_id', sort=False).size()
+            for user_id, attempt_count in rapid_counts.items():
                 anomalies.append({
                     'type': 'rapid_attempts',
                     'severity': 'high',
                     'confidence': 0.9,
                     'user_id': user_id,
-                    'attempt_count': len(user_rapid),
-                    'description': f'User {user_id} made {len(user_rapid)} rapid access attempts'
+                    'attempt_count': attempt_count,
+                    'description': f'User {user_id} made {attempt_count} rapid access attempts'
                 })
         
         # Door hopping (multiple doors in short time)
@@ -235,7 +387,7 @@ class AnomalyDetector:
         
         return anomalies
     
-    def _detect_security_anomalies(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_security_anomalies(self, df: pd.DataFrame) -> List[Union[Dict[str, Any], pd.DataFrame]]:
         """Detect security-specific anomalies"""
         
         anomalies = []
@@ -264,8 +416,9 @@ class AnomalyDetector:
             
             # Door-specific failure spikes
             door_failures = failed_attempts.groupby('door_id')['event_id'].count()
+            door_totals = df['door_id'].value_counts()
             for door_id, failure_count in door_failures.items():
-                total_door_attempts = len(df[df['door_id'] == door_id])
+                total_door_attempts = door_totals[door_id]
                 failure_rate = failure_count / total_door_attempts
                 
                 if failure_rate > 0.3 and failure_count >= 5:
@@ -291,11 +444,11 @@ class AnomalyDetector:
         
         # Tailgating detection
         tailgating_anomalies = self._detect_tailgating(df)
-        anomalies.extend(tailgating_anomalies)
+        self._collect(anomalies, tailgating_anomalies)
         
         return anomalies
     
-    def _detect_pattern_anomalies(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_pattern_anomalies(self, df: pd.DataFrame) -> List[Union[Dict[str, Any], pd.DataFrame]]:
         """Detect anomalies in access patterns"""
         
         anomalies = []
@@ -310,7 +463,7 @@ class AnomalyDetector:
         
         # Frequency anomalies
         frequency_anomalies = self._detect_frequency_anomalies(df)
-        anomalies.extend(frequency_anomalies)
+        self._collect(anomalies, frequency_anomalies)
         
         return anomalies
     
@@ -343,18 +496,19 @@ class AnomalyDetector:
     def _extract_ml_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Extract features for machine learning anomaly detection"""
         
-        # Aggregate features by time windows (hourly)
-        df['hour_window'] = df['timestamp'].dt.floor('H')
-        
-        features = df.groupby('hour_window').agg({
-            'event_id': 'count',
-            'person_id': 'nunique',
-            'door_id': 'nunique',
-            'access_result': lambda x: (x == 'Granted').mean(),
-            'hour': 'mean',
-            'is_weekend': 'mean',
-            'is_business_hours': 'mean'
-        })
+        # Hourly aggregates come from the shared time-bucket cube
+        totals = get_time_cube(df).totals('hour')
+        hours = totals.index.hour
+        
+        features = pd.DataFrame({
+            'event_id': totals['count'],
+            'person_id': totals['unique_people'],
+            'door_id': totals['doors'],
+            'access_result': totals['granted'] / totals['count'],
+            'hour': hours,
+            'is_weekend': (totals.index.dayofweek >= 5).astype(float),
+            'is_business_hours': ((hours >= 8) & (hours <= 18)).astype(float)
+        }, index=totals.index)
         
         # Add temporal features
         features['hour_sin'] = np.sin(2 * np.pi * features['hour'] / 24)
@@ -385,8 +539,8 @@ class AnomalyDetector:
             n_estimators=100
         )
         
-        # Scale features
-        features_scaled = self.scaler.fit_transform(features)
+        # Scale features (local scaler keeps concurrent runs independent)
+        features_scaled = StandardScaler().fit_transform(features)
         
         # Predict anomalies
         predictions = iso_forest.fit_predict(features_scaled)
@@ -425,7 +579,7 @@ class AnomalyDetector:
             svm = OneClassSVM(nu=nu, kernel='rbf', gamma='scale')
             
             # Scale features
-            features_scaled = self.scaler.fit_transform(features)
+            features_scaled = StandardScaler().fit_transform(features)
             
             # Predict anomalies
             predictions = svm.fit_predict(features_scaled)
@@ -457,8 +611,7 @@ class AnomalyDetector:
         anomalies = []
         
         # Look for unusual clustering of events in short time windows
-        df['time_window'] = df['timestamp'].dt.floor('15min')
-        window_counts = df.groupby('time_window')['event_id'].count()
+        window_counts = get_time_cube(df).series('quarter_hour')
         
         # Statistical threshold
         if len(window_counts) > 10:
@@ -477,28 +630,29 @@ class AnomalyDetector:
         
         return anomalies
     
-    def _detect_sequential_anomalies(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_sequential_anomalies(self, df: pd.DataFrame) -> AnomalyBatch:
         """Detect sequential pattern anomalies"""
         
         anomalies = []
         
         # Look for unusual gaps in sequential access
-        df_sorted = df.sort_values('timestamp')
-        df_sorted['time_gap'] = df_sorted['timestamp'].diff()
+        timestamps = df['timestamp'].sort_values()
+        time_gap = timestamps.diff()
         
         # Very large gaps (potential system issues)
-        large_gaps = df_sorted[df_sorted['time_gap'] > pd.Timedelta(hours=6)]
-        for _, row in large_gaps.iterrows():
-            anomalies.append({
-                'type': 'sequential_gap',
-                'severity': 'low',
-                'confidence': 0.6,
-                'gap_duration': row['time_gap'],
-                'timestamp': row['timestamp'],
-                'description': f'Large time gap in access sequence: {row["time_gap"]}'
-            })
+        mask = time_gap > pd.Timedelta(hours=6)
+        if not mask.any():
+            return anomalies
         
-        return anomalies
+        gaps = time_gap[mask]
+        return pd.DataFrame({
+            'type': 'sequential_gap',
+            'severity': 'low',
+            'confidence': 0.6,
+            'gap_duration': gaps.to_numpy(),
+            'timestamp': timestamps[mask].to_numpy(),
+            'description': 'Large time gap in access sequence: ' + gaps.astype(str).to_numpy()
+        })
     
     def _detect_door_hopping(self, df_sorted: pd.DataFrame) -> List[Dict[str, Any]]:
         """Detect door hopping behavior"""
@@ -658,40 +812,35 @@ class AnomalyDetector:
         
         return anomalies
     
-    def _detect_tailgating(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_tailgating(self, df: pd.DataFrame) -> AnomalyBatch:
         """Detect potential tailgating events"""
         
-        anomalies = []
-        
         # Look for multiple successful accesses at same door within short time
-        df_sorted = df.sort_values(['door_id', 'timestamp'])
-        
-        for door_id in df['door_id'].unique():
-            door_data = df_sorted[df_sorted['door_id'] == door_id]
-            granted_access = door_data[door_data['access_result'] == 'Granted']
-            
-            if len(granted_access) < 2:
-                continue
-            
-            granted_access = granted_access.copy()
-            granted_access['time_diff'] = granted_access['timestamp'].diff()
-            
-            # Multiple accesses within 30 seconds
-            rapid_accesses = granted_access[granted_access['time_diff'] < pd.Timedelta(seconds=30)]
-            
-            if len(rapid_accesses) > 0:
-                for _, row in rapid_accesses.iterrows():
-                    anomalies.append({
-                        'type': 'potential_tailgating',
-                        'severity': 'medium',
-                        'confidence': 0.6,
-                        'door_id': door_id,
-                        'timestamp': row['timestamp'],
-                        'time_gap': row['time_diff'],
-                        'description': f'Potential tailgating at door {door_id}: access {row["time_diff"]} after previous'
-                    })
-        
-        return anomalies
+        granted_access = df.loc[df['access_result'] == 'Granted', ['door_id', 'timestamp']]
+        if len(granted_access) < 2:
+            return []
+        
+        granted_access = granted_access.sort_values(['door_id', 'timestamp'], kind='mergesort')
+        time_diff = granted_access.groupby('door_id', sort=False)['timestamp'].diff()
+        
+        # Multiple accesses within 30 seconds
+        mask = time_diff < pd.Timedelta(seconds=30)
+        if not mask.any():
+            return []
+        
+        rapid_accesses = granted_access[mask]
+        gaps = time_diff[mask]
+        door_ids = rapid_accesses['door_id'].astype(str)
+        return pd.DataFrame({
+            'type': 'potential_tailgating',
+            'severity': 'medium',
+            'confidence': 0.6,
+            'door_id': rapid_accesses['door_id'].to_numpy(),
+            'timestamp': rapid_accesses['timestamp'].to_numpy(),
+            'time_gap': gaps.to_numpy(),
+            'description': ('Potential tailgating at door ' + door_ids + ': access '
+                            + gaps.astype(str) + ' after previous').to_numpy()
+        })
     
     def _detect_sequence_anomalies(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Detect unusual access sequences"""
@@ -764,32 +913,46 @@ class AnomalyDetector:
         
         return anomalies
     
-    def _detect_frequency_anomalies(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_frequency_anomalies(self, df: pd.DataFrame) -> AnomalyBatch:
         """Detect frequency-based anomalies"""
         
-        anomalies = []
-        
         # Sudden burst of activity
-        df['hour_window'] = df['timestamp'].dt.floor('H')
-        hourly_counts = df.groupby(['person_id', 'hour_window'])['event_id'].count()
-        
-        # Find users with unusually high activity in single hours
-        for (user_id, hour_window), count in hourly_counts.items():
-            user_hourly_avg = hourly_counts[user_id].mean()
-            
-            if count > user_hourly_avg * 5 and count > 10:  # 5x average and at least 10 events
-                anomalies.append({
-                    'type': 'activity_burst',
-                    'severity': 'medium',
-                    'confidence': 0.7,
-                    'user_id': user_id,
-                    'hour_window': hour_window,
-                    'event_count': count,
-                    'avg_hourly': user_hourly_avg,
-                    'description': f'User {user_id} had activity burst: {count} events in hour {hour_window}'
-                })
-        
-        return anomalies
+        hour_window = df['timestamp'].dt.floor('H').rename('hour_window')
+        hourly_counts = df.groupby([df['person_id'], hour_window])['event_id'].count()
+        if hourly_counts.empty:
+            return []
+        
+        # Per-user hourly average computed once and broadcast to each (user, hour)
+        user_hourly_avg = hourly_counts.groupby(level=0).transform('mean')
+        
+        # 5x average and at least 10 events
+        mask = (hourly_counts > user_hourly_avg * 5) & (hourly_counts > 10)
+        if not mask.any():
+            return []
+        
+        bursts = hourly_counts[mask]
+        user_ids = bursts.index.get_level_values(0)
+        windows = bursts.index.get_level_values(1)
+        return pd.DataFrame({
+            'type': 'activity_burst',
+            'severity': 'medium',
+            'confidence': 0.7,
+            'user_id': user_ids,
+            'hour_window': windows,
+            'event_count': bursts.to_numpy(),
+            'avg_hourly': user_hourly_avg[mask].to_numpy(),
+            'description': ('User ' + user_ids.astype(str) + ' had activity burst: '
+                            + bursts.astype(str).to_numpy() + ' events in hour '
+                            + windows.astype(str))
+        })
+    
+    def _collect(self, anomalies: List[Any], batch: AnomalyBatch) -> None:
+        """Add a helper's result to a category list without expanding frames"""
+        if isinstance(batch, pd.DataFrame):
+            if not batch.empty:
+                anomalies.append(batch)
+        else:
+            anomalies.extend(batch)
     
     def _calculate_pattern_similarity(self, pattern1: pd.Series, 
                                       pattern2: pd.Series) -> float:
@@ -808,26 +971,26 @@ class AnomalyDetector:
         
         return max(0, similarity)
     
-    def _consolidate_anomalies(self, anomaly_dict: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Consolidate all anomalies into a single list"""
+    def _consolidate_anomalies(self, anomaly_dict: Dict[str, Any]) -> AnomalySink:
+        """Consolidate all detector results into a bounded anomaly sink"""
         
-        all_anomalies = []
+        sink = AnomalySink(top_k=self.top_k)
         
         for category, anomalies in anomaly_dict.items():
             if category in ['anomaly_summary', 'risk_assessment']:
                 continue
             
-            if isinstance(anomalies, list):
-                for anomaly in anomalies:
-                    anomaly['category'] = category
-                    all_anomalies.append(anomaly)
+            if isinstance(anomalies, pd.DataFrame):
+                sink.add_frame(category, anomalies)
+            elif isinstance(anomalies, list):
+                sink.extend(category, anomalies)
         
-        return all_anomalies
+        return sink
     
-    def _generate_anomaly_summary(self, all_anomalies: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate comprehensive anomaly summary"""
+    def _generate_anomaly_summary(self, sink: AnomalySink) -> Dict[str, Any]:
+        """Generate comprehensive anomaly summary from sink aggregates"""
         
-        if not all_anomalies:
+        if sink.total == 0:
             return {
                 'total_anomalies': 0,
                 'severity_breakdown': {},
@@ -836,51 +999,19 @@ class AnomalyDetector:
                 'top_anomalies': []
             }
         
-        # Severity breakdown
-        severity_counts = {}
-        for anomaly in all_anomalies:
-            severity = anomaly.get('severity', 'unknown')
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-        
-        # Type breakdown
-        type_counts = {}
-        for anomaly in all_anomalies:
-            anomaly_type = anomaly.get('type', 'unknown')
-            type_counts[anomaly_type] = type_counts.get(anomaly_type, 0) + 1
-        
-        # Confidence statistics
-        confidences = [anomaly.get('confidence', 0) for anomaly in all_anomalies]
-        confidence_stats = {
-            'mean': np.mean(confidences),
-            'median': np.median(confidences),
-            'min': np.min(confidences),
-            'max': np.max(confidences)
-        }
-        
-        # Top anomalies by severity and confidence
-        sorted_anomalies = sorted(
-            all_anomalies,
-            key=lambda x: (
-                {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}.get(x.get('severity', 'low'), 1),
-                x.get('confidence', 0)
-            ),
-            reverse=True
-        )
-        
-        top_anomalies = sorted_anomalies[:10]  # Top 10
-        
         return {
-            'total_anomalies': len(all_anomalies),
-            'severity_breakdown': severity_counts,
-            'type_breakdown': type_counts,
-            'confidence_stats': confidence_stats,
-            'top_anomalies': top_anomalies
+            'total_anomalies': sink.total,
+            'severity_breakdown': sink.severity_counts(),
+            'type_breakdown': sink.type_counts(),
+            'truncated_breakdown': sink.truncated_counts(),
+            'confidence_stats': sink.confidence_stats(),
+            'top_anomalies': sink.top_records(10)
         }
     
-    def _assess_overall_risk(self, all_anomalies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _assess_overall_risk(self, sink: AnomalySink) -> Dict[str, Any]:
         """Assess overall risk based on detected anomalies"""
         
-        if not all_anomalies:
+        if sink.total == 0:
             return {
                 'risk_level': 'low',
                 'risk_score': 0,
@@ -888,20 +1019,11 @@ class AnomalyDetector:
                 'recommendations': []
             }
         
-        # Calculate risk score
-        risk_score = 0
         risk_factors = []
         
-        # Severity-based scoring
-        severity_weights = {'critical': 10, 'high': 5, 'medium': 2, 'low': 1}
-        for anomaly in all_anomalies:
-            severity = anomaly.get('severity', 'low')
-            confidence = anomaly.get('confidence', 0.5)
-            risk_score += severity_weights[severity] * confidence
-        
-        # Normalize risk score
-        max_possible_score = len(all_anomalies) * 10  # All critical with full confidence
-        normalized_risk_score = min(100, (risk_score / max_possible_score) * 100) if max_possible_score > 0 else 0
+        # Severity-based scoring, normalized against all critical with full confidence
+        max_possible_score = sink.total * 10
+        normalized_risk_score = min(100, (sink.risk_weight_sum / max_possible_score) * 100)
         
         # Determine risk level
         if normalized_risk_score >= 70:
@@ -914,33 +1036,32 @@ class AnomalyDetector:
             risk_level = 'low'
         
         # Identify key risk factors
-        critical_anomalies = [a for a in all_anomalies if a.get('severity') == 'critical']
-        high_anomalies = [a for a in all_anomalies if a.get('severity') == 'high']
+        severity_counts = sink.severity_counts()
         
-        if critical_anomalies:
-            risk_factors.append(f"{len(critical_anomalies)} critical security anomalies detected")
-        if high_anomalies:
-            risk_factors.append(f"{len(high_anomalies)} high-severity anomalies detected")
+        if severity_counts.get('critical'):
+            risk_factors.append(f"{severity_counts['critical']} critical security anomalies detected")
+        if severity_counts.get('high'):
+            risk_factors.append(f"{severity_counts['high']} high-severity anomalies detected")
         
         # Generate recommendations
-        recommendations = self._generate_risk_recommendations(all_anomalies, risk_level)
+        recommendations = self._generate_risk_recommendations(sink, risk_level)
         
         return {
             'risk_level': risk_level,
             'risk_score': normalized_risk_score,
             'risk_factors': risk_factors,
             'recommendations': recommendations,
-            'anomaly_impact_analysis': self._analyze_anomaly_impact(all_anomalies)
+            'anomaly_impact_analysis': self._analyze_anomaly_impact(sink)
         }
     
-    def _generate_risk_recommendations(self, all_anomalies: List[Dict[str, Any]], 
+    def _generate_risk_recommendations(self, sink: AnomalySink, 
                                        risk_level: str) -> List[str]:
         """Generate risk mitigation recommendations"""
         
         recommendations = []
         
         # Type-specific recommendations
-        anomaly_types = set(anomaly.get('type', '') for anomaly in all_anomalies)
+        anomaly_types = set(sink.type_counts())
         
         if 'repeated_access_failures' in anomaly_types:
             recommendations.append("Investigate users with repeated access failures for potential security threats")
@@ -967,38 +1088,19 @@ class AnomalyDetector:
         
         return recommendations
     
-    def _analyze_anomaly_impact(self, all_anomalies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_anomaly_impact(self, sink: AnomalySink) -> Dict[str, Any]:
         """Analyze the impact of detected anomalies"""
         
-        # Affected entities
-        affected_users = set()
-        affected_doors = set()
-        
-        for anomaly in all_anomalies:
-            if 'user_id' in anomaly:
-                affected_users.add(anomaly['user_id'])
-            if 'door_id' in anomaly:
-                affected_doors.add(anomaly['door_id'])
-        
-        # Temporal impact
-        anomaly_dates = []
-        for anomaly in all_anomalies:
-            if 'date' in anomaly:
-                anomaly_dates.append(anomaly['date'])
-            elif 'timestamp' in anomaly:
-                if isinstance(anomaly['timestamp'], str):
-                    anomaly_dates.append(anomaly['timestamp'][:10])  # Extract date part
-        
-        unique_dates = len(set(anomaly_dates))
+        affected = sink.affected_counts()
         
         return {
-            'affected_users_count': len(affected_users),
-            'affected_doors_count': len(affected_doors),
-            'affected_dates_count': unique_dates,
-            'security_impact_level': self._calculate_security_impact(all_anomalies)
+            'affected_users_count': affected['user_id'],
+            'affected_doors_count': affected['door_id'],
+            'affected_dates_count': affected['date'],
+            'security_impact_level': self._calculate_security_impact(sink)
         }
     
-    def _calculate_security_impact(self, all_anomalies: List[Dict[str, Any]]) -> str:
+    def _calculate_security_impact(self, sink: AnomalySink) -> str:
         """Calculate the security impact level"""
         
         security_types = [
@@ -1009,14 +1111,15 @@ class AnomalyDetector:
             'potential_tailgating'
         ]
         
-        security_anomalies = [a for a in all_anomalies if a.get('type') in security_types]
-        critical_security = [a for a in security_anomalies if a.get('severity') == 'critical']
+        type_counts = sink.type_counts()
+        security_count = sum(type_counts.get(t, 0) for t in security_types)
+        critical_security = sink.severity_counts(security_types).get('critical', 0)
         
-        if len(critical_security) >= 3:
+        if critical_security >= 3:
             return 'severe'
-        elif len(security_anomalies) >= 5:
+        elif security_count >= 5:
             return 'significant'
-        elif len(security_anomalies) >= 2:
+        elif security_count >= 2:
             return 'moderate'
         else:
             return 'minimal'
@@ -1043,9 +1146,9 @@ class AnomalyDetector:
         }
 
 # Factory function
-def create_anomaly_detector() -> AnomalyDetector:
+def create_anomaly_detector(**kwargs) -> AnomalyDetector:
     """Create anomaly detector instance"""
-    return AnomalyDetector()
+    return AnomalyDetector(**kwargs)
 
 # Export
 __all__ = ['AnomalyDetector', 'Anomaly', 'create_anomaly_detector']
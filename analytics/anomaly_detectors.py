@@ -0,0 +1,184 @@
+"""
+Anomaly Detector Registry
+Pluggable anomaly detector families run independently over a prepared frame
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+import logging
+import threading
+
+import pandas as pd
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .anomaly_detection import AnomalyDetector
+
+# Cost classes used to schedule detectors (heavier detectors start first)
+COST_LIGHT = 'light'
+COST_MEDIUM = 'medium'
+COST_HEAVY = 'heavy'
+
+COST_ORDER = {COST_HEAVY: 0, COST_MEDIUM: 1, COST_LIGHT: 2}
+
+
+class AnomalySubDetector(ABC):
+    """Base class for a single anomaly detector family
+
+    Detectors receive the prepared frame produced by
+    ``AnomalyDetector._prepare_data`` and must treat it as read-only so
+    that several detectors can run over the same frame concurrently.
+    """
+
+    name: str = ''
+    input_columns: Tuple[str, ...] = ()
+    cost_class: str = COST_LIGHT
+
+    def missing_columns(self, df: pd.DataFrame) -> List[str]:
+        """Return declared input columns that are absent from ``df``"""
+        return [col for col in self.input_columns if col not in df.columns]
+
+    @abstractmethod
+    def detect(self, engine: 'AnomalyDetector', df: pd.DataFrame,
+               sensitivity: float) -> List[Dict[str, Any]]:
+        """Run the detector and return a list of anomaly dicts"""
+
+
+class AnomalyDetectorRegistry:
+    """Registry mapping detector names to detector instances"""
+
+    def __init__(self):
+        self._detectors: Dict[str, AnomalySubDetector] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def register(self, detector: AnomalySubDetector) -> AnomalySubDetector:
+        """Register a detector instance under its ``name``"""
+        if not detector.name:
+            raise ValueError("Anomaly detectors must define a name")
+        with self._lock:
+            if detector.name in self._detectors:
+                self.logger.warning(f"Replacing anomaly detector {detector.name}")
+            self._detectors[detector.name] = detector
+        return detector
+
+    def unregister(self, name: str) -> None:
+        """Remove a detector from the registry"""
+        with self._lock:
+            self._detectors.pop(name, None)
+
+    def get(self, name: str) -> Optional[AnomalySubDetector]:
+        """Return the detector registered under ``name``"""
+        return self._detectors.get(name)
+
+    def names(self) -> List[str]:
+        """Return registered detector names in registration order"""
+        return list(self._detectors.keys())
+
+    def select(self, enabled: Optional[List[str]] = None,
+               disabled: Optional[List[str]] = None) -> List[AnomalySubDetector]:
+        """Return detectors filtered by ``enabled`` and ``disabled`` names"""
+        disabled_set = set(disabled or [])
+        names = self.names() if enabled is None else [n for n in enabled if n in self._detectors]
+        return [self._detectors[n] for n in names if n not in disabled_set]
+
+
+# Global registry instance
+_registry = AnomalyDetectorRegistry()
+
+
+def get_detector_registry() -> AnomalyDetectorRegistry:
+    """Return the default anomaly detector registry"""
+    return _registry
+
+
+def register_detector(cls):
+    """Class decorator registering a detector with the default registry"""
+    _registry.register(cls())
+    return cls
+
+
+# Built-in detector families
+
+@register_detector
+class StatisticalAnomalyDetector(AnomalySubDetector):
+    """Z-score based volume, success-rate and user activity anomalies"""
+    name = 'statistical_anomalies'
+    input_columns = ('date', 'event_id', 'person_id', 'access_result')
+    cost_class = COST_LIGHT
+
+    def detect(self, engine, df, sensitivity):
+        return engine._detect_statistical_anomalies(df, sensitivity)
+
+
+@register_detector
+class TemporalAnomalyDetector(AnomalySubDetector):
+    """After-hours, weekend, clustering and sequential gap anomalies"""
+    name = 'temporal_anomalies'
+    input_columns = ('timestamp', 'date', 'event_id', 'is_business_hours', 'is_weekend')
+    cost_class = COST_LIGHT
+
+    def detect(self, engine, df, sensitivity):
+        return engine._detect_temporal_anomalies(df)
+
+
+@register_detector
+class BehavioralAnomalyDetector(AnomalySubDetector):
+    """Rapid attempts, door hopping and per-user pattern deviations"""
+    name = 'behavioral_anomalies'
+    input_columns = ('timestamp', 'person_id', 'door_id', 'event_id', 'hour')
+    cost_class = COST_MEDIUM
+
+    def detect(self, engine, df, sensitivity):
+        return engine._detect_behavioral_anomalies(df)
+
+
+@register_detector
+class SecurityAnomalyDetector(AnomalySubDetector):
+    """Access failures, badge and device issues, tailgating"""
+    name = 'security_anomalies'
+    input_columns = ('timestamp', 'person_id', 'door_id', 'event_id', 'access_result')
+    cost_class = COST_MEDIUM
+
+    def detect(self, engine, df, sensitivity):
+        return engine._detect_security_anomalies(df)
+
+
+@register_detector
+class PatternAnomalyDetector(AnomalySubDetector):
+    """Access sequence, routine break and frequency anomalies"""
+    name = 'pattern_anomalies'
+    input_columns = ('timestamp', 'date', 'person_id', 'door_id', 'event_id')
+    cost_class = COST_MEDIUM
+
+    def detect(self, engine, df, sensitivity):
+        return engine._detect_pattern_anomalies(df)
+
+
+@register_detector
+class MachineLearningAnomalyDetector(AnomalySubDetector):
+    """Isolation Forest and One-Class SVM over hourly features"""
+    name = 'machine_learning_anomalies'
+    input_columns = ('timestamp', 'event_id', 'person_id', 'door_id', 'access_result',
+                     'hour', 'is_weekend', 'is_business_hours')
+    cost_class = COST_HEAVY
+
+    def detect(self, engine, df, sensitivity):
+        return engine._detect_ml_anomalies(df, sensitivity)
+
+
+# Export
+__all__ = [
+    'AnomalySubDetector',
+    'AnomalyDetectorRegistry',
+    'get_detector_registry',
+    'register_detector',
+    'StatisticalAnomalyDetector',
+    'TemporalAnomalyDetector',
+    'BehavioralAnomalyDetector',
+    'SecurityAnomalyDetector',
+    'PatternAnomalyDetector',
+    'MachineLearningAnomalyDetector',
+    'COST_LIGHT',
+    'COST_MEDIUM',
+    'COST_HEAVY',
+]
@@ -0,0 +1,203 @@
+"""
+Anomaly Sink Module
+Bounded, array-backed storage for detected anomalies
+"""
+
+from typing import Dict, List, Any, Iterable, Optional, Set, Union
+import math
+
+import numpy as np
+import pandas as pd
+
+SEVERITY_RANK = {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}
+SEVERITY_WEIGHTS = {'critical': 10, 'high': 5, 'medium': 2, 'low': 1}
+
+# Resolution of the confidence histogram used for the approximate median
+CONFIDENCE_BINS = 1000
+
+# A batch is either a list of anomaly dicts or a DataFrame with one anomaly per row
+AnomalyBatch = Union[List[Dict[str, Any]], pd.DataFrame]
+
+
+def _is_missing(value: Any) -> bool:
+    """Return True for scalar missing values introduced by frame alignment"""
+    if value is None or value is pd.NaT:
+        return True
+    return isinstance(value, float) and math.isnan(value)
+
+
+class AnomalySink:
+    """Bounded anomaly store keeping the top-K anomalies of each type
+
+    Every anomaly added to the sink is counted in per-type aggregates
+    (counts by severity, confidence histogram, risk weight and affected
+    entities) but only the ``top_k`` highest ranked anomalies of each type
+    are retained, as DataFrames, until :meth:`records` materializes them for
+    presentation.  Anomalies are ranked by severity and then confidence.
+    """
+
+    def __init__(self, top_k: int = 100):
+        self.top_k = max(1, int(top_k))
+        self._retained: Dict[str, pd.DataFrame] = {}
+        self._type_category: Dict[str, str] = {}
+        self._severity_counts: Dict[str, Dict[str, int]] = {}
+        self._confidence_hist = np.zeros(CONFIDENCE_BINS + 1, dtype=np.int64)
+        self._confidence_sum = 0.0
+        self._confidence_min = math.inf
+        self._confidence_max = -math.inf
+        self._risk_weight_sum = 0.0
+        self._entities: Dict[str, Set[Any]] = {'user_id': set(), 'door_id': set(), 'date': set()}
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+    def extend(self, category: str, batches: Iterable[Union[Dict[str, Any], pd.DataFrame]]) -> None:
+        """Add a detector category result to the sink
+
+        ``batches`` may mix individual anomaly dicts and DataFrames produced
+        by vectorized detectors.  Dicts are grouped by ``type`` before being
+        converted so that each type keeps homogeneous columns.
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for item in batches:
+            if isinstance(item, pd.DataFrame):
+                self.add_frame(category, item)
+            else:
+                grouped.setdefault(item.get('type', 'unknown'), []).append(item)
+
+        for anomaly_type, items in grouped.items():
+            self._add_type_frame(category, anomaly_type, pd.DataFrame(items))
+
+    def add_frame(self, category: str, frame: pd.DataFrame) -> None:
+        """Add a DataFrame of anomalies (one per row) to the sink"""
+        if frame is None or frame.empty:
+            return
+        if 'type' not in frame.columns:
+            frame = frame.assign(type='unknown')
+        for anomaly_type, group in frame.groupby('type', sort=False):
+            self._add_type_frame(category, anomaly_type, group)
+
+    def _add_type_frame(self, category: str, anomaly_type: str, frame: pd.DataFrame) -> None:
+        """Update aggregates for one anomaly type and keep its top-K rows"""
+        frame = frame.reset_index(drop=True)
+        if 'severity' not in frame.columns:
+            frame['severity'] = 'low'
+        if 'confidence' not in frame.columns:
+            frame['confidence'] = 0.0
+        frame['category'] = category
+
+        severity = frame['severity'].fillna('unknown')
+        confidence = pd.to_numeric(frame['confidence'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+
+        counts = self._severity_counts.setdefault(anomaly_type, {})
+        for level, count in severity.value_counts(sort=False).items():
+            counts[level] = counts.get(level, 0) + int(count)
+        self._type_category.setdefault(anomaly_type, category)
+
+        bins = np.clip((confidence * CONFIDENCE_BINS).astype(np.int64), 0, CONFIDENCE_BINS)
+        self._confidence_hist += np.bincount(bins, minlength=CONFIDENCE_BINS + 1)
+        self._confidence_sum += float(confidence.sum())
+        self._confidence_min = min(self._confidence_min, float(confidence.min()))
+        self._confidence_max = max(self._confidence_max, float(confidence.max()))
+
+        weights = severity.map(SEVERITY_WEIGHTS).fillna(1).to_numpy(dtype=float)
+        self._risk_weight_sum += float((weights * confidence).sum())
+
+        for column, values in self._entities.items():
+            if column in frame.columns:
+                values.update(frame[column].dropna().astype(str).unique())
+        if 'timestamp' in frame.columns and frame['timestamp'].dtype == object:
+            self._entities['date'].update(
+                v[:10] for v in frame['timestamp'] if isinstance(v, str)
+            )
+
+        self._retain(anomaly_type, frame)
+
+    def _retain(self, anomaly_type: str, frame: pd.DataFrame) -> None:
+        """Merge ``frame`` into the retained rows and keep the top-K"""
+        existing = self._retained.get(anomaly_type)
+        if existing is not None:
+            frame = pd.concat([existing, frame], ignore_index=True)
+        if len(frame) > self.top_k:
+            rank = frame['severity'].map(SEVERITY_RANK).fillna(1)
+            order = np.lexsort((-pd.to_numeric(frame['confidence'], errors='coerce').fillna(0.0).to_numpy(),
+                                -rank.to_numpy()))
+            frame = frame.iloc[order[:self.top_k]].reset_index(drop=True)
+        self._retained[anomaly_type] = frame
+
+    # ------------------------------------------------------------------
+    # Aggregates
+    # ------------------------------------------------------------------
+    @property
+    def total(self) -> int:
+        """Total number of anomalies added, including those not retained"""
+        return sum(sum(counts.values()) for counts in self._severity_counts.values())
+
+    def type_counts(self) -> Dict[str, int]:
+        """Number of anomalies per type"""
+        return {t: sum(counts.values()) for t, counts in self._severity_counts.items()}
+
+    def severity_counts(self, anomaly_types: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Number of anomalies per severity, optionally restricted to types"""
+        selected = self._severity_counts.keys() if anomaly_types is None else anomaly_types
+        totals: Dict[str, int] = {}
+        for anomaly_type in selected:
+            for level, count in self._severity_counts.get(anomaly_type, {}).items():
+                totals[level] = totals.get(level, 0) + count
+        return totals
+
+    def truncated_counts(self) -> Dict[str, int]:
+        """Number of anomalies per type that were counted but not retained"""
+        return {
+            t: count - len(self._retained.get(t, ()))
+            for t, count in self.type_counts().items()
+            if count > len(self._retained.get(t, ()))
+        }
+
+    def confidence_stats(self) -> Dict[str, float]:
+        """Mean, approximate median, min and max confidence"""
+        total = self.total
+        if total == 0:
+            return {}
+        cumulative = np.cumsum(self._confidence_hist)
+        median_bin = int(np.searchsorted(cumulative, (total + 1) / 2))
+        return {
+            'mean': self._confidence_sum / total,
+            'median': min(median_bin / CONFIDENCE_BINS, self._confidence_max),
+            'min': self._confidence_min,
+            'max': self._confidence_max
+        }
+
+    @property
+    def risk_weight_sum(self) -> float:
+        """Sum of severity weight times confidence over all anomalies"""
+        return self._risk_weight_sum
+
+    def affected_counts(self) -> Dict[str, int]:
+        """Distinct users, doors and dates referenced by anomalies"""
+        return {column: len(values) for column, values in self._entities.items()}
+
+    # ------------------------------------------------------------------
+    # Presentation
+    # ------------------------------------------------------------------
+    def records(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Materialize retained anomalies as dicts, optionally for one category"""
+        records: List[Dict[str, Any]] = []
+        for anomaly_type, frame in self._retained.items():
+            if category is not None and self._type_category.get(anomaly_type) != category:
+                continue
+            for record in frame.to_dict('records'):
+                records.append({k: v for k, v in record.items() if not _is_missing(v)})
+        return records
+
+    def top_records(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the highest ranked retained anomalies across all types"""
+        return sorted(
+            self.records(),
+            key=lambda x: (SEVERITY_RANK.get(x.get('severity', 'low'), 1), x.get('confidence', 0)),
+            reverse=True
+        )[:limit]
+
+
+# Export
+__all__ = ['AnomalySink', 'AnomalyBatch', 'SEVERITY_RANK', 'SEVERITY_WEIGHTS']
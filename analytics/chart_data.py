@@ -0,0 +1,173 @@
+"""
+Chart Data Module
+Server-side downsampling and aggregation that keeps chart payloads bounded
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+@dataclass
+class ChartDataConfig:
+    """Point budgets for chart traces"""
+    # Maximum points per time-series trace
+    max_points: int = 2000
+    # Method used when a series exceeds its budget ('lttb' or 'minmax')
+    downsample_method: str = 'lttb'
+    # Number of server-side histogram bins
+    histogram_bins: int = 20
+    # Categories shown in bar charts before the rest are folded into "Other"
+    top_n_categories: int = 20
+    # Maximum markers in per-entity scatter plots
+    max_scatter_points: int = 5000
+    # Per-chart overrides of the point budget, keyed by chart id
+    point_budgets: Dict[str, int] = field(default_factory=dict)
+
+    def budget(self, chart_id: str, default: Optional[int] = None) -> int:
+        """Point budget for ``chart_id``"""
+        return self.point_budgets.get(chart_id, default if default is not None else self.max_points)
+
+
+def _numeric(x) -> np.ndarray:
+    """Return x coordinates as floats (datetimes become nanoseconds)"""
+    values = np.asarray(x)
+    if values.dtype.kind in 'iufb':
+        return values.astype(float)
+    if values.dtype.kind not in 'mM':
+        values = pd.to_datetime(values).to_numpy()
+    return values.astype('datetime64[ns]').astype(np.int64).astype(float)
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """Indices selected by Largest-Triangle-Three-Buckets downsampling
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the average of the next bucket.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = _numeric(x)
+
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                       - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.nanargmax(areas)) if np.isfinite(areas).any() else start
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, threshold: int) -> np.ndarray:
+    """Indices of each bucket's minimum and maximum plus the two end points"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+    n_buckets = (threshold - 2) // 2
+    bucket = np.arange(n) * n_buckets // n
+    order = np.lexsort((y, bucket))
+    starts = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    return np.unique(np.concatenate([[0, n - 1], order[starts], order[ends]]))
+
+
+def downsample_indices(x, y, max_points: int, method: str = 'lttb') -> np.ndarray:
+    """Positions of the points kept when reducing a series to ``max_points``"""
+    if len(y) <= max_points:
+        return np.arange(len(y))
+    if method == 'minmax':
+        return minmax_indices(y, max_points)
+    if method == 'lttb':
+        return lttb_indices(x, y, max_points)
+    raise ValueError(f"Unknown downsampling method '{method}', expected one of {DOWNSAMPLE_METHODS}")
+
+
+def downsample(x, y, max_points: int, method: str = 'lttb') -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce an ``(x, y)`` series to at most ``max_points`` points"""
+    x_values, y_values = np.asarray(x), np.asarray(y)
+    index = downsample_indices(x_values, y_values, max_points, method)
+    return x_values[index], y_values[index]
+
+
+def downsample_series(series: pd.Series, max_points: int, method: str = 'lttb') -> pd.Series:
+    """Downsample a series indexed by x, keeping the original index values"""
+    index = downsample_indices(series.index, series.to_numpy(dtype=float), max_points, method)
+    return series.iloc[index] if len(index) < len(series) else series
+
+
+def histogram(values: Iterable[float], bins: int = 20) -> pd.DataFrame:
+    """Bin values server-side and return bin centers, widths and counts"""
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return pd.DataFrame(columns=['center', 'width', 'count', 'start', 'end'])
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({
+        'center': (edges[:-1] + edges[1:]) / 2,
+        'width': np.diff(edges),
+        'count': counts,
+        'start': edges[:-1],
+        'end': edges[1:],
+    })
+
+
+def top_n_with_other(data: Union[pd.Series, pd.DataFrame], n: int,
+                     sort_by: Optional[str] = None, other_label: str = 'Other',
+                     sum_columns: Optional[Iterable[str]] = None) -> Union[pd.Series, pd.DataFrame]:
+    """Keep the ``n`` largest categories and fold the remainder into one row
+
+    For frames, ``sort_by`` selects the ranking column and ``sum_columns``
+    (default: ``sort_by`` only) are summed into the "Other" row; remaining
+    columns are left empty there because they do not aggregate by sum.
+    """
+    if len(data) <= n:
+        return data
+    if isinstance(data, pd.Series):
+        ordered = data.sort_values(ascending=False)
+        rest = ordered.iloc[n:]
+        return pd.concat([ordered.iloc[:n], pd.Series({other_label: rest.sum()})])
+
+    sort_by = sort_by or data.columns[0]
+    ordered = data.sort_values(sort_by, ascending=False)
+    rest = ordered.iloc[n:]
+    other = {column: np.nan for column in data.columns}
+    for column in (sum_columns or [sort_by]):
+        other[column] = rest[column].sum()
+    return pd.concat([ordered.iloc[:n], pd.DataFrame([other], index=[other_label])])
+
+
+def limit_points(frame: pd.DataFrame, max_points: int, sort_by: str) -> pd.DataFrame:
+    """Keep the ``max_points`` rows with the largest ``sort_by`` values"""
+    if len(frame) <= max_points:
+        return frame
+    return frame.nlargest(max_points, sort_by)
+
+
+# Export
+__all__ = [
+    'ChartDataConfig',
+    'lttb_indices',
+    'minmax_indices',
+    'downsample_indices',
+    'downsample',
+    'downsample_series',
+    'histogram',
+    'top_n_with_other',
+    'limit_points',
+    'DOWNSAMPLE_METHODS',
+]
@@ -0,0 +1,164 @@
+"""
+Chart Registry Module
+Named chart groups rendered on demand and memoized per dataset
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+import logging
+import threading
+
+import pandas as pd
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .interactive_charts import SecurityChartsGenerator
+
+ChartBuilder = Callable[['SecurityChartsGenerator', pd.DataFrame], Dict[str, Any]]
+
+# Separator between group and chart name in chart ids ("temporal_analysis.peak_hours")
+CHART_ID_SEPARATOR = '.'
+
+
+@dataclass(frozen=True)
+class ChartGroup:
+    """A builder producing one or more related charts from the prepared frame
+
+    Charts in a group share intermediate aggregates, so a request for any
+    chart of the group renders the whole group once and memoizes it.
+    """
+    name: str
+    charts: Tuple[str, ...]
+    builder: ChartBuilder
+    description: str = ''
+
+    def chart_ids(self) -> List[str]:
+        """Fully qualified ids of the charts in this group"""
+        return [f"{self.name}{CHART_ID_SEPARATOR}{chart}" for chart in self.charts]
+
+
+def split_chart_id(chart_id: str) -> Tuple[str, Optional[str]]:
+    """Split ``group.chart`` into its parts (chart is None for a bare group)"""
+    group, _, chart = chart_id.partition(CHART_ID_SEPARATOR)
+    return group, chart or None
+
+
+class ChartRegistry:
+    """Registry mapping chart group names to builders"""
+
+    def __init__(self):
+        self._groups: Dict[str, ChartGroup] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def register(self, group: ChartGroup) -> ChartGroup:
+        """Register a chart group under its ``name``"""
+        if not group.name or CHART_ID_SEPARATOR in group.name:
+            raise ValueError(f"Invalid chart group name: {group.name!r}")
+        with self._lock:
+            if group.name in self._groups:
+                self.logger.warning(f"Replacing chart group {group.name}")
+            self._groups[group.name] = group
+        return group
+
+    def unregister(self, name: str) -> None:
+        """Remove a chart group from the registry"""
+        with self._lock:
+            self._groups.pop(name, None)
+
+    def get(self, name: str) -> Optional[ChartGroup]:
+        """Return the chart group registered under ``name``"""
+        return self._groups.get(name)
+
+    def groups(self) -> List[str]:
+        """Return registered group names in registration order"""
+        return list(self._groups.keys())
+
+    def chart_ids(self) -> List[str]:
+        """Return every registered chart id"""
+        return [chart_id for group in self._groups.values() for chart_id in group.chart_ids()]
+
+    def resolve(self, chart_id: str) -> Tuple[ChartGroup, Optional[str]]:
+        """Return the group and chart name for ``chart_id``"""
+        group_name, chart = split_chart_id(chart_id)
+        group = self._groups.get(group_name)
+        if group is None:
+            raise KeyError(f"Unknown chart group: {group_name}")
+        return group, chart
+
+
+# Global registry instance
+_registry = ChartRegistry()
+
+
+def get_chart_registry() -> ChartRegistry:
+    """Return the default chart registry"""
+    return _registry
+
+
+def register_chart_group(name: str, charts: Tuple[str, ...], description: str = ''):
+    """Decorator registering a builder function as a chart group"""
+    def decorator(builder: ChartBuilder) -> ChartBuilder:
+        _registry.register(ChartGroup(name, tuple(charts), builder, description))
+        return builder
+    return decorator
+
+
+# Built-in chart groups
+
+@register_chart_group('onion_model', ('onion_model', 'layer_breakdown'),
+                      'Security layer (onion) model and per-layer breakdown')
+def _onion_model(generator, df):
+    return generator._create_onion_model(df)
+
+
+@register_chart_group('security_overview', ('access_results', 'success_trend', 'activity_heatmap'),
+                      'Access results, success rate trend and day/hour heatmap')
+def _security_overview(generator, df):
+    return generator._create_security_overview_charts(df)
+
+
+@register_chart_group('temporal_analysis', ('time_series', 'peak_hours', 'weekend_comparison'),
+                      'Daily metrics, hour-of-day and weekday/weekend patterns')
+def _temporal_analysis(generator, df):
+    return generator._create_temporal_charts(df)
+
+
+@register_chart_group('user_activity', ('user_distribution', 'top_users', 'user_behavior'),
+                      'Per-user activity distribution and behavior')
+def _user_activity(generator, df):
+    return generator._create_user_activity_charts(df)
+
+
+@register_chart_group('door_analysis', ('door_usage', 'door_security', 'door_failures'),
+                      'Door utilization, security and failures')
+def _door_analysis(generator, df):
+    return generator._create_door_analysis_charts(df)
+
+
+@register_chart_group('risk_dashboard', ('risk_gauge', 'risk_breakdown', 'risk_timeline'),
+                      'Risk score gauge, factors and daily risk')
+def _risk_dashboard(generator, df):
+    return generator._create_risk_dashboard(df)
+
+
+@register_chart_group('anomaly_visualization', ('volume_anomalies', 'user_anomalies'),
+                      'Daily volume and per-user anomalies')
+def _anomaly_visualization(generator, df):
+    return generator._create_anomaly_charts(df)
+
+
+@register_chart_group('compliance_metrics', ('time_compliance', 'badge_compliance', 'compliance_summary'),
+                      'Business hours, badge and overall compliance')
+def _compliance_metrics(generator, df):
+    return generator._create_compliance_charts(df)
+
+
+# Export
+__all__ = [
+    'ChartGroup',
+    'ChartRegistry',
+    'get_chart_registry',
+    'register_chart_group',
+    'split_chart_id',
+    'CHART_ID_SEPARATOR',
+]
@@ -0,0 +1,310 @@
+"""
+Access Forecasting Module
+Vectorized seasonal forecasting for many access series at once
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Season lengths for the supported bucket frequencies
+SEASON_LENGTHS = {'H': 24, 'D': 7}
+
+# Smoothing parameter grid searched per series (alpha, beta, gamma)
+DEFAULT_PARAM_GRID: Tuple[Tuple[float, float, float], ...] = tuple(
+    (alpha, beta, gamma)
+    for alpha in (0.1, 0.3, 0.6)
+    for beta in (0.0, 0.05, 0.2)
+    for gamma in (0.05, 0.2, 0.4)
+)
+
+
+@dataclass
+class ForecastState:
+    """Fitted additive Holt-Winters state for a batch of series"""
+    method: str  # 'holt_winters', 'seasonal_naive', 'drift'
+    season_length: int
+    level: np.ndarray  # (series,)
+    trend: np.ndarray  # (series,)
+    seasonals: np.ndarray  # (series, season_length)
+    alpha: np.ndarray
+    beta: np.ndarray
+    gamma: np.ndarray
+    sigma: np.ndarray  # one-step residual standard deviation
+    r_squared: np.ndarray
+    n_obs: int
+
+
+@dataclass
+class ForecastResult:
+    """Point forecasts and prediction intervals for a batch of series"""
+    series_ids: List[Any]
+    index: pd.DatetimeIndex
+    mean: np.ndarray  # (series, horizon)
+    lower: np.ndarray
+    upper: np.ndarray
+    state: ForecastState
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return a long-format frame with one row per (series, step)"""
+        n_series, horizon = self.mean.shape
+        return pd.DataFrame({
+            'series_id': np.repeat(np.asarray(self.series_ids, dtype=object), horizon),
+            'timestamp': np.tile(self.index.to_numpy(), n_series),
+            'forecast': self.mean.ravel(),
+            'lower': self.lower.ravel(),
+            'upper': self.upper.ravel(),
+        })
+
+
+def _fingerprint(values: np.ndarray, *params: Any) -> str:
+    """Return a stable fingerprint for a series matrix and fit parameters"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    digest.update(repr((values.shape,) + params).encode())
+    return digest.hexdigest()
+
+
+class SeasonalForecaster:
+    """Batch additive Holt-Winters forecaster
+
+    Series are fitted together as a ``(series x time)`` matrix: every
+    smoothing step is a NumPy operation over all series and all candidate
+    smoothing parameters, and each series keeps the parameters with the
+    lowest one-step squared error.  Series shorter than two seasons fall
+    back to seasonal-naive plus drift, or plain drift below one season.
+    Fitted states are cached by series fingerprint so repeated requests
+    over unchanged data skip the fit.
+    """
+
+    def __init__(self, param_grid: Tuple[Tuple[float, float, float], ...] = DEFAULT_PARAM_GRID,
+                 cache_size: int = 64):
+        self.param_grid = np.asarray(param_grid, dtype=float)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, ForecastState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------
+    # Fitting
+    # ------------------------------------------------------------------
+    def fit(self, values: np.ndarray, season_length: int) -> ForecastState:
+        """Fit (or fetch from cache) the state for a ``(series x time)`` matrix"""
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        key = _fingerprint(values, season_length, self.param_grid.tobytes())
+
+        with self._lock:
+            state = self._cache.get(key)
+            if state is not None:
+                self._cache.move_to_end(key)
+                return state
+
+        n_obs = values.shape[1]
+        if n_obs >= 2 * season_length:
+            state = self._fit_holt_winters(values, season_length)
+        elif n_obs > season_length:
+            state = self._fit_seasonal_naive(values, season_length)
+        else:
+            state = self._fit_drift(values, season_length)
+
+        with self._lock:
+            self._cache[key] = state
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return state
+
+    def _fit_holt_winters(self, values: np.ndarray, m: int) -> ForecastState:
+        """Grid-searched additive Holt-Winters over all series at once"""
+        n_series, n_obs = values.shape
+        grid = self.param_grid
+        n_grid = len(grid)
+        alpha = grid[:, 0][:, None]
+        beta = grid[:, 1][:, None]
+        gamma = grid[:, 2][:, None]
+
+        first = values[:, :m].mean(axis=1)
+        second = values[:, m:2 * m].mean(axis=1)
+        level = np.broadcast_to(first, (n_grid, n_series)).copy()
+        trend = np.broadcast_to((second - first) / m, (n_grid, n_series)).copy()
+        seasonals = np.broadcast_to(values[:, :m] - first[:, None], (n_grid, n_series, m)).copy()
+        sse = np.zeros((n_grid, n_series))
+
+        for t in range(n_obs):
+            y = values[:, t]
+            s = seasonals[:, :, t % m]
+            err = y - (level + trend + s)
+            if t >= m:
+                sse += err ** 2
+            new_level = alpha * (y - s) + (1 - alpha) * (level + trend)
+            trend = beta * (new_level - level) + (1 - beta) * trend
+            seasonals[:, :, t % m] = gamma * (y - new_level) + (1 - gamma) * s
+            level = new_level
+
+        best = np.argmin(sse, axis=0)
+        cols = np.arange(n_series)
+        n_eff = max(n_obs - m, 1)
+        best_sse = sse[best, cols]
+
+        return ForecastState(
+            method='holt_winters',
+            season_length=m,
+            level=level[best, cols],
+            trend=trend[best, cols],
+            seasonals=seasonals[best, cols, :],
+            alpha=grid[best, 0],
+            beta=grid[best, 1],
+            gamma=grid[best, 2],
+            sigma=np.sqrt(best_sse / n_eff),
+            r_squared=self._r_squared(values[:, m:], best_sse),
+            n_obs=n_obs
+        )
+
+    def _fit_seasonal_naive(self, values: np.ndarray, m: int) -> ForecastState:
+        """Repeat the last season, shifted by the average season-over-season drift"""
+        n_series, n_obs = values.shape
+        last_season = values[:, n_obs - m:]
+        diffs = values[:, m:] - values[:, :-m]
+        drift = diffs.mean(axis=1) / m
+        residuals = diffs - diffs.mean(axis=1, keepdims=True)
+        sse = (residuals ** 2).sum(axis=1)
+        # Store the last season relative to the final level so forecasts line up
+        level = last_season[:, -1]
+        order = (np.arange(m) + n_obs) % m
+        seasonals = np.empty((n_series, m))
+        seasonals[:, order] = last_season - level[:, None]
+        zeros = np.zeros(n_series)
+        return ForecastState(
+            method='seasonal_naive',
+            season_length=m,
+            level=level,
+            trend=drift,
+            seasonals=seasonals,
+            alpha=zeros, beta=zeros, gamma=zeros,
+            sigma=np.sqrt(sse / max(diffs.shape[1], 1)),
+            r_squared=self._r_squared(values[:, m:], sse),
+            n_obs=n_obs
+        )
+
+    def _fit_drift(self, values: np.ndarray, m: int) -> ForecastState:
+        """Least-squares linear trend for series shorter than one season"""
+        n_series, n_obs = values.shape
+        x = np.arange(n_obs, dtype=float)
+        x_centered = x - x.mean()
+        denom = (x_centered ** 2).sum() or 1.0
+        slope = (values - values.mean(axis=1, keepdims=True)) @ x_centered / denom
+        intercept = values.mean(axis=1) - slope * x.mean()
+        fitted = intercept[:, None] + slope[:, None] * x
+        sse = ((values - fitted) ** 2).sum(axis=1)
+        zeros = np.zeros(n_series)
+        return ForecastState(
+            method='drift',
+            season_length=m,
+            level=fitted[:, -1],
+            trend=slope,
+            seasonals=np.zeros((n_series, m)),
+            alpha=zeros, beta=zeros, gamma=zeros,
+            sigma=np.sqrt(sse / max(n_obs - 2, 1)),
+            r_squared=self._r_squared(values, sse),
+            n_obs=n_obs
+        )
+
+    @staticmethod
+    def _r_squared(values: np.ndarray, sse: np.ndarray) -> np.ndarray:
+        """In-sample coefficient of determination per series"""
+        if values.shape[1] == 0:
+            return np.zeros(values.shape[0])
+        sst = ((values - values.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r2 = np.where(sst > 0, 1 - sse / sst, 0.0)
+        return np.clip(r2, 0.0, 1.0)
+
+    # ------------------------------------------------------------------
+    # Forecasting
+    # ------------------------------------------------------------------
+    def predict(self, state: ForecastState, horizon: int,
+                confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return point forecasts and prediction interval bounds"""
+        m = state.season_length
+        steps = np.arange(1, horizon + 1)
+        season_idx = (state.n_obs + steps - 1) % m
+        # Seasonal-naive forecasts reuse values whole seasons back
+        seasons_ahead = np.ceil(steps / m)
+        trend_steps = seasons_ahead * m if state.method == 'seasonal_naive' else steps
+        mean = (state.level[:, None] + state.trend[:, None] * trend_steps
+                + state.seasonals[:, season_idx])
+
+        if state.method == 'holt_winters':
+            # Additive Holt-Winters forecast variance multipliers
+            j = np.arange(1, horizon)
+            psi = (state.alpha[:, None] * (1 + j * state.beta[:, None])
+                   + state.gamma[:, None] * ((j % m) == 0))
+            cumulative = np.concatenate(
+                [np.zeros((len(state.level), 1)), np.cumsum(psi ** 2, axis=1)], axis=1
+            )
+        elif state.method == 'seasonal_naive':
+            cumulative = np.broadcast_to(seasons_ahead - 1, mean.shape)
+        else:
+            cumulative = np.broadcast_to(steps - 1, mean.shape).astype(float)
+        spread = stats.norm.ppf(0.5 + confidence / 2) * state.sigma[:, None] * np.sqrt(1 + cumulative)
+
+        mean = np.clip(mean, 0, None)
+        return mean, np.clip(mean - spread, 0, None), mean + spread
+
+    def forecast_matrix(self, matrix: pd.DataFrame, horizon: int, freq: str = 'D',
+                        confidence: float = 0.95) -> ForecastResult:
+        """Forecast every row of a ``(series x time)`` frame"""
+        season_length = SEASON_LENGTHS.get(freq, 7)
+        state = self.fit(matrix.to_numpy(dtype=float), season_length)
+        mean, lower, upper = self.predict(state, horizon, confidence)
+        start = matrix.columns[-1] + pd.tseries.frequencies.to_offset(freq)
+        index = pd.date_range(start=start, periods=horizon, freq=freq)
+        return ForecastResult(list(matrix.index), index, mean, lower, upper, state)
+
+
+def build_series_matrix(df: pd.DataFrame, freq: str = 'D',
+                        key: Optional[str] = None) -> pd.DataFrame:
+    """Count events into a ``(series x time)`` matrix with gap-free columns
+
+    Without ``key`` the result has a single ``'all'`` row.
+    """
+    buckets = pd.to_datetime(df['timestamp']).dt.floor(freq)
+    if key is None:
+        counts = buckets.value_counts().sort_index().to_frame('all').T
+    else:
+        counts = (df.groupby([df[key], buckets]).size().unstack(fill_value=0))
+    if counts.empty:
+        return counts
+    full_range = pd.date_range(counts.columns.min(), counts.columns.max(), freq=freq)
+    return counts.reindex(columns=full_range, fill_value=0)
+
+
+# Shared forecaster so fitted states are reused across analyzer instances
+_forecaster: Optional[SeasonalForecaster] = None
+_forecaster_lock = threading.Lock()
+
+
+def get_forecaster() -> SeasonalForecaster:
+    """Return the shared seasonal forecaster"""
+    global _forecaster
+    with _forecaster_lock:
+        if _forecaster is None:
+            _forecaster = SeasonalForecaster()
+        return _forecaster
+
+
+# Export
+__all__ = [
+    'SeasonalForecaster',
+    'ForecastState',
+    'ForecastResult',
+    'build_series_matrix',
+    'get_forecaster',
+    'SEASON_LENGTHS',
+]
@@ -9,15 +9,35 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 import json
+import threading
+
+from .chart_data import (
+    ChartDataConfig, downsample_series, histogram, limit_points, top_n_with_other
+)
+from .chart_registry import ChartRegistry, get_chart_registry
+from .time_cube import dataset_fingerprint, get_time_cube
 
 class SecurityChartsGenerator:
     """Generate interactive security charts for dashboard"""
     
-    def __init__(self):
+    def __init__(self, data_config: Optional[ChartDataConfig] = None,
+                 registry: Optional[ChartRegistry] = None, cache_size: int = 8):
         self.logger = logging.getLogger(__name__)
+        # Point budgets that keep figure payloads bounded for large datasets
+        self.data_config = data_config or ChartDataConfig()
+        self.registry = registry or get_chart_registry()
+        
+        # Datasets registered for on-demand rendering and their rendered groups
+        self.cache_size = cache_size
+        self._datasets: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._prepared: Dict[str, pd.DataFrame] = {}
+        self._rendered: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
+        self._build_locks: Dict[Tuple[str, str], threading.Lock] = {}
         self.color_palette = {
             'primary': '#1f77b4',
             'success': '#2ca02c',
@@ -36,14 +56,8 @@ class SecurityChartsGenerator:
             df = self._prepare_data(df)
             
             charts = {
-                'onion_model': self._create_onion_model(df),
-                'security_overview': self._create_security_overview_charts(df),
-                'temporal_analysis': self._create_temporal_charts(df),
-                'user_activity': self._create_user_activity_charts(df),
-                'door_analysis': self._create_door_analysis_charts(df),
-                'risk_dashboard': self._create_risk_dashboard(df),
-                'anomaly_visualization': self._create_anomaly_charts(df),
-                'compliance_metrics': self._create_compliance_charts(df)
+                name: self.registry.get(name).builder(self, df)
+                for name in self.registry.groups()
             }
             
             return charts
@@ -52,6 +66,98 @@ class SecurityChartsGenerator:
             self.logger.error(f"Chart generation failed: {e}")
             return self._empty_charts()
     
+    # On-demand rendering
+    def register_dataset(self, df: pd.DataFrame) -> str:
+        """Register a dataset for on-demand rendering and return its id
+        
+        Nothing is rendered here; charts are built by :meth:`render_chart`
+        the first time they are requested and memoized per dataset id.
+        """
+        dataset_id = dataset_fingerprint(df, df.columns)
+        with self._cache_lock:
+            if dataset_id not in self._datasets:
+                self._datasets[dataset_id] = df
+            self._datasets.move_to_end(dataset_id)
+            while len(self._datasets) > self.cache_size:
+                evicted, _ = self._datasets.popitem(last=False)
+                self._drop_dataset(evicted)
+        return dataset_id
+    
+    def has_dataset(self, dataset_id: Optional[str]) -> bool:
+        """Whether ``dataset_id`` is still registered (not evicted)"""
+        with self._cache_lock:
+            return dataset_id in self._datasets
+    
+    def available_charts(self) -> List[str]:
+        """Ids (``group.chart``) of every chart that can be rendered"""
+        return self.registry.chart_ids()
+    
+    def render_group(self, group: str, dataset_id: Optional[str] = None,
+                     df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Render (or fetch) every chart of ``group`` for a registered dataset"""
+        if df is not None:
+            dataset_id = self.register_dataset(df)
+        chart_group = self.registry.get(group)
+        if chart_group is None:
+            raise KeyError(f"Unknown chart group: {group}")
+        
+        key = (dataset_id, group)
+        with self._cache_lock:
+            if key in self._rendered:
+                return self._rendered[key]
+            if dataset_id not in self._datasets:
+                raise KeyError(f"Unknown or expired chart dataset: {dataset_id}")
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        
+        # Concurrent requests for the same group wait for a single render
+        with build_lock:
+            with self._cache_lock:
+                if key in self._rendered:
+                    return self._rendered[key]
+            charts = chart_group.builder(self, self._prepared_frame(dataset_id))
+            with self._cache_lock:
+                if dataset_id in self._datasets:
+                    self._rendered[key] = charts
+                self._build_locks.pop(key, None)
+        return charts
+    
+    def render_chart(self, chart_id: str, dataset_id: Optional[str] = None,
+                     df: Optional[pd.DataFrame] = None) -> Optional[go.Figure]:
+        """Render a single chart by id (``group.chart``)
+        
+        A bare group id returns the whole group.  Returns ``None`` when the
+        group does not produce that chart for this dataset, e.g. badge
+        compliance without a ``badge_status`` column.
+        """
+        group, chart = self.registry.resolve(chart_id)
+        charts = self.render_group(group.name, dataset_id, df)
+        return charts.get(chart) if chart else charts
+    
+    def clear_cache(self) -> None:
+        """Forget registered datasets and rendered charts"""
+        with self._cache_lock:
+            self._datasets.clear()
+            self._prepared.clear()
+            self._rendered.clear()
+    
+    def _prepared_frame(self, dataset_id: str) -> pd.DataFrame:
+        """Prepared frame for a registered dataset, computed on first use"""
+        with self._cache_lock:
+            prepared = self._prepared.get(dataset_id)
+            raw = self._datasets.get(dataset_id)
+        if prepared is None:
+            prepared = self._prepare_data(raw)
+            with self._cache_lock:
+                if dataset_id in self._datasets:
+                    self._prepared[dataset_id] = prepared
+        return prepared
+    
+    def _drop_dataset(self, dataset_id: str) -> None:
+        """Remove cached state for an evicted dataset (lock held by caller)"""
+        self._prepared.pop(dataset_id, None)
+        for key in [key for key in self._rendered if key[0] == dataset_id]:
+            del self._rendered[key]
+    
     def _prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare data for chart generation"""
         df = df.copy()
@@ -276,6 +382,7 @@ class SecurityChartsGenerator:
         daily_success = df.groupby('date').agg({
             'access_result': lambda x: (x == 'Granted').mean() * 100
         })['access_result']
+        daily_success = self._downsample('success_trend', daily_success)
         
         charts['success_trend'] = go.Figure()
         charts['success_trend'].add_trace(go.Scatter(
@@ -318,14 +425,18 @@ class SecurityChartsGenerator:
         
         charts = {}
         
+        # Daily and hourly aggregates come from the shared time-bucket cube
+        cube = get_time_cube(df)
+        daily = cube.totals('day')
+        hourly = cube.totals('hour')
+        
         # Multi-metric time series
-        daily_metrics = df.groupby('date').agg({
-            'event_id': 'count',
-            'person_id': 'nunique',
-            'door_id': 'nunique',
-            'access_result': lambda x: (x == 'Granted').mean() * 100
+        daily_metrics = pd.DataFrame({
+            'Total Events': daily['count'],
+            'Unique Users': daily['unique_people'],
+            'Unique Doors': daily['doors'],
+            'Success Rate': daily['granted'] / daily['count'] * 100
         })
-        daily_metrics.columns = ['Total Events', 'Unique Users', 'Unique Doors', 'Success Rate']
         
         charts['time_series'] = make_subplots(
             rows=2, cols=2,
@@ -337,11 +448,12 @@ class SecurityChartsGenerator:
         for i, (col, color) in enumerate(zip(daily_metrics.columns, colors)):
             row = (i // 2) + 1
             col_pos = (i % 2) + 1
+            metric = self._downsample('time_series', daily_metrics[col])
             
             charts['time_series'].add_trace(
                 go.Scatter(
-                    x=daily_metrics.index,
-                    y=daily_metrics[col],
+                    x=metric.index,
+                    y=metric.values,
                     mode='lines+markers',
                     line=dict(color=color, width=2),
                     marker=dict(size=4),
@@ -357,7 +469,7 @@ class SecurityChartsGenerator:
         )
         
         # Peak hours analysis
-        hourly_counts = df.groupby('hour')['event_id'].count()
+        hourly_counts = hourly['count'].groupby(hourly.index.hour).sum()
         charts['peak_hours'] = go.Figure()
         
         # Color bars based on business hours
@@ -377,7 +489,9 @@ class SecurityChartsGenerator:
         )
         
         # Weekend vs Weekday comparison
-        weekend_comparison = df.groupby(['is_weekend', 'hour'])['event_id'].count().unstack(level=0, fill_value=0)
+        weekend_comparison = hourly['count'].groupby(
+            [hourly.index.dayofweek >= 5, hourly.index.hour]
+        ).sum().unstack(level=0, fill_value=0).reindex(columns=[False, True], fill_value=0)
         weekend_comparison.columns = ['Weekday', 'Weekend']
         
         charts['weekend_comparison'] = go.Figure()
@@ -411,14 +525,17 @@ class SecurityChartsGenerator:
         })
         user_activity.columns = ['Total Events', 'Doors Accessed', 'Success Rate']
         
-        # Activity distribution histogram
+        # Activity distribution histogram (binned here so only bin counts are sent)
+        bins = histogram(user_activity['Total Events'], self.data_config.histogram_bins)
         charts['user_distribution'] = go.Figure()
-        charts['user_distribution'].add_trace(go.Histogram(
-            x=user_activity['Total Events'],
-            nbinsx=20,
+        charts['user_distribution'].add_trace(go.Bar(
+            x=bins['center'],
+            y=bins['count'],
+            width=bins['width'],
+            customdata=bins[['start', 'end']],
             marker_color='#1f77b4',
             opacity=0.7,
-            hovertemplate='Events: %{x}<br>Users: %{y}<extra></extra>'
+            hovertemplate='Events: %{customdata[0]:.0f}-%{customdata[1]:.0f}<br>Users: %{y}<extra></extra>'
         ))
         charts['user_distribution'].update_layout(
             title="User Activity Distribution",
@@ -448,8 +565,13 @@ class SecurityChartsGenerator:
             xaxis=dict(tickangle=45)
         )
         
-        # User behavior scatter plot
+        # User behavior scatter plot (most active users within the point budget)
         charts['user_behavior'] = go.Figure()
+        user_activity = limit_points(
+            user_activity,
+            self.data_config.budget('user_behavior', self.data_config.max_scatter_points),
+            'Total Events'
+        )
         
         # Create size array for marker sizing
         sizes = np.clip(user_activity['Total Events'] / user_activity['Total Events'].max() * 50, 5, 50)
@@ -490,14 +612,18 @@ class SecurityChartsGenerator:
         })
         door_stats.columns = ['Total Events', 'Unique Users', 'Success Rate']
         
-        # Door usage bar chart
+        # Door usage bar chart (busiest doors, the rest folded into "Other")
+        door_usage = top_n_with_other(
+            door_stats, self.data_config.budget('door_usage', self.data_config.top_n_categories),
+            sort_by='Total Events'
+        )
         charts['door_usage'] = go.Figure()
         charts['door_usage'].add_trace(go.Bar(
-            x=door_stats.index,
-            y=door_stats['Total Events'],
+            x=door_usage.index,
+            y=door_usage['Total Events'],
             marker_color='#1f77b4',
             hovertemplate='Door: %{x}<br>Events: %{y}<br>Users: %{customdata}<extra></extra>',
-            customdata=door_stats['Unique Users']
+            customdata=door_usage['Unique Users']
         ))
         charts['door_usage'].update_layout(
             title="Door Usage Analysis",
@@ -507,6 +633,11 @@ class SecurityChartsGenerator:
         
         # Door security matrix
         charts['door_security'] = go.Figure()
+        door_stats = limit_points(
+            door_stats,
+            self.data_config.budget('door_security', self.data_config.max_scatter_points),
+            'Total Events'
+        )
         
         # Color code doors by success rate
         colors = ['#d62728' if sr < 80 else '#ff7f0e' if sr < 95 else '#2ca02c' 
@@ -533,7 +664,10 @@ class SecurityChartsGenerator:
         )
         
         # Failed attempts by door
-        failed_by_door = df[df['access_result'] == 'Denied'].groupby('door_id').size()
+        failed_by_door = top_n_with_other(
+            df[df['access_result'] == 'Denied'].groupby('door_id').size(),
+            self.data_config.budget('door_failures', self.data_config.top_n_categories)
+        )
         if len(failed_by_door) > 0:
             charts['door_failures'] = go.Figure()
             charts['door_failures'].add_trace(go.Bar(
@@ -624,9 +758,10 @@ class SecurityChartsGenerator:
         
         charts['risk_timeline'] = go.Figure()
         for col, color in zip(daily_risk.columns, ['#d62728', '#ff7f0e']):
+            series = self._downsample('risk_timeline', daily_risk[col])
             charts['risk_timeline'].add_trace(go.Scatter(
-                x=daily_risk.index,
-                y=daily_risk[col],
+                x=series.index,
+                y=series.values,
                 mode='lines+markers',
                 name=col,
                 line=dict(color=color, width=2)
@@ -658,7 +793,7 @@ class SecurityChartsGenerator:
             charts['volume_anomalies'] = go.Figure()
             
             # Normal days
-            normal_days = daily_volumes[z_scores <= 2]
+            normal_days = self._downsample('volume_anomalies', daily_volumes[z_scores <= 2])
             charts['volume_anomalies'].add_trace(go.Scatter(
                 x=normal_days.index,
                 y=normal_days.values,
@@ -682,13 +817,14 @@ class SecurityChartsGenerator:
                     )
                 ))
             
-            # Add confidence bands
+            # Add confidence bands (constant, so only the end points are needed)
             upper_bound = mean_volume + 2 * std_volume
             lower_bound = mean_volume - 2 * std_volume
+            band_x = [daily_volumes.index[0], daily_volumes.index[-1]]
             
             charts['volume_anomalies'].add_trace(go.Scatter(
-                x=daily_volumes.index,
-                y=[upper_bound] * len(daily_volumes),
+                x=band_x,
+                y=[upper_bound] * 2,
                 mode='lines',
                 name='Upper Threshold',
                 line=dict(color='red', dash='dash'),
@@ -696,8 +832,8 @@ class SecurityChartsGenerator:
             ))
             
             charts['volume_anomalies'].add_trace(go.Scatter(
-                x=daily_volumes.index,
-                y=[lower_bound] * len(daily_volumes),
+                x=band_x,
+                y=[lower_bound] * 2,
                 mode='lines',
                 name='Lower Threshold',
                 line=dict(color='red', dash='dash'),
@@ -718,7 +854,9 @@ class SecurityChartsGenerator:
             mean_activity = user_activity.mean()
             std_activity = user_activity.std()
             z_scores = abs((user_activity - mean_activity) / std_activity)
-            anomalous_users = user_activity[z_scores > 2.5]
+            anomalous_users = user_activity[z_scores > 2.5].nlargest(
+                self.data_config.budget('user_anomalies', self.data_config.top_n_categories)
+            )
             
             if len(anomalous_users) > 0:
                 charts['user_anomalies'] = go.Figure()
@@ -749,11 +887,12 @@ class SecurityChartsGenerator:
             'event_id': 'count'
         })
         business_hours_compliance['compliance_score'] = business_hours_compliance['is_business_hours'] * 100
+        compliance_score = self._downsample('time_compliance', business_hours_compliance['compliance_score'])
         
         charts['time_compliance'] = go.Figure()
         charts['time_compliance'].add_trace(go.Scatter(
-            x=business_hours_compliance.index,
-            y=business_hours_compliance['compliance_score'],
+            x=compliance_score.index,
+            y=compliance_score.values,
             mode='lines+markers',
             name='Business Hours Compliance',
             line=dict(color='#2ca02c', width=2),
@@ -763,8 +902,8 @@ class SecurityChartsGenerator:
         
         # Add compliance threshold line
         charts['time_compliance'].add_trace(go.Scatter(
-            x=business_hours_compliance.index,
-            y=[80] * len(business_hours_compliance),
+            x=[compliance_score.index[0], compliance_score.index[-1]],
+            y=[80] * 2,
             mode='lines',
             name='Compliance Threshold (80%)',
             line=dict(color='red', dash='dash')
@@ -782,6 +921,7 @@ class SecurityChartsGenerator:
             badge_compliance = df.groupby('date').agg({
                 'badge_status': lambda x: (x == 'Valid').mean() * 100
             })['badge_status']
+            badge_compliance = self._downsample('badge_compliance', badge_compliance)
             
             charts['badge_compliance'] = go.Figure()
             charts['badge_compliance'].add_trace(go.Scatter(
@@ -827,6 +967,11 @@ class SecurityChartsGenerator:
         return charts
     
     # Helper methods
+    def _downsample(self, chart_id: str, series: pd.Series) -> pd.Series:
+        """Downsample a time series to the point budget of ``chart_id``"""
+        return downsample_series(series, self.data_config.budget(chart_id),
+                                 self.data_config.downsample_method)
+    
     def _hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
         """Convert hex color to RGB tuple"""
         hex_color = hex_color.lstrip('#')
@@ -903,9 +1048,9 @@ class SecurityChartsGenerator:
         }
 
 # Factory function
-def create_charts_generator() -> SecurityChartsGenerator:
+def create_charts_generator(**kwargs) -> SecurityChartsGenerator:
     """Create security charts generator instance"""
-    return SecurityChartsGenerator()
+    return SecurityChartsGenerator(**kwargs)
 
 # Export
 __all__ = ['SecurityChartsGenerator', 'create_charts_generator']
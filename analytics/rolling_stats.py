@@ -0,0 +1,151 @@
+"""
+Rolling Statistics Module
+O(n) sliding-window statistics over NumPy arrays
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+def _as_float(values) -> np.ndarray:
+    """Return ``values`` as a float array with time along axis 0"""
+    return np.asarray(values, dtype=float)
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of the trailing ``window`` values at each position via cumulative sums"""
+    padded = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+    upper = padded[1:]
+    lower = padded[np.maximum(np.arange(1, len(padded)) - window, 0)]
+    return upper - lower
+
+
+def _window_counts(length: int, window: int, shape: tuple) -> np.ndarray:
+    """Number of observations in each trailing window, broadcast to ``shape``"""
+    counts = np.minimum(np.arange(1, length + 1), window).astype(float)
+    return counts.reshape((length,) + (1,) * (len(shape) - 1))
+
+
+def rolling_mean(values, window: int, min_periods: int = 1) -> np.ndarray:
+    """Trailing mean over ``window`` observations (NaN below ``min_periods``)"""
+    values = _as_float(values)
+    if len(values) == 0:
+        return values.copy()
+    counts = _window_counts(len(values), window, values.shape)
+    mean = _window_sums(values, window) / counts
+    return np.where(counts >= min_periods, mean, np.nan)
+
+
+def rolling_var(values, window: int, min_periods: int = 2, ddof: int = 1) -> np.ndarray:
+    """Trailing variance over ``window`` observations
+
+    Values are centred on their global mean before the cumulative sums are
+    taken so the sum-of-squares formula does not lose precision on large
+    counts.
+    """
+    values = _as_float(values)
+    if len(values) == 0:
+        return values.copy()
+    centred = values - np.nanmean(values, axis=0)
+    counts = _window_counts(len(values), window, values.shape)
+    sums = _window_sums(centred, window)
+    squares = _window_sums(centred ** 2, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = (squares - sums ** 2 / counts) / (counts - ddof)
+    var = np.maximum(var, 0.0)
+    return np.where(counts >= max(min_periods, ddof + 1), var, np.nan)
+
+
+def rolling_std(values, window: int, min_periods: int = 2, ddof: int = 1) -> np.ndarray:
+    """Trailing standard deviation over ``window`` observations"""
+    return np.sqrt(rolling_var(values, window, min_periods, ddof))
+
+
+def ewma(values, span: Optional[float] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """Exponentially weighted moving average computed as a linear filter"""
+    values = _as_float(values)
+    if alpha is None:
+        alpha = 2.0 / ((span or 10) + 1.0)
+    if len(values) == 0:
+        return values.copy()
+    # y[t] = alpha * x[t] + (1 - alpha) * y[t-1], seeded with the first value
+    initial = (1 - alpha) * values[:1]
+    smoothed, _ = lfilter([alpha], [1, -(1 - alpha)], values, axis=0, zi=initial)
+    return smoothed
+
+
+def rolling_slope(values, window: int, min_periods: int = 2) -> np.ndarray:
+    """Trailing ordinary least-squares slope against the observation index"""
+    values = _as_float(values)
+    if len(values) == 0:
+        return values.copy()
+    shape = values.shape
+    x = np.arange(len(values), dtype=float).reshape((len(values),) + (1,) * (len(shape) - 1))
+    x = x - x.mean()
+    x_full = np.broadcast_to(x, shape)
+    centred = values - np.nanmean(values, axis=0)
+
+    n = _window_counts(len(values), window, shape)
+    sum_x = _window_sums(x_full, window)
+    sum_y = _window_sums(centred, window)
+    sum_xy = _window_sums(x_full * centred, window)
+    sum_xx = _window_sums(x_full ** 2, window)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x ** 2)
+    return np.where(n >= max(min_periods, 2), slope, np.nan)
+
+
+def rolling_zscore(values, window: int, min_periods: int = 7,
+                   fallback_global: bool = True) -> np.ndarray:
+    """Z-score of each value against the preceding ``window`` values
+
+    The current value is excluded from its own baseline so a spike does not
+    dilute itself.  When the series is too short for any trailing baseline
+    and ``fallback_global`` is set, global z-scores are returned instead.
+    """
+    values = _as_float(values)
+    if len(values) == 0:
+        return values.copy()
+    mean = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+    if len(values) > 1:
+        mean[1:] = rolling_mean(values[:-1], window, min_periods)
+        std[1:] = rolling_std(values[:-1], window, min_periods)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (values - mean) / std
+    z = np.where(std > 0, z, np.where(np.isnan(std), np.nan, 0.0))
+
+    if fallback_global and np.all(np.isnan(z)):
+        global_std = np.std(values, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(global_std > 0, (values - np.mean(values, axis=0)) / global_std, 0.0)
+    return z
+
+
+def rolling_frame(series: pd.Series, window: int, min_periods: int = 7,
+                  span: Optional[float] = None) -> pd.DataFrame:
+    """Return rolling mean, std, EWMA, z-score and slope for a series"""
+    values = series.to_numpy(dtype=float)
+    return pd.DataFrame({
+        'rolling_mean': rolling_mean(values, window),
+        'rolling_std': rolling_std(values, window),
+        'ewma': ewma(values, span=span or window),
+        'rolling_zscore': rolling_zscore(values, window, min_periods),
+        'rolling_slope': rolling_slope(values, window),
+    }, index=series.index)
+
+
+# Export
+__all__ = [
+    'rolling_mean',
+    'rolling_var',
+    'rolling_std',
+    'ewma',
+    'rolling_slope',
+    'rolling_zscore',
+    'rolling_frame',
+]
@@ -0,0 +1,233 @@
+"""
+Probabilistic Sketches Module
+HyperLogLog distinct counting with vectorized NumPy register updates and
+Space-Saving heavy hitters; both merge across files, chunks and workers
+"""
+
+import base64
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Default precision: 2**10 registers, ~3.3% standard error
+DEFAULT_PRECISION = 10
+
+# Default number of counters kept by a Space-Saving sketch
+DEFAULT_CAPACITY = 512
+
+
+def hash_values(values) -> np.ndarray:
+    """Return stable 64-bit hashes for an iterable of values"""
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    return pd.util.hash_pandas_object(series.astype(str), index=False).to_numpy(dtype=np.uint64)
+
+
+def register_updates(hashes: np.ndarray, precision: int = DEFAULT_PRECISION):
+    """Split 64-bit hashes into register indexes and ranks
+
+    The top ``precision`` bits select the register and the rank is the
+    position of the first set bit in the remaining bits.
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    shift = np.uint64(64 - precision)
+    index = (hashes >> shift).astype(np.int64)
+    remainder = hashes & np.uint64((1 << (64 - precision)) - 1)
+    # Leading zeros of the remainder from its top 32 bits (exact in float64)
+    top = (remainder >> np.uint64(64 - precision - 32)).astype(np.float64)
+    with np.errstate(divide='ignore'):
+        rank = np.where(top > 0, 32 - np.floor(np.log2(top)), 33).astype(np.uint8)
+    return index, rank
+
+
+def _alpha(m: int) -> float:
+    """Bias correction constant for ``m`` registers"""
+    return {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+
+
+def _corrected(raw: np.ndarray, zeros: np.ndarray, m: int) -> np.ndarray:
+    """Apply linear counting where it is more accurate than the raw estimate"""
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+def estimate_cardinality(registers: np.ndarray) -> np.ndarray:
+    """Estimate distinct counts for one dense register row or a matrix of rows"""
+    registers = np.atleast_2d(registers)
+    m = registers.shape[1]
+    raw = _alpha(m) * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)), axis=1)
+    zeros = np.count_nonzero(registers == 0, axis=1)
+    return _corrected(raw, zeros, m)
+
+
+def sparse_registers(cells: np.ndarray, index: np.ndarray, rank: np.ndarray,
+                     precision: int = DEFAULT_PRECISION):
+    """Reduce ``(cell, register, rank)`` triples to the maximum rank per register
+
+    This is the sparse form of one HyperLogLog per cell: only non-zero
+    registers are stored, so memory grows with the data rather than with
+    ``cells x 2**precision``.  Merging sketches is re-running this function
+    over the concatenated (or re-labelled) triples.
+    """
+    cells = np.asarray(cells, dtype=np.int64)
+    index = np.asarray(index, dtype=np.int64)
+    rank = np.asarray(rank, dtype=np.uint8)
+    if len(cells) == 0:
+        return cells, index, rank
+    key = cells * (1 << precision) + index
+    order = np.lexsort((rank, key))
+    key = key[order]
+    last = np.r_[key[1:] != key[:-1], True]
+    keep = order[last]
+    return cells[keep], index[keep], rank[keep]
+
+
+def estimate_sparse(cells: np.ndarray, rank: np.ndarray, n_cells: int,
+                    precision: int = DEFAULT_PRECISION) -> np.ndarray:
+    """Estimate distinct counts for every cell of a sparse register set"""
+    m = 1 << precision
+    cells = np.asarray(cells, dtype=np.int64)
+    nonzero = np.bincount(cells, minlength=n_cells)
+    inverse = np.bincount(cells, weights=np.power(2.0, -np.asarray(rank, dtype=np.float64)),
+                          minlength=n_cells)
+    zeros = m - nonzero
+    raw = _alpha(m) * m * m / (inverse + zeros)
+    return _corrected(raw, zeros, m)
+
+
+class HyperLogLog:
+    """Mergeable HyperLogLog distinct-count sketch"""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION,
+                 registers: Optional[np.ndarray] = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = (np.zeros(1 << precision, dtype=np.uint8)
+                          if registers is None else np.asarray(registers, dtype=np.uint8))
+
+    def update(self, values: Iterable) -> 'HyperLogLog':
+        """Add values to the sketch"""
+        hashes = hash_values(values)
+        if len(hashes):
+            index, rank = register_updates(hashes, self.precision)
+            np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Merge another sketch of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """Estimated number of distinct values"""
+        return int(round(float(estimate_cardinality(self.registers)[0])))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the sketch"""
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        """Rebuild a sketch produced by :meth:`to_dict`"""
+        registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8)
+        return cls(int(data['precision']), registers.copy())
+
+
+class SpaceSaving:
+    """Mergeable Space-Saving heavy-hitter sketch
+
+    Keeps at most ``capacity`` counters.  Each tracked count is an upper
+    bound on the true count and ``count - error`` a lower bound; ``floor``
+    bounds the count of any value that is not tracked.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("SpaceSaving capacity must be positive")
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.floor = 0
+
+    def update(self, values: Iterable, counts: Optional[Iterable[int]] = None) -> 'SpaceSaving':
+        """Add values, or ``values`` with pre-aggregated ``counts``, to the sketch"""
+        if counts is None:
+            series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+            totals = series.dropna().astype(str).value_counts()
+        else:
+            totals = pd.Series(list(counts), index=pd.Index(list(values), dtype=object).astype(str),
+                               dtype=np.int64)
+            totals = totals.groupby(level=0, sort=False).sum().sort_values(ascending=False, kind='stable')
+        chunk = SpaceSaving(self.capacity)
+        kept = totals.iloc[:self.capacity]
+        chunk.counts = dict(zip(kept.index.tolist(), kept.to_numpy().tolist()))
+        chunk.errors = dict.fromkeys(chunk.counts, 0)
+        chunk.floor = int(totals.iloc[self.capacity]) if len(totals) > self.capacity else 0
+        return self.merge(chunk)
+
+    def merge(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        """Merge another sketch into this one, keeping the top ``capacity`` counters"""
+        counts: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        keys = list(self.counts) + [key for key in other.counts if key not in self.counts]
+        for key in keys:
+            counts[key] = self.counts.get(key, self.floor) + other.counts.get(key, other.floor)
+            errors[key] = (self.errors.get(key, self.floor)
+                           + other.errors.get(key, other.floor))
+        floor = self.floor + other.floor
+        if len(counts) > self.capacity:
+            ranked = sorted(counts, key=lambda key: (-counts[key], key))
+            floor = max(floor, counts[ranked[self.capacity]])
+            for key in ranked[self.capacity:]:
+                del counts[key], errors[key]
+        self.counts, self.errors, self.floor = counts, errors, floor
+        return self
+
+    def top(self, k: int = 10) -> List[Tuple[str, int]]:
+        """The ``k`` values with the largest estimated counts"""
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the sketch"""
+        keys = list(self.counts)
+        return {
+            'capacity': self.capacity,
+            'floor': self.floor,
+            'ids': keys,
+            'counts': [self.counts[key] for key in keys],
+            'errors': [self.errors[key] for key in keys],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SpaceSaving':
+        """Rebuild a sketch produced by :meth:`to_dict`"""
+        sketch = cls(int(data['capacity']))
+        sketch.counts = dict(zip(data['ids'], data['counts']))
+        sketch.errors = dict(zip(data['ids'], data['errors']))
+        sketch.floor = int(data['floor'])
+        return sketch
+
+
+# Export
+__all__ = [
+    'HyperLogLog',
+    'SpaceSaving',
+    'hash_values',
+    'register_updates',
+    'estimate_cardinality',
+    'sparse_registers',
+    'estimate_sparse',
+    'DEFAULT_PRECISION',
+    'DEFAULT_CAPACITY',
+]
@@ -0,0 +1,281 @@
+"""
+Time Bucket Cube Module
+Pre-aggregated access counts at minute, quarter-hour, hour, day and week resolution
+"""
+
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .sketches import estimate_sparse, hash_values, register_updates, sparse_registers
+
+# Cube levels from finest to coarsest
+LEVELS: Tuple[str, ...] = ('minute', 'quarter_hour', 'hour', 'day', 'week')
+
+# Bucket frequency of each level (weeks start on Monday)
+LEVEL_FREQ: Dict[str, str] = {
+    'minute': 'min',
+    'quarter_hour': '15min',
+    'hour': 'H',
+    'day': 'D',
+    'week': 'W-MON',
+}
+
+CUBE_COLUMNS = ['count', 'granted', 'denied']
+
+# HyperLogLog precision for unique-person sketches (~1.6% standard error).
+# Sketches are stored sparsely so precision does not inflate memory per cell.
+CUBE_PRECISION = 12
+
+# Columns that identify a dataset for caching purposes
+_FINGERPRINT_COLUMNS = ('timestamp', 'door_id', 'person_id', 'access_result')
+
+_Sketch = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _floor(buckets: pd.Series, level: str) -> pd.Series:
+    """Floor bucket timestamps to ``level``"""
+    if level == 'week':
+        days = buckets.dt.floor('D')
+        return days - pd.to_timedelta(days.dt.dayofweek, unit='D')
+    return buckets.dt.floor(LEVEL_FREQ[level])
+
+
+class TimeBucketCube:
+    """Hierarchical time-bucket aggregates of one access dataset
+
+    Raw events are read once to build the minute level: event, granted and
+    denied counts per ``(bucket, door)`` cell plus a sparse HyperLogLog
+    sketch of the people seen in each cell.  Every coarser level is rolled
+    up from the level below it by re-bucketing the cells and merging their
+    sketches, so raw rows are never touched again.  Query results are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, cells: Dict[str, pd.DataFrame], sketches: Dict[str, _Sketch],
+                 doors: pd.Index, n_events: int, precision: int = CUBE_PRECISION):
+        self._cells = cells
+        self._sketches = sketches
+        self.doors = doors
+        self.n_events = n_events
+        self.precision = precision
+        self._totals: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, df: pd.DataFrame, precision: int = CUBE_PRECISION) -> 'TimeBucketCube':
+        """Build the cube from raw events in a single pass"""
+        timestamps = pd.to_datetime(df['timestamp'], errors='coerce')
+        valid = timestamps.notna().to_numpy()
+        n_events = int(valid.sum())
+
+        if 'door_id' in df.columns:
+            door_codes, doors = pd.factorize(df['door_id'].to_numpy()[valid], use_na_sentinel=False)
+        else:
+            door_codes, doors = np.zeros(n_events, dtype=np.int64), pd.Index(['all'])
+        if 'access_result' in df.columns:
+            results = df['access_result'].to_numpy()[valid]
+            granted, denied = results == 'Granted', results == 'Denied'
+        else:
+            granted = denied = np.zeros(n_events, dtype=bool)
+
+        events = pd.DataFrame({
+            'bucket': timestamps[valid].dt.floor(LEVEL_FREQ['minute']).to_numpy(),
+            'door': door_codes,
+            'count': 1,
+            'granted': granted.astype(np.int64),
+            'denied': denied.astype(np.int64),
+        })
+        grouped = events.groupby(['bucket', 'door'], sort=True)
+        cells = {'minute': grouped[CUBE_COLUMNS].sum().reset_index()}
+
+        if 'person_id' in df.columns and n_events:
+            index, rank = register_updates(hash_values(df['person_id'][valid]), precision)
+            sketch = sparse_registers(grouped.ngroup().to_numpy(), index, rank, precision)
+        else:
+            sketch = (np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.uint8))
+        sketches = {'minute': sketch}
+
+        for finer, level in zip(LEVELS, LEVELS[1:]):
+            cells[level], sketches[level] = cls._roll_up(cells[finer], sketches[finer],
+                                                         level, precision)
+
+        return cls(cells, sketches, pd.Index(doors), n_events, precision)
+
+    @staticmethod
+    def _roll_up(cells: pd.DataFrame, sketch: _Sketch, level: str,
+                 precision: int) -> Tuple[pd.DataFrame, _Sketch]:
+        """Aggregate the cells of a finer level into ``level``"""
+        grouped = cells.groupby([_floor(cells['bucket'], level), cells['door']], sort=True)
+        rolled = grouped[CUBE_COLUMNS].sum().reset_index()
+        mapping = grouped.ngroup().to_numpy()
+        cell_ids, index, rank = sketch
+        return rolled, sparse_registers(mapping[cell_ids], index, rank, precision)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _check_level(self, level: str) -> None:
+        if level not in LEVEL_FREQ:
+            raise ValueError(f"Unknown cube level '{level}', expected one of {LEVELS}")
+
+    def cells(self, level: str) -> pd.DataFrame:
+        """Per ``(bucket, door_id)`` counts at ``level``"""
+        self._check_level(level)
+        cells = self._cells[level]
+        return pd.DataFrame({
+            'bucket': cells['bucket'],
+            'door_id': self.doors.take(cells['door'].to_numpy()),
+            **{column: cells[column] for column in CUBE_COLUMNS},
+        })
+
+    def totals(self, level: str) -> pd.DataFrame:
+        """Per-bucket counts, active doors and estimated unique people at ``level``
+
+        Only buckets containing events are returned; use :meth:`series` with
+        ``fill=True`` for a gap-free index.
+        """
+        self._check_level(level)
+        with self._lock:
+            totals = self._totals.get(level)
+        if totals is not None:
+            return totals
+
+        cells = self._cells[level]
+        bucket_ids, buckets = pd.factorize(cells['bucket'], sort=True)
+        totals = cells.groupby(bucket_ids)[CUBE_COLUMNS].sum()
+        totals.index = pd.DatetimeIndex(buckets, name='bucket')
+        totals['doors'] = np.bincount(bucket_ids, minlength=len(buckets))
+
+        cell_ids, index, rank = self._sketches[level]
+        merged_cells, _, merged_rank = sparse_registers(bucket_ids[cell_ids], index, rank,
+                                                        self.precision)
+        totals['unique_people'] = np.rint(
+            estimate_sparse(merged_cells, merged_rank, len(buckets), self.precision)
+        ).astype(np.int64)
+
+        with self._lock:
+            self._totals[level] = totals
+        return totals
+
+    def series(self, level: str, column: str = 'count', fill: bool = False) -> pd.Series:
+        """One totals column over time, optionally with empty buckets as zero"""
+        values = self.totals(level)[column]
+        if fill and len(values):
+            full_range = pd.date_range(values.index.min(), values.index.max(),
+                                       freq=LEVEL_FREQ[level], name='bucket')
+            values = values.reindex(full_range, fill_value=0)
+        return values
+
+    def unique_people(self, level: str, by_door: bool = False) -> pd.Series:
+        """Estimated distinct people per bucket, or per ``(bucket, door_id)``"""
+        if not by_door:
+            return self.totals(level)['unique_people']
+        cells = self.cells(level)
+        cell_ids, _, rank = self._sketches[level]
+        estimates = estimate_sparse(cell_ids, rank, len(cells), self.precision)
+        return pd.Series(np.rint(estimates).astype(np.int64),
+                         index=pd.MultiIndex.from_frame(cells[['bucket', 'door_id']]),
+                         name='unique_people')
+
+    def matrix(self, level: str, column: str = 'count') -> pd.DataFrame:
+        """``(door x bucket)`` matrix of one count column with gap-free columns"""
+        cells = self.cells(level)
+        if cells.empty:
+            return pd.DataFrame()
+        matrix = cells.pivot_table(index='door_id', columns='bucket', values=column,
+                                   aggfunc='sum', fill_value=0)
+        full_range = pd.date_range(matrix.columns.min(), matrix.columns.max(),
+                                   freq=LEVEL_FREQ[level])
+        return matrix.reindex(columns=full_range, fill_value=0)
+
+
+def dataset_fingerprint(df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> str:
+    """Return a stable fingerprint of ``columns`` (default: the cube's input columns)"""
+    columns = [c for c in (_FINGERPRINT_COLUMNS if columns is None else columns) if c in df.columns]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((len(df), columns)).encode())
+    if columns:
+        hashed = pd.util.hash_pandas_object(df[columns], index=False)
+        digest.update(hashed.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class TimeCubeCache:
+    """Small LRU cache of cubes keyed by dataset fingerprint
+
+    Repeated lookups with the same DataFrame object skip fingerprinting,
+    so callers should not mutate a frame in place after querying its cube.
+    """
+
+    def __init__(self, max_size: int = 8, precision: int = CUBE_PRECISION):
+        self.max_size = max_size
+        self.precision = precision
+        self._cubes: "OrderedDict[str, TimeBucketCube]" = OrderedDict()
+        self._frames: List[Tuple[weakref.ref, int, str]] = []
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, df: pd.DataFrame) -> TimeBucketCube:
+        """Return the cube for ``df``, building it on first use"""
+        with self._lock:
+            key = self._lookup_frame(df)
+            if key is None:
+                key = dataset_fingerprint(df)
+                self._remember_frame(df, key)
+
+            cube = self._cubes.get(key)
+            if cube is None:
+                # Built under the lock so concurrent consumers share one build
+                cube = TimeBucketCube.build(df, self.precision)
+                self._cubes[key] = cube
+                while len(self._cubes) > self.max_size:
+                    self._cubes.popitem(last=False)
+            self._cubes.move_to_end(key)
+            return cube
+
+    def _lookup_frame(self, df: pd.DataFrame) -> Optional[str]:
+        for ref, length, key in self._frames:
+            if ref() is df and length == len(df):
+                return key
+        return None
+
+    def _remember_frame(self, df: pd.DataFrame, key: str) -> None:
+        self._frames = [entry for entry in self._frames if entry[0]() is not None]
+        self._frames.append((weakref.ref(df), len(df), key))
+        del self._frames[:-self.max_size]
+
+    def clear(self) -> None:
+        """Drop all cached cubes"""
+        with self._lock:
+            self._cubes.clear()
+            self._frames.clear()
+
+
+# Shared cache so trends, charts and anomaly detection reuse one cube per dataset
+_cube_cache = TimeCubeCache()
+
+
+def get_time_cube(df: pd.DataFrame) -> TimeBucketCube:
+    """Return the shared time-bucket cube for ``df``"""
+    return _cube_cache.get(df)
+
+
+# Export
+__all__ = [
+    'TimeBucketCube',
+    'TimeCubeCache',
+    'get_time_cube',
+    'dataset_fingerprint',
+    'LEVELS',
+    'LEVEL_FREQ',
+]
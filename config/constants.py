@@ -7,13 +7,20 @@ class SecurityConstants:
     salt_bytes: int = 32
     rate_limit_requests: int = 100
     rate_limit_window_minutes: int = 1
+    rate_limit_backend: str = "memory"
     max_upload_mb: int = 100
+    audit_sink: str = ""
+    audit_log_path: str = ""
+    session_store: str = "memory"
+    session_store_path: str = "data/sessions.db"
+    session_ttl_seconds: int = 8 * 3600
 
 @dataclass
 class PerformanceConstants:
     """Performance tuning defaults"""
     db_pool_size: int = 10
     ai_confidence_threshold: int = 75
+    analytics_summary_mode: str = "exact"
 
 @dataclass
 class CSSConstants:
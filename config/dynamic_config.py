@@ -25,6 +25,30 @@ class DynamicConfigManager:
         if rate_limit_window is not None:
             self.security.rate_limit_window_minutes = int(rate_limit_window)
 
+        rate_limit_backend = os.getenv("RATE_LIMIT_BACKEND")
+        if rate_limit_backend is not None:
+            self.security.rate_limit_backend = rate_limit_backend.lower()
+
+        audit_sink = os.getenv("SECURITY_AUDIT_SINK")
+        if audit_sink is not None:
+            self.security.audit_sink = audit_sink.lower()
+
+        audit_path = os.getenv("SECURITY_AUDIT_PATH")
+        if audit_path is not None:
+            self.security.audit_log_path = audit_path
+
+        session_store = os.getenv("SESSION_STORE")
+        if session_store is not None:
+            self.security.session_store = session_store.lower()
+
+        session_path = os.getenv("SESSION_STORE_PATH")
+        if session_path is not None:
+            self.security.session_store_path = session_path
+
+        session_ttl = os.getenv("SESSION_TTL")
+        if session_ttl is not None:
+            self.security.session_ttl_seconds = int(session_ttl)
+
         max_upload = os.getenv("MAX_UPLOAD_MB")
         if max_upload is not None:
             self.security.max_upload_mb = int(max_upload)
@@ -37,6 +61,10 @@ class DynamicConfigManager:
         if ai_threshold is not None:
             self.performance.ai_confidence_threshold = int(ai_threshold)
 
+        summary_mode = os.getenv("ANALYTICS_SUMMARY_MODE")
+        if summary_mode is not None:
+            self.performance.analytics_summary_mode = summary_mode.lower()
+
         css_threshold = os.getenv("CSS_BUNDLE_THRESHOLD")
         if css_threshold is not None:
             self.css.bundle_threshold_kb = int(css_threshold)
@@ -51,6 +79,9 @@ class DynamicConfigManager:
             "window_minutes": self.security.rate_limit_window_minutes,
         }
 
+    def get_rate_limit_backend(self) -> str:
+        return self.security.rate_limit_backend
+
     def get_security_level(self) -> int:
         return self.security.pbkdf2_iterations
 
@@ -69,5 +100,8 @@ class DynamicConfigManager:
     def get_ai_confidence_threshold(self) -> int:
         return self.performance.ai_confidence_threshold
 
+    def get_analytics_summary_mode(self) -> str:
+        return self.performance.analytics_summary_mode
+
 # Global instance
 dynamic_config = DynamicConfigManager()
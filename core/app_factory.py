@@ -9,6 +9,7 @@ from typing import Optional, Any
 import dash_bootstrap_components as dbc
 from dash import html, dcc, Input, Output, callback
 from core.unified_callback_coordinator import UnifiedCallbackCoordinator
+from core.request_metrics import install_request_metrics
 import pandas as pd
 
 # Use correct config system
@@ -91,6 +92,9 @@ def _create_full_app() -> dash.Dash:
         def health():
             return {"status": "ok"}, 200
 
+        # Per-route latency histograms and Prometheus /metrics endpoint
+        install_request_metrics(server)
+
         logger.info("Complete Dash application created successfully")
         return app
 
@@ -136,6 +140,9 @@ def _create_simple_app() -> dash.Dash:
         def health():
             return {"status": "ok"}, 200
 
+        # Per-route latency histograms and Prometheus /metrics endpoint
+        install_request_metrics(server)
+
         logger.info("Simple Dash application created successfully")
         return app
 
@@ -185,6 +192,9 @@ def _create_json_safe_app() -> dash.Dash:
         def health():
             return {"status": "ok"}, 200
 
+        # Per-route latency histograms and Prometheus /metrics endpoint
+        install_request_metrics(server)
+
         logger.info("JSON-safe Dash application created")
         return app
 
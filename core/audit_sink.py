@@ -0,0 +1,179 @@
+"""
+Append-only security audit sinks
+Events are queued by the caller and written in batches by a background
+thread, so audit logging never blocks request threads
+"""
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+AUDIT_SINK_TYPES = ("jsonl", "sqlite")
+
+DEFAULT_AUDIT_PATHS = {
+    "jsonl": "logs/security_audit.jsonl",
+    "sqlite": "logs/security_audit.db",
+}
+
+
+class BatchedAuditSink:
+    """Base class: bounded queue drained by a daemon writer thread
+
+    ``write`` never blocks; when the queue is full the record is dropped and
+    counted in ``dropped``.  Subclasses implement ``_write_batch``.
+    """
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 1.0,
+                 max_queue: int = 10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._closed = threading.Event()
+        self.logger = logging.getLogger(__name__)
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """Queue ``record``; returns ``False`` if it had to be dropped"""
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self) -> None:
+        """Block until every queued record has been written"""
+        self._queue.join()
+
+    def close(self) -> None:
+        self.flush()
+        self._closed.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+                self.written += len(batch)
+            except Exception as e:
+                self.logger.error(f"Failed to write {len(batch)} audit records: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+
+class JsonlAuditSink(BatchedAuditSink):
+    """One JSON object per line, appended to ``path``"""
+
+    def __init__(self, path: Union[str, Path], **kwargs: Any):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(**kwargs)
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(lines)
+
+
+class SQLiteAuditSink(BatchedAuditSink):
+    """Rows in a ``security_events`` table, one transaction per batch"""
+
+    COLUMNS = ("event_id", "timestamp", "event_type", "severity",
+               "source_ip", "user_id", "blocked", "details")
+
+    def __init__(self, path: Union[str, Path], **kwargs: Any):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection: Optional[sqlite3.Connection] = None
+        super().__init__(**kwargs)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Created on the writer thread, which is the only one using it
+        if self._connection is None:
+            self._connection = sqlite3.connect(str(self.path))
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS security_events ("
+                "event_id TEXT PRIMARY KEY, timestamp TEXT, event_type TEXT, "
+                "severity TEXT, source_ip TEXT, user_id TEXT, blocked INTEGER, "
+                "details TEXT)"
+            )
+        return self._connection
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        rows = [
+            (
+                record["event_id"], record["timestamp"], record["event_type"],
+                record["severity"], record.get("source_ip"), record.get("user_id"),
+                int(bool(record.get("blocked"))),
+                json.dumps(record.get("details", {}), default=str),
+            )
+            for record in records
+        ]
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO security_events ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                rows,
+            )
+
+    def _run(self) -> None:
+        try:
+            super()._run()
+        finally:
+            if self._connection is not None:
+                self._connection.close()
+
+
+def create_audit_sink(kind: str, path: Union[str, Path], **kwargs: Any) -> BatchedAuditSink:
+    """Create a ``jsonl`` or ``sqlite`` audit sink writing to ``path``"""
+    kind = kind.lower()
+    if kind == "jsonl":
+        return JsonlAuditSink(path, **kwargs)
+    if kind == "sqlite":
+        return SQLiteAuditSink(path, **kwargs)
+    raise ValueError(f"Unknown audit sink type: {kind}")
+
+
+def create_configured_audit_sink() -> Optional[BatchedAuditSink]:
+    """Sink from ``SECURITY_AUDIT_SINK`` / ``SECURITY_AUDIT_PATH``, if enabled"""
+    from config.dynamic_config import dynamic_config
+
+    kind = dynamic_config.security.audit_sink
+    if not kind:
+        return None
+    path = dynamic_config.security.audit_log_path or DEFAULT_AUDIT_PATHS.get(kind, "")
+    try:
+        return create_audit_sink(kind, path)
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Security audit sink disabled: {e}")
+        return None
+
+
+__all__ = [
+    "BatchedAuditSink",
+    "JsonlAuditSink",
+    "SQLiteAuditSink",
+    "create_audit_sink",
+    "create_configured_audit_sink",
+    "AUDIT_SINK_TYPES",
+]
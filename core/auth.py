@@ -2,12 +2,9 @@ from __future__ import annotations
 
 """Auth0 OIDC integration"""
 
-import json
-import os
-import time
+import secrets
 from functools import wraps
 from typing import Optional, List
-from urllib.request import urlopen
 
 from flask import Blueprint, redirect, url_for, session, current_app, request
 from flask_login import (
@@ -21,7 +18,9 @@ from flask_login import (
 from authlib.integrations.flask_client import OAuth
 from jose import jwt
 
+from .jwks import get_jwks_manager
 from .secret_manager import SecretManager
+from .session_store import get_session_store
 
 
 auth_bp = Blueprint("auth", __name__)
@@ -30,29 +29,41 @@ oauth = OAuth()
 
 
 class User(UserMixin):
-    def __init__(self, user_id: str, name: str, email: str, roles: List[str]):
+    def __init__(self, user_id: str, name: str, email: str, roles: List[str],
+                 session_id: Optional[str] = None):
         self.id = user_id
         self.name = name
         self.email = email
         self.roles = roles
+        self.session_id = session_id
 
+    def get_id(self) -> str:
+        # Flask-Login keeps this in the cookie: one id per login, not per user
+        return self.session_id or self.id
 
-_users: dict[str, User] = {}
+    def to_dict(self) -> dict:
+        return {"user_id": self.id, "name": self.name, "email": self.email,
+                "roles": self.roles}
 
-# Cached JWKS per domain: {domain: (jwks_dict, fetch_timestamp)}
-_jwks_cache: dict[str, tuple[dict, float]] = {}
+
+def _load_stored_user(session_id: str) -> Optional[User]:
+    data = get_session_store().load(session_id)
+    if data is None:
+        return None
+    return User(data.get("user_id", ""), data.get("name", ""), data.get("email", ""),
+                data.get("roles", []), session_id=session_id)
 
 
 @login_manager.user_loader
-def load_user(user_id: str) -> Optional[User]:
-    return _users.get(user_id)
+def load_user(session_id: str) -> Optional[User]:
+    return _load_stored_user(session_id)
 
 
 @login_manager.request_loader
 def load_user_from_request(request):
-    user_id = session.get("user_id")
-    if user_id:
-        return _users.get(user_id)
+    session_id = session.get("session_id")
+    if session_id:
+        return _load_stored_user(session_id)
     return None
 
 
@@ -81,30 +92,16 @@ def init_auth(app) -> None:
 
 
 def _get_jwks(domain: str) -> dict:
-    """Return cached JWKS for a domain if within TTL, otherwise fetch."""
-    ttl = int(os.getenv("JWKS_CACHE_TTL", "300"))
-    now = time.time()
-    cached = _jwks_cache.get(domain)
-    if cached and now - cached[1] < ttl:
-        return cached[0]
-
-    jwks_url = f"https://{domain}/.well-known/jwks.json"
-    with urlopen(jwks_url) as resp:
-        jwks = json.load(resp)
-    _jwks_cache[domain] = (jwks, now)
-    return jwks
+    """Return the JWKS for a domain, refreshed in the background when stale."""
+    return get_jwks_manager(domain).get_jwks()
 
 
 def _decode_jwt(token: str, domain: str, audience: str, client_id: str) -> dict:
-    jwks = _get_jwks(domain)
     header = jwt.get_unverified_header(token)
-    key = None
-    for jwk in jwks["keys"]:
-        if jwk["kid"] == header["kid"]:
-            key = jwk
-            break
-    if key is None:
-        raise ValueError("Public key not found")
+    try:
+        key = get_jwks_manager(domain).get_key(header["kid"])
+    except KeyError:
+        raise ValueError("Public key not found") from None
     return jwt.decode(
         token,
         key,
@@ -138,11 +135,13 @@ def callback():
         claims.get("name", ""),
         claims.get("email", ""),
         claims.get("https://yosai-intel.io/roles", []),
+        session_id=secrets.token_urlsafe(32),
     )
-    _users[user.id] = user
+    get_session_store().save(user.session_id, user.to_dict())
     login_user(user)
     session["roles"] = user.roles
     session["user_id"] = user.id
+    session["session_id"] = user.session_id
     return redirect("/")
 
 
@@ -151,6 +150,10 @@ def callback():
 def logout():
     manager = SecretManager()
     domain = manager.get("AUTH0_DOMAIN")
+    # Only this login ends; the user's other browsers keep their sessions
+    session_id = session.get("session_id")
+    if session_id:
+        get_session_store().delete(session_id)
     logout_user()
     session.clear()
     return redirect(
@@ -0,0 +1,256 @@
+"""
+Compact Figure Serialization
+Binary-encoded (``bdata``) numeric arrays and cached figure payloads for Dash
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Optional fast JSON backend
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import plotly
+    PLOTLY_VERSION: Optional[str] = plotly.__version__
+except ImportError:  # pragma: no cover - plotly is a core dependency
+    PLOTLY_VERSION = None
+
+logger = logging.getLogger(__name__)
+
+# plotly.js decodes typed arrays from 2.28, bundled since plotly.py 5.19
+TYPED_ARRAY_MIN_PLOTLY = (5, 19)
+
+# Arrays shorter than this stay as plain lists; base64 only pays off for longer arrays
+DEFAULT_MIN_ARRAY_LENGTH = 16
+
+# Integer dtypes supported by plotly.js typed arrays, smallest first
+_INT_DTYPES = (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32)
+
+# plotly.js dtype codes
+_DTYPE_CODES = {
+    np.dtype(np.int8): 'i1', np.dtype(np.uint8): 'u1',
+    np.dtype(np.int16): 'i2', np.dtype(np.uint16): 'u2',
+    np.dtype(np.int32): 'i4', np.dtype(np.uint32): 'u4',
+    np.dtype(np.float32): 'f4', np.dtype(np.float64): 'f8',
+}
+
+
+def plotly_supports_typed_arrays(version: Optional[str] = PLOTLY_VERSION) -> bool:
+    """Whether the plotly.js bundled with plotly ``version`` decodes ``bdata`` arrays"""
+    if not version:
+        return False
+    parts = tuple(int(part) for part in re.findall(r'\d+', version)[:2])
+    return parts >= TYPED_ARRAY_MIN_PLOTLY
+
+
+TYPED_ARRAYS_SUPPORTED = plotly_supports_typed_arrays()
+if not TYPED_ARRAYS_SUPPORTED:
+    logger.info(f"plotly {PLOTLY_VERSION} cannot decode typed arrays; figures are sent as lists")
+
+
+def _numeric_array(value: Any) -> Optional[np.ndarray]:
+    """Return ``value`` as a numeric NumPy array, or None if it is not one"""
+    if isinstance(value, np.ndarray):
+        array = value
+    elif isinstance(value, (list, tuple)) and value and isinstance(value[0], (int, float, list, tuple)) \
+            and not isinstance(value[0], bool):
+        try:
+            array = np.asarray(value)
+        except ValueError:  # ragged nested lists
+            return None
+    else:
+        return None
+    return array if array.dtype.kind in 'iuf' else None
+
+
+def _narrow(array: np.ndarray) -> np.ndarray:
+    """Cast to the smallest dtype plotly.js can decode without losing values"""
+    if array.dtype.kind == 'f':
+        finite = np.isfinite(array).all()
+        if not (finite and array.size and np.array_equal(array, np.rint(array))):
+            if array.dtype != np.float32 and np.array_equal(array.astype(np.float32), array,
+                                                             equal_nan=True):
+                return array.astype(np.float32)
+            return array.astype(np.float64, copy=False)
+        # Whole-number floats (counts after aggregation) encode as integers
+    if array.size == 0:
+        return array.astype(np.int32)
+    low, high = array.min(), array.max()
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype, copy=False)
+    return array.astype(np.float64)
+
+
+def encode_typed_array(array: np.ndarray) -> Dict[str, str]:
+    """Encode a numeric array as a plotly.js typed-array spec"""
+    array = np.ascontiguousarray(_narrow(np.asarray(array)))
+    spec = {
+        'dtype': _DTYPE_CODES[array.dtype],
+        'bdata': base64.b64encode(array.tobytes()).decode('ascii'),
+    }
+    if array.ndim > 1:
+        spec['shape'] = ','.join(str(size) for size in array.shape)
+    return spec
+
+
+def compact_value(value: Any, min_length: int = DEFAULT_MIN_ARRAY_LENGTH) -> Any:
+    """Recursively replace long numeric arrays with typed-array specs"""
+    if isinstance(value, dict):
+        return {key: compact_value(item, min_length) for key, item in value.items()}
+    array = _numeric_array(value)
+    if array is not None:
+        if array.size >= min_length:
+            return encode_typed_array(array)
+        return array.tolist() if isinstance(value, np.ndarray) else value
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], (dict, list, tuple)):
+        return [compact_value(item, min_length) for item in value]
+    return value
+
+
+def compact_figure(figure: Any, min_length: int = DEFAULT_MIN_ARRAY_LENGTH) -> Dict[str, Any]:
+    """Return a figure dict whose numeric arrays are base64 typed arrays
+
+    The result can be returned from a Dash callback as a ``dcc.Graph``
+    figure; plotly.js decodes the ``bdata`` arrays on the client.  Dates,
+    strings and short arrays are left untouched.  With a plotly older than
+    5.19 the bundled plotly.js cannot decode them, so arrays stay lists.
+    """
+    data = figure.to_plotly_json() if hasattr(figure, 'to_plotly_json') else figure
+    if not TYPED_ARRAYS_SUPPORTED:
+        return compact_value(data, float('inf'))
+    return compact_value(data, min_length)
+
+
+def _json_default(o: Any) -> Any:
+    """Fallback for values the JSON backends cannot encode natively"""
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, np.generic):
+        return o.item()
+    if hasattr(o, 'isoformat'):
+        return o.isoformat()
+    if hasattr(o, 'to_plotly_json'):
+        return o.to_plotly_json()
+    return str(o)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes with orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+def figure_fingerprint(figure: Any) -> str:
+    """Content hash of a figure, usable as a cache id"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(dumps(figure.to_plotly_json() if hasattr(figure, 'to_plotly_json') else figure))
+    return digest.hexdigest()
+
+
+class FigureSerializer:
+    """Serialize figures compactly and cache the result per figure id
+
+    Repeat renders of a figure under the same id (for example a chart id
+    plus dataset id) reuse the cached payload instead of re-encoding.
+    """
+
+    def __init__(self, min_length: int = DEFAULT_MIN_ARRAY_LENGTH, cache_size: int = 128):
+        self.min_length = min_length
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], Optional[bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def to_dict(self, figure: Any, figure_id: Optional[str] = None) -> Dict[str, Any]:
+        """Compact figure dict, cached under ``figure_id`` when given"""
+        return self._entry(figure, figure_id)[0]
+
+    def to_json(self, figure: Any, figure_id: Optional[str] = None) -> bytes:
+        """Compact figure JSON bytes, cached under ``figure_id`` when given"""
+        compact, payload = self._entry(figure, figure_id)
+        if payload is None:
+            payload = dumps(compact)
+            if figure_id is not None:
+                with self._lock:
+                    if figure_id in self._cache:
+                        self._cache[figure_id] = (compact, payload)
+        return payload
+
+    def invalidate(self, figure_id: Optional[str] = None) -> None:
+        """Drop one cached figure, or all of them"""
+        with self._lock:
+            if figure_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(figure_id, None)
+
+    def _entry(self, figure: Any, figure_id: Optional[str]) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        if figure_id is not None:
+            with self._lock:
+                entry = self._cache.get(figure_id)
+                if entry is not None:
+                    self._cache.move_to_end(figure_id)
+                    self.hits += 1
+                    return entry
+        compact = compact_figure(figure, self.min_length)
+        entry = (compact, None)
+        if figure_id is not None:
+            with self._lock:
+                self.misses += 1
+                self._cache[figure_id] = entry
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        with self._lock:
+            return {'cached_figures': len(self._cache), 'hits': self.hits,
+                    'misses': self.misses, 'orjson': ORJSON_AVAILABLE}
+
+
+# Shared serializer instance
+_serializer: Optional[FigureSerializer] = None
+_serializer_lock = threading.Lock()
+
+
+def get_figure_serializer() -> FigureSerializer:
+    """Return the shared figure serializer"""
+    global _serializer
+    with _serializer_lock:
+        if _serializer is None:
+            _serializer = FigureSerializer()
+        return _serializer
+
+
+# Export
+__all__ = [
+    'FigureSerializer',
+    'compact_figure',
+    'compact_value',
+    'encode_typed_array',
+    'figure_fingerprint',
+    'dumps',
+    'get_figure_serializer',
+    'ORJSON_AVAILABLE',
+    'TYPED_ARRAYS_SUPPORTED',
+    'plotly_supports_typed_arrays',
+]
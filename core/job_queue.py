@@ -0,0 +1,507 @@
+"""
+Background Job Queue
+Run long analyses in a worker pool with progress polling and request coalescing
+"""
+
+import importlib
+import inspect
+import logging
+import multiprocessing
+import pickle
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Job states
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+ACTIVE_STATES = (JOB_QUEUED, JOB_RUNNING)
+
+
+@dataclass
+class Job:
+    """State of one background job"""
+    job_id: str
+    func_path: str
+    key: Optional[str] = None
+    status: str = JOB_QUEUED
+    progress: float = 0.0
+    stage: str = ''
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status not in ACTIVE_STATES
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        """Job status for polling; the result is only included on request"""
+        data = asdict(self)
+        if not include_result:
+            data.pop('result')
+        return data
+
+
+def _func_path(func: Callable) -> str:
+    return f"{func.__module__}:{func.__qualname__}"
+
+
+def _import_func(path: str) -> Callable:
+    module_name, _, qualname = path.partition(':')
+    target: Any = importlib.import_module(module_name)
+    for part in qualname.split('.'):
+        target = getattr(target, part)
+    return target
+
+
+def _accepts_progress(func: Callable) -> bool:
+    try:
+        return 'progress' in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class ProgressReporter:
+    """Picklable ``progress(percent, stage)`` callable handed to job functions"""
+
+    def __init__(self, job_id: str, channel: Any):
+        self.job_id = job_id
+        self.channel = channel
+
+    def __call__(self, percent: float, stage: str = '') -> None:
+        try:
+            self.channel.put((self.job_id, float(percent), stage))
+        except Exception:  # pragma: no cover - queue closed during shutdown
+            pass
+
+
+def _run_job(func_path: str, args: Tuple, kwargs: Dict[str, Any],
+             reporter: Optional[ProgressReporter]) -> Any:
+    """Worker entry point; resolves the function by import path"""
+    if reporter is not None:
+        reporter(0.0)
+    func = _import_func(func_path)
+    if reporter is not None and _accepts_progress(func):
+        kwargs = dict(kwargs, progress=reporter)
+    return func(*args, **kwargs)
+
+
+class SqliteJobStore:
+    """Disk-backed job records so queued work survives a restart
+
+    The file can be shared by the queues of several worker processes so
+    any of them can report a job's status and result.  With
+    ``keep_payloads=False`` job arguments are not stored (large inputs);
+    such jobs cannot be re-queued after a restart.
+    """
+
+    _COLUMNS = ("job_id, key, func_path, payload, status, progress, stage, result,"
+                " error, created_at, started_at, finished_at")
+
+    def __init__(self, path: Union[str, Path], keep_payloads: bool = True):
+        self.path = Path(path)
+        self.keep_payloads = keep_payloads
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY, key TEXT, func_path TEXT, payload BLOB,"
+            " status TEXT, progress REAL, stage TEXT, result BLOB, error TEXT,"
+            " created_at REAL, started_at REAL, finished_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key)")
+        self._conn.commit()
+
+    def save(self, job: Job, payload: Optional[Tuple[Tuple, Dict[str, Any]]] = None) -> None:
+        """Insert or update a job; ``payload`` holds its (args, kwargs)"""
+        if not self.keep_payloads:
+            payload = None
+        with self._lock:
+            # Read the job under the lock so concurrent saves keep the latest state
+            status = job.status
+            result = pickle.dumps(job.result) if status == JOB_COMPLETED else None
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, key, func_path, payload, status, progress, stage,"
+                " result, error, created_at, started_at, finished_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(job_id) DO UPDATE SET status=excluded.status,"
+                " progress=excluded.progress, stage=excluded.stage, result=excluded.result,"
+                " error=excluded.error, started_at=excluded.started_at,"
+                " finished_at=excluded.finished_at",
+                (job.job_id, job.key, job.func_path,
+                 pickle.dumps(payload) if payload is not None else None,
+                 status, job.progress, job.stage, result, job.error,
+                 job.created_at, job.started_at, job.finished_at),
+            )
+            self._conn.commit()
+
+    def load(self) -> List[Tuple[Job, Optional[Tuple[Tuple, Dict[str, Any]]]]]:
+        """Return every stored job with its payload, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs ORDER BY created_at"
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Stored job, e.g. one submitted by another worker process"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._from_row(row)[0] if row is not None else None
+
+    def find(self, key: str) -> Optional[Job]:
+        """Most recently stored job submitted under ``key``"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE key = ? ORDER BY created_at DESC LIMIT 1",
+                (key,),
+            ).fetchone()
+        return self._from_row(row)[0] if row is not None else None
+
+    @staticmethod
+    def _from_row(row: Tuple) -> Tuple[Job, Optional[Tuple[Tuple, Dict[str, Any]]]]:
+        (job_id, key, func_path, payload, status, progress, stage, result,
+         error, created_at, started_at, finished_at) = row
+        job = Job(job_id, func_path, key, status, progress, stage,
+                  pickle.loads(result) if result is not None else None,
+                  error, created_at, started_at, finished_at)
+        return job, pickle.loads(payload) if payload is not None else None
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobQueue:
+    """Worker pool for long-running jobs
+
+    Jobs submitted with the same ``key`` while one is queued or running
+    coalesce onto that job; a completed job is reused until evicted.  Job
+    functions receive a ``progress(percent, stage)`` callable when they
+    accept a ``progress`` argument.  Process workers require module-level
+    functions and picklable arguments.
+
+    Without a ``store`` jobs are only visible in the process that submitted
+    them.  When several web workers poll the same jobs, give every queue a
+    store on the same file: status, progress and results are written to it
+    and lookups of unknown jobs and keys fall back to it, so identical
+    submissions coalesce across workers too.  A stored job still unfinished
+    after ``stale_after`` seconds is not reused (its worker may have died).
+    Only one of those queues should be created with ``recover=True``,
+    otherwise each worker would re-queue jobs another one is still running.
+    """
+
+    def __init__(self, max_workers: int = 2, executor: str = 'process',
+                 store: Optional[SqliteJobStore] = None, max_finished: int = 256,
+                 reuse_results: bool = True, recover: bool = True,
+                 stale_after: float = 3600.0):
+        if executor not in ('process', 'thread'):
+            raise ValueError(f"Unknown executor type: {executor}")
+        self.max_workers = max_workers
+        self.executor_type = executor
+        self.store = store
+        self.max_finished = max_finished
+        self.reuse_results = reuse_results
+        self.stale_after = stale_after
+        self.logger = logging.getLogger(__name__)
+
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._executor: Optional[Executor] = None
+        self._manager = None
+        self._channel: Any = None
+        self._listener: Optional[threading.Thread] = None
+
+        if self.store is not None and recover:
+            self._recover()
+
+    # -- Submission -----------------------------------------------------------
+    def submit(self, func: Callable, *args, key: Optional[str] = None, **kwargs) -> Job:
+        """Queue ``func(*args, **kwargs)`` unless a job with ``key`` can be reused"""
+        with self._lock:
+            if key is not None:
+                existing = self.find(key)
+                if existing is not None and self._reusable(existing):
+                    return existing
+            job = Job(job_id=uuid.uuid4().hex, func_path=_func_path(func), key=key)
+            self._jobs[job.job_id] = job
+            if key is not None:
+                self._by_key[key] = job.job_id
+        if self.store is not None:
+            self.store.save(job, (args, kwargs))
+        self._dispatch(job, func, args, kwargs)
+        return job
+
+    def _dispatch(self, job: Job, func: Optional[Callable], args: Tuple,
+                  kwargs: Dict[str, Any]) -> None:
+        executor = self._ensure_executor()
+        reporter = ProgressReporter(job.job_id, self._channel)
+        if self.executor_type == 'process':
+            future = executor.submit(_run_job, job.func_path, args, kwargs, reporter)
+        else:
+            future = executor.submit(self._run_local, job, func, args, kwargs, reporter)
+        future.add_done_callback(lambda done: self._finish(job, done))
+
+    def _run_local(self, job: Job, func: Optional[Callable], args: Tuple,
+                   kwargs: Dict[str, Any], reporter: ProgressReporter) -> Any:
+        self._mark_running(job)
+        func = func or _import_func(job.func_path)
+        if _accepts_progress(func):
+            kwargs = dict(kwargs, progress=reporter)
+        return func(*args, **kwargs)
+
+    # -- Status ---------------------------------------------------------------
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job, or None when unknown or evicted
+
+        Jobs of other processes are read from the store, if there is one.
+        """
+        job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.get(job_id)
+        return job
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Polling view of a job (without its result)"""
+        job = self.get(job_id)
+        return job.to_dict() if job is not None else None
+
+    def result(self, job_id: str) -> Any:
+        """Result of a completed job, or None"""
+        job = self.get(job_id)
+        return job.result if job is not None and job.status == JOB_COMPLETED else None
+
+    def find(self, key: str) -> Optional[Job]:
+        """Most recent job submitted under ``key``, here or in the store"""
+        job = self._jobs.get(self._by_key.get(key, ''))
+        if job is None and self.store is not None:
+            job = self.store.find(key)
+        return job
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """Block until the job finishes (mainly for scripts and tests)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        job = self._jobs.get(job_id)
+        while job is not None and not job.done:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.02)
+        return job
+
+    def forget(self, job_id: str) -> None:
+        """Drop a finished job and its result"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.done:
+                return
+            self._remove(job)
+
+    # -- Internals ------------------------------------------------------------
+    def _reusable(self, job: Job) -> bool:
+        if job.done:
+            return self.reuse_results and job.status == JOB_COMPLETED
+        if job.job_id in self._jobs:
+            return True
+        # Unfinished job of another process
+        return time.time() - job.created_at < self.stale_after
+
+    def _ensure_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.executor_type == 'process':
+                    context = multiprocessing.get_context('spawn')
+                    self._manager = context.Manager()
+                    self._channel = self._manager.Queue()
+                    self._executor = ProcessPoolExecutor(self.max_workers, mp_context=context)
+                else:
+                    self._channel = queue.Queue()
+                    self._executor = ThreadPoolExecutor(self.max_workers,
+                                                        thread_name_prefix='job-worker')
+                self._listener = threading.Thread(target=self._drain_progress,
+                                                  name='job-progress', daemon=True)
+                self._listener.start()
+            return self._executor
+
+    def _drain_progress(self) -> None:
+        channel = self._channel
+        while True:
+            try:
+                message = channel.get()
+            except (EOFError, OSError):  # manager shut down
+                return
+            if message is None:
+                return
+            job_id, percent, stage = message
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.done:
+                    continue
+                if job.status == JOB_QUEUED:
+                    job.status = JOB_RUNNING
+                    job.started_at = time.time()
+                job.progress = max(job.progress, min(percent, 100.0))
+                if stage:
+                    job.stage = stage
+            if self.store is not None:
+                # Lets queues in other processes report progress
+                self.store.save(job)
+
+    def _mark_running(self, job: Job) -> None:
+        with self._lock:
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+        if self.store is not None:
+            self.store.save(job)
+
+    def _finish(self, job: Job, future: Future) -> None:
+        with self._lock:
+            job.finished_at = time.time()
+            error = 'Job cancelled' if future.cancelled() else future.exception()
+            if error is None:
+                job.result = future.result()
+                job.status = JOB_COMPLETED
+                job.progress = 100.0
+            else:
+                self.logger.error(f"Job {job.job_id} ({job.func_path}) failed: {error}")
+                job.error = str(error)
+                job.status = JOB_FAILED
+            self._evict()
+        if self.store is not None and job.job_id in self._jobs:
+            self.store.save(job)
+
+    def _evict(self) -> None:
+        finished = [job for job in self._jobs.values() if job.done]
+        excess = len(finished) - self.max_finished
+        if excess > 0:
+            for job in sorted(finished, key=lambda j: j.finished_at or 0)[:excess]:
+                self._remove(job)
+
+    def _remove(self, job: Job) -> None:
+        self._jobs.pop(job.job_id, None)
+        if job.key is not None and self._by_key.get(job.key) == job.job_id:
+            del self._by_key[job.key]
+        if self.store is not None:
+            self.store.delete(job.job_id)
+
+    def _recover(self) -> None:
+        """Reload stored jobs and re-queue the ones that never finished"""
+        for job, payload in self.store.load():
+            self._jobs[job.job_id] = job
+            if job.key is not None:
+                self._by_key[job.key] = job.job_id
+            if job.done:
+                continue
+            if payload is None:
+                job.status, job.error = JOB_FAILED, 'Job payload missing after restart'
+                self.store.save(job)
+                continue
+            self.logger.info(f"Re-queueing job {job.job_id} after restart")
+            job.status, job.progress, job.stage = JOB_QUEUED, 0.0, ''
+            args, kwargs = payload
+            self._dispatch(job, None, args, kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool and progress listener"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+            try:
+                self._channel.put(None)
+            except Exception:  # pragma: no cover - manager already gone
+                pass
+            if self._listener is not None:
+                self._listener.join(timeout=1)
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+        if self.store is not None:
+            self.store.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts by state"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {'executor': self.executor_type, 'max_workers': self.max_workers,
+                'jobs': counts, 'durable': self.store is not None}
+
+
+def create_job_queue(**kwargs) -> JobQueue:
+    """Factory function to create a job queue
+
+    ``store_path`` enables the disk-backed store (``keep_payloads`` is
+    passed to it); other keyword arguments are passed to :class:`JobQueue`.
+    """
+    store_path = kwargs.pop('store_path', None)
+    keep_payloads = kwargs.pop('keep_payloads', True)
+    if store_path is not None:
+        kwargs['store'] = SqliteJobStore(store_path, keep_payloads=keep_payloads)
+    return JobQueue(**kwargs)
+
+
+# Shared queue used by the Dash pages
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the shared job queue, creating it on first use
+
+    The default queue has no store, so its jobs are only visible in this
+    process; use :func:`set_job_queue` with a queue on a shared
+    ``store_path`` when several web workers serve the polls.
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = create_job_queue()
+        return _job_queue
+
+
+def set_job_queue(job_queue: Optional[JobQueue]) -> None:
+    """Replace the shared job queue (e.g. with a durable or thread-based one)"""
+    global _job_queue
+    with _job_queue_lock:
+        _job_queue = job_queue
+
+
+# Export
+__all__ = [
+    'Job',
+    'JobQueue',
+    'ProgressReporter',
+    'SqliteJobStore',
+    'create_job_queue',
+    'get_job_queue',
+    'set_job_queue',
+    'JOB_QUEUED',
+    'JOB_RUNNING',
+    'JOB_COMPLETED',
+    'JOB_FAILED',
+]
@@ -6,12 +6,16 @@ Handles all JSON serialization issues internally with minimal external dependenc
 import os
 import json
 import logging
+import functools
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
 from dataclasses import is_dataclass, asdict
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from dataclasses import dataclass
 
+from core.figure_serialization import compact_figure
+
 # Optional Babel support
 try:
     from flask_babel import LazyString
@@ -32,60 +36,130 @@ class JsonSerializationConfig:
     compress_large_objects: bool = True
     fallback_to_repr: bool = True
     auto_wrap_callbacks: bool = True
+    # Encode numeric arrays in Plotly figures as base64 typed arrays (opt-in)
+    compact_figures: bool = False
+
+# Types ``json`` encodes natively; returned as-is when sanitizing
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+@functools.lru_cache(maxsize=None)
+def _is_lazystring_type(cls: type) -> bool:
+    """Whether ``cls`` is a LazyString (flask_babel or look-alike)"""
+    if BABEL_AVAILABLE and LazyString and issubclass(cls, LazyString):
+        return True
+    return any('LazyString' in klass.__name__ for klass in cls.__mro__)
+
 
 class YosaiJSONEncoder(json.JSONEncoder):
-    """Self-contained JSON encoder that handles all problematic types"""
-    
+    """Self-contained JSON encoder that handles all problematic types
+
+    Handlers are resolved once per type and cached, so repeat values of the
+    same type skip the isinstance/hasattr cascade.
+    """
+
+    # type -> handler(encoder, obj), shared by all encoder instances
+    _handler_cache: Dict[type, Callable[['YosaiJSONEncoder', Any], Any]] = {}
+
     def __init__(self, config: Optional[JsonSerializationConfig] = None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.config = config or JsonSerializationConfig()
-    
+
     def default(self, o: Any) -> Any:
         """Handle all problematic types for JSON serialization"""
-        
-        # Handle LazyString objects
-        if self._is_lazystring(o):
+        return self._handler_for(type(o))(self, o)
+
+    @classmethod
+    def _handler_for(cls, obj_type: type) -> Callable[['YosaiJSONEncoder', Any], Any]:
+        """Return the cached handler for ``obj_type``"""
+        handler = cls._handler_cache.get(obj_type)
+        if handler is None:
+            handler = cls._resolve_handler(obj_type)
+            cls._handler_cache[obj_type] = handler
+        return handler
+
+    @classmethod
+    def _resolve_handler(cls, obj_type: type) -> Callable[['YosaiJSONEncoder', Any], Any]:
+        """Pick the handler for ``obj_type`` (same precedence as the old cascade)"""
+        if _is_lazystring_type(obj_type):
+            return cls._encode_str
+        if issubclass(obj_type, pd.DataFrame):
+            return cls._encode_dataframe
+        if issubclass(obj_type, pd.Series):
+            return cls._encode_series
+        if hasattr(obj_type, 'to_plotly_json'):
+            return cls._encode_figure
+        if issubclass(obj_type, (datetime, date)):
+            return cls._encode_datetime
+        if issubclass(obj_type, _JSON_SCALARS):
+            return cls._encode_native
+        if hasattr(obj_type, 'dtype') and hasattr(obj_type, 'tolist'):
+            return cls._encode_array
+        if is_dataclass(obj_type):
+            return cls._encode_dataclass
+        return cls._encode_object
+
+    def _encode_str(self, o: Any) -> str:
+        return str(o)
+
+    def _encode_native(self, o: Any) -> Any:
+        return o
+
+    def _column_values(self, column: pd.Series) -> List[Any]:
+        """Convert one column to JSON-native values in bulk"""
+        values = column.to_numpy()
+        kind = values.dtype.kind
+        if kind in 'biuf':
+            return values.tolist()
+        if kind == 'M':
+            # Naive datetimes; whole seconds render like ``datetime.isoformat``
+            unit = 's' if not (values.view('i8') % 10 ** 9).any() else 'us'
+            return np.datetime_as_string(values, unit=unit).tolist()
+        return [self._safe_serialize(value) for value in column.tolist()]
+
+    def _encode_dataframe(self, o: pd.DataFrame) -> Dict[str, Any]:
+        head = o.head(self.config.max_dataframe_rows)
+        columns = [self._column_values(head.iloc[:, i]) for i in range(head.shape[1])]
+        return {
+            '__type__': 'DataFrame',
+            'orient': 'split',
+            'data': [list(row) for row in zip(*columns)] if columns else [[] for _ in range(len(head))],
+            'shape': o.shape,
+            'columns': [self._safe_serialize(column) for column in o.columns]
+        }
+
+    def _encode_series(self, o: pd.Series) -> Dict[str, Any]:
+        return {
+            '__type__': 'Series',
+            'data': self._column_values(o.head(self.config.max_dataframe_rows)),
+            'name': self._safe_serialize(o.name)
+        }
+
+    def _encode_figure(self, o: Any) -> Any:
+        if self.config.compact_figures:
+            return compact_figure(o)
+        return o.to_plotly_json()
+
+    def _encode_datetime(self, o: Union[datetime, date]) -> str:
+        return o.isoformat()
+
+    def _encode_array(self, o: Any) -> Any:
+        try:
+            return o.tolist()
+        except Exception:
             return str(o)
-        
-        # Handle pandas DataFrames
-        if isinstance(o, pd.DataFrame):
-            return {
-                '__type__': 'DataFrame',
-                'data': o.head(self.config.max_dataframe_rows).to_dict('records'),
-                'shape': o.shape,
-                'columns': list(o.columns)
-            }
-        
-        # Handle pandas Series
-        if isinstance(o, pd.Series):
-            return {
-                '__type__': 'Series',
-                'data': o.head(self.config.max_dataframe_rows).tolist(),
-                'name': o.name
-            }
-        
-        # Handle datetime objects
-        if isinstance(o, (datetime, date)):
-            return o.isoformat()
-        
-        # Handle numpy types
-        if hasattr(o, 'dtype') and hasattr(o, 'tolist'):
-            try:
-                return o.tolist()
-            except Exception:
-                return str(o)
-        
-        # Handle dataclasses
-        if is_dataclass(o):
-            try:
-                return asdict(o)
-            except Exception:
-                return str(o)
-        
+
+    def _encode_dataclass(self, o: Any) -> Any:
+        try:
+            return asdict(o)
+        except Exception:
+            return str(o)
+
+    def _encode_object(self, o: Any) -> Any:
         # Handle callable objects
         if callable(o):
             return f"<function {getattr(o, '__name__', 'anonymous')}>"
-        
+
         # Handle complex objects with __dict__
         if hasattr(o, '__dict__'):
             try:
@@ -96,25 +170,45 @@ class YosaiJSONEncoder(json.JSONEncoder):
                 }
             except Exception:
                 return str(o)
-        
+
         # Fallback to string representation
         return str(o)
-    
+
     def _is_lazystring(self, obj: Any) -> bool:
         """Check if object is a LazyString"""
-        if BABEL_AVAILABLE and LazyString and isinstance(obj, LazyString):
-            return True
-        # Additional check for LazyString-like objects
-        return hasattr(obj, '__class__') and 'LazyString' in str(obj.__class__)
-    
+        return _is_lazystring_type(type(obj))
+
     def _safe_serialize(self, obj: Any) -> Any:
-        """Safely serialize any object"""
-        try:
-            # Test if object is already JSON serializable
-            json.dumps(obj)
+        """Return ``obj`` converted to JSON-native types
+
+        Containers are walked directly instead of trial-encoding them with
+        ``json.dumps``; everything else goes through the cached handlers.
+        """
+        obj_type = type(obj)
+        if obj_type in _JSON_SCALARS:
             return obj
-        except (TypeError, ValueError):
-            return self.default(obj)
+        if isinstance(obj, dict):
+            return {
+                key if type(key) in _JSON_SCALARS else str(key): self._safe_serialize(value)
+                for key, value in obj.items()
+            }
+        if isinstance(obj, (list, tuple)):
+            items = [self._safe_serialize(item) for item in obj]
+            return items if isinstance(obj, list) else tuple(items)
+        handler = self._handler_for(obj_type)
+        result = handler(self, obj)
+        if result is obj or handler in _NATIVE_HANDLERS:
+            return result
+        return self._safe_serialize(result)
+
+# Handlers whose output is already JSON-native and needs no further walk
+_NATIVE_HANDLERS = (
+    YosaiJSONEncoder._encode_str,
+    YosaiJSONEncoder._encode_datetime,
+    YosaiJSONEncoder._encode_dataframe,
+    YosaiJSONEncoder._encode_series,
+)
+
 
 class JsonSerializationService:
     """Self-contained JSON serialization service"""
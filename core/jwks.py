@@ -0,0 +1,187 @@
+"""
+JWKS key manager
+Caches signing keys per issuer, refreshes them in the background and indexes
+constructed keys by ``kid`` so token verification never waits on the network
+in steady state
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.request import urlopen
+
+# fetcher(url, timeout) -> JWKS document
+Fetcher = Callable[[str, float], Dict[str, Any]]
+# key_builder(jwk) -> verification key
+KeyBuilder = Callable[[Dict[str, Any]], Any]
+
+
+def fetch_jwks(url: str, timeout: float) -> Dict[str, Any]:
+    """Download a JWKS document"""
+    with urlopen(url, timeout=timeout) as resp:
+        return json.load(resp)
+
+
+def construct_key(jwk_data: Dict[str, Any]) -> Any:
+    """Build a ``jose`` key object once instead of on every decode"""
+    from jose import jwk
+
+    return jwk.construct(jwk_data, jwk_data.get("alg", "RS256"))
+
+
+class JWKSManager:
+    """Stale-while-revalidate cache of one JWKS endpoint
+
+    * Keys younger than ``refresh_ahead * ttl`` are served as is.
+    * Older keys are still served while a single background fetch refreshes
+      them; only keys older than ``max_stale`` (or no keys yet) are fetched
+      inline.
+    * Concurrent fetches are collapsed into one (single flight) and every
+      fetch uses ``timeout``.
+    * An unknown ``kid`` (key rotation) triggers an inline refetch at most
+      once per ``min_refetch_interval`` seconds.
+    """
+
+    def __init__(self, jwks_url: str, ttl: float = 300.0, timeout: float = 5.0,
+                 max_stale: float = 86400.0, refresh_ahead: float = 0.8,
+                 min_refetch_interval: float = 30.0,
+                 fetcher: Optional[Fetcher] = None,
+                 key_builder: Optional[KeyBuilder] = None):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_stale = max_stale
+        self.refresh_ahead = refresh_ahead
+        self.min_refetch_interval = min_refetch_interval
+        self.fetcher = fetcher or fetch_jwks
+        self.key_builder = key_builder or construct_key
+        self.fetch_count = 0
+        self._jwks: Optional[Dict[str, Any]] = None
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._last_attempt = 0.0
+        self._last_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._in_flight: Optional[threading.Event] = None
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------
+    def get_jwks(self) -> Dict[str, Any]:
+        """Current JWKS document, fetching inline only when none is usable"""
+        self._ensure_fresh()
+        return self._jwks
+
+    def get_key(self, kid: str) -> Any:
+        """Verification key for ``kid``; raises ``KeyError`` if unknown"""
+        self._ensure_fresh()
+        key = self._keys.get(kid)
+        if key is None and time.time() - self._last_attempt >= self.min_refetch_interval:
+            # Possibly a rotated key: refetch, but not more than once per interval
+            self._fetch()
+            key = self._keys.get(kid)
+        if key is None:
+            raise KeyError(kid)
+        return key
+
+    def refresh(self, wait: bool = True) -> None:
+        """Fetch now, or start a background fetch if ``wait`` is false"""
+        if wait:
+            self._fetch()
+        else:
+            self._refresh_in_background()
+
+    # ------------------------------------------------------------------
+    def _ensure_fresh(self) -> None:
+        age = time.time() - self._fetched_at
+        if self._jwks is None or age >= self.max_stale:
+            self._fetch()
+        elif age >= self.ttl * self.refresh_ahead:
+            self._refresh_in_background()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._in_flight is not None:
+                return
+            event = self._in_flight = threading.Event()
+        threading.Thread(target=self._lead, args=(event,),
+                         name="jwks-refresh", daemon=True).start()
+
+    def _fetch(self) -> None:
+        """Single-flight fetch: concurrent callers wait for the running one"""
+        with self._lock:
+            event = self._in_flight
+            leader = event is None
+            if leader:
+                event = self._in_flight = threading.Event()
+        if leader:
+            self._lead(event)
+        else:
+            event.wait(self.timeout + 1)
+        if self._jwks is None:
+            raise self._last_error or TimeoutError(f"JWKS fetch timed out: {self.jwks_url}")
+
+    def _lead(self, event: threading.Event) -> None:
+        try:
+            self._load()
+        finally:
+            with self._lock:
+                self._in_flight = None
+            event.set()
+
+    def _load(self) -> None:
+        self._last_attempt = time.time()
+        self.fetch_count += 1
+        try:
+            jwks = self.fetcher(self.jwks_url, self.timeout)
+            keys = {
+                jwk_data["kid"]: self.key_builder(jwk_data)
+                for jwk_data in jwks.get("keys", [])
+                if "kid" in jwk_data
+            }
+        except Exception as e:
+            self._last_error = e
+            self.logger.warning(f"JWKS fetch from {self.jwks_url} failed: {e}")
+            return
+        # Publish the document and index together
+        self._jwks, self._keys = jwks, keys
+        self._fetched_at = self._last_attempt
+        self._last_error = None
+
+
+# Managers per issuer domain
+_jwks_managers: Dict[str, JWKSManager] = {}
+_jwks_managers_lock = threading.Lock()
+
+
+def get_jwks_manager(domain: str) -> JWKSManager:
+    """Return the shared manager for an Auth0 ``domain``, creating it if necessary.
+
+    ``JWKS_CACHE_TTL`` and ``JWKS_TIMEOUT`` (seconds) configure new managers.
+    """
+    manager = _jwks_managers.get(domain)
+    if manager is None:
+        with _jwks_managers_lock:
+            manager = _jwks_managers.get(domain)
+            if manager is None:
+                manager = _jwks_managers[domain] = create_jwks_manager(
+                    f"https://{domain}/.well-known/jwks.json",
+                    ttl=float(os.getenv("JWKS_CACHE_TTL", "300")),
+                    timeout=float(os.getenv("JWKS_TIMEOUT", "5")),
+                )
+    return manager
+
+
+def create_jwks_manager(jwks_url: str, **kwargs: Any) -> JWKSManager:
+    """Create a new JWKS manager for ``jwks_url``"""
+    return JWKSManager(jwks_url, **kwargs)
+
+
+__all__ = [
+    "JWKSManager",
+    "get_jwks_manager",
+    "create_jwks_manager",
+    "fetch_jwks",
+    "construct_key",
+]
@@ -4,13 +4,16 @@ Performance optimization and monitoring system
 Inspired by Apple's Instruments and performance measurement tools
 """
 import time
+import math
+import bisect
 import functools
+import itertools
 import threading
 import asyncio
-from typing import Dict, Any, Optional, Callable, List, Tuple
+from typing import Dict, Any, Optional, Callable, List, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 import logging
 import psutil
 import pandas as pd
@@ -47,71 +50,273 @@ class PerformanceSnapshot:
     active_threads: int
     active_connections: int = 0
     
+# Series name used once a monitor window reaches ``max_series``
+OVERFLOW_SERIES = "__other__"
+
+# Prometheus default latency buckets (seconds)
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram with O(log buckets) observations"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add one observation"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[int]:
+        """Cumulative count per bucket, ending with the ``+Inf`` bucket"""
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class MetricHistogram:
+    """Log-bucketed histogram with bounded relative error
+
+    Values are counted in buckets whose bounds grow geometrically, so any
+    quantile is reported within ``relative_error`` of the true sample value.
+    Recording is O(1), memory depends only on the value range, and two
+    histograms with the same ``relative_error`` merge by adding counts.
+    """
+
+    def __init__(self, relative_error: float = 0.01):
+        if not 0 < relative_error < 1:
+            raise ValueError("relative_error must be between 0 and 1")
+        self.relative_error = relative_error
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float) -> None:
+        """Add one observation; values <= 0 share a single zero bucket"""
+        if value > 0:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'MetricHistogram') -> 'MetricHistogram':
+        """Add the counts of another histogram into this one"""
+        if other.relative_error != self.relative_error:
+            raise ValueError("Cannot merge histograms with different relative_error")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def copy(self) -> 'MetricHistogram':
+        return MetricHistogram(self.relative_error).merge(self)
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile ``q`` (0..1)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return min(0.0, self.max)
+        value = self.max
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                break
+        return min(max(value, self.min), self.max)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, min, max and tail percentiles"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0,
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+@dataclass(frozen=True)
+class TimerToken:
+    """Handle returned by :meth:`PerformanceMonitor.start_timer`"""
+    name: str
+    started: float
+    token_id: int
+
+
+# Histogram key: (metric type, name, sorted tag items)
+SeriesKey = Tuple[MetricType, str, Tuple[Tuple[str, str], ...]]
+
+
 class PerformanceMonitor:
     """
     Comprehensive performance monitoring system
     Tracks execution times, resource usage, and system health
+
+    Metrics are aggregated into hourly :class:`MetricHistogram` slices per
+    (type, name, tags), so recording is O(1) and summaries cost the same
+    whatever the traffic.
     """
-    
-    def __init__(self, max_metrics: int = 10000):
+
+    def __init__(self, max_metrics: int = 10000, retention_hours: int = 24,
+                 max_series: int = 1000, relative_error: float = 0.01,
+                 background: bool = True):
         self.metrics: deque = deque(maxlen=max_metrics)
         self.snapshots: deque = deque(maxlen=1000)
-        self.active_timers: Dict[str, float] = {}
-        self.aggregated_metrics: Dict[str, List[float]] = defaultdict(list)
+        self.active_timers: Dict[str, List[TimerToken]] = defaultdict(list)
+        self.retention_hours = retention_hours
+        self.max_series = max_series
+        self.relative_error = relative_error
+        self._windows: "OrderedDict[int, Dict[SeriesKey, MetricHistogram]]" = OrderedDict()
+        self._timer_ids = itertools.count(1)
         self.logger = logging.getLogger(__name__)
         self._lock = threading.Lock()
-        
+
         # Start background monitoring
-        self._monitoring_active = True
+        self._monitoring_active = background
         self._monitor_thread = threading.Thread(target=self._background_monitor, daemon=True)
-        self._monitor_thread.start()
-    
+        if background:
+            self._monitor_thread.start()
+
     def record_metric(
-        self, 
-        name: str, 
-        value: float, 
+        self,
+        name: str,
+        value: float,
         metric_type: MetricType = MetricType.EXECUTION_TIME,
         duration: Optional[float] = None,
         metadata: Dict[str, Any] = None,
         tags: Dict[str, str] = None
     ) -> None:
         """Record a performance metric"""
+        timestamp = datetime.now()
         metric = PerformanceMetric(
             name=name,
             metric_type=metric_type,
             value=value,
-            timestamp=datetime.now(),
+            timestamp=timestamp,
             duration=duration,
             metadata=metadata or {},
             tags=tags or {}
         )
-        
+        key = (metric_type, name, tuple(sorted((k, str(v)) for k, v in (tags or {}).items())))
+        hour = int(time.time() // 3600)
+
         with self._lock:
             self.metrics.append(metric)
-            self.aggregated_metrics[name].append(value)
-            
-            # Keep only recent aggregated metrics
-            if len(self.aggregated_metrics[name]) > 1000:
-                self.aggregated_metrics[name] = self.aggregated_metrics[name][-1000:]
-    
-    def start_timer(self, name: str) -> None:
-        """Start a named timer"""
-        self.active_timers[name] = time.time()
-    
+            window = self._windows.get(hour)
+            if window is None:
+                window = self._windows[hour] = {}
+                while next(iter(self._windows)) <= hour - self.retention_hours:
+                    self._windows.popitem(last=False)
+            histogram = window.get(key)
+            if histogram is None:
+                if len(window) >= self.max_series:
+                    key = (metric_type, OVERFLOW_SERIES, ())
+                    histogram = window.get(key)
+                if histogram is None:
+                    histogram = window[key] = MetricHistogram(self.relative_error)
+            histogram.record(value)
+
+    def snapshot(self, hours: int = 24) -> Dict[SeriesKey, MetricHistogram]:
+        """Merged histograms per series over the last ``hours`` hourly slices
+
+        The result is a copy; snapshots from several monitors (or workers)
+        can be combined with :meth:`MetricHistogram.merge`.
+        """
+        first_hour = int(time.time() // 3600) - hours + 1
+        merged: Dict[SeriesKey, MetricHistogram] = {}
+        with self._lock:
+            for hour, window in self._windows.items():
+                if hour < first_hour:
+                    continue
+                for key, histogram in window.items():
+                    if key in merged:
+                        merged[key].merge(histogram)
+                    else:
+                        merged[key] = histogram.copy()
+        return merged
+
+    def get_histogram(self, name: str, tags: Dict[str, str] = None,
+                      hours: int = 24) -> MetricHistogram:
+        """Histogram of one metric name (all tag sets unless ``tags`` given)"""
+        wanted = None if tags is None else tuple(sorted((k, str(v)) for k, v in tags.items()))
+        result = MetricHistogram(self.relative_error)
+        for (_, series_name, series_tags), histogram in self.snapshot(hours).items():
+            if series_name == name and (wanted is None or series_tags == wanted):
+                result.merge(histogram)
+        return result
+
+    def start_timer(self, name: str) -> TimerToken:
+        """Start a named timer and return its token
+
+        Pass the token to :meth:`end_timer`; concurrent timers with the same
+        name do not interfere.  Ending by name stops the latest timer started
+        with that name.
+        """
+        token = TimerToken(name, time.perf_counter(), next(self._timer_ids))
+        with self._lock:
+            self.active_timers[name].append(token)
+        return token
+
     def end_timer(
-        self, 
-        name: str, 
+        self,
+        timer: Union[TimerToken, str],
         metric_type: MetricType = MetricType.EXECUTION_TIME,
         metadata: Dict[str, Any] = None,
         tags: Dict[str, str] = None
     ) -> float:
-        """End a named timer and record the duration"""
-        if name not in self.active_timers:
+        """End a timer (by token or name) and record the duration"""
+        name = timer.name if isinstance(timer, TimerToken) else timer
+        with self._lock:
+            running = self.active_timers.get(name, [])
+            if isinstance(timer, TimerToken):
+                token = timer if timer in running else None
+                if token is not None:
+                    running.remove(token)
+            else:
+                token = running.pop() if running else None
+            if not running:
+                self.active_timers.pop(name, None)
+
+        if token is None:
             self.logger.warning(f"Timer {name} not found")
             return 0.0
-        
-        duration = time.time() - self.active_timers.pop(name)
-        
+
+        duration = time.perf_counter() - token.started
+
         self.record_metric(
             name=name,
             value=duration,
@@ -120,9 +325,9 @@ class PerformanceMonitor:
             metadata=metadata,
             tags=tags
         )
-        
+
         return duration
-    
+
     def get_system_snapshot(self) -> PerformanceSnapshot:
         """Get current system performance snapshot"""
         return PerformanceSnapshot(
@@ -132,53 +337,48 @@ class PerformanceMonitor:
             memory_used_mb=psutil.virtual_memory().used / (1024 * 1024),
             active_threads=threading.active_count()
         )
-    
+
     def _background_monitor(self) -> None:
         """Background thread for system monitoring"""
         while self._monitoring_active:
             try:
                 snapshot = self.get_system_snapshot()
                 self.snapshots.append(snapshot)
-                
+
                 # Record system metrics
                 self.record_metric("system.cpu_percent", snapshot.cpu_percent, MetricType.CPU_USAGE)
                 self.record_metric("system.memory_percent", snapshot.memory_percent, MetricType.MEMORY_USAGE)
                 self.record_metric("system.memory_used_mb", snapshot.memory_used_mb, MetricType.MEMORY_USAGE)
-                
+
                 time.sleep(30)  # Monitor every 30 seconds
-                
+
             except Exception as e:
                 self.logger.error(f"Background monitoring error: {e}")
                 time.sleep(60)  # Wait longer on error
-    
+
     def get_metrics_summary(self, hours: int = 24) -> Dict[str, Any]:
-        """Get performance metrics summary"""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent_metrics = [m for m in self.metrics if m.timestamp >= cutoff]
-        
-        if not recent_metrics:
+        """Get performance metrics summary
+
+        Built from the hourly histogram slices, so the window is rounded to
+        whole hours and percentiles carry the histogram's relative error.
+        """
+        by_type: Dict[MetricType, MetricHistogram] = {}
+        for (metric_type, _, _), histogram in self.snapshot(hours).items():
+            if metric_type in by_type:
+                by_type[metric_type].merge(histogram)
+            else:
+                by_type[metric_type] = histogram
+
+        total = sum(histogram.count for histogram in by_type.values())
+        if not total:
             return {'total_metrics': 0}
-        
-        # Group by metric type
-        by_type = defaultdict(list)
-        for metric in recent_metrics:
-            by_type[metric.metric_type].append(metric.value)
-        
-        # Calculate statistics
-        summary = {'total_metrics': len(recent_metrics)}
-        
-        for metric_type, values in by_type.items():
-            summary[metric_type.value] = {
-                'count': len(values),
-                'mean': sum(values) / len(values),
-                'min': min(values),
-                'max': max(values),
-                'p95': self._percentile(values, 95),
-                'p99': self._percentile(values, 99)
-            }
-        
+
+        summary: Dict[str, Any] = {'total_metrics': total}
+        for metric_type, histogram in by_type.items():
+            summary[metric_type.value] = histogram.summary()
+
         return summary
-    
+
     def get_slow_operations(self, threshold: float = 1.0, hours: int = 24) -> List[Dict[str, Any]]:
         """Get operations that exceeded threshold"""
         cutoff = datetime.now() - timedelta(hours=hours)
@@ -197,15 +397,6 @@ class PerformanceMonitor:
         
         return sorted(slow_ops, key=lambda x: x['duration'], reverse=True)
     
-    def _percentile(self, values: List[float], percentile: int) -> float:
-        """Calculate percentile of values"""
-        if not values:
-            return 0.0
-        
-        sorted_values = sorted(values)
-        index = int(len(sorted_values) * percentile / 100)
-        return sorted_values[min(index, len(sorted_values) - 1)]
-    
     def stop_monitoring(self) -> None:
         """Stop background monitoring"""
         self._monitoring_active = False
@@ -338,9 +529,11 @@ class PerformanceProfiler:
     Similar to Apple's Time Profiler instrument
     """
     
-    def __init__(self):
+    def __init__(self, max_sampled_profiles: int = 50):
         self.profile_data: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
         self.active_profiles: Dict[str, float] = {}
+        self.sampled_profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_sampled_profiles = max_sampled_profiles
     
     def start_profiling(self, session_name: str) -> None:
         """Start a profiling session"""
@@ -359,6 +552,26 @@ class PerformanceProfiler:
         """Record function profiling data"""
         self.profile_data[session_name].append((func_name, duration))
     
+    def record_sampled_profile(
+        self,
+        session_name: str,
+        sampler: Any,
+        files: Optional[Dict[str, str]] = None,
+        top_n: int = 20
+    ) -> None:
+        """Attach a stopped :class:`core.sampling_profiler.SamplingProfiler` to a session"""
+        self.profile_function(session_name, "session", sampler.duration)
+        self.sampled_profiles[session_name] = {
+            'interval': sampler.interval,
+            'samples': sum(sampler.samples.values()),
+            'hot_functions': sampler.hot_functions(top_n),
+            'files': files or {},
+        }
+        self.sampled_profiles.move_to_end(session_name)
+        while len(self.sampled_profiles) > self.max_sampled_profiles:
+            dropped, _ = self.sampled_profiles.popitem(last=False)
+            self.profile_data.pop(dropped, None)
+
     def get_profile_report(self, session_name: str) -> Dict[str, Any]:
         """Get profiling report for session"""
         if session_name not in self.profile_data:
@@ -388,6 +601,15 @@ class PerformanceProfiler:
                 'percentage': (sum(durations) / total_time) * 100 if total_time > 0 else 0
             }
         
+        sampled = self.sampled_profiles.get(session_name)
+        if sampled:
+            report['sampling'] = {
+                'interval': sampled['interval'],
+                'samples': sampled['samples'],
+                'files': sampled['files'],
+            }
+            report['hot_functions'] = sampled['hot_functions']
+        
         return report
 
 class CacheMonitor:
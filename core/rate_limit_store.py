@@ -0,0 +1,200 @@
+"""
+Rate limit state storage
+GCRA bookkeeping kept in process memory or in a shared cache manager so
+limits hold across workers
+"""
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+RATE_LIMIT_BACKENDS = ("memory", "cache")
+
+# Atomic GCRA step for Redis: KEYS[1]=tat key, ARGV=now, interval, window
+GCRA_SCRIPT = """
+local tat = tonumber(redis.call('GET', KEYS[1]))
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+if not tat or tat < now then tat = now end
+local new_tat = tat + interval
+if new_tat - now > window then return {0, tostring(tat)} end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, tostring(new_tat)}
+"""
+
+
+class RateLimitStore(Protocol):
+    """Storage used by ``core.security.RateLimiter``"""
+
+    def acquire(self, key: str, now: float, interval: float,
+                window: float) -> Tuple[bool, float]:
+        """Try to take one request; returns ``(allowed, theoretical arrival time)``"""
+        ...
+
+    def block(self, key: str, until: float) -> None:
+        ...
+
+    def blocked_until(self, key: str, now: float) -> Optional[float]:
+        ...
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        ...
+
+
+def _gcra(tat: Optional[float], now: float, interval: float,
+          window: float) -> Tuple[bool, float]:
+    tat = now if tat is None or tat < now else tat
+    new_tat = tat + interval
+    if new_tat - now > window:
+        return False, tat
+    return True, new_tat
+
+
+class MemoryRateLimitStore:
+    """Per-process store; expired entries are swept every ``sweep_interval`` seconds"""
+
+    def __init__(self, sweep_interval: float = 60.0):
+        self.sweep_interval = sweep_interval
+        self._tats: Dict[str, float] = {}
+        self._blocks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def acquire(self, key: str, now: float, interval: float,
+                window: float) -> Tuple[bool, float]:
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            allowed, tat = _gcra(self._tats.get(key), now, interval, window)
+            if allowed:
+                self._tats[key] = tat
+            return allowed, tat
+
+    def block(self, key: str, until: float) -> None:
+        with self._lock:
+            self._blocks[key] = until
+
+    def blocked_until(self, key: str, now: float) -> Optional[float]:
+        with self._lock:
+            until = self._blocks.get(key)
+            if until is None:
+                return None
+            if until <= now:
+                del self._blocks[key]
+                return None
+            return until
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop idle identifiers and expired blocks; returns the number removed"""
+        with self._lock:
+            return self._sweep(time.time() if now is None else now)
+
+    def _sweep(self, now: float) -> int:
+        idle = [key for key, tat in self._tats.items() if tat <= now]
+        for key in idle:
+            del self._tats[key]
+        expired = [key for key, until in self._blocks.items() if until <= now]
+        for key in expired:
+            del self._blocks[key]
+        self._next_sweep = now + self.sweep_interval
+        return len(idle) + len(expired)
+
+    def __len__(self) -> int:
+        return len(self._tats) + len(self._blocks)
+
+
+class CacheRateLimitStore:
+    """Store backed by a cache manager shared between workers
+
+    With a Redis cache manager (``redis_client`` attribute) each request is a
+    single atomic script call and idle identifiers expire through Redis
+    TTLs.  Other cache managers are updated with ``get``/``set`` under a
+    process lock; they are per process and may only drop expired entries
+    when read, so :func:`create_rate_limit_store` does not use them.
+    """
+
+    def __init__(self, cache: Any, prefix: str = "ratelimit:",
+                 redis_client: Any = None):
+        self.cache = cache
+        self.prefix = prefix
+        self._redis_client = redis_client
+        self._script = None
+        self._script_client = None
+        self._lock = threading.Lock()
+
+    def _redis(self) -> Any:
+        return self._redis_client or getattr(self.cache, "redis_client", None)
+
+    def acquire(self, key: str, now: float, interval: float,
+                window: float) -> Tuple[bool, float]:
+        client = self._redis()
+        if client is not None:
+            if self._script is None or self._script_client is not client:
+                self._script = client.register_script(GCRA_SCRIPT)
+                self._script_client = client
+            allowed, tat = self._script(keys=[self.prefix + key], args=[now, interval, window])
+            return bool(int(allowed)), float(tat)
+
+        with self._lock:
+            stored = self.cache.get(self.prefix + key)
+            allowed, tat = _gcra(None if stored is None else float(stored), now, interval, window)
+            if allowed:
+                self.cache.set(self.prefix + key, tat, math.ceil(tat - now))
+            return allowed, tat
+
+    def block(self, key: str, until: float) -> None:
+        self.cache.set(f"{self.prefix}block:{key}", until, math.ceil(until - time.time()))
+
+    def blocked_until(self, key: str, now: float) -> Optional[float]:
+        until = self.cache.get(f"{self.prefix}block:{key}")
+        if until is None or float(until) <= now:
+            return None
+        return float(until)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        # Expiry is handled by the cache TTLs
+        return 0
+
+
+def create_rate_limit_store(backend: Optional[str] = None, **kwargs: Any) -> RateLimitStore:
+    """Create the store for ``backend`` (default ``security.rate_limit_backend``)
+
+    ``cache`` uses the cache manager configured through ``CACHE_TYPE`` /
+    ``CACHE_HOST`` / ``CACHE_PORT``.  It falls back to memory if that cache
+    cannot be started or is not Redis, since only Redis shares limits across
+    workers and expires idle identifiers on its own.
+    """
+    from config.dynamic_config import dynamic_config
+
+    backend = (backend or dynamic_config.get_rate_limit_backend()).lower()
+    if backend not in RATE_LIMIT_BACKENDS:
+        raise ValueError(f"Unknown rate limit backend: {backend}")
+    if backend == "cache":
+        cache = kwargs.pop("cache", None)
+        try:
+            if cache is None:
+                from config.cache_manager import from_environment
+                from core.plugins.config.factories import CacheManagerFactory
+
+                cache = CacheManagerFactory.create_manager(from_environment())
+                cache.start()
+            if kwargs.get("redis_client") is None and not hasattr(cache, "redis_client"):
+                raise ValueError(f"{type(cache).__name__} is not shared between workers")
+            return CacheRateLimitStore(cache, **kwargs)
+        except Exception as e:
+            logging.getLogger(__name__).warning(
+                f"Shared rate limit store unavailable, using memory: {e}"
+            )
+            kwargs.clear()
+    return MemoryRateLimitStore(**kwargs)
+
+
+__all__ = [
+    "RateLimitStore",
+    "MemoryRateLimitStore",
+    "CacheRateLimitStore",
+    "create_rate_limit_store",
+    "RATE_LIMIT_BACKENDS",
+]
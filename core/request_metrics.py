@@ -0,0 +1,270 @@
+"""
+Request and callback latency instrumentation
+Flask hooks and a Dash callback wrapper feeding Prometheus histograms
+"""
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dash.exceptions import PreventUpdate
+
+from .performance import (
+    DEFAULT_LATENCY_BUCKETS,
+    LatencyHistogram,
+    MetricType,
+    cache_monitor,
+    db_monitor,
+    get_performance_monitor,
+)
+
+# Label value used once a metric reaches its series limit
+OVERFLOW_LABEL = "__other__"
+
+REQUEST_METRIC = "yosai_http_request_duration_seconds"
+CALLBACK_METRIC = "yosai_callback_duration_seconds"
+VALIDATION_METRIC = "yosai_request_validation_duration_seconds"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + body + "}"
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RequestMetrics:
+    """Thread-safe latency histograms keyed by metric name and labels
+
+    Each metric holds at most ``max_series`` label combinations; further
+    combinations are folded into a single series whose labels are all
+    ``__other__`` so unexpected routes or ids cannot grow memory unbounded.
+    """
+
+    def __init__(self, max_series: int = 200,
+                 buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+                 forward_to_monitor: bool = True):
+        self.max_series = max_series
+        self.buckets = buckets
+        self.forward_to_monitor = forward_to_monitor
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Tuple[Tuple[str, str], ...], LatencyHistogram]] = {}
+        self._help: Dict[str, str] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def observe(self, metric: str, value: float, labels: Dict[str, str],
+                help_text: str = "") -> None:
+        """Record ``value`` seconds for ``metric`` with the given labels"""
+        key = tuple(sorted((name, str(label)) for name, label in labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(metric, {})
+            if help_text:
+                self._help.setdefault(metric, help_text)
+            histogram = series.get(key)
+            if histogram is None:
+                if len(series) >= self.max_series:
+                    key = tuple((name, OVERFLOW_LABEL) for name, _ in key)
+                    histogram = series.get(key)
+                if histogram is None:
+                    histogram = series[key] = LatencyHistogram(self.buckets)
+            histogram.observe(value)
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Copy of every series as ``{"labels", "buckets", "count", "sum"}``"""
+        with self._lock:
+            return {
+                metric: [
+                    {
+                        "labels": dict(key),
+                        "buckets": list(zip(hist.buckets, hist.cumulative_counts())),
+                        "count": hist.count,
+                        "sum": hist.sum,
+                    }
+                    for key, hist in series.items()
+                ]
+                for metric, series in self._histograms.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Histograms and monitor counters in Prometheus text format"""
+        lines: List[str] = []
+        for metric, series in sorted(self.snapshot().items()):
+            lines.append(f"# HELP {metric} {self._help.get(metric, metric)}")
+            lines.append(f"# TYPE {metric} histogram")
+            for entry in series:
+                labels = entry["labels"]
+                for bound, count in entry["buckets"]:
+                    lines.append(
+                        f"{metric}_bucket{_format_labels({**labels, 'le': _format_number(bound)})} {count}"
+                    )
+                lines.append(f"{metric}_bucket{_format_labels({**labels, 'le': '+Inf'})} {entry['count']}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {_format_number(entry['sum'])}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {entry['count']}")
+        lines.extend(self._monitor_lines())
+        return "\n".join(lines) + "\n"
+
+    def _monitor_lines(self) -> List[str]:
+        """Counters collected by the cache and database query monitors"""
+        lines = [
+            "# HELP yosai_cache_requests_total Cache lookups by result",
+            "# TYPE yosai_cache_requests_total counter",
+        ]
+        for name, stats in sorted(cache_monitor.get_all_cache_stats().items())[:self.max_series]:
+            for result, count in (("hit", stats["hits"]), ("miss", stats["misses"])):
+                labels = _format_labels({"cache": name, "result": result})
+                lines.append(f"yosai_cache_requests_total{labels} {count}")
+
+        lines.extend([
+            "# HELP yosai_db_queries_total Database queries by normalized pattern",
+            "# TYPE yosai_db_queries_total counter",
+            "# HELP yosai_db_query_seconds_total Time spent in database queries",
+            "# TYPE yosai_db_query_seconds_total counter",
+        ])
+        patterns = sorted(db_monitor.get_query_patterns().items())[:self.max_series]
+        for pattern, stats in patterns:
+            labels = _format_labels({"query": pattern})
+            lines.append(f"yosai_db_queries_total{labels} {stats['count']}")
+            total = stats['avg_duration'] * stats['count']
+            lines.append(f"yosai_db_query_seconds_total{labels} {_format_number(total)}")
+        return lines
+
+    # ------------------------------------------------------------------
+    def record_request(self, method: str, route: str, status: int, duration: float) -> None:
+        self.observe(
+            REQUEST_METRIC, duration,
+            {"method": method, "route": route, "status": str(status)},
+            "HTTP request latency by route",
+        )
+        if self.forward_to_monitor:
+            get_performance_monitor().record_metric(
+                f"http.{method} {route}", duration, MetricType.API_CALL,
+                duration=duration, tags={"status": str(status)},
+            )
+
+    def record_callback(self, callback_id: str, duration: float, success: bool) -> None:
+        self.observe(
+            CALLBACK_METRIC, duration,
+            {"callback_id": callback_id, "outcome": "success" if success else "error"},
+            "Dash callback latency by callback id",
+        )
+        if self.forward_to_monitor:
+            get_performance_monitor().record_metric(
+                f"callback.{callback_id}", duration, MetricType.USER_INTERACTION,
+                duration=duration, metadata={"success": success},
+            )
+
+    def record_validation(self, route: str, mode: str, outcome: str, duration: float) -> None:
+        self.observe(
+            VALIDATION_METRIC, duration,
+            {"route": route, "mode": mode, "outcome": outcome},
+            "Time spent in request validation middleware",
+        )
+        if self.forward_to_monitor:
+            get_performance_monitor().record_metric(
+                f"validation.{route}", duration, MetricType.EXECUTION_TIME,
+                duration=duration, tags={"mode": mode, "outcome": outcome},
+            )
+
+
+def instrument_callback(callback_id: str, func: Callable[..., Any],
+                        metrics: Optional[RequestMetrics] = None) -> Callable[..., Any]:
+    """Wrap a Dash callback so each invocation records its latency"""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        success = False
+        try:
+            result = func(*args, **kwargs)
+            success = True
+            return result
+        except PreventUpdate:
+            # Control flow rather than a failure
+            success = True
+            raise
+        finally:
+            (metrics or get_request_metrics()).record_callback(
+                callback_id, time.perf_counter() - start, success
+            )
+
+    return wrapper
+
+
+def install_request_metrics(server: Any, metrics: Optional[RequestMetrics] = None,
+                            endpoint: str = "/metrics") -> RequestMetrics:
+    """Register timing hooks and a Prometheus ``endpoint`` on a Flask server
+
+    Requests are labelled by their URL rule (``/assets/<path:filename>``)
+    rather than the raw path; unmatched paths share the ``<unmatched>`` route.
+    """
+    from flask import Response, g, request
+
+    metrics = metrics or get_request_metrics()
+
+    @server.before_request
+    def _start_request_timer():
+        g._yosai_request_start = time.perf_counter()
+
+    @server.after_request
+    def _record_request(response):
+        start = g.pop("_yosai_request_start", None)
+        if start is not None:
+            rule = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+            metrics.record_request(request.method, rule, response.status_code,
+                                   time.perf_counter() - start)
+        return response
+
+    def prometheus_metrics():
+        return Response(metrics.render_prometheus(), mimetype=PROMETHEUS_CONTENT_TYPE)
+
+    server.add_url_rule(endpoint, "prometheus_metrics", prometheus_metrics, methods=["GET"])
+    return metrics
+
+
+# Lazy-loaded global request metrics instance
+_request_metrics: Optional[RequestMetrics] = None
+_request_metrics_lock = threading.Lock()
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Return the singleton request metrics registry, creating it if necessary."""
+    global _request_metrics
+    if _request_metrics is None:
+        with _request_metrics_lock:
+            if _request_metrics is None:
+                _request_metrics = RequestMetrics()
+    return _request_metrics
+
+
+def create_request_metrics(**kwargs: Any) -> RequestMetrics:
+    """Create a new request metrics registry"""
+    return RequestMetrics(**kwargs)
+
+
+__all__ = [
+    "RequestMetrics",
+    "instrument_callback",
+    "install_request_metrics",
+    "get_request_metrics",
+    "create_request_metrics",
+    "REQUEST_METRIC",
+    "CALLBACK_METRIC",
+    "VALIDATION_METRIC",
+    "OVERFLOW_LABEL",
+]
@@ -0,0 +1,210 @@
+"""
+Statistical sampling profiler
+Periodically captures the Python stacks of running threads and exports
+collapsed stacks and speedscope flamegraphs
+"""
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# (function name, file, first line)
+FrameInfo = Tuple[str, str, int]
+
+
+def _thread_cpu_ns(native_id: int) -> Optional[int]:
+    """On-CPU time of a thread in nanoseconds, or ``None`` if unavailable"""
+    try:
+        with open(f"/proc/self/task/{native_id}/schedstat", "rb") as handle:
+            return int(handle.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SamplingProfiler:
+    """Low-overhead stack sampler running on a background thread
+
+    Every ``interval`` seconds the stacks of all other threads are read from
+    ``sys._current_frames()``.  Unless ``include_idle`` is set, threads that
+    used no CPU since the previous sample (blocked on locks, queues or
+    sleeps) are skipped, so idle pool workers do not dominate the profile.
+    """
+
+    def __init__(self, interval: float = 0.01, include_idle: bool = False,
+                 max_depth: int = 128):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._frames: List[FrameInfo] = []
+        self._frame_index: Dict[Any, int] = {}
+        self._cpu_times: Dict[int, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------
+    def start(self) -> 'SamplingProfiler':
+        """Start sampling in a daemon thread"""
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'SamplingProfiler':
+        """Stop sampling and wait for the sampler thread"""
+        if self._thread is None:
+            return self
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.duration += time.perf_counter() - self.started_at
+        return self
+
+    def __enter__(self) -> 'SamplingProfiler':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample(own)
+            except Exception as e:  # pragma: no cover - sampling is best effort
+                self.logger.debug(f"Sampling failed: {e}")
+
+    def _sample(self, own: int) -> None:
+        native_ids = {t.ident: t.native_id for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if not self.include_idle and not self._on_cpu(native_ids.get(ident)):
+                continue
+            stack = self._stack(frame)
+            if stack:
+                self.samples[stack] += 1
+        self.sample_count += 1
+
+    def _on_cpu(self, native_id: Optional[int]) -> bool:
+        if native_id is None:
+            return True
+        cpu = _thread_cpu_ns(native_id)
+        if cpu is None:
+            return True
+        previous = self._cpu_times.get(native_id)
+        self._cpu_times[native_id] = cpu
+        return previous is not None and cpu > previous
+
+    def _stack(self, frame) -> Tuple[int, ...]:
+        """Frame indexes from the outermost to the innermost frame"""
+        stack: List[int] = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            index = self._frame_index.get(code)
+            if index is None:
+                name = getattr(code, "co_qualname", code.co_name)
+                index = self._frame_index[code] = len(self._frames)
+                self._frames.append((name, code.co_filename, code.co_firstlineno))
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    # ------------------------------------------------------------------
+    def _label(self, index: int) -> str:
+        name, filename, line = self._frames[index]
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+        return label.replace(";", ":")
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format (``frame;frame;frame count``)"""
+        lines = [
+            ";".join(self._label(index) for index in stack) + f" {count}"
+            for stack, count in self.samples.most_common()
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def to_speedscope(self, name: str = "profile") -> Dict[str, Any]:
+        """Samples as a speedscope ``sampled`` profile (weights in seconds)"""
+        stacks = list(self.samples.items())
+        weights = [count * self.interval for _, count in stacks]
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "yosai-sampling-profiler",
+            "shared": {
+                "frames": [
+                    {"name": frame_name, "file": filename, "line": line}
+                    for frame_name, filename, line in self._frames
+                ]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": [list(stack) for stack, _ in stacks],
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def hot_functions(self, top_n: int = 20) -> List[Dict[str, Any]]:
+        """Functions ranked by self samples, with inclusive totals"""
+        total = sum(self.samples.values())
+        if not total:
+            return []
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.samples.items():
+            self_counts[stack[-1]] += count
+            for index in set(stack):
+                total_counts[index] += count
+        ranked = sorted(total_counts, key=lambda i: (self_counts[i], total_counts[i]), reverse=True)
+        return [
+            {
+                "function": self._label(index),
+                "self_samples": self_counts[index],
+                "total_samples": total_counts[index],
+                "self_percent": self_counts[index] / total * 100,
+                "total_percent": total_counts[index] / total * 100,
+            }
+            for index in ranked[:top_n]
+        ]
+
+    def write(self, directory: os.PathLike, name: str) -> Dict[str, str]:
+        """Write ``<name>.collapsed`` and ``<name>.speedscope.json`` into ``directory``"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+        collapsed_path = directory / f"{stem}.collapsed"
+        speedscope_path = directory / f"{stem}.speedscope.json"
+        collapsed_path.write_text(self.collapsed(), encoding="utf-8")
+        speedscope_path.write_text(json.dumps(self.to_speedscope(name)), encoding="utf-8")
+        return {"collapsed": str(collapsed_path), "speedscope": str(speedscope_path)}
+
+
+def create_sampling_profiler(**kwargs: Any) -> SamplingProfiler:
+    """Create a new sampling profiler"""
+    return SamplingProfiler(**kwargs)
+
+
+__all__ = ["SamplingProfiler", "create_sampling_profiler", "SPEEDSCOPE_SCHEMA"]
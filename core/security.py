@@ -3,30 +3,34 @@
 Comprehensive security system for Yōsai Intel Dashboard
 Implements Apple's security-by-design principles
 """
-import re
 import hashlib
+import math
 import secrets
+import threading
 import time
-from typing import Dict, Any, Optional, List, Union
-from dataclasses import dataclass
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, Any, Optional, List, Union
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 import logging
 from pathlib import Path
 import mimetypes
 
-# Import common security regex patterns used throughout this module.
-# These constants live in ``core/security_patterns.py`` and are reused in
-# ``core/security_validator.py``. Importing them here ensures ``InputValidator``
-# has access to the pre-defined patterns without duplicating definitions.
-from .security_patterns import (
-    SQL_INJECTION_PATTERNS,
-    XSS_PATTERNS,
-    PATH_TRAVERSAL_PATTERNS,
+# Pattern matching is shared with ``core/security_validator.py`` and the
+# request validation middleware through ``core/security_scanner.py``.
+from .security_scanner import (
+    PATH_TRAVERSAL,
+    SQL_INJECTION,
+    XSS,
+    encode_html_entities,
+    get_security_scanner,
 )
 
 from utils.unicode_handler import sanitize_unicode_input
 from config.dynamic_config import dynamic_config
+from .rate_limit_store import RateLimitStore, create_rate_limit_store
+from .audit_sink import BatchedAuditSink, create_configured_audit_sink
 
 
 class SecurityLevel(Enum):
@@ -60,11 +64,8 @@ class InputValidator:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.compiled_patterns = {
-            'sql': [re.compile(pattern, re.IGNORECASE) for pattern in SQL_INJECTION_PATTERNS],
-            'xss': [re.compile(pattern, re.IGNORECASE) for pattern in XSS_PATTERNS],
-            'path': [re.compile(pattern, re.IGNORECASE) for pattern in PATH_TRAVERSAL_PATTERNS]
-        }
+        self.scanner = get_security_scanner()
+        self.compiled_patterns = self.scanner.compiled_patterns
     
     def validate_input(self, input_data: str, field_name: str = "unknown") -> Dict[str, Any]:
         """Comprehensive input validation"""
@@ -80,76 +81,52 @@ class InputValidator:
             'sanitized': input_data
         }
         
-        # Check for SQL injection
-        sql_issues = self._check_sql_injection(input_data)
+        # One scan reports SQL injection, XSS and path traversal matches
+        matches = self.scanner.scan(input_data).matches
+        
+        sql_issues = self._issues(SQL_INJECTION, matches)
         if sql_issues:
             result['issues'].extend(sql_issues)
             result['severity'] = SecurityLevel.HIGH
             result['valid'] = False
         
-        # Check for XSS
-        xss_issues = self._check_xss(input_data)
-        if xss_issues:
-            result['issues'].extend(xss_issues)
-            result['severity'] = max(result['severity'], SecurityLevel.MEDIUM, key=lambda x: x.value)
-            result['valid'] = False
-        
-        # Check for path traversal
-        path_issues = self._check_path_traversal(input_data)
-        if path_issues:
-            result['issues'].extend(path_issues)
-            result['severity'] = max(result['severity'], SecurityLevel.MEDIUM, key=lambda x: x.value)
-            result['valid'] = False
+        for category in (XSS, PATH_TRAVERSAL):
+            issues = self._issues(category, matches)
+            if issues:
+                result['issues'].extend(issues)
+                result['severity'] = max(result['severity'], SecurityLevel.MEDIUM, key=lambda x: x.value)
+                result['valid'] = False
         
-        # Sanitize input
-        result['sanitized'] = self._sanitize_input(input_data)
+        # Input is already normalized; only encode entities
+        result['sanitized'] = encode_html_entities(input_data, strip_nulls=True)
         
         return result
     
+    _ISSUE_LABELS = {
+        SQL_INJECTION: "Potential SQL injection detected",
+        XSS: "Potential XSS detected",
+        PATH_TRAVERSAL: "Potential path traversal detected",
+    }
+    
+    def _issues(self, category: str, matches: Dict[str, List[str]]) -> List[str]:
+        label = self._ISSUE_LABELS[category]
+        return [f"{label}: {pattern}" for pattern in matches.get(category, [])]
+    
     def _check_sql_injection(self, data: str) -> List[str]:
         """Check for SQL injection patterns"""
-        issues = []
-        for pattern in self.compiled_patterns['sql']:
-            if pattern.search(data):
-                issues.append(f"Potential SQL injection detected: {pattern.pattern}")
-        return issues
+        return self._issues(SQL_INJECTION, self.scanner.scan(data, (SQL_INJECTION,)).matches)
     
     def _check_xss(self, data: str) -> List[str]:
         """Check for XSS patterns"""
-        issues = []
-        for pattern in self.compiled_patterns['xss']:
-            if pattern.search(data):
-                issues.append(f"Potential XSS detected: {pattern.pattern}")
-        return issues
+        return self._issues(XSS, self.scanner.scan(data, (XSS,)).matches)
     
     def _check_path_traversal(self, data: str) -> List[str]:
         """Check for path traversal patterns"""
-        issues = []
-        for pattern in self.compiled_patterns['path']:
-            if pattern.search(data):
-                issues.append(f"Potential path traversal detected: {pattern.pattern}")
-        return issues
+        return self._issues(PATH_TRAVERSAL, self.scanner.scan(data, (PATH_TRAVERSAL,)).matches)
     
     def _sanitize_input(self, data: str) -> str:
         """Sanitize input data"""
-        data = sanitize_unicode_input(data)
-        # Remove null bytes
-        sanitized = data.replace('\x00', '')
-        
-        # Encode HTML special characters
-        html_entities = {
-            '&': '&amp;',
-            '<': '&lt;',
-            '>': '&gt;',
-            '"': '&quot;',
-            "'": '&#x27;',
-            '/': '&#x2F;'
-        }
-        
-        for char, entity in html_entities.items():
-            sanitized = sanitized.replace(char, entity)
-        
-        return sanitized
+        return encode_html_entities(sanitize_unicode_input(data), strip_nulls=True)
     
     def validate_file_upload(self, filename: str, file_content: bytes,
                              max_size_mb: int = dynamic_config.security.max_upload_mb) -> Dict[str, Any]:
@@ -248,14 +225,22 @@ class InputValidator:
         return any(pattern in text_content for pattern in suspicious_patterns)
 
 class RateLimiter:
-    """Rate limiting to prevent abuse"""
+    """Rate limiting to prevent abuse
+
+    Uses the generic cell rate algorithm: each identifier keeps a single
+    theoretical arrival time, so a check is O(1) and allows bursts of up to
+    ``max_requests`` per window.  State lives in ``store`` (see
+    ``core.rate_limit_store``); a shared store makes limits hold across
+    workers.
+    """
     
     def __init__(self, max_requests: int = dynamic_config.security.rate_limit_requests,
-                 window_minutes: int = dynamic_config.security.rate_limit_window_minutes):
+                 window_minutes: int = dynamic_config.security.rate_limit_window_minutes,
+                 store: Optional[RateLimitStore] = None):
         self.max_requests = max_requests
         self.window_seconds = window_minutes * 60
-        self.requests: Dict[str, List[float]] = {}
-        self.blocked_ips: Dict[str, float] = {}
+        self.emission_interval = self.window_seconds / max_requests
+        self.store = store if store is not None else create_rate_limit_store()
         self.logger = logging.getLogger(__name__)
     
     def is_allowed(self, identifier: str, source_ip: Optional[str] = None) -> Dict[str, Any]:
@@ -263,58 +248,77 @@ class RateLimiter:
         current_time = time.time()
         
         # Check if IP is blocked
-        if source_ip and source_ip in self.blocked_ips:
-            if current_time < self.blocked_ips[source_ip]:
+        if source_ip:
+            blocked_until = self.store.blocked_until(source_ip, current_time)
+            if blocked_until is not None:
                 return {
                     'allowed': False,
                     'reason': 'IP temporarily blocked',
-                    'retry_after': self.blocked_ips[source_ip] - current_time
+                    'retry_after': blocked_until - current_time
                 }
-            else:
-                # Unblock IP
-                del self.blocked_ips[source_ip]
         
-        # Initialize or clean old requests
-        if identifier not in self.requests:
-            self.requests[identifier] = []
-        
-        # Remove old requests outside the window
-        cutoff_time = current_time - self.window_seconds
-        self.requests[identifier] = [
-            req_time for req_time in self.requests[identifier] 
-            if req_time > cutoff_time
-        ]
+        allowed, tat = self.store.acquire(
+            identifier, current_time, self.emission_interval, self.window_seconds
+        )
+        requests_in_window = min(
+            self.max_requests,
+            math.ceil(round((tat - current_time) / self.emission_interval, 9))
+        )
         
-        # Check if under limit
-        if len(self.requests[identifier]) >= self.max_requests:
+        if not allowed:
             # Block IP if provided
             if source_ip:
-                self.blocked_ips[source_ip] = current_time + (self.window_seconds * 2)
+                self.store.block(source_ip, current_time + (self.window_seconds * 2))
                 self.logger.warning(f"Rate limit exceeded, blocking IP: {source_ip}")
             
             return {
                 'allowed': False,
                 'reason': 'Rate limit exceeded',
-                'requests_in_window': len(self.requests[identifier]),
+                'requests_in_window': requests_in_window,
                 'max_requests': self.max_requests,
-                'window_seconds': self.window_seconds
+                'window_seconds': self.window_seconds,
+                'retry_after': tat + self.emission_interval - self.window_seconds - current_time
             }
         
-        # Record this request
-        self.requests[identifier].append(current_time)
-        
         return {
             'allowed': True,
-            'requests_in_window': len(self.requests[identifier]),
-            'remaining': self.max_requests - len(self.requests[identifier])
+            'requests_in_window': requests_in_window,
+            'remaining': self.max_requests - requests_in_window
         }
 
+    def sweep(self) -> int:
+        """Remove idle identifiers and expired blocks from the store"""
+        return self.store.sweep()
+
+@dataclass
+class _AuditBucket:
+    """Event counters for one time bucket"""
+    total: int = 0
+    blocked: int = 0
+    by_severity: Counter = field(default_factory=Counter)
+    by_type: Counter = field(default_factory=Counter)
+    ips: set = field(default_factory=set)
+
+
 class SecurityAuditor:
-    """Security event logging and monitoring"""
+    """Security event logging and monitoring
+
+    Recent events are kept in a ring buffer of ``max_events``; summaries are
+    built from per-``bucket_seconds`` counters kept for ``retention_hours``,
+    so the time range of a summary has bucket resolution.  An optional
+    ``sink`` (``core.audit_sink``) receives every event for durable storage.
+    """
     
-    def __init__(self):
-        self.events: List[SecurityEvent] = []
-        self.max_events = 10000
+    def __init__(self, max_events: int = 10000, bucket_seconds: int = 60,
+                 retention_hours: int = 24 * 7, sink: Optional[BatchedAuditSink] = None):
+        self.max_events = max_events
+        self.bucket_seconds = bucket_seconds
+        self.retention_hours = retention_hours
+        self.sink = sink
+        self.events: Deque[SecurityEvent] = deque(maxlen=max_events)
+        self._high_severity: Deque[SecurityEvent] = deque(maxlen=max_events)
+        self._buckets: "OrderedDict[int, _AuditBucket]" = OrderedDict()
+        self._lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
     
     def log_security_event(
@@ -339,11 +343,23 @@ class SecurityAuditor:
             blocked=blocked
         )
         
-        self.events.append(event)
-        
-        # Limit stored events
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
+        with self._lock:
+            self.events.append(event)
+            if severity in (SecurityLevel.HIGH, SecurityLevel.CRITICAL):
+                self._high_severity.append(event)
+            self._count(event)
+        
+        if self.sink is not None:
+            self.sink.write({
+                'event_id': event.event_id,
+                'timestamp': event.timestamp.isoformat(),
+                'event_type': event_type,
+                'severity': severity.value,
+                'source_ip': source_ip,
+                'user_id': user_id,
+                'blocked': blocked,
+                'details': details,
+            })
         
         # Log based on severity
         log_message = f"Security Event [{event.event_id}]: {event_type} - {severity.value}"
@@ -357,34 +373,60 @@ class SecurityAuditor:
             self.logger.info(log_message)
         
         return event
+
+    def _bucket_key(self, timestamp: datetime) -> int:
+        return int(timestamp.timestamp() // self.bucket_seconds)
+
+    def _count(self, event: SecurityEvent) -> None:
+        key = self._bucket_key(event.timestamp)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _AuditBucket()
+            # Buckets are created in time order; expire from the oldest
+            oldest = key - self.retention_hours * 3600 // self.bucket_seconds
+            while self._buckets and next(iter(self._buckets)) < oldest:
+                self._buckets.popitem(last=False)
+        bucket.total += 1
+        bucket.blocked += event.blocked
+        bucket.by_severity[event.severity.value] += 1
+        bucket.by_type[event.event_type] += 1
+        if event.source_ip:
+            bucket.ips.add(event.source_ip)
     
     def get_security_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get security events summary"""
         cutoff = datetime.now() - timedelta(hours=hours)
-        recent_events = [e for e in self.events if e.timestamp >= cutoff]
-        
-        if not recent_events:
+        first_key = self._bucket_key(cutoff)
+        
+        total = blocked = 0
+        by_severity: Counter = Counter()
+        by_type: Counter = Counter()
+        ips: set = set()
+        with self._lock:
+            for key in reversed(self._buckets):
+                if key < first_key:
+                    break
+                bucket = self._buckets[key]
+                total += bucket.total
+                blocked += bucket.blocked
+                by_severity.update(bucket.by_severity)
+                by_type.update(bucket.by_type)
+                ips.update(bucket.ips)
+            high_severity = []
+            for event in reversed(self._high_severity):
+                if event.timestamp < cutoff:
+                    break
+                high_severity.append(event)
+        
+        if not total:
             return {'total_events': 0}
         
-        # Group by severity
-        by_severity = {}
-        for severity in SecurityLevel:
-            by_severity[severity.value] = len([e for e in recent_events if e.severity == severity])
-        
-        # Group by event type
-        by_type = {}
-        for event in recent_events:
-            by_type[event.event_type] = by_type.get(event.event_type, 0) + 1
-        
-        # Get blocked events
-        blocked_events = [e for e in recent_events if e.blocked]
-        
         return {
-            'total_events': len(recent_events),
-            'by_severity': by_severity,
-            'by_type': by_type,
-            'blocked_events': len(blocked_events),
-            'unique_ips': len(set(e.source_ip for e in recent_events if e.source_ip)),
+            'total_events': total,
+            'by_severity': {severity.value: by_severity[severity.value] for severity in SecurityLevel},
+            'by_type': dict(by_type),
+            'blocked_events': blocked,
+            'unique_ips': len(ips),
             'high_severity_events': [
                 {
                     'event_id': e.event_id,
@@ -392,8 +434,7 @@ class SecurityAuditor:
                     'timestamp': e.timestamp,
                     'details': e.details
                 }
-                for e in recent_events 
-                if e.severity in [SecurityLevel.HIGH, SecurityLevel.CRITICAL]
+                for e in reversed(high_severity)
             ]
         }
 
@@ -437,7 +478,7 @@ class SecureHashManager:
 # Global security instances
 input_validator = InputValidator()
 rate_limiter = RateLimiter()
-security_auditor = SecurityAuditor()
+security_auditor = SecurityAuditor(sink=create_configured_audit_sink())
 
 # Decorators for easy security integration
 def validate_input_decorator(field_mapping: Dict[str, str] = None):
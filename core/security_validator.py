@@ -4,7 +4,6 @@ Implements comprehensive input validation and security checks
 """
 
 import logging
-import re
 import os
 import secrets
 from typing import Dict, Any, List, Callable
@@ -12,10 +11,12 @@ from typing import Dict, Any, List, Callable
 from utils.unicode_handler import sanitize_unicode_input
 from dataclasses import dataclass
 from enum import Enum
-from .security_patterns import (
-    SQL_INJECTION_PATTERNS as RAW_SQL_PATTERNS,
-    XSS_PATTERNS as RAW_XSS_PATTERNS,
-    PATH_TRAVERSAL_PATTERNS as RAW_PATH_PATTERNS,
+from .security_scanner import (
+    PATH_TRAVERSAL,
+    SQL_INJECTION,
+    XSS,
+    encode_html_entities,
+    get_security_scanner,
 )
 
 
@@ -43,110 +44,87 @@ class SecurityValidator:
         "path_traversal": True,
     }
 
+    # Validator name -> (scanner category, level, message, recommendation)
+    CATEGORY_ISSUES = {
+        "sql_injection": (
+            SQL_INJECTION,
+            SecurityLevel.CRITICAL,
+            "Potential SQL injection detected",
+            "Use parameterized queries and input sanitization",
+        ),
+        "xss": (
+            XSS,
+            SecurityLevel.HIGH,
+            "Potential XSS attack detected",
+            "Encode output and validate input",
+        ),
+        "path_traversal": (
+            PATH_TRAVERSAL,
+            SecurityLevel.HIGH,
+            "Potential path traversal detected",
+            "Restrict file access and validate paths",
+        ),
+    }
+
     def __init__(self) -> None:
         self.logger = logging.getLogger(__name__)
-
-    # Compiled patterns for performance
-    SQL_PATTERNS = [re.compile(p, re.IGNORECASE) for p in RAW_SQL_PATTERNS]
-
-    XSS_PATTERNS = [re.compile(p, re.IGNORECASE) for p in RAW_XSS_PATTERNS]
-
-    PATH_PATTERNS = [re.compile(p, re.IGNORECASE) for p in RAW_PATH_PATTERNS]
+        self.scanner = get_security_scanner()
 
     def validate_input(self, value: str, field_name: str = "input") -> Dict[str, Any]:
         """Orchestrate security validations for the given value."""
         sanitized = self._sanitize_input(value)
-        issues: List[SecurityIssue] = []
+        issues = self._validate_with_error_handling(
+            self._validate_enabled_categories, sanitized, field_name
+        )
+        return self._compile_validation_results(issues, sanitized)
 
-        validators: List[Callable[[str, str], List[SecurityIssue]]] = []
-        if self.VALIDATION_CONFIG.get("sql_injection"):
-            validators.append(self._validate_sql_injection)
-        if self.VALIDATION_CONFIG.get("xss"):
-            validators.append(self._validate_xss_patterns)
-        if self.VALIDATION_CONFIG.get("path_traversal"):
-            validators.append(self._validate_path_traversal)
-
-        for validator in validators:
-            issues.extend(
-                self._validate_with_error_handling(validator, sanitized, field_name)
-            )
-            if any(issue.level == SecurityLevel.CRITICAL for issue in issues):
-                break
+    def _validate_enabled_categories(
+        self, value: str, field_name: str
+    ) -> List[SecurityIssue]:
+        """Scan once for every enabled validator, stopping at a critical issue."""
+        enabled = self.get_available_validators()
+        found = self.scanner.scan(
+            value, [self.CATEGORY_ISSUES[name][0] for name in enabled]
+        ).matches
 
-        return self._compile_validation_results(issues, sanitized)
+        issues: List[SecurityIssue] = []
+        for name in enabled:
+            if self.CATEGORY_ISSUES[name][0] in found:
+                issues.append(self._category_issue(name, field_name))
+                if issues[-1].level == SecurityLevel.CRITICAL:
+                    break
+        return issues
 
     def _sanitize_input(self, value: str) -> str:
         """Sanitize input by encoding dangerous characters"""
-        value = sanitize_unicode_input(value)
-        # HTML entity encoding
-        replacements = {
-            "&": "&amp;",
-            "<": "&lt;",
-            ">": "&gt;",
-            '"': "&quot;",
-            "'": "&#x27;",
-            "/": "&#x2F;",
-        }
+        return encode_html_entities(sanitize_unicode_input(value))
 
-        sanitized = value
-        for char, entity in replacements.items():
-            sanitized = sanitized.replace(char, entity)
+    def _category_issue(self, name: str, field_name: str) -> SecurityIssue:
+        _, level, message, recommendation = self.CATEGORY_ISSUES[name]
+        return self._create_security_issue(level, message, field_name, recommendation)
 
-        return sanitized
+    def _validate_category(self, name: str, value: str, field_name: str) -> List[SecurityIssue]:
+        if self.scanner.matches_category(self.CATEGORY_ISSUES[name][0], value):
+            return [self._category_issue(name, field_name)]
+        return []
 
     def _validate_sql_injection(
         self, value: str, field_name: str
     ) -> List[SecurityIssue]:
         """Check for SQL injection patterns."""
-        issues = []
-        for pattern in self.SQL_PATTERNS:
-            if pattern.search(value):
-                issues.append(
-                    self._create_security_issue(
-                        SecurityLevel.CRITICAL,
-                        "Potential SQL injection detected",
-                        field_name,
-                        "Use parameterized queries and input sanitization",
-                    )
-                )
-                break
-        return issues
+        return self._validate_category("sql_injection", value, field_name)
 
     def _validate_xss_patterns(
         self, value: str, field_name: str
     ) -> List[SecurityIssue]:
         """Check for cross-site scripting patterns."""
-        issues = []
-        for pattern in self.XSS_PATTERNS:
-            if pattern.search(value):
-                issues.append(
-                    self._create_security_issue(
-                        SecurityLevel.HIGH,
-                        "Potential XSS attack detected",
-                        field_name,
-                        "Encode output and validate input",
-                    )
-                )
-                break
-        return issues
+        return self._validate_category("xss", value, field_name)
 
     def _validate_path_traversal(
         self, value: str, field_name: str
     ) -> List[SecurityIssue]:
         """Check for path traversal attempts."""
-        issues = []
-        for pattern in self.PATH_PATTERNS:
-            if pattern.search(value):
-                issues.append(
-                    self._create_security_issue(
-                        SecurityLevel.HIGH,
-                        "Potential path traversal detected",
-                        field_name,
-                        "Restrict file access and validate paths",
-                    )
-                )
-                break
-        return issues
+        return self._validate_category("path_traversal", value, field_name)
 
     def _create_security_issue(
         self,
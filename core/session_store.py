@@ -0,0 +1,321 @@
+"""
+Server-side user session store
+Each login gets a session id whose user data is kept in a backend shared by
+all workers (SQLite file or a Redis-compatible cache) behind a small
+per-process LRU, so any worker can serve any session
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol, Tuple, Union
+
+SESSION_BACKENDS = ("memory", "sqlite", "cache")
+
+# (user data, expiry timestamp)
+SessionEntry = Tuple[Dict[str, Any], float]
+
+
+class SessionBackend(Protocol):
+    """Persistent storage behind :class:`UserSessionStore`"""
+
+    def get(self, session_id: str) -> Optional[SessionEntry]:
+        ...
+
+    def set(self, session_id: str, data: Dict[str, Any], expires_at: float) -> None:
+        ...
+
+    def delete(self, session_id: str) -> None:
+        ...
+
+    def touch_many(self, expiries: Dict[str, float]) -> None:
+        """Extend the expiry of several sessions in one operation"""
+        ...
+
+    def sweep(self, now: float) -> int:
+        ...
+
+
+class MemorySessionBackend:
+    """Process-local backend (single worker or tests)"""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, SessionEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[SessionEntry]:
+        return self._entries.get(session_id)
+
+    def set(self, session_id: str, data: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._entries[session_id] = (data, expires_at)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def touch_many(self, expiries: Dict[str, float]) -> None:
+        with self._lock:
+            for session_id, expires_at in expiries.items():
+                entry = self._entries.get(session_id)
+                if entry is not None:
+                    self._entries[session_id] = (entry[0], expires_at)
+
+    def sweep(self, now: float) -> int:
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+            return len(expired)
+
+
+class SQLiteSessionBackend:
+    """Sessions in a SQLite file shared by the workers of one host"""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5.0)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS login_sessions ("
+                "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, session_id: str) -> Optional[SessionEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data, expires_at FROM login_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return None if row is None else (json.loads(row[0]), row[1])
+
+    def set(self, session_id: str, data: Dict[str, Any], expires_at: float) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO login_sessions (session_id, data, expires_at) VALUES (?, ?, ?)",
+                (session_id, json.dumps(data), expires_at),
+            )
+
+    def delete(self, session_id: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM login_sessions WHERE session_id = ?", (session_id,))
+
+    def touch_many(self, expiries: Dict[str, float]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE login_sessions SET expires_at = MAX(expires_at, ?) WHERE session_id = ?",
+                [(expires_at, session_id) for session_id, expires_at in expiries.items()],
+            )
+
+    def sweep(self, now: float) -> int:
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "DELETE FROM login_sessions WHERE expires_at <= ?", (now,)
+            ).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class CacheSessionBackend:
+    """Sessions in a cache manager (Redis in production) using cache TTLs
+
+    Any object with ``get``/``set(key, value, ttl)``/``delete`` works, e.g.
+    ``config.cache_manager.MemoryCacheManager`` as a local stand-in.
+    """
+
+    def __init__(self, cache: Any, prefix: str = "session:") -> None:
+        self.cache = cache
+        self.prefix = prefix
+
+    def get(self, session_id: str) -> Optional[SessionEntry]:
+        entry = self.cache.get(self.prefix + session_id)
+        return None if entry is None else (entry["data"], float(entry["expires_at"]))
+
+    def set(self, session_id: str, data: Dict[str, Any], expires_at: float) -> None:
+        ttl = max(1, int(expires_at - time.time()) + 1)
+        self.cache.set(self.prefix + session_id, {"data": data, "expires_at": expires_at}, ttl)
+
+    def delete(self, session_id: str) -> None:
+        if hasattr(self.cache, "delete"):
+            self.cache.delete(self.prefix + session_id)
+        else:
+            self.cache.set(self.prefix + session_id, None, 1)
+
+    def touch_many(self, expiries: Dict[str, float]) -> None:
+        for session_id, expires_at in expiries.items():
+            entry = self.get(session_id)
+            if entry is not None and entry[1] < expires_at:
+                self.set(session_id, entry[0], expires_at)
+
+    def sweep(self, now: float) -> int:
+        # Expiry is handled by the cache TTLs
+        return 0
+
+
+class UserSessionStore:
+    """Logged-in users by session id with sliding TTL expiry
+
+    Every login has its own session id, so deleting one (logout) leaves the
+    same user's sessions in other browsers intact.
+
+    Reads are served from an LRU of ``lru_size`` entries for up to
+    ``local_ttl`` seconds before the backend is consulted again, so a logout
+    in another worker is seen within ``local_ttl``.  Sliding-expiry updates
+    are buffered and written to the backend in one batch every
+    ``touch_interval`` seconds.
+    """
+
+    def __init__(self, backend: Optional[SessionBackend] = None, ttl: float = 8 * 3600,
+                 lru_size: int = 1024, local_ttl: float = 10.0,
+                 touch_interval: float = 60.0) -> None:
+        self.backend = backend if backend is not None else MemorySessionBackend()
+        self.ttl = ttl
+        self.lru_size = lru_size
+        self.local_ttl = local_ttl
+        self.touch_interval = touch_interval
+        # session_id -> (data, expires_at, cached_at)
+        self._lru: "OrderedDict[str, Tuple[Dict[str, Any], float, float]]" = OrderedDict()
+        self._pending_touches: Dict[str, float] = {}
+        self._next_flush = time.time() + touch_interval
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        now = time.time()
+        expires_at = now + self.ttl
+        self.backend.set(session_id, data, expires_at)
+        with self._lock:
+            self._pending_touches.pop(session_id, None)
+            self._remember(session_id, data, expires_at, now)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            cached = self._lru.get(session_id)
+            if cached is not None and now - cached[2] < self.local_ttl:
+                self._lru.move_to_end(session_id)
+                data, expires_at = cached[0], cached[1]
+            else:
+                cached = None
+        if cached is None:
+            entry = self.backend.get(session_id)
+            if entry is None:
+                with self._lock:
+                    self._lru.pop(session_id, None)
+                return None
+            data, expires_at = entry
+            with self._lock:
+                expires_at = max(expires_at, self._pending_touches.get(session_id, 0.0))
+                self._remember(session_id, data, expires_at, now)
+        if expires_at <= now:
+            self.delete(session_id)
+            return None
+        self._touch(session_id, now)
+        return data
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._lru.pop(session_id, None)
+            self._pending_touches.pop(session_id, None)
+        self.backend.delete(session_id)
+
+    def flush(self) -> None:
+        """Write buffered expiry updates to the backend"""
+        with self._lock:
+            pending, self._pending_touches = self._pending_touches, {}
+            self._next_flush = time.time() + self.touch_interval
+        if pending:
+            try:
+                self.backend.touch_many(pending)
+            except Exception as e:
+                self.logger.warning(f"Failed to extend {len(pending)} sessions: {e}")
+
+    def sweep(self) -> int:
+        """Remove expired sessions from the backend"""
+        return self.backend.sweep(time.time())
+
+    def _remember(self, session_id: str, data: Dict[str, Any], expires_at: float,
+                  now: float) -> None:
+        self._lru[session_id] = (data, expires_at, now)
+        self._lru.move_to_end(session_id)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def _touch(self, session_id: str, now: float) -> None:
+        with self._lock:
+            cached = self._lru.get(session_id)
+            # Only extend once the expiry has moved by a full touch interval
+            if cached is not None and now + self.ttl - cached[1] >= self.touch_interval:
+                expires_at = now + self.ttl
+                self._lru[session_id] = (cached[0], expires_at, cached[2])
+                self._pending_touches[session_id] = expires_at
+            due = now >= self._next_flush
+        if due:
+            self.flush()
+
+
+def create_session_backend(kind: str, path: Optional[str] = None,
+                           cache: Any = None) -> SessionBackend:
+    """Create a ``memory``, ``sqlite`` or ``cache`` backend"""
+    kind = kind.lower()
+    if kind == "memory":
+        return MemorySessionBackend()
+    if kind == "sqlite":
+        return SQLiteSessionBackend(path or "data/sessions.db")
+    if kind == "cache":
+        if cache is None:
+            from config.cache_manager import from_environment
+            from core.plugins.config.factories import CacheManagerFactory
+
+            cache = CacheManagerFactory.create_manager(from_environment())
+            cache.start()
+        return CacheSessionBackend(cache)
+    raise ValueError(f"Unknown session backend: {kind}")
+
+
+def create_session_store(backend: Union[str, SessionBackend, None] = None,
+                         **kwargs: Any) -> UserSessionStore:
+    """Create a session store; ``backend`` defaults to ``SESSION_STORE``"""
+    if backend is None or isinstance(backend, str):
+        from config.dynamic_config import dynamic_config
+
+        security = dynamic_config.security
+        kwargs.setdefault("ttl", security.session_ttl_seconds)
+        backend = create_session_backend(backend or security.session_store,
+                                         security.session_store_path)
+    return UserSessionStore(backend, **kwargs)
+
+
+# Lazy-loaded session store for core.auth
+_session_store: Optional[UserSessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> UserSessionStore:
+    """Return the shared session store, creating it if necessary."""
+    global _session_store
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                _session_store = create_session_store()
+    return _session_store
+
+
+__all__ = [
+    "UserSessionStore",
+    "SessionBackend",
+    "MemorySessionBackend",
+    "SQLiteSessionBackend",
+    "CacheSessionBackend",
+    "create_session_backend",
+    "create_session_store",
+    "get_session_store",
+    "SESSION_BACKENDS",
+]
@@ -8,6 +8,8 @@ import logging
 from dash import Dash
 from dash.dependencies import Output, Input, State
 
+from .request_metrics import instrument_callback
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,7 +49,10 @@ class UnifiedCallbackCoordinator:
         component_name: str,
         **kwargs: Any,
     ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
-        """Wrap ``Dash.callback`` and track registrations."""
+        """Wrap ``Dash.callback`` and track registrations.
+
+        Every invocation of the callback is timed under ``callback_id``.
+        """
 
         if inputs is None:
             inputs_tuple: Tuple[Input, ...] = tuple()
@@ -95,7 +100,7 @@ class UnifiedCallbackCoordinator:
                     inputs_arg if inputs_arg is not None else inputs_tuple,
                     states_arg if states_arg is not None else states_tuple,
                     **kwargs,
-                )(func)
+                )(instrument_callback(callback_id, func))
 
                 reg = CallbackRegistration(
                     callback_id=callback_id,
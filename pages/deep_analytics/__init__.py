@@ -8,19 +8,23 @@ from .analysis_helpers import (
     analyze_data_with_service,
     analyze_data_with_service_safe,
     get_analytics_service_safe,
+    get_analysis_queue,
     get_analysis_type_options,
     get_data_source_options_safe,
     get_latest_uploaded_source_value,
+    load_analysis_frame,
     process_quality_analysis,
     process_quality_analysis_safe,
     process_suggests_analysis,
     process_suggests_analysis_safe,
+    submit_analysis_job,
 )
 from .layout_components import (
     create_analysis_results_display,
     create_analysis_results_display_safe,
     create_data_quality_display,
     create_data_quality_display_corrected,
+    create_job_progress_display,
     create_limited_analysis_display,
     create_suggests_display,
     get_analysis_buttons_section,
@@ -40,18 +44,22 @@ __all__ = [
     "create_analysis_results_display_safe",
     "create_data_quality_display",
     "create_data_quality_display_corrected",
+    "create_job_progress_display",
     "create_limited_analysis_display",
     "create_suggests_display",
     "get_analytics_service_safe",
     "get_analysis_buttons_section",
+    "get_analysis_queue",
     "get_analysis_type_options",
     "get_data_source_options_safe",
     "get_initial_message",
     "get_initial_message_safe",
     "get_latest_uploaded_source_value",
+    "load_analysis_frame",
     "get_updated_button_group",
     "process_quality_analysis",
     "process_quality_analysis_safe",
     "process_suggests_analysis",
     "process_suggests_analysis_safe",
+    "submit_analysis_job",
 ]
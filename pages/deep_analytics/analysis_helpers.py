@@ -1,7 +1,10 @@
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 import pandas as pd
 from services import AnalyticsService
+from analytics.analysis_jobs import ANALYSIS_TYPES, analysis_job_key, run_deep_analysis
+from core.job_queue import JobQueue, create_job_queue
 
 try:
     from components.column_verification import get_ai_suggestions_for_file
@@ -29,6 +32,28 @@ except ImportError:  # pragma: no cover - fallback suggestions
 ANALYTICS_SERVICE_AVAILABLE = AnalyticsService is not None
 logger = logging.getLogger(__name__)
 
+# Job records shared by every web worker so any of them can serve a poll
+ANALYSIS_JOB_STORE = "data/analysis_jobs.db"
+_analysis_queue: Optional[JobQueue] = None
+_analysis_queue_lock = threading.Lock()
+
+
+def get_analysis_queue() -> JobQueue:
+    """Return the process pool used for deep analysis jobs, creating it on first use
+
+    The analyzed DataFrame is not written to the shared store, so jobs are
+    never re-queued; an analysis interrupted by a restart has to be run again.
+    """
+    global _analysis_queue
+    with _analysis_queue_lock:
+        if _analysis_queue is None:
+            _analysis_queue = create_job_queue(
+                store_path=ANALYSIS_JOB_STORE,
+                keep_payloads=False,
+                recover=False,
+            )
+        return _analysis_queue
+
 
 def get_analytics_service_safe():
     """Safely instantiate the analytics service if available."""
@@ -377,3 +402,37 @@ def analyze_data_with_service_safe(data_source: str, analysis_type: str) -> Dict
     except Exception as e:
         return {"error": f"Service analysis failed: {str(e)}"}
 
+
+
+def load_analysis_frame(data_source: str) -> Optional[pd.DataFrame]:
+    """Return the uploaded DataFrame behind ``data_source``, if any."""
+    if not data_source or not (data_source.startswith("upload:") or data_source == "service:uploaded"):
+        return None
+    try:
+        from pages.file_upload import get_uploaded_data
+        uploaded_files = get_uploaded_data()
+    except Exception:
+        return None
+    if not uploaded_files:
+        return None
+    if data_source.startswith("upload:"):
+        return uploaded_files.get(data_source.replace("upload:", "", 1))
+    return pd.concat(list(uploaded_files.values()), ignore_index=True)
+
+
+def submit_analysis_job(data_source: str, analysis_type: str) -> Optional[Dict[str, Any]]:
+    """Queue a deep analysis of uploaded data and return its job status.
+
+    Returns ``None`` when the source has no uploaded frame to analyze.
+    Identical requests for the same data share one job.
+    """
+    if analysis_type not in ANALYSIS_TYPES:
+        return None
+    df = load_analysis_frame(data_source)
+    if df is None or df.empty:
+        return None
+    job = get_analysis_queue().submit(
+        run_deep_analysis, df, analysis_type, key=analysis_job_key(analysis_type, df)
+    )
+    logger.info(f"Deep analysis {analysis_type} for {data_source}: job {job.job_id} ({job.status})")
+    return job.to_dict()
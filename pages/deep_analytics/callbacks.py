@@ -1,10 +1,19 @@
 import logging
+from typing import Any, Dict, Tuple
 
 import dash_bootstrap_components as dbc
 from dash import html
 
+from core.job_queue import JOB_COMPLETED, JOB_FAILED
 from core.unified_callback_coordinator import UnifiedCallbackCoordinator
 
+from .analysis_helpers import (
+    analyze_data_with_service,
+    get_analysis_queue,
+    submit_analysis_job,
+)
+from .layout_components import create_analysis_results_display, create_job_progress_display
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,12 +32,49 @@ def run_simple_analysis(analysis_type: str, data_source: str):
         return dbc.Alert(f"❌ Analysis failed: {str(e)}", color="danger")
 
 
+def start_analysis(analysis_type: str, data_source: str) -> Tuple[Any, Dict[str, Any], bool]:
+    """Start an analysis; returns (display, job store data, interval disabled)"""
+    if not (data_source and data_source != "none"):
+        return dbc.Alert("Please select a data source first", color="warning"), {}, True
+
+    status = submit_analysis_job(data_source, analysis_type)
+    if status is None:
+        # No uploaded frame behind this source: use the service summary directly
+        results = analyze_data_with_service(data_source, analysis_type)
+        if "error" in results:
+            return dbc.Alert(f"❌ Analysis failed: {results['error']}", color="danger"), {}, True
+        return create_analysis_results_display(results, analysis_type), {}, True
+
+    job = {"job_id": status["job_id"], "analysis_type": analysis_type, "data_source": data_source}
+    display, finished = job_display(job)
+    return display, job, finished
+
+
+def job_display(job: Dict[str, Any]) -> Tuple[Any, bool]:
+    """Display for a background analysis job and whether polling can stop"""
+    job_queue = get_analysis_queue()
+    status = job_queue.status(job.get("job_id", ""))
+    analysis_type = job.get("analysis_type", "")
+    if status is None:
+        return dbc.Alert("Analysis job expired, please run it again", color="warning"), True
+    if status["status"] == JOB_FAILED:
+        return dbc.Alert(f"❌ Analysis failed: {status['error']}", color="danger"), True
+    if status["status"] == JOB_COMPLETED:
+        results = dict(job_queue.result(job["job_id"]) or {}, data_source=job.get("data_source"))
+        return create_analysis_results_display(results, analysis_type), True
+    return create_job_progress_display(status, analysis_type), False
+
+
 def register_callbacks(manager: UnifiedCallbackCoordinator) -> None:
     """Register simplified analytics callbacks"""
-    from dash import Input, Output, State
+    from dash import Input, Output, State, no_update
 
     @manager.register_callback(
-        Output("analytics-display-area", "children"),
+        [
+            Output("analytics-display-area", "children"),
+            Output("analytics-job-store", "data"),
+            Output("analytics-job-interval", "disabled"),
+        ],
         Input("security-btn", "n_clicks"),
         State("analytics-data-source", "value"),
         prevent_initial_call=True,
@@ -36,12 +82,14 @@ def register_callbacks(manager: UnifiedCallbackCoordinator) -> None:
         component_name="deep_analytics",
     )
     def security_analysis(n_clicks, data_source):
-        if n_clicks and data_source and data_source != "none":
-            return run_simple_analysis("security", data_source)
-        return dbc.Alert("Please select a data source first", color="warning")
+        return start_analysis("security", data_source if n_clicks else None)
 
     @manager.register_callback(
-        Output("analytics-display-area", "children", allow_duplicate=True),
+        [
+            Output("analytics-display-area", "children", allow_duplicate=True),
+            Output("analytics-job-store", "data", allow_duplicate=True),
+            Output("analytics-job-interval", "disabled", allow_duplicate=True),
+        ],
         Input("trends-btn", "n_clicks"),
         State("analytics-data-source", "value"),
         prevent_initial_call=True,
@@ -49,12 +97,14 @@ def register_callbacks(manager: UnifiedCallbackCoordinator) -> None:
         component_name="deep_analytics",
     )
     def trends_analysis(n_clicks, data_source):
-        if n_clicks and data_source and data_source != "none":
-            return run_simple_analysis("trends", data_source)
-        return dbc.Alert("Please select a data source first", color="warning")
+        return start_analysis("trends", data_source if n_clicks else None)
 
     @manager.register_callback(
-        Output("analytics-display-area", "children", allow_duplicate=True),
+        [
+            Output("analytics-display-area", "children", allow_duplicate=True),
+            Output("analytics-job-store", "data", allow_duplicate=True),
+            Output("analytics-job-interval", "disabled", allow_duplicate=True),
+        ],
         Input("behavior-btn", "n_clicks"),
         State("analytics-data-source", "value"),
         prevent_initial_call=True,
@@ -62,12 +112,14 @@ def register_callbacks(manager: UnifiedCallbackCoordinator) -> None:
         component_name="deep_analytics",
     )
     def behavior_analysis(n_clicks, data_source):
-        if n_clicks and data_source and data_source != "none":
-            return run_simple_analysis("behavior", data_source)
-        return dbc.Alert("Please select a data source first", color="warning")
+        return start_analysis("behavior", data_source if n_clicks else None)
 
     @manager.register_callback(
-        Output("analytics-display-area", "children", allow_duplicate=True),
+        [
+            Output("analytics-display-area", "children", allow_duplicate=True),
+            Output("analytics-job-store", "data", allow_duplicate=True),
+            Output("analytics-job-interval", "disabled", allow_duplicate=True),
+        ],
         Input("anomaly-btn", "n_clicks"),
         State("analytics-data-source", "value"),
         prevent_initial_call=True,
@@ -75,9 +127,23 @@ def register_callbacks(manager: UnifiedCallbackCoordinator) -> None:
         component_name="deep_analytics",
     )
     def anomaly_analysis(n_clicks, data_source):
-        if n_clicks and data_source and data_source != "none":
-            return run_simple_analysis("anomaly", data_source)
-        return dbc.Alert("Please select a data source first", color="warning")
+        return start_analysis("anomaly", data_source if n_clicks else None)
+
+    @manager.register_callback(
+        [
+            Output("analytics-display-area", "children", allow_duplicate=True),
+            Output("analytics-job-interval", "disabled", allow_duplicate=True),
+        ],
+        Input("analytics-job-interval", "n_intervals"),
+        State("analytics-job-store", "data"),
+        prevent_initial_call=True,
+        callback_id="poll_analysis_job",
+        component_name="deep_analytics",
+    )
+    def poll_analysis_job(n_intervals, job):
+        if not job or not job.get("job_id"):
+            return no_update, True
+        return job_display(job)
 
     @manager.register_callback(
         Output("analytics-data-source", "options"),
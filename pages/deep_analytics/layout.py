@@ -158,6 +158,8 @@ def layout():
         stores = [
             dcc.Store(id="analytics-results-store", data={}),
             dcc.Store(id="service-health-store", data={}),
+            dcc.Store(id="analytics-job-store", data={}),
+            dcc.Interval(id="analytics-job-interval", interval=1000, disabled=True),
             html.Div(id="hidden-trigger", style={"display": "none"})
         ]
 
@@ -1,6 +1,6 @@
 import logging
 from typing import Dict, Any
-from dash import html, dcc
+from dash import html
 import dash_bootstrap_components as dbc
 
 logger = logging.getLogger(__name__)
@@ -86,74 +86,6 @@ def create_suggests_display(suggests_data: Dict[str, Any]) -> html.Div:
         return html.Div([summary_card, suggestions_table])
     except Exception as e:  # pragma: no cover
         return dbc.Alert(f"Error creating display: {str(e)}", color="danger")
-            dbc.CardHeader([html.H5(f"🤖 AI Column Mapping Analysis - {filename}")]),
-            dbc.CardBody([
-                dbc.Row([
-                    dbc.Col([
-                        html.H6("Dataset Info"),
-                        html.P(f"File: {filename}"),
-                        html.P(f"Rows: {total_rows:,}"),
-                        html.P(f"Columns: {total_columns}")
-                    ], width=4),
-                    dbc.Col([
-                        html.H6("Overall Confidence"),
-                        dbc.Progress(
-                            value=avg_confidence * 100,
-                            label=f"{avg_confidence:.1%}",
-                            color="success" if avg_confidence >= 0.7 else "warning" if avg_confidence >= 0.4 else "danger",
-                        )
-                    ], width=4),
-                    dbc.Col([
-                        html.H6("Confident Mappings"),
-                        html.H3(
-                            f"{confident_mappings}/{total_columns}",
-                            className="text-success" if confident_mappings >= total_columns * 0.7 else "text-warning",
-                        ),
-                    ], width=4),
-                ])
-            ])
-        ], className="mb-3")
-        if suggestions:
-            table_rows = []
-            for suggestion in suggestions:
-                confidence = suggestion["confidence"]
-                table_rows.append(
-                    html.Tr([
-                        html.Td(suggestion["column"]),
-                        html.Td(suggestion["suggested_field"]),
-                        html.Td([
-                            dbc.Progress(
-                                value=confidence * 100,
-                                label=f"{confidence:.1%}",
-                                color="success" if confidence >= 0.7 else "warning" if confidence >= 0.4 else "danger",
-                            )
-                        ]),
-                        html.Td(suggestion["status"]),
-                        html.Td(html.Small(str(suggestion["sample_data"][:2]), className="text-muted")),
-                    ])
-                )
-            suggestions_table = dbc.Card([
-                dbc.CardHeader([html.H6("📋 Column Mapping Suggestions")]),
-                dbc.CardBody([
-                    dbc.Table([
-                        html.Thead([
-                            html.Tr([
-                                html.Th("Column Name"),
-                                html.Th("Suggested Field"),
-                                html.Th("Confidence"),
-                                html.Th("Status"),
-                                html.Th("Sample Data"),
-                            ])
-                        ]),
-                        html.Tbody(table_rows),
-                    ], responsive=True, striped=True),
-                ])
-            ], className="mb-3")
-        else:
-            suggestions_table = dbc.Alert("No suggestions available", color="warning")
-        return html.Div([summary_card, suggestions_table])
-    except Exception as e:  # pragma: no cover
-        return dbc.Alert(f"Error creating display: {str(e)}", color="danger")
 
 
 def get_analysis_buttons_section() -> dbc.Col:
@@ -301,6 +233,19 @@ def create_analysis_results_display(results: Dict[str, Any], analysis_type: str)
         return dbc.Alert(f"Error displaying results: {str(e)}", color="danger")
 
 
+def create_job_progress_display(status: Dict[str, Any], analysis_type: str) -> html.Div:
+    """Progress card for a queued or running background analysis."""
+    progress = status.get("progress", 0) or 0
+    stage = status.get("stage") or ("Waiting for a worker" if status.get("status") == "queued" else "Running")
+    return dbc.Card([
+        dbc.CardHeader([html.H5(f"⏳ {analysis_type.title()} Analysis Running")]),
+        dbc.CardBody([
+            html.P(stage, className="text-muted"),
+            dbc.Progress(value=progress, label=f"{progress:.0f}%", striped=True, animated=True),
+        ])
+    ])
+
+
 def create_limited_analysis_display(data_source: str, analysis_type: str) -> html.Div:
     """Create limited analysis display when service unavailable."""
     return dbc.Card([
@@ -8,6 +8,7 @@ from .helpers import (
     get_uploaded_filenames,
     clear_uploaded_data,
     get_file_info,
+    get_upload_summaries,
     save_ai_training_data,
 )
 
@@ -19,6 +20,7 @@ __all__ = [
     "get_uploaded_filenames",
     "clear_uploaded_data",
     "get_file_info",
+    "get_upload_summaries",
     "save_ai_training_data",
 ]
 
@@ -1,65 +1,82 @@
-import base64
+import hashlib
 import logging
-from typing import Any, List, Tuple
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
-import pandas as pd
 from dash import html, no_update
 import dash_bootstrap_components as dbc
 
-from services.file_processor_service import FileProcessorService
+from services.file_processor_service import PREVIEW_ROWS, process_upload
+from core.job_queue import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JobQueue,
+    create_job_queue,
+)
 from core.unified_callback_coordinator import UnifiedCallbackCoordinator
 
 logger = logging.getLogger(__name__)
 
+# Parsing is CPU bound, so multi-file batches run in a small process pool
+UPLOAD_MAX_WORKERS = min(4, os.cpu_count() or 1)
+# Batch status and results are shared through this file so any web worker
+# can answer the progress polls
+UPLOAD_JOB_STORE = "data/upload_jobs.db"
+_upload_queue: Optional[JobQueue] = None
+_upload_queue_lock = threading.Lock()
+
+
+def get_upload_queue() -> JobQueue:
+    """Return the process pool used for multi-file uploads, creating it on first use
+
+    File contents are not written to the shared store, so jobs are never
+    re-queued; a batch interrupted by a restart has to be uploaded again.
+    """
+    global _upload_queue
+    with _upload_queue_lock:
+        if _upload_queue is None:
+            _upload_queue = create_job_queue(
+                max_workers=UPLOAD_MAX_WORKERS,
+                store_path=UPLOAD_JOB_STORE,
+                keep_payloads=False,
+                recover=False,
+            )
+        return _upload_queue
 
-def process_uploaded_file_simple(content: str, filename: str) -> dict:
-    """Simplified file processing"""
-    try:
-        content_type, content_string = content.split(',')
-        decoded = base64.b64decode(content_string)
 
-        processor = FileProcessorService()
-        validation = processor.validate_file(filename, len(decoded))
-        if not validation['valid']:
-            return {
-                'success': False,
-                'error': f"Validation failed: {'; '.join(validation['issues'])}"
-            }
+def upload_job_key(content: str, filename: str) -> str:
+    """Jobs for an identical file share one parse"""
+    return f"upload:{filename}:{hashlib.sha1(content.encode()).hexdigest()}"
 
-        df = processor.process_file(decoded, filename)
 
-        return {
-            'success': True,
-            'data': df,
-            'filename': filename,
-            'rows': len(df),
-            'columns': list(df.columns)
-        }
-    except Exception as e:
-        logger.error(f"Error processing {filename}: {e}")
-        return {'success': False, 'error': str(e)}
+def submit_upload_batch(contents: List[str], filenames: List[str]) -> List[Dict[str, str]]:
+    """Queue every file of a batch; returns ``{job_id, filename}`` in upload order"""
+    upload_queue = get_upload_queue()
+    jobs = []
+    for content, filename in zip(contents, filenames):
+        job = upload_queue.submit(process_upload, content, filename,
+                                  key=upload_job_key(content, filename))
+        jobs.append({"job_id": job.job_id, "filename": filename})
+    logger.info(f"Queued upload batch of {len(jobs)} files")
+    return jobs
 
 
-def handle_file_upload_simple(contents, filenames):
-    """Simplified upload handler"""
-    if not contents:
-        return no_update, no_update, no_update
-
-    if not isinstance(contents, list):
-        contents = [contents]
-        filenames = [filenames]
-
-    results: List[Any] = []
+def build_upload_outputs(results: List[Dict[str, Any]]) -> Tuple[List[Any], List[Any], dict]:
+    """Alerts, preview cards and file info for processed files, in order"""
+    alerts: List[Any] = []
     previews: List[Any] = []
     file_info: dict = {}
 
-    for content, filename in zip(contents, filenames):
-        result = process_uploaded_file_simple(content, filename)
+    for result in results:
+        filename = result['filename']
         if result['success']:
-            df = result['data']
-            results.append(
+            rows, columns = result['rows'], result['columns']
+            alerts.append(
                 dbc.Alert(
-                    f"✅ Successfully uploaded {filename}: {len(df)} rows, {len(df.columns)} columns",
+                    f"✅ Successfully uploaded {filename}: {rows} rows, {len(columns)} columns",
                     color="success",
                 )
             )
@@ -67,37 +84,106 @@ def handle_file_upload_simple(contents, filenames):
                 dbc.Card([
                     dbc.CardHeader(f"📄 {filename}"),
                     dbc.CardBody([
-                        html.P(f"Rows: {len(df)} | Columns: {len(df.columns)}"),
-                        html.P(f"Columns: {', '.join(df.columns.tolist())}"),
+                        html.P(f"Rows: {rows} | Columns: {len(columns)}"),
+                        html.P(f"Columns: {', '.join(columns)}"),
                         html.Div([
-                            html.H6("Preview (first 5 rows):"),
-                            dbc.Table.from_dataframe(df.head(), striped=True, bordered=True, hover=True, size="sm"),
+                            html.H6(f"Preview (first {PREVIEW_ROWS} rows):"),
+                            dbc.Table.from_dataframe(result['preview'], striped=True, bordered=True, hover=True, size="sm"),
                         ])
                     ])
                 ], className="mb-3")
             )
             file_info[filename] = {
-                'rows': len(df),
-                'columns': len(df.columns),
-                'column_names': df.columns.tolist()
+                'rows': rows,
+                'columns': len(columns),
+                'column_names': columns
             }
         else:
-            results.append(
+            alerts.append(
                 dbc.Alert(f"❌ Failed to upload {filename}: {result['error']}", color="danger")
             )
 
-    return results, previews, file_info
+    return alerts, previews, file_info
+
+
+def create_upload_progress_display(statuses: List[Tuple[str, Optional[Dict[str, Any]]]]) -> dbc.Card:
+    """One progress bar per file of a running batch"""
+    rows = []
+    for filename, status in statuses:
+        if status is None or status["status"] == JOB_FAILED:
+            value, label, color = 100, "failed", "danger"
+        elif status["status"] == JOB_COMPLETED:
+            value, label, color = 100, "done", "success"
+        else:
+            value = status.get("progress", 0) or 0
+            label = status.get("stage") or ("Waiting" if status["status"] == JOB_QUEUED else "Running")
+            color = "primary"
+        rows.append(html.Div([
+            html.Small(f"{filename} – {label}"),
+            dbc.Progress(value=value, color=color, striped=color == "primary",
+                         animated=color == "primary", className="mb-2"),
+        ]))
+    done = sum(1 for _, status in statuses
+               if status is None or status["status"] not in (JOB_QUEUED, JOB_RUNNING))
+    return dbc.Card([
+        dbc.CardHeader(f"⏳ Processing {len(statuses)} files ({done} done)"),
+        dbc.CardBody(rows),
+    ], className="mb-3")
+
+
+def upload_batch_display(jobs: List[Dict[str, str]]) -> Tuple[Any, Any, Any, bool]:
+    """(results, previews, file info, finished) for a queued batch"""
+    upload_queue = get_upload_queue()
+    statuses = [(job["filename"], upload_queue.status(job["job_id"])) for job in jobs]
+    if any(status is not None and status["status"] in (JOB_QUEUED, JOB_RUNNING)
+           for _, status in statuses):
+        return create_upload_progress_display(statuses), no_update, no_update, False
+
+    results = []
+    for job, (filename, status) in zip(jobs, statuses):
+        if status is None:
+            results.append({'success': False, 'filename': filename,
+                            'error': "Upload job expired, please upload the file again"})
+        elif status["status"] == JOB_FAILED:
+            results.append({'success': False, 'filename': filename, 'error': status["error"]})
+        else:
+            results.append(upload_queue.result(job["job_id"]))
+    return (*build_upload_outputs(results), True)
+
+
+def handle_file_upload_simple(contents, filenames):
+    """Upload handler; returns (results, previews, file info, batch jobs, interval disabled)
+
+    A single file is processed inline.  Larger batches are parsed in the
+    upload process pool and polled through ``upload-progress-interval``.
+    """
+    if not contents:
+        return no_update, no_update, no_update, no_update, no_update
+
+    if not isinstance(contents, list):
+        contents = [contents]
+        filenames = [filenames]
+
+    if len(contents) == 1:
+        outputs = build_upload_outputs([process_upload(contents[0], filenames[0])])
+        return (*outputs, {}, True)
+
+    jobs = submit_upload_batch(contents, filenames)
+    results, previews, file_info, finished = upload_batch_display(jobs)
+    return results, previews, file_info, {"jobs": jobs}, finished
 
 
 def register_callbacks(manager: UnifiedCallbackCoordinator) -> None:
     """Register simplified callbacks"""
-    from dash import Input, Output
+    from dash import Input, Output, State
 
     @manager.register_callback(
         [
             Output("upload-results", "children"),
             Output("file-preview", "children"),
             Output("file-info-store", "data"),
+            Output("upload-jobs-store", "data"),
+            Output("upload-progress-interval", "disabled"),
         ],
         [Input("upload-data", "contents")],
         [Input("upload-data", "filename")],
@@ -107,3 +193,21 @@ def register_callbacks(manager: UnifiedCallbackCoordinator) -> None:
     )
     def upload_callback(contents, filenames):
         return handle_file_upload_simple(contents, filenames)
+
+    @manager.register_callback(
+        [
+            Output("upload-results", "children", allow_duplicate=True),
+            Output("file-preview", "children", allow_duplicate=True),
+            Output("file-info-store", "data", allow_duplicate=True),
+            Output("upload-progress-interval", "disabled", allow_duplicate=True),
+        ],
+        Input("upload-progress-interval", "n_intervals"),
+        State("upload-jobs-store", "data"),
+        prevent_initial_call=True,
+        callback_id="poll_upload_batch",
+        component_name="file_upload",
+    )
+    def poll_upload_batch(n_intervals, batch):
+        if not batch or not batch.get("jobs"):
+            return no_update, no_update, no_update, True
+        return upload_batch_display(batch["jobs"])
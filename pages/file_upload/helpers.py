@@ -30,10 +30,9 @@ def analyze_device_name_with_ai(device_name):
             f"\U0001f916 No user mapping found, generating AI analysis for '{device_name}'"
         )
 
-        from services.ai_device_generator import AIDeviceGenerator
+        from services.ai_device_generator import get_ai_device_generator
 
-        ai_generator = AIDeviceGenerator()
-        result = ai_generator.generate_device_attributes(device_name)
+        result = get_ai_device_generator().generate_device_attributes(device_name)
 
         ai_mapping = {
             "floor_number": result.floor_number,
@@ -79,6 +78,11 @@ def get_file_info() -> Dict[str, Dict[str, Any]]:
     return _uploaded_data_store.get_file_info()
 
 
+def get_upload_summaries() -> Dict[str, Dict[str, Any]]:
+    """Get per-file summaries computed at upload time."""
+    return _uploaded_data_store.get_summaries()
+
+
 def save_ai_training_data(filename: str, mappings: Dict[str, str], file_info: Dict):
     """Save confirmed mappings for AI training"""
     try:
@@ -129,5 +133,6 @@ __all__ = [
     "get_uploaded_filenames",
     "clear_uploaded_data",
     "get_file_info",
+    "get_upload_summaries",
     "save_ai_training_data",
 ]
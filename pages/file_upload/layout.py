@@ -153,6 +153,8 @@ def layout():
                 style={"display": "none"},
             ),
             dcc.Store(id="file-info-store", data={}),
+            dcc.Store(id="upload-jobs-store", data={}),
+            dcc.Interval(id="upload-progress-interval", interval=500, disabled=True),
             dcc.Store(id="current-file-info-store"),
             dcc.Store(id="current-session-id", data="session_123"),
             dbc.Modal(
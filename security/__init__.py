@@ -7,7 +7,11 @@ from .dataframe_validator import DataFrameSecurityValidator
 from .sql_validator import SQLInjectionPrevention
 from .xss_validator import XSSPrevention
 from .business_logic_validator import BusinessLogicValidator
-from .validation_middleware import ValidationMiddleware, ValidationOrchestrator
+from .validation_middleware import (
+    ValidationMiddleware,
+    ValidationOrchestrator,
+    ValidationPolicy,
+)
 from .attack_detection import AttackDetection
 from .validation_exceptions import ValidationError, SecurityViolation
 
@@ -22,6 +26,7 @@ __all__ = [
     "BusinessLogicValidator",
     "ValidationMiddleware",
     "ValidationOrchestrator",
+    "ValidationPolicy",
     "AttackDetection",
     "ValidationError",
     "SecurityViolation",
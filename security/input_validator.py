@@ -2,9 +2,9 @@ from __future__ import annotations
 
 """Input validation utilities."""
 
-import re
-from typing import Any
+from typing import Any, Optional
 
+from core.security_scanner import SecurityScanner
 from utils.unicode_handler import sanitize_unicode_input
 
 from .validation_exceptions import ValidationError
@@ -16,13 +16,25 @@ class Validator(Protocol):
     def validate(self, data: Any) -> Any:
         ...
 
+# Default rule set: reject markup characters
+MARKUP_RULES = {"markup": [r"[<>]"]}
+
+
 class InputValidator:
-    """Simple input validator using unicode sanitization and basic patterns."""
+    """Simple input validator using unicode sanitization and basic patterns.
+
+    Pass ``core.security_scanner.get_security_scanner()`` as ``scanner`` to
+    also reject SQL injection, XSS and path traversal patterns.
+    """
+
+    _markup_scanner = SecurityScanner(MARKUP_RULES)
 
-    _dangerous_pattern = re.compile(r"[<>]")
+    def __init__(self, scanner: Optional[SecurityScanner] = None) -> None:
+        self.scanner = scanner or self._markup_scanner
 
     def validate(self, data: str) -> str:
         cleaned = sanitize_unicode_input(data)
-        if self._dangerous_pattern.search(cleaned):
-            raise ValidationError("Potentially dangerous characters detected")
+        match = self.scanner.first_match(cleaned)
+        if match is not None:
+            raise ValidationError(f"Potentially dangerous input detected ({match[0]})")
         return cleaned
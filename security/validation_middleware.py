@@ -1,13 +1,71 @@
 """Flask request validation middleware."""
 
+import re
+import time
+from dataclasses import dataclass, field
 from flask import request, Response
-from typing import Callable
+from typing import Any, Dict, FrozenSet, Optional
 
 from config.dynamic_config import dynamic_config
 
 from .validation_exceptions import ValidationError
+from core.request_metrics import RequestMetrics, get_request_metrics
+from core.security_scanner import SecurityScanner
+
 from .input_validator import InputValidator, Validator
 
+# Body handling modes
+MODE_AUTO = "auto"
+MODE_JSON = "json"
+MODE_FORM = "form"
+MODE_TEXT = "text"
+MODE_SKIP = "skip"
+
+# ``data:<mime>;base64,<payload>`` strings, e.g. ``dcc.Upload`` contents
+_DATA_URL_HEADER = re.compile(r"data:[\w.+-]+/[\w.+-]+(?:;[\w.+-]+=[\w.+-]+)*;base64,")
+_BASE64_PAYLOAD = re.compile(r"[A-Za-z0-9+/=\r\n]*")
+
+
+@dataclass(frozen=True)
+class ValidationPolicy:
+    """How request bodies on a route are validated.
+
+    ``mode`` is one of ``auto`` (chosen from the content type), ``json``,
+    ``form``, ``text`` or ``skip``.  ``max_body_bytes`` overrides the global
+    upload limit and ``max_scan_chars`` caps the characters scanned per
+    request; exceeding either rejects the request with 413.
+    """
+
+    mode: str = MODE_AUTO
+    max_body_bytes: Optional[int] = None
+    max_scan_chars: Optional[int] = None
+    skip_keys: FrozenSet[str] = field(default_factory=frozenset)
+    chunk_chars: int = 64 * 1024
+    chunk_overlap: int = 256
+
+
+# Dash posts callback inputs as JSON; uploads arrive as base64 data URLs
+DEFAULT_ROUTE_POLICIES: Dict[str, ValidationPolicy] = {
+    "/_dash-update-component": ValidationPolicy(mode=MODE_JSON),
+}
+
+
+class _BudgetExceeded(Exception):
+    """Raised when a request needs more scanning than its route allows."""
+
+
+class _ScanBudget:
+    def __init__(self, limit: Optional[int]) -> None:
+        self.remaining = limit
+
+    def consume(self, chars: int) -> None:
+        if self.remaining is None:
+            return
+        self.remaining -= chars
+        if self.remaining < 0:
+            raise _BudgetExceeded()
+
+
 class ValidationOrchestrator:
     """Coordinate multiple validators."""
 
@@ -20,33 +78,150 @@ class ValidationOrchestrator:
         return data
 
 class ValidationMiddleware:
-    """Middleware applying input validation."""
+    """Middleware applying input validation.
 
-    def __init__(self) -> None:
-        self.orchestrator = ValidationOrchestrator([InputValidator()])
+    ``scanner`` selects the rules checked on query values and bodies; by
+    default only markup characters are rejected.  ``policies`` maps path
+    prefixes to :class:`ValidationPolicy` (longest prefix wins); other paths
+    use ``default_policy``.  JSON bodies are checked value by value and
+    base64 data URLs are only checked to be base64, so uploaded files are
+    not normalized and scanned character by character.  Time spent here is
+    recorded in ``core.request_metrics`` per route, mode and outcome.
+    """
+
+    def __init__(
+        self,
+        scanner: Optional[SecurityScanner] = None,
+        policies: Optional[Dict[str, ValidationPolicy]] = None,
+        default_policy: Optional[ValidationPolicy] = None,
+        metrics: Optional[RequestMetrics] = None,
+    ) -> None:
+        self.orchestrator = ValidationOrchestrator([InputValidator(scanner)])
         self.max_body_size = dynamic_config.security.max_upload_mb * 1024 * 1024
+        self.policies = dict(DEFAULT_ROUTE_POLICIES if policies is None else policies)
+        self.default_policy = default_policy or ValidationPolicy()
+        self.metrics = metrics
+
+    def policy_for(self, path: str) -> ValidationPolicy:
+        """Policy of the longest matching path prefix."""
+        best = None
+        for prefix in self.policies:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.default_policy if best is None else self.policies[best]
+
+    def validate_request(self) -> Optional[Response]:
+        start = time.perf_counter()
+        policy = self.policy_for(request.path)
+        mode = self._resolve_mode(policy)
+        outcome, response = "error", None
+        try:
+            response = self._validate(policy, mode)
+            outcome = "pass" if response is None else "too_large"
+        except _BudgetExceeded:
+            outcome, response = "budget", Response("Request Entity Too Large", status=413)
+        except ValidationError:
+            outcome, response = "rejected", Response("Bad Request", status=400)
+        finally:
+            rule = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+            (self.metrics or get_request_metrics()).record_validation(
+                rule, mode, outcome, time.perf_counter() - start
+            )
+        return response
+
+    def _resolve_mode(self, policy: ValidationPolicy) -> str:
+        if policy.mode != MODE_AUTO:
+            return policy.mode
+        mimetype = request.mimetype
+        if mimetype == "application/json" or mimetype.endswith("+json"):
+            return MODE_JSON
+        if mimetype in ("multipart/form-data", "application/x-www-form-urlencoded"):
+            return MODE_FORM
+        if mimetype == "application/octet-stream":
+            return MODE_SKIP
+        return MODE_TEXT
 
-    def validate_request(self) -> None:
+    def _validate(self, policy: ValidationPolicy, mode: str) -> Optional[Response]:
         # Enforce maximum request body size
-        if request.content_length and request.content_length > self.max_body_size:
+        limit = self.max_body_size if policy.max_body_bytes is None else policy.max_body_bytes
+        if request.content_length and request.content_length > limit:
             return Response("Request Entity Too Large", status=413)
 
+        budget = _ScanBudget(policy.max_scan_chars)
+
         # Validate query string parameters
         for value in request.args.values():
-            try:
-                self.orchestrator.validate(value)
-            except ValidationError:
-                return Response("Bad Request", status=400)
+            self._check_value(value, budget)
 
         # Validate body content
-        if request.data:
-            try:
-                request._cached_data = self.orchestrator.validate(
-                    request.data.decode("utf-8", errors="ignore")
-                ).encode("utf-8")
-            except ValidationError:
-                return Response("Bad Request", status=400)
+        if mode == MODE_JSON:
+            self._validate_json(policy, budget)
+        elif mode == MODE_FORM:
+            for value in request.form.values():
+                self._check_value(value, budget)
+        elif mode == MODE_TEXT and request.data:
+            request._cached_data = self._validate_text(
+                request.data.decode("utf-8", errors="ignore"), policy, budget
+            ).encode("utf-8")
         return None
 
+    def _check_value(self, value: str, budget: _ScanBudget) -> None:
+        header = _DATA_URL_HEADER.match(value) if value.startswith("data:") else None
+        if header is not None:
+            # Structural check only: a valid base64 payload cannot carry markup
+            if _BASE64_PAYLOAD.fullmatch(value, header.end()):
+                return
+        budget.consume(len(value))
+        self.orchestrator.validate(value)
+
+    def _validate_json(self, policy: ValidationPolicy, budget: _ScanBudget) -> None:
+        if not request.data:
+            return
+        # Parsed once; Flask caches the result for the view (and Dash)
+        payload = request.get_json(force=True, silent=True)
+        if payload is None:
+            raise ValidationError("Malformed JSON body")
+        stack: list[Any] = [payload]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                self._check_value(node, budget)
+            elif isinstance(node, dict):
+                for key, value in node.items():
+                    self._check_value(key, budget)
+                    if key not in policy.skip_keys:
+                        stack.append(value)
+            elif isinstance(node, list):
+                stack.extend(node)
+
+    def _validate_text(self, text: str, policy: ValidationPolicy, budget: _ScanBudget) -> str:
+        """Sanitize and check ``text`` chunk by chunk, stopping at the first match."""
+        budget.consume(len(text))
+        if len(text) <= policy.chunk_chars:
+            return self.orchestrator.validate(text)
+        pieces = []
+        tail = ""
+        for offset in range(0, len(text), policy.chunk_chars):
+            chunk = self.orchestrator.validate(text[offset:offset + policy.chunk_chars])
+            if tail:
+                # Patterns spanning the chunk boundary
+                self.orchestrator.validate(tail + chunk[:policy.chunk_overlap])
+            pieces.append(chunk)
+            tail = (tail + chunk)[-policy.chunk_overlap:]
+        return "".join(pieces)
+
     def sanitize_response(self, response: Response) -> Response:
         return response
+
+
+__all__ = [
+    "ValidationMiddleware",
+    "ValidationOrchestrator",
+    "ValidationPolicy",
+    "DEFAULT_ROUTE_POLICIES",
+    "MODE_AUTO",
+    "MODE_JSON",
+    "MODE_FORM",
+    "MODE_TEXT",
+    "MODE_SKIP",
+]
@@ -3,9 +3,10 @@ AI-powered device attribute generation service.
 Enhanced for real device naming patterns like F01A, F02B, etc.
 """
 import re
-from typing import Dict, Any, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
-import pandas as pd
 import logging
 
 @dataclass
@@ -23,11 +24,41 @@ class DeviceAttributes:
     confidence: float
     ai_reasoning: str
 
+class _CombinedPatterns:
+    """One regex reporting every pattern that occurs anywhere in a string
+
+    Each pattern sits in an optional lookahead anchored at the start, so a
+    single ``match`` call fills a group for every pattern that ``re.search``
+    would find.
+    """
+
+    def __init__(self, patterns: List[str], flags: int = 0):
+        self.regex = re.compile(
+            "".join(f"(?:(?=.*?(?P<p{i}>{pattern})))?" for i, pattern in enumerate(patterns)),
+            flags | re.DOTALL,
+        )
+        # Positions in ``groups()``; the patterns' own groups are nested inside
+        self._positions = [self.regex.groupindex[f"p{i}"] - 1 for i in range(len(patterns))]
+
+    def matches(self, text: str) -> List[int]:
+        """Indexes of the patterns that occur in ``text``, in order"""
+        groups = self.regex.match(text).groups()
+        return [i for i, position in enumerate(self._positions) if groups[position] is not None]
+
+
 class AIDeviceGenerator:
-    """Enhanced AI device attribute generator for real-world device names."""
+    """Enhanced AI device attribute generator for real-world device names.
+
+    Patterns are compiled once per instance and results are memoized in an
+    LRU of ``cache_size`` device names, so share one instance through
+    :func:`get_ai_device_generator`.
+    """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 10000):
         self.logger = logging.getLogger(__name__)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, DeviceAttributes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         
         # Floor extraction patterns for F01A, F02B format
         self.floor_patterns = [
@@ -88,18 +119,78 @@ class AIDeviceGenerator:
             r'staircase\s*([A-Z])': r'Staircase \1',     # staircase A → Staircase A
         }
 
+        self._compile_patterns()
+
+    def _compile_patterns(self) -> None:
+        """Compile the pattern tables into combined single-pass regexes"""
+        self._floor_res = [(re.compile(pattern), extractor) for pattern, extractor in self.floor_patterns]
+        self._floor_combined = _CombinedPatterns([pattern for pattern, _ in self.floor_patterns])
+        self._security_combined = _CombinedPatterns([pattern for pattern, _ in self.security_patterns])
+        self._access_entries: List[Tuple[str, str]] = [
+            (access_type, pattern)
+            for access_type, patterns in self.access_patterns.items()
+            for pattern in patterns
+        ]
+        self._access_combined = _CombinedPatterns([pattern for _, pattern in self._access_entries])
+        self._location_res = [(re.compile(pattern), replacement)
+                              for pattern, replacement in self.location_patterns.items()]
+        self._separator_re = re.compile(r'[_-]')
+        self._letter_digit_re = re.compile(r'([a-zA-Z])([0-9])')
+        self._wing_format_re = re.compile(r'[Ff]0*\d+[A-Z]')
+
     def generate_device_attributes(self, device_id: str, 
-                                 usage_data: Optional[pd.DataFrame] = None) -> DeviceAttributes:
+                                 usage_data: Optional[Any] = None) -> DeviceAttributes:
         """
         Generate comprehensive device attributes using enhanced AI analysis.
         
         Args:
             device_id: Device identifier to analyze
-            usage_data: Optional usage patterns for enhanced analysis
+            usage_data: Accepted for compatibility and ignored; attributes
+                depend on the id alone, which is what lets them be cached
             
         Returns:
             DeviceAttributes with AI-generated properties
         """
+        original_id = device_id
+        device_id = self.normalize_device_name(device_id)
+        with self._cache_lock:
+            cached = self._cache.get(device_id)
+            if cached is not None:
+                self._cache.move_to_end(device_id)
+        if cached is not None:
+            return self._copy(cached, original_id)
+
+        attributes = self._analyze(device_id)
+        with self._cache_lock:
+            self._cache[device_id] = attributes
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return self._copy(attributes, original_id)
+
+    def generate_batch(self, device_ids: Iterable[Any]) -> Dict[Any, DeviceAttributes]:
+        """Attributes for many devices at once, keyed by the given ids"""
+        return {device_id: self.generate_device_attributes(device_id) for device_id in device_ids}
+
+    @staticmethod
+    def _copy(attributes: DeviceAttributes, device_id: Any) -> DeviceAttributes:
+        # Callers may modify the result, so never hand out the cached object
+        copied = DeviceAttributes(**vars(attributes))
+        copied.device_id = device_id
+        return copied
+
+    @staticmethod
+    def normalize_device_name(device_id: Any) -> str:
+        """Cache key and analysis input: the id as text
+
+        Case and padding are kept because both show up in generated names.
+        """
+        return device_id if isinstance(device_id, str) else str(device_id)
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _analyze(self, device_id: str) -> DeviceAttributes:
         device_lower = device_id.lower()
         reasoning_parts = []
         
@@ -134,8 +225,10 @@ class AIDeviceGenerator:
 
     def _extract_floor(self, device_id: str, reasoning: List[str]) -> int:
         """Extract floor number using enhanced pattern matching."""
-        for pattern, extractor in self.floor_patterns:
-            match = re.search(pattern, device_id)
+        for index in self._floor_combined.matches(device_id):
+            pattern = self.floor_patterns[index][0]
+            compiled, extractor = self._floor_res[index]
+            match = compiled.search(device_id)
             if match:
                 try:
                     floor = extractor(match)
@@ -150,10 +243,10 @@ class AIDeviceGenerator:
 
     def _calculate_security_level(self, device_lower: str, reasoning: List[str]) -> int:
         """Calculate security level with enhanced pattern matching."""
-        for pattern, level in self.security_patterns:
-            if re.search(pattern, device_lower):
-                reasoning.append(f"Security level {level} - matched '{pattern}'")
-                return level
+        for index in self._security_combined.matches(device_lower):
+            pattern, level = self.security_patterns[index]
+            reasoning.append(f"Security level {level} - matched '{pattern}'")
+            return level
         
         reasoning.append("Security level 5 (default)")
         return 5
@@ -162,12 +255,11 @@ class AIDeviceGenerator:
         """Determine access type boolean flags with enhanced patterns."""
         flags = {access_type: False for access_type in self.access_patterns.keys()}
         
-        for access_type, patterns in self.access_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, device_lower):
-                    flags[access_type] = True
-                    reasoning.append(f"Detected {access_type} from '{pattern}'")
-                    break
+        for index in self._access_combined.matches(device_lower):
+            access_type, pattern = self._access_entries[index]
+            if not flags[access_type]:
+                flags[access_type] = True
+                reasoning.append(f"Detected {access_type} from '{pattern}'")
         
         return flags
 
@@ -176,17 +268,17 @@ class AIDeviceGenerator:
         name = device_id
         
         # Apply location-specific transformations
-        for pattern, replacement in self.location_patterns.items():
-            if re.search(pattern, device_id):
-                name = re.sub(pattern, replacement, device_id)
+        for pattern, replacement in self._location_res:
+            if pattern.search(device_id):
+                name = pattern.sub(replacement, device_id)
                 break
         
         # If no specific transformation, clean up generically
         if name == device_id:
             # Replace underscores and hyphens with spaces
-            name = re.sub(r'[_-]', ' ', device_id)
+            name = self._separator_re.sub(' ', device_id)
             # Add spaces before numbers when appropriate
-            name = re.sub(r'([a-zA-Z])([0-9])', r'\1 \2', name)
+            name = self._letter_digit_re.sub(r'\1 \2', name)
             # Capitalize words
             name = ' '.join(word.capitalize() for word in name.split())
         
@@ -206,13 +298,28 @@ class AIDeviceGenerator:
         confidence_penalty = default_patterns * 0.1
         
         # Extra boost for your specific F01A, F02B format
-        if re.search(r'[Ff]0*\d+[A-Z]', device_id):
+        if self._wing_format_re.search(device_id):
             confidence_boost += 0.15
             
         final_confidence = base_confidence + confidence_boost - confidence_penalty
         return min(max(final_confidence, 0.3), 0.95)
 
 
-def create_ai_device_generator() -> AIDeviceGenerator:
+def create_ai_device_generator(**kwargs) -> AIDeviceGenerator:
     """Factory function for AI device generator."""
-    return AIDeviceGenerator()
+    return AIDeviceGenerator(**kwargs)
+
+
+# Shared generator so compiled patterns and memoized results are reused
+_ai_device_generator: Optional[AIDeviceGenerator] = None
+_ai_device_generator_lock = threading.Lock()
+
+
+def get_ai_device_generator() -> AIDeviceGenerator:
+    """Return the shared AI device generator, creating it if necessary."""
+    global _ai_device_generator
+    if _ai_device_generator is None:
+        with _ai_device_generator_lock:
+            if _ai_device_generator is None:
+                _ai_device_generator = create_ai_device_generator()
+    return _ai_device_generator
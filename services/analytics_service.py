@@ -3,7 +3,6 @@
 Analytics Service - Enhanced with Unique Patterns Analysis
 """
 import pandas as pd
-import json
 import logging
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
@@ -11,10 +10,14 @@ from typing import Dict, Any, List, Optional, Tuple
 from services.file_processing_service import FileProcessingService
 from services.database_analytics_service import DatabaseAnalyticsService
 from services.data_loader import DataLoader
+from services.learned_mapping_store import read_learned_mappings
 from services.analytics_summary import (
+    SUMMARY_MODES,
     generate_basic_analytics,
     generate_sample_analytics,
+    merge_upload_summaries,
     summarize_dataframe,
+    summarize_upload,
 )
 
 from utils.mapping_helpers import map_and_clean
@@ -47,10 +50,7 @@ class AnalyticsDataAccessor:
     def _load_consolidated_mappings(self) -> Dict[str, Any]:
         """Load consolidated mappings from learned_mappings.json"""
         try:
-            if self.mappings_file.exists():
-                with open(self.mappings_file, "r") as f:
-                    return json.load(f)
-            return {}
+            return read_learned_mappings(self.mappings_file)
         except Exception as e:
             logger.error(f"Error loading mappings: {e}")
             return {}
@@ -166,7 +166,13 @@ class AnalyticsDataAccessor:
 class AnalyticsService:
     """Complete analytics service that integrates all data sources"""
 
-    def __init__(self):
+    def __init__(self, summary_mode: Optional[str] = None):
+        if summary_mode is None:
+            from config.dynamic_config import dynamic_config
+            summary_mode = dynamic_config.get_analytics_summary_mode()
+        if summary_mode not in SUMMARY_MODES:
+            raise ValueError(f"Unknown summary mode: {summary_mode}")
+        self.summary_mode = summary_mode
         self.database_manager: Optional[Any] = None
         self._initialize_database()
         self.file_processing_service = FileProcessingService()
@@ -259,82 +265,42 @@ class AnalyticsService:
             return {'status': 'error', 'message': f'Unknown source: {source}'}
 
     def _process_uploaded_data_directly(self, uploaded_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process uploaded CSV files or DataFrames with incremental aggregation."""
+        """Merge per-file upload summaries instead of rescanning every row.
+
+        DataFrames use the summary stored at upload time; file paths (and
+        frames without a matching summary) are summarized chunk by chunk.
+        ``summary_mode`` selects exact counts or constant-memory sketches.
+        """
         try:
             logger.info(f"Processing {len(uploaded_data)} uploaded files directly...")
 
-            from collections import Counter
-
-            total_events = 0
-            user_counts: Counter = Counter()
-            door_counts: Counter = Counter()
-            min_ts: Optional[pd.Timestamp] = None
-            max_ts: Optional[pd.Timestamp] = None
+            stored = self._load_upload_summaries()
+            summaries: List[Dict[str, Any]] = []
 
             for filename, source in uploaded_data.items():
                 if isinstance(source, (str, Path)):
                     reader = pd.read_csv(source, chunksize=50000)
                 else:
+                    summary = stored.get(filename)
+                    if summary is not None and summary.get('rows') == len(source):
+                        summaries.append(summary)
+                        continue
                     reader = [source]
 
                 for chunk in reader:
                     logger.info(f"{filename} chunk rows: {len(chunk):,}")
-                    self.df_validator.validate(chunk)
-                    df_processed = map_and_clean(chunk)
-
-                    total_events += len(df_processed)
-
-                    if 'person_id' in df_processed.columns:
-                        user_counts.update(df_processed['person_id'].dropna().astype(str))
-
-                    if 'door_id' in df_processed.columns:
-                        door_counts.update(df_processed['door_id'].dropna().astype(str))
-
-                    if 'timestamp' in df_processed.columns:
-                        ts = pd.to_datetime(df_processed['timestamp'], errors='coerce').dropna()
-                        if not ts.empty:
-                            cur_min = ts.min()
-                            cur_max = ts.max()
-                            if min_ts is None or cur_min < min_ts:
-                                min_ts = cur_min
-                            if max_ts is None or cur_max > max_ts:
-                                max_ts = cur_max
-
-            date_range = {'start': 'Unknown', 'end': 'Unknown'}
-            if min_ts is not None and max_ts is not None:
-                date_range = {
-                    'start': min_ts.strftime('%Y-%m-%d'),
-                    'end': max_ts.strftime('%Y-%m-%d')
-                }
-                logger.info(f"Date range: {date_range['start']} to {date_range['end']}")
+                    summaries.append(summarize_upload(chunk, mode=self.summary_mode))
 
-            active_users = len(user_counts)
-            active_doors = len(door_counts)
+            invalid = next((s['validation_error'] for s in summaries if s.get('validation_error')), None)
+            if invalid:
+                raise ValueError(invalid)
 
-            result = {
-                'status': 'success',
-                'total_events': total_events,
-                'active_users': active_users,
-                'active_doors': active_doors,
-                'unique_users': active_users,
-                'unique_doors': active_doors,
-                'data_source': 'uploaded',
-                'date_range': date_range,
-                'top_users': [
-                    {'user_id': user, 'count': int(count)}
-                    for user, count in user_counts.most_common(10)
-                ],
-                'top_doors': [
-                    {'door_id': door, 'count': int(count)}
-                    for door, count in door_counts.most_common(10)
-                ],
-                'timestamp': datetime.now().isoformat(),
-            }
+            result = merge_upload_summaries(summaries, mode=self.summary_mode)
 
             logger.info("Direct processing result:")
-            logger.info(f"Total Events: {total_events:,}")
-            logger.info(f"Active Users: {active_users:,}")
-            logger.info(f"Active Doors: {active_doors:,}")
+            logger.info(f"Total Events: {result['total_events']:,}")
+            logger.info(f"Active Users: {result['active_users']:,}")
+            logger.info(f"Active Doors: {result['active_doors']:,}")
 
             return result
 
@@ -342,6 +308,15 @@ class AnalyticsService:
             logger.error(f"Direct processing failed: {e}")
             return {'status': 'error', 'message': str(e)}
 
+    def _load_upload_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Summaries stored with the uploaded files, if available."""
+        try:
+            from pages.file_upload import get_upload_summaries
+            return get_upload_summaries() or {}
+        except Exception as e:  # pragma: no cover - best effort
+            logger.warning(f"Upload summaries unavailable: {e}")
+            return {}
+
     # ------------------------------------------------------------------
     # Helper methods for processing uploaded data
     # ------------------------------------------------------------------
@@ -1,6 +1,7 @@
 import logging
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional
 
 import numpy as np
 import pandas as pd
@@ -55,6 +56,187 @@ def summarize_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
+# Bump when the upload summary layout changes so stored summaries are rebuilt
+UPLOAD_SUMMARY_VERSION = 2
+
+SUMMARY_MODE_EXACT = "exact"
+SUMMARY_MODE_APPROXIMATE = "approximate"
+SUMMARY_MODES = (SUMMARY_MODE_EXACT, SUMMARY_MODE_APPROXIMATE)
+
+_NO_COUNTS: Dict[str, list] = {"ids": [], "counts": []}
+_SKETCH_FIELDS = {"users": "user_sketch", "doors": "door_sketch"}
+
+
+def _value_counts(series: pd.Series) -> Dict[str, list]:
+    """Compact ``{"ids": [...], "counts": [...]}`` value counts of a column"""
+    counts = series.dropna().astype(str).value_counts()
+    return {"ids": counts.index.tolist(), "counts": counts.to_numpy().tolist()}
+
+
+def _sketch_counts(counts: Dict[str, list]) -> Dict[str, Any]:
+    """Distinct-count and heavy-hitter sketches of ``_value_counts`` output"""
+    from analytics.sketches import HyperLogLog, SpaceSaving
+
+    ids = pd.Series(counts["ids"], dtype=object)
+    return {
+        "distinct": HyperLogLog().update(ids).to_dict(),
+        "top": SpaceSaving().update(counts["ids"], counts["counts"]).to_dict(),
+    }
+
+
+def _check_mode(mode: str) -> None:
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode: {mode}")
+
+
+def summarize_upload(df: pd.DataFrame, mode: str = SUMMARY_MODE_EXACT) -> Dict[str, Any]:
+    """Summary statistics of one uploaded file, computed once at upload time.
+
+    The result is JSON-serializable so it can live in the upload store
+    metadata; :func:`merge_upload_summaries` combines summaries without
+    touching the rows again.  Both modes store user/door sketches; the
+    ``"approximate"`` mode leaves out the exact per-id counts so the
+    summary size does not grow with the number of distinct ids.
+    """
+    _check_mode(mode)
+    from security.dataframe_validator import DataFrameSecurityValidator
+    from utils.mapping_helpers import map_and_clean
+
+    validation_error = None
+    try:
+        DataFrameSecurityValidator().validate(df.copy(deep=False))
+    except Exception as exc:
+        validation_error = str(exc)
+
+    df = map_and_clean(df)
+    users = _value_counts(df["person_id"]) if "person_id" in df.columns else _NO_COUNTS
+    doors = _value_counts(df["door_id"]) if "door_id" in df.columns else _NO_COUNTS
+    summary: Dict[str, Any] = {
+        "version": UPLOAD_SUMMARY_VERSION,
+        "rows": len(df),
+        "user_sketch": _sketch_counts(users),
+        "door_sketch": _sketch_counts(doors),
+        "min_timestamp": None,
+        "max_timestamp": None,
+        "access_results": {},
+        "validation_error": validation_error,
+    }
+    if "timestamp" in df.columns:
+        ts = df["timestamp"].dropna()
+        if not ts.empty:
+            summary["min_timestamp"] = ts.min().isoformat()
+            summary["max_timestamp"] = ts.max().isoformat()
+    if "access_result" in df.columns:
+        summary["access_results"] = {
+            str(k): int(v) for k, v in df["access_result"].value_counts().items()
+        }
+    if mode == SUMMARY_MODE_EXACT:
+        summary["users"] = users
+        summary["doors"] = doors
+    return summary
+
+
+class _ExactCounts:
+    """Exact id counts merged with a ``Counter``"""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.counts: Counter = Counter()
+
+    def add(self, summary: Dict[str, Any]) -> None:
+        if self.field not in summary:
+            raise ValueError("Approximate upload summaries cannot be merged exactly")
+        values = summary[self.field]
+        self.counts.update(dict(zip(values["ids"], values["counts"])))
+
+    def distinct(self) -> int:
+        return len(self.counts)
+
+    def top(self, k: int):
+        return self.counts.most_common(k)
+
+
+class _SketchCounts:
+    """Id counts merged through HyperLogLog and Space-Saving sketches"""
+
+    def __init__(self, field: str):
+        from analytics.sketches import HyperLogLog, SpaceSaving
+
+        self.field = field
+        self.hll = HyperLogLog()
+        self.heavy = SpaceSaving()
+
+    def add(self, summary: Dict[str, Any]) -> None:
+        from analytics.sketches import HyperLogLog, SpaceSaving
+
+        sketch = summary.get(_SKETCH_FIELDS[self.field])
+        if sketch is None:
+            sketch = _sketch_counts(summary.get(self.field, _NO_COUNTS))
+        self.hll.merge(HyperLogLog.from_dict(sketch["distinct"]))
+        self.heavy.merge(SpaceSaving.from_dict(sketch["top"]))
+
+    def distinct(self) -> int:
+        return self.hll.count()
+
+    def top(self, k: int):
+        return self.heavy.top(k)
+
+
+def merge_upload_summaries(summaries: Iterable[Dict[str, Any]],
+                           mode: str = SUMMARY_MODE_EXACT) -> Dict[str, Any]:
+    """Combine per-file upload summaries into dashboard analytics.
+
+    Cost depends on the number of files and distinct users/doors, not rows.
+    In ``"approximate"`` mode user and door counts come from merged
+    sketches, so memory stays constant however many distinct ids exist.
+    """
+    _check_mode(mode)
+    counter = _ExactCounts if mode == SUMMARY_MODE_EXACT else _SketchCounts
+    total_events = 0
+    user_counts = counter("users")
+    door_counts = counter("doors")
+    access_patterns: Counter = Counter()
+    min_ts: Optional[str] = None
+    max_ts: Optional[str] = None
+
+    for summary in summaries:
+        total_events += summary.get("rows", 0)
+        user_counts.add(summary)
+        door_counts.add(summary)
+        access_patterns.update(summary.get("access_results", {}))
+        # ISO timestamps of naive datetimes compare correctly as strings
+        if summary.get("min_timestamp") and (min_ts is None or summary["min_timestamp"] < min_ts):
+            min_ts = summary["min_timestamp"]
+        if summary.get("max_timestamp") and (max_ts is None or summary["max_timestamp"] > max_ts):
+            max_ts = summary["max_timestamp"]
+
+    date_range = {"start": "Unknown", "end": "Unknown"}
+    if min_ts is not None and max_ts is not None:
+        date_range = {"start": min_ts[:10], "end": max_ts[:10]}
+
+    active_users = user_counts.distinct()
+    active_doors = door_counts.distinct()
+    return {
+        "status": "success",
+        "total_events": total_events,
+        "active_users": active_users,
+        "active_doors": active_doors,
+        "unique_users": active_users,
+        "unique_doors": active_doors,
+        "data_source": "uploaded",
+        "summary_mode": mode,
+        "date_range": date_range,
+        "access_patterns": dict(access_patterns),
+        "top_users": [
+            {"user_id": user, "count": int(count)} for user, count in user_counts.top(10)
+        ],
+        "top_doors": [
+            {"door_id": door, "count": int(count)} for door, count in door_counts.top(10)
+        ],
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 def create_sample_data(n_events: int = 1000) -> pd.DataFrame:
     np.random.seed(42)
     end_date = datetime.now()
@@ -160,6 +342,12 @@ def generate_sample_analytics() -> Dict[str, Any]:
 
 __all__ = [
     "summarize_dataframe",
+    "summarize_upload",
+    "merge_upload_summaries",
+    "UPLOAD_SUMMARY_VERSION",
+    "SUMMARY_MODE_EXACT",
+    "SUMMARY_MODE_APPROXIMATE",
+    "SUMMARY_MODES",
     "create_sample_data",
     "analyze_dataframe",
     "generate_basic_analytics",
@@ -11,19 +11,31 @@ from datetime import datetime
 import pandas as pd
 import logging
 
+from services.learned_mapping_store import LearnedMappingStore
+
 class ConsolidatedLearningService:
-    """Unified learning service for all mapping types."""
+    """Unified learning service for all mapping types.
+
+    Mappings live in a :class:`LearnedMappingStore`: a save appends one
+    record under a file lock, and similar layouts are found through its
+    MinHash index instead of comparing every stored mapping.
+    """
 
     def __init__(self, storage_path: str = "data/learned_mappings.json",
                  allow_pickle: bool = False):
         self.storage_path = Path(storage_path)
-        self.learned_data: Dict[str, Any] = {}
         self.logger = logging.getLogger(__name__)
         self.allow_pickle = allow_pickle
 
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.store = LearnedMappingStore(self.storage_path)
         self._load_learned_data()
 
+    @property
+    def learned_data(self) -> Dict[str, Any]:
+        """Learned mappings by fingerprint"""
+        return self.store.records
+
     def save_complete_mapping(self, df: pd.DataFrame, filename: str,
                               device_mappings: Dict[str, Any],
                               column_mappings: Optional[Dict[str, str]] = None) -> str:
@@ -43,14 +55,17 @@ class ConsolidatedLearningService:
             }
         }
 
-        self.learned_data[fingerprint] = mapping_data
-        self._persist_learned_data()
+        try:
+            self.store.save(fingerprint, mapping_data)
+        except Exception as e:
+            self.logger.error(f"Could not persist learned data: {e}")
         self.logger.info(f"Saved mapping {fingerprint[:8]} for {filename}")
         return fingerprint
 
     def get_learned_mappings(self, df: pd.DataFrame, filename: str) -> Dict[str, Any]:
         """Retrieve learned mappings for similar data."""
         fingerprint = self._generate_fingerprint(df, filename)
+        self.store.refresh()
 
         if fingerprint in self.learned_data:
             learned = self.learned_data[fingerprint]
@@ -101,6 +116,7 @@ class ConsolidatedLearningService:
 
     def get_learning_statistics(self) -> Dict[str, Any]:
         """Get comprehensive learning statistics."""
+        self.store.refresh()
         if not self.learned_data:
             return {
                 'total_mappings': 0,
@@ -145,20 +161,13 @@ class ConsolidatedLearningService:
 
     def _find_similar_mapping(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
         """Find similar mapping based on column structure."""
-        current_columns = set(df.columns)
-        best_match = None
-        best_score = 0.0
         similarity_threshold = 0.7
-
-        for data in self.learned_data.values():
-            stored_columns = set(data['file_stats']['columns'])
-            intersection = len(current_columns & stored_columns)
-            union = len(current_columns | stored_columns)
-            similarity = intersection / union if union > 0 else 0.0
-            if similarity > best_score and similarity >= similarity_threshold:
-                best_score = similarity
-                best_match = data.copy()
-                best_match['similarity_score'] = similarity
+        match = self.store.find_similar(df.columns, similarity_threshold)
+        if match is None:
+            return None
+        fingerprint, similarity = match
+        best_match = self.learned_data[fingerprint].copy()
+        best_match['similarity_score'] = similarity
         return best_match
 
     def _count_unique_devices(self, df: pd.DataFrame) -> int:
@@ -172,54 +181,35 @@ class ConsolidatedLearningService:
         return df.iloc[:, 0].nunique() if len(df.columns) > 0 else 0
 
     def _load_learned_data(self):
-        """Load learned data from storage. Migrate legacy pickle data if needed.
+        """Migrate legacy pickle data into the store if needed.
 
         Pickle loading is disabled by default to avoid executing untrusted
         serialized data. Pass ``allow_pickle=True`` when creating the service to
         enable migration from the legacy ``.pkl`` format.
         """
         if self.storage_path.exists():
-            try:
-                with open(self.storage_path, "r") as f:
-                    self.learned_data = json.load(f)
-                self.logger.info(
-                    f"Loaded {len(self.learned_data)} learned mappings")
-            except Exception as e:
-                self.logger.warning(f"Could not load learned data: {e}")
-                self.learned_data = {}
+            self.logger.info(f"Loaded {len(self.learned_data)} learned mappings")
             return
 
-        # Legacy pickle support
         legacy_path = self.storage_path.with_suffix('.pkl')
-        if legacy_path.exists():
-            if not self.allow_pickle:
-                self.logger.warning(
-                    f"Legacy pickle file {legacy_path} ignored; set allow_pickle=True to load")
-                self.learned_data = {}
-                return
-            try:
-                with open(legacy_path, "rb") as f:
-                    self.learned_data = pickle.load(f)
-                self.logger.info(
-                    f"Migrating {legacy_path} with {len(self.learned_data)} mappings")
-                self._persist_learned_data()
-                try:
-                    legacy_path.unlink()
-                except Exception:
-                    pass
-            except Exception as e:
-                self.logger.warning(f"Could not migrate legacy data: {e}")
-                self.learned_data = {}
-        else:
-            self.learned_data = {}
-
-    def _persist_learned_data(self):
-        """Persist learned data to storage using JSON."""
+        if not legacy_path.exists():
+            return
+        if not self.allow_pickle:
+            self.logger.warning(
+                f"Legacy pickle file {legacy_path} ignored; set allow_pickle=True to load")
+            return
         try:
-            with open(self.storage_path, "w") as f:
-                json.dump(self.learned_data, f, indent=2)
+            with open(legacy_path, "rb") as f:
+                legacy_data = pickle.load(f)
+            self.logger.info(
+                f"Migrating {legacy_path} with {len(legacy_data)} mappings")
+            self.store.replace_all(legacy_data)
+            try:
+                legacy_path.unlink()
+            except Exception:
+                pass
         except Exception as e:
-            self.logger.error(f"Could not persist learned data: {e}")
+            self.logger.warning(f"Could not migrate legacy data: {e}")
 
 
 _learning_service: Optional[ConsolidatedLearningService] = None
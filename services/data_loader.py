@@ -1,4 +1,3 @@
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -6,6 +5,8 @@ from typing import Any, Dict, Tuple
 
 import pandas as pd
 
+from services.learned_mapping_store import read_learned_mappings
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,15 +28,7 @@ class DataLoader:
 
     def _load_consolidated_mappings(self) -> Dict[str, Any]:
         try:
-            if self.mappings_file.exists():
-                with open(
-                    self.mappings_file,
-                    "r",
-                    encoding="utf-8",
-                    errors="replace",
-                ) as fh:
-                    return json.load(fh)
-            return {}
+            return read_learned_mappings(self.mappings_file)
         except Exception as exc:  # pragma: no cover - best effort
             logger.error(f"Error loading mappings: {exc}")
             return {}
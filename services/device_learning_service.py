@@ -11,6 +11,7 @@ from dash import html
 from dash._callback import callback
 from dash.dependencies import Input, Output
 from services.consolidated_learning_service import get_learning_service
+from services.learned_mapping_store import atomic_write_json
 from dash._callback_context import callback_context
 
 logger = logging.getLogger(__name__)
@@ -72,15 +73,11 @@ class DeviceLearningService:
         except Exception as e:
             logger.error(f"Failed to load learned mappings: {e}")
 
-    def _persist_learned_mappings(self):
-        """Persist all learned mappings to disk"""
-        try:
-            for fingerprint, data in self.learned_mappings.items():
-                mapping_file = self.storage_dir / f"mapping_{fingerprint}.json"
-                with open(mapping_file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to persist learned mappings: {e}")
+    def _persist_learned_mapping(self, fingerprint: str) -> Path:
+        """Write one learned mapping file, replacing it atomically"""
+        mapping_file = self.storage_dir / f"mapping_{fingerprint}.json"
+        atomic_write_json(mapping_file, self.learned_mappings[fingerprint], indent=2)
+        return mapping_file
 
     def save_device_mappings(
         self, df: pd.DataFrame, filename: str, device_mappings: Dict[str, Dict]
@@ -107,13 +104,9 @@ class DeviceLearningService:
                 ),
             }
 
-            # Save to file immediately
-            mapping_file = self.storage_dir / f"mapping_{fingerprint}.json"
-            with open(mapping_file, "w", encoding="utf-8") as f:
-                json.dump(learning_data, f, indent=2)
-
-            # Update in-memory cache
+            # Update in-memory cache and save this mapping's file immediately
             self.learned_mappings[fingerprint] = learning_data
+            mapping_file = self._persist_learned_mapping(fingerprint)
 
             logger.info(
                 f"Saved {len(device_mappings)} device mappings for {filename}"
@@ -192,7 +185,7 @@ class DeviceLearningService:
             }
 
             self.learned_mappings[fingerprint] = mapping_data
-            self._persist_learned_mappings()
+            self._persist_learned_mapping(fingerprint)
 
             logger.info(
                 f"Saved user device mappings for {filename}: {len(user_mappings)} devices"
@@ -10,7 +10,7 @@ from datetime import datetime
 from dataclasses import dataclass
 
 # ADD after existing imports
-from services.ai_device_generator import AIDeviceGenerator
+from services.ai_device_generator import DeviceAttributes, get_ai_device_generator
 from services.consolidated_learning_service import get_learning_service
 from config.dynamic_config import dynamic_config
 
@@ -62,14 +62,13 @@ class DoorMappingService:
             if missing_columns:
                 raise ValueError(f"Missing required columns: {missing_columns}")
             
-            # Extract unique devices
-            unique_doors = df['door_id'].unique()
-            
-            # Generate AI attribute assignments
-            devices_data = []
-            for door_id in unique_doors:
-                device_data = self._generate_ai_attributes(door_id, df, client_profile)
-                devices_data.append(device_data)
+            # Attributes depend on the door id alone: one lookup per distinct
+            # door, in order of first appearance
+            ai_attributes = get_ai_device_generator().generate_batch(df['door_id'].unique())
+            devices_data = [
+                self._generate_ai_attributes(attributes, client_profile)
+                for attributes in ai_attributes.values()
+            ]
             
             # Prepare response
             response = {
@@ -91,16 +90,9 @@ class DoorMappingService:
             raise
     
     def _generate_ai_attributes(
-        self, door_id: str, df: pd.DataFrame, client_profile: str
+        self, ai_attributes: DeviceAttributes, client_profile: str
     ) -> DeviceAttributeData:
-        """Generate AI-based attribute assignments using enhanced modular AI generator"""
-
-        # Use new modular AI generator
-        ai_generator = AIDeviceGenerator()
-        device_rows = df[df["door_id"] == door_id]
-
-        # Generate attributes using enhanced AI
-        ai_attributes = ai_generator.generate_device_attributes(door_id, device_rows)
+        """Convert generated device attributes into door mapping data"""
 
         # Apply client profile adjustments
         security_level = ai_attributes.security_level
@@ -340,7 +332,7 @@ class DoorMappingService:
             "ai_analysis": {},
         }
 
-        ai_generator = AIDeviceGenerator()
+        ai_generator = get_ai_device_generator()
         for device_name in device_names:
             try:
                 ai_attrs = ai_generator.generate_device_attributes(str(device_name))
@@ -0,0 +1,161 @@
+"""Format detection for uploaded CSV files.
+
+The delimiter, quoting, encoding and header are sniffed from the first few
+KB of a file so the full file can be parsed once with pandas' C (or
+pyarrow) engine instead of the Python engine's ``sep=None`` detection.
+"""
+
+import codecs
+import csv
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_BYTES = 64 * 1024
+CANDIDATE_DELIMITERS = ",;\t|"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+@dataclass
+class CSVFormat:
+    """Dialect, encoding and header of a CSV file"""
+    delimiter: str = ","
+    quotechar: str = '"'
+    doublequote: bool = True
+    escapechar: Optional[str] = None
+    encoding: str = "utf-8"
+    has_header: bool = True
+    columns: List[str] = field(default_factory=list)
+    # Columns holding only text in the sample; read as ``object`` up front
+    text_columns: List[str] = field(default_factory=list)
+
+    def read_csv_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for ``pd.read_csv`` describing this format"""
+        kwargs: Dict[str, Any] = {
+            "sep": self.delimiter,
+            "quotechar": self.quotechar,
+            "doublequote": self.doublequote,
+            "encoding": self.encoding,
+            "header": 0 if self.has_header else None,
+        }
+        if self.escapechar:
+            kwargs["escapechar"] = self.escapechar
+        if self.has_header and self.text_columns:
+            kwargs["dtype"] = {column: object for column in self.text_columns}
+        return kwargs
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Encoding of ``sample``: BOM, then UTF-8, then charset detection"""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # A multi-byte character may be cut at the end of the sample
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:  # pragma: no cover - optional dependency
+        return "cp1252"
+    match = from_bytes(sample).best()
+    return match.encoding if match is not None else "cp1252"
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def detect_csv_format(path: str, sample_bytes: int = SAMPLE_BYTES) -> CSVFormat:
+    """Sniff the format of the CSV file at ``path`` from its first bytes"""
+    with open(path, "rb") as handle:
+        raw = handle.read(sample_bytes)
+    fmt = CSVFormat(encoding=detect_encoding(raw))
+    if not raw:
+        return fmt
+
+    text = raw.decode(fmt.encoding, errors="ignore")
+    if len(raw) == sample_bytes and "\n" in text:
+        # Drop the partial last line
+        text = text[:text.rindex("\n") + 1]
+
+    sniffer = csv.Sniffer()
+    try:
+        dialect = sniffer.sniff(text, delimiters=CANDIDATE_DELIMITERS)
+        fmt.delimiter = dialect.delimiter
+        fmt.quotechar = dialect.quotechar or '"'
+        fmt.escapechar = dialect.escapechar
+        # The sniffer reports doublequote=False whenever the sample has no
+        # doubled quotes; keep the CSV default unless an escape char is used
+        fmt.doublequote = dialect.doublequote if dialect.escapechar else True
+    except csv.Error:
+        logger.debug(f"Could not sniff dialect of {path}, assuming comma separated")
+
+    rows = list(csv.reader(text.splitlines(), delimiter=fmt.delimiter,
+                           quotechar=fmt.quotechar, doublequote=fmt.doublequote,
+                           escapechar=fmt.escapechar))
+    rows = [row for row in rows if row]
+    if not rows:
+        return fmt
+
+    # Only trust a "no header" verdict when the first row looks like data
+    try:
+        sniffed_header = sniffer.has_header(text)
+    except csv.Error:
+        sniffed_header = True
+    fmt.has_header = sniffed_header or not any(_is_number(value) for value in rows[0])
+
+    if fmt.has_header:
+        fmt.columns = rows[0]
+        body = rows[1:]
+        if body and len(set(fmt.columns)) == len(fmt.columns):
+            fmt.text_columns = [
+                column for index, column in enumerate(fmt.columns)
+                if all(
+                    index < len(row) and row[index] and not _is_number(row[index])
+                    for row in body
+                )
+            ]
+    return fmt
+
+
+def read_csv_detected(path: str, fmt: Optional[CSVFormat] = None,
+                      engine: str = "c", **kwargs: Any) -> pd.DataFrame:
+    """Read ``path`` in one pass with the sniffed (or given) format"""
+    fmt = fmt or detect_csv_format(path)
+    options = {**fmt.read_csv_kwargs(), **kwargs}
+    if engine == "pyarrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            engine = "c"
+        else:
+            # Options the pyarrow engine does not support
+            options.pop("escapechar", None)
+    return pd.read_csv(path, engine=engine, **options)
+
+
+__all__ = [
+    "CSVFormat",
+    "detect_csv_format",
+    "detect_encoding",
+    "read_csv_detected",
+    "SAMPLE_BYTES",
+]
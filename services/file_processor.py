@@ -9,12 +9,17 @@ from typing import Dict, Any, Optional, Tuple, Sequence
 import logging
 from datetime import datetime
 
+from .file_format import detect_csv_format, read_csv_detected
+
+logger = logging.getLogger(__name__)
+
 class FileProcessor:
     """Service for processing uploaded files"""
     
-    def __init__(self, upload_folder: str, allowed_extensions: set):
+    def __init__(self, upload_folder: str, allowed_extensions: set, csv_engine: str = "c"):
         self.upload_folder = upload_folder
         self.allowed_extensions = allowed_extensions
+        self.csv_engine = csv_engine
         
         # Ensure upload folder exists
         os.makedirs(upload_folder, exist_ok=True)
@@ -79,20 +84,11 @@ class FileProcessor:
             }
     
     def _parse_csv(self, file_path: str) -> pd.DataFrame:
-        """Parse CSV file using pandas automatic delimiter detection"""
-
-        # Detect header with automatic delimiter detection
-        header = pd.read_csv(file_path, nrows=0, sep=None, engine="python").columns
-        parse_dates = ["timestamp"] if "timestamp" in header else False
-
-        # Read the entire file once using the detected delimiter
-        return pd.read_csv(
-            file_path,
-            sep=None,
-            engine="python",
-            encoding="utf-8",
-            parse_dates=parse_dates,
-        )
+        """Parse CSV file in one pass using a format sniffed from its first bytes"""
+
+        fmt = detect_csv_format(file_path)
+        parse_dates = ["timestamp"] if "timestamp" in fmt.columns else False
+        return read_csv_detected(file_path, fmt, engine=self.csv_engine, parse_dates=parse_dates)
     
     def _parse_json(self, file_path: str) -> pd.DataFrame:
         """Parse JSON file"""
@@ -112,19 +108,16 @@ class FileProcessor:
             raise ValueError("Unsupported JSON structure")
     
     def _parse_excel(self, file_path: str) -> pd.DataFrame:
-        """Parse Excel file"""
+        """Parse the first sheet of an Excel file, opening the workbook once"""
         
-        # Try to read the first sheet
-        excel_file = pd.ExcelFile(file_path)
+        with pd.ExcelFile(file_path) as excel_file:
+            df = excel_file.parse(excel_file.sheet_names[0])
         
-        # Get the first sheet name
-        sheet_name = excel_file.sheet_names[0]
-        
-        df = pd.read_excel(
-            file_path, 
-            sheet_name=sheet_name,
-            parse_dates=['timestamp'] if 'timestamp' in pd.read_excel(file_path, nrows=0).columns else False
-        )
+        if 'timestamp' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            try:
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+            except (ValueError, TypeError):
+                pass
         
         return df
     
@@ -1,6 +1,9 @@
+import base64
 import io
 import logging
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -60,3 +63,47 @@ class FileProcessorService:
     def _process_excel_simple(self, content: bytes) -> pd.DataFrame:
         """Simple Excel processing"""
         return pd.read_excel(io.BytesIO(content))
+
+
+PREVIEW_ROWS = 5
+
+
+def process_upload(content: str, filename: str, preview_rows: int = PREVIEW_ROWS,
+                   progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, Any]:
+    """Decode, validate and parse one ``dcc.Upload`` file
+
+    Runs in an upload worker process, so only a summary and the first
+    ``preview_rows`` rows are returned instead of the whole frame.
+    """
+    def report(percent: float, stage: str) -> None:
+        if progress is not None:
+            progress(percent, stage)
+
+    try:
+        report(5, "Decoding")
+        content_string = content.split(',', 1)[1]
+        decoded = base64.b64decode(content_string)
+
+        report(20, "Validating")
+        processor = FileProcessorService()
+        validation = processor.validate_file(filename, len(decoded))
+        if not validation['valid']:
+            return {
+                'success': False,
+                'filename': filename,
+                'error': f"Validation failed: {'; '.join(validation['issues'])}"
+            }
+
+        report(30, "Parsing")
+        df = processor.process_file(decoded, filename)
+        report(90, "Building preview")
+        return {
+            'success': True,
+            'filename': filename,
+            'rows': len(df),
+            'columns': [str(column) for column in df.columns],
+            'preview': df.head(preview_rows).copy(),
+        }
+    except Exception as e:
+        logger.error(f"Error processing {filename}: {e}")
+        return {'success': False, 'filename': filename, 'error': str(e)}
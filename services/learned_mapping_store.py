@@ -0,0 +1,340 @@
+"""
+Learned mapping store
+Learned mapping records are kept in a compacted JSON snapshot plus an
+append-only log shared by worker processes, with a MinHash/LSH index over
+column names for similar-layout lookups
+"""
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# splitmix64 finalizer constants
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+@contextlib.contextmanager
+def file_lock(path: Union[str, Path]) -> Iterator[None]:
+    """Exclusive advisory lock on ``path`` across processes (no-op without ``fcntl``)"""
+    with open(path, "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_json(path: Union[str, Path], data: Any, **kwargs: Any) -> None:
+    """Write ``data`` to a temporary file and rename it over ``path``"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, **kwargs)
+    os.replace(tmp_path, path)
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer; uint64 multiplication wraps, as intended"""
+    values = (values ^ (values >> np.uint64(30))) * _MIX_1
+    values = (values ^ (values >> np.uint64(27))) * _MIX_2
+    return values ^ (values >> np.uint64(31))
+
+
+def _record_columns(record: Dict[str, Any]) -> List[str]:
+    return record.get("file_stats", {}).get("columns", [])
+
+
+class MinHashLSH:
+    """Locality-sensitive index of string sets
+
+    Each set gets a MinHash signature of ``bands * rows`` values; sets that
+    agree on all ``rows`` values of any band share a bucket.  A set with
+    Jaccard similarity ``s`` is returned as a candidate with probability
+    ``1 - (1 - s ** rows) ** bands``.  The defaults miss about 2 in a million
+    sets at 0.7 (the learning service threshold) and fewer above it, at the
+    cost of more false candidates, which are filtered by an exact comparison.
+    """
+
+    def __init__(self, bands: int = 48, rows: int = 4, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        # One hash function per signature value: the item hash XOR a seed, mixed
+        self._seeds = rng.integers(0, np.iinfo(np.uint64).max, bands * rows,
+                                   dtype=np.uint64, endpoint=True)
+        self._buckets: List[Dict[bytes, Set[str]]] = [defaultdict(set) for _ in range(bands)]
+        self._band_keys: Dict[str, List[bytes]] = {}
+
+    def signature(self, items: Iterable[str]) -> np.ndarray:
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(str(item).encode(), digest_size=8).digest(), "little")
+             for item in set(items)],
+            dtype=np.uint64,
+        )
+        return _mix64(hashes[:, None] ^ self._seeds).min(axis=0)
+
+    def _keys_for(self, items: Iterable[str]) -> List[bytes]:
+        signature = self.signature(items)
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes()
+                for band in range(self.bands)]
+
+    def add(self, key: str, items: Iterable[str]) -> None:
+        self.remove(key)
+        items = list(items)
+        if not items:
+            return
+        band_keys = self._keys_for(items)
+        for buckets, band_key in zip(self._buckets, band_keys):
+            buckets[band_key].add(key)
+        self._band_keys[key] = band_keys
+
+    def remove(self, key: str) -> None:
+        band_keys = self._band_keys.pop(key, None)
+        if band_keys is None:
+            return
+        for buckets, band_key in zip(self._buckets, band_keys):
+            bucket = buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[band_key]
+
+    def query(self, items: Iterable[str]) -> Set[str]:
+        """Keys of indexed sets likely to be similar to ``items``"""
+        items = list(items)
+        if not items:
+            return set()
+        candidates: Set[str] = set()
+        for buckets, band_key in zip(self._buckets, self._keys_for(items)):
+            candidates.update(buckets.get(band_key, ()))
+        return candidates
+
+    def clear(self) -> None:
+        for buckets in self._buckets:
+            buckets.clear()
+        self._band_keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._band_keys)
+
+
+class LearnedMappingStore:
+    """Learned mapping records keyed by fingerprint
+
+    ``path`` holds a compacted JSON snapshot (``{fingerprint: record}``, the
+    format read by ``DataLoader``) and ``<path>.log`` the records saved
+    since, one JSON line each.  A save appends one line under an exclusive
+    file lock and the log is folded into the snapshot once it has
+    ``compact_after`` lines.  :meth:`refresh` picks up saves made by other
+    processes by reading only the unread tail of the log.
+    """
+
+    def __init__(self, path: Union[str, Path], compact_after: int = 500,
+                 index: Optional[MinHashLSH] = None):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.compact_after = compact_after
+        self.index = index or MinHashLSH()
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._column_sets: Dict[str, frozenset] = {}
+        self._order: Dict[str, int] = {}
+        self._log_offset = 0
+        self._log_lines = 0
+        self._snapshot_stamp: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.RLock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.reload()
+
+    # -- Reading --------------------------------------------------------------
+    def reload(self) -> None:
+        """Read the snapshot and the whole log again"""
+        with self._lock:
+            self._snapshot_stamp = self._stamp()
+            records: Dict[str, Dict[str, Any]] = {}
+            if self._snapshot_stamp is not None:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as handle:
+                        records = json.load(handle)
+                except Exception as e:
+                    logger.warning(f"Could not load learned mappings from {self.path}: {e}")
+            self.records = {}
+            self._column_sets.clear()
+            self._order.clear()
+            self.index.clear()
+            for fingerprint, record in records.items():
+                self._apply(fingerprint, record)
+            self._log_offset = 0
+            self._log_lines = 0
+            self._read_log()
+
+    def refresh(self) -> None:
+        """Apply records appended by other processes since the last read"""
+        with self._lock:
+            if self._stamp() != self._snapshot_stamp:
+                self.reload()
+                return
+            try:
+                log_size = self.log_path.stat().st_size
+            except FileNotFoundError:
+                log_size = 0
+            if log_size < self._log_offset:
+                self.reload()
+            elif log_size > self._log_offset:
+                self._read_log()
+                # A compaction that raced the read truncates the log
+                if self._stamp() != self._snapshot_stamp:
+                    self.reload()
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        return self.records.get(fingerprint)
+
+    def find_similar(self, columns: Iterable[str],
+                     threshold: float = 0.7) -> Optional[Tuple[str, float]]:
+        """Fingerprint and Jaccard similarity of the closest column layout
+
+        Only LSH candidates are compared exactly, so a qualifying layout is
+        missed with the small probability given in :class:`MinHashLSH`;
+        ties go to the record saved first.
+        """
+        current = frozenset(columns)
+        best: Optional[Tuple[str, float]] = None
+        with self._lock:
+            candidates = sorted(self.index.query(current), key=self._order.__getitem__)
+            for fingerprint in candidates:
+                stored = self._column_sets[fingerprint]
+                union = len(current | stored)
+                similarity = len(current & stored) / union if union else 0.0
+                if similarity >= threshold and (best is None or similarity > best[1]):
+                    best = (fingerprint, similarity)
+        return best
+
+    # -- Writing --------------------------------------------------------------
+    def save(self, fingerprint: str, record: Dict[str, Any]) -> None:
+        """Append one record; compacts when the log is long enough"""
+        line = json.dumps({"fingerprint": fingerprint, "record": record}, default=str) + "\n"
+        with self._lock, file_lock(self.lock_path):
+            with open(self.log_path, "a", encoding="utf-8") as handle:
+                handle.write(line)
+            self.refresh()
+            if self._log_lines >= self.compact_after or self._snapshot_stamp is None:
+                self._compact()
+
+    def replace_all(self, records: Dict[str, Dict[str, Any]]) -> None:
+        """Replace every record (e.g. when migrating a legacy file)"""
+        with self._lock, file_lock(self.lock_path):
+            self.records = {}
+            self._column_sets.clear()
+            self._order.clear()
+            self.index.clear()
+            for fingerprint, record in records.items():
+                self._apply(fingerprint, record)
+            self._compact()
+
+    def compact(self) -> None:
+        """Fold the log into the snapshot"""
+        with self._lock, file_lock(self.lock_path):
+            self.refresh()
+            self._compact()
+
+    # -- Internals ------------------------------------------------------------
+    def _stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_log(self) -> None:
+        try:
+            with open(self.log_path, "rb") as handle:
+                handle.seek(self._log_offset)
+                data = handle.read()
+        except FileNotFoundError:
+            return
+        # Leave a partially written last line for the next read
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                self._apply(entry["fingerprint"], entry["record"])
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping corrupt learned mapping log line: {e}")
+            self._log_lines += 1
+        self._log_offset += end
+
+    def _apply(self, fingerprint: str, record: Dict[str, Any]) -> None:
+        columns = frozenset(_record_columns(record))
+        self.records[fingerprint] = record
+        self._order.setdefault(fingerprint, len(self._order))
+        if self._column_sets.get(fingerprint) != columns:
+            self._column_sets[fingerprint] = columns
+            self.index.add(fingerprint, columns)
+
+    def _compact(self) -> None:
+        # Caller holds the file lock and has applied the whole log
+        atomic_write_json(self.path, self.records)
+        with open(self.log_path, "w", encoding="utf-8"):
+            pass
+        self._snapshot_stamp = self._stamp()
+        self._log_offset = 0
+        self._log_lines = 0
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def read_learned_mappings(path: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """Current records of the store at ``path`` (snapshot plus log), read only"""
+    path = Path(path)
+    records: Dict[str, Dict[str, Any]] = {}
+    if path.exists():
+        with open(path, "r", encoding="utf-8", errors="replace") as handle:
+            records = json.load(handle)
+    log_path = path.with_name(path.name + ".log")
+    if log_path.exists():
+        with open(log_path, "r", encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                    records[entry["fingerprint"]] = entry["record"]
+                except (ValueError, KeyError):
+                    continue
+    return records
+
+
+def create_learned_mapping_store(path: Union[str, Path] = "data/learned_mappings.json",
+                                 **kwargs: Any) -> LearnedMappingStore:
+    """Factory function to create a learned mapping store"""
+    return LearnedMappingStore(path, **kwargs)
+
+
+__all__ = [
+    "LearnedMappingStore",
+    "MinHashLSH",
+    "atomic_write_json",
+    "create_learned_mapping_store",
+    "file_lock",
+    "read_learned_mappings",
+]
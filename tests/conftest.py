@@ -10,6 +10,16 @@ import pandas as pd
 from core.container import Container
 from models.entities import Person, Door, AccessEvent
 from models.enums import AccessResult, DoorType
+from services import consolidated_learning_service as learning
+
+
+@pytest.fixture(autouse=True)
+def learning_service(monkeypatch, tmp_path) -> learning.ConsolidatedLearningService:
+    """Keep mappings saved through the global learning service out of data/"""
+
+    service = learning.ConsolidatedLearningService(str(tmp_path / "learned_mappings.json"))
+    monkeypatch.setattr(learning, "_learning_service", service)
+    return service
 
 
 @pytest.fixture
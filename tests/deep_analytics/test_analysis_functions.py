@@ -63,3 +63,41 @@ def test_create_analysis_results_display():
     }
     comp = da.create_analysis_results_display(data, "security")
     assert isinstance(comp, Component)
+
+
+def test_deep_analysis_runs_as_background_job(monkeypatch, tmp_path):
+    import dash_bootstrap_components as dbc
+    import pages.deep_analytics.analysis_helpers as helpers
+    import pages.deep_analytics.callbacks as cb
+    from core.job_queue import create_job_queue
+
+    df = pd.DataFrame({
+        "Timestamp": pd.date_range("2024-01-01", periods=48, freq="H"),
+        "Person ID": ["u1", "u2", "u3"] * 16,
+        "Device name": ["d1", "d2"] * 24,
+        "Access result": ["Granted", "Granted", "Denied"] * 16,
+    })
+    monkeypatch.setattr('pages.file_upload.get_uploaded_data', lambda: {"events.csv": df})
+    store_path = tmp_path / "analysis_jobs.db"
+    job_queue = create_job_queue(executor="thread", store_path=store_path,
+                                 keep_payloads=False, recover=False)
+    monkeypatch.setattr(helpers, "_analysis_queue", job_queue)
+    display, job, finished = cb.start_analysis("anomaly", "upload:events.csv")
+    assert job["job_id"] and job["analysis_type"] == "anomaly"
+    job_queue.wait(job["job_id"], timeout=60)
+
+    display, finished = cb.job_display(job)
+    assert finished and isinstance(display, dbc.Card)
+    assert job_queue.result(job["job_id"])["total_events"] == 48
+
+    # Polls and repeat requests handled by another web worker
+    other_worker = create_job_queue(executor="thread", store_path=store_path, recover=False)
+    monkeypatch.setattr(helpers, "_analysis_queue", other_worker)
+    display, finished = cb.job_display(job)
+    assert finished and isinstance(display, dbc.Card)
+    again, again_job, _ = cb.start_analysis("anomaly", "upload:events.csv")
+    assert isinstance(again, dbc.Card)
+    assert again_job["job_id"] == job["job_id"]
+    assert len(job_queue.jobs()) == 1 and not other_worker.jobs()
+    job_queue.shutdown()
+    other_worker.shutdown()
@@ -74,3 +74,63 @@ def test_malicious_query_rejected():
     client = app.test_client()
     resp = client.get("/?q=%3Cscript%3E")
     assert resp.status_code == 400
+
+
+def test_upload_json_skips_base64_and_records_metric():
+    import base64
+    from flask import Flask
+    from core.request_metrics import VALIDATION_METRIC, create_request_metrics
+    from security.validation_middleware import ValidationMiddleware
+
+    metrics = create_request_metrics(forward_to_monitor=False)
+    app = Flask(__name__)
+    app.before_request(ValidationMiddleware(metrics=metrics).validate_request)
+
+    @app.route("/_dash-update-component", methods=["POST"])
+    def update():
+        from flask import request
+        return {"inputs": len(request.get_json()["inputs"])}
+
+    contents = "data:text/csv;base64," + base64.b64encode(b"a,b\n1,2\n" * 20000).decode()
+    body = {"inputs": [{"id": "upload-data", "property": "contents", "value": [contents]},
+                       {"id": "upload-data", "property": "filename", "value": ["a.csv"]}]}
+    client = app.test_client()
+    assert client.post("/_dash-update-component", json=body).get_json() == {"inputs": 2}
+
+    body["inputs"][1]["value"] = ["<b>.csv"]
+    assert client.post("/_dash-update-component", json=body).status_code == 400
+    forged = {"inputs": [{"value": "data:text/csv;base64,<script>"}]}
+    assert client.post("/_dash-update-component", json=forged).status_code == 400
+
+    outcomes = {s["labels"]["outcome"]: s["count"] for s in metrics.snapshot()[VALIDATION_METRIC]}
+    assert outcomes == {"pass": 1, "rejected": 2}
+
+
+def test_route_budgets_and_chunked_text_scan():
+    from flask import Flask
+    from core.request_metrics import create_request_metrics
+    from core.security_scanner import get_security_scanner
+    from security.validation_middleware import ValidationMiddleware, ValidationPolicy
+
+    middleware = ValidationMiddleware(
+        scanner=get_security_scanner(),
+        policies={"/small": ValidationPolicy(max_scan_chars=16),
+                  "/small/large": ValidationPolicy(max_body_bytes=32)},
+        default_policy=ValidationPolicy(chunk_chars=8, chunk_overlap=32),
+        metrics=create_request_metrics(forward_to_monitor=False),
+    )
+    app = Flask(__name__)
+    app.before_request(middleware.validate_request)
+
+    @app.route("/<path:anything>", methods=["POST"])
+    def echo(anything):
+        from flask import request
+        return request.get_data(as_text=True)
+
+    client = app.test_client()
+    assert client.post("/small", data="x" * 16).status_code == 200
+    assert client.post("/small", data="x" * 17).status_code == 413
+    assert client.post("/small/large", data="x" * 33).status_code == 413
+    assert client.post("/small/large", data="x" * 20).status_code == 200
+    assert client.post("/other", data="plain text body").get_data(as_text=True) == "plain text body"
+    assert client.post("/other", data="xxxxxx<script>alert(1)</script>").status_code == 400
@@ -94,3 +94,25 @@ class TestAIDeviceGenerator:
         
         assert attrs.is_fire_escape == True
         assert attrs.is_exit == True  # Fire escapes should also be exits
+
+    def test_batch_matches_single_generation(self):
+        """Batch results equal per-device results and are memoized."""
+        devices = ["office_3F_entrance", "device_F01A", "elevator_1", "office_3F_entrance"]
+        batch = self.generator.generate_batch(devices)
+
+        assert list(batch) == ["office_3F_entrance", "device_F01A", "elevator_1"]
+        for device_id, attrs in batch.items():
+            assert attrs == AIDeviceGenerator().generate_device_attributes(device_id)
+
+        # Cached results are copies, so callers cannot corrupt the cache
+        batch["elevator_1"].floor_number = 42
+        assert self.generator.generate_device_attributes("elevator_1").floor_number == 1
+
+    def test_shared_generator_and_non_string_ids(self):
+        """The shared generator is reused and accepts numeric door ids."""
+        from services.ai_device_generator import get_ai_device_generator
+
+        assert get_ai_device_generator() is get_ai_device_generator()
+        attrs = self.generator.generate_device_attributes(101)
+        assert attrs.device_id == 101
+        assert attrs.device_name == "101"
@@ -1,3 +1,6 @@
+import json
+import time
+
 import pandas as pd
 import pytest
 
@@ -100,3 +103,66 @@ def test_analyze_all_triggers_callbacks_and_cache():
     assert events == ["start", "complete", "start"]
     assert controller.security_analyzer.calls == 1
     assert result2 is result1
+
+
+def test_charts_render_on_demand():
+    config = AnalyticsConfig(
+        lazy_charts=True,
+        enable_security_patterns=False,
+        enable_access_trends=False,
+        enable_user_behavior=False,
+        enable_anomaly_detection=False,
+        parallel_processing=False,
+        cache_results=False,
+    )
+    controller = AnalyticsController(config)
+    rendered = []
+    original = controller.charts_generator._create_temporal_charts
+    controller.charts_generator._create_temporal_charts = lambda df: rendered.append(1) or original(df)
+
+    result = controller.analyze_all(sample_df())
+    charts = result.interactive_charts
+    assert charts["lazy"] and "temporal_analysis.peak_hours" in charts["chart_ids"]
+    assert rendered == []
+
+    figure = controller.get_chart("temporal_analysis.peak_hours", charts["dataset_id"])
+    assert figure is not None
+    controller.get_chart("temporal_analysis.time_series", charts["dataset_id"])
+    assert rendered == [1]
+
+    # An evicted dataset is reported instead of raising KeyError
+    controller.charts_generator.clear_cache()
+    assert controller.get_chart("temporal_analysis.peak_hours", charts["dataset_id"]) is None
+
+
+def busy_security_analysis(df):
+    deadline = time.perf_counter() + 0.3
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(i * i for i in range(200))
+    return {"security": total > 0}
+
+
+def test_profiled_analysis_exports_flamegraphs(tmp_path):
+    from core.performance import profiler
+
+    controller = create_controller(cache_results=True)
+    controller.config.profile_dir = str(tmp_path)
+    controller.config.profile_interval_ms = 2
+    controller.security_analyzer.analyze_patterns = busy_security_analysis
+
+    result = controller.analyze_all(sample_df(), analysis_id="slow-run", profile=True)
+    assert result.status == "success"
+    files = result.profile["files"]
+    collapsed = open(files["collapsed"]).read()
+    assert "busy_security_analysis" in collapsed
+    speedscope = json.load(open(files["speedscope"]))
+    assert speedscope["profiles"][0]["type"] == "sampled"
+
+    report = profiler.get_profile_report("slow-run")
+    top = report["hot_functions"][:3]
+    assert any("busy_security_analysis" in entry["function"] for entry in top)
+    assert report["sampling"]["samples"] > 0
+
+    cached = controller.analyze_all(sample_df())
+    assert cached.profile is None
@@ -1,5 +1,10 @@
 import pandas as pd
-from services.analytics_summary import generate_basic_analytics, generate_sample_analytics
+from services.analytics_summary import (
+    generate_basic_analytics,
+    generate_sample_analytics,
+    merge_upload_summaries,
+)
+from utils.upload_store import UploadedDataStore
 
 
 def test_generate_basic_analytics():
@@ -14,3 +19,68 @@ def test_generate_sample_analytics():
     result = generate_sample_analytics()
     assert result["status"] == "success"
     assert result["total_events"] > 0
+
+
+def upload_frame(users, doors, start):
+    return pd.DataFrame({
+        "Timestamp": pd.date_range(start, periods=len(users), freq="H").astype(str),
+        "Person ID": users,
+        "Device name": doors,
+        "Access result": ["Granted", "Denied"] * (len(users) // 2),
+    })
+
+
+def test_upload_summaries_merge_without_rescanning(tmp_path, monkeypatch):
+    store = UploadedDataStore(storage_dir=tmp_path)
+    store.add_file("a.csv", upload_frame(["u1", "u2", "u1", "u3"], ["d1", "d1", "d2", "d2"], "2024-01-01"))
+    store.add_file("b.csv", upload_frame(["u1", "u4"], ["d3", "d1"], "2024-02-01"))
+
+    summaries = store.get_summaries()
+    assert summaries["a.csv"]["users"] == {"ids": ["u1", "u2", "u3"], "counts": [2, 1, 1]}
+    assert store.get_file_info()["b.csv"]["summary"]["access_results"] == {"Granted": 1, "Denied": 1}
+
+    merged = merge_upload_summaries(summaries.values())
+    assert merged["total_events"] == 6
+    assert merged["active_users"] == 4 and merged["active_doors"] == 3
+    assert merged["top_users"][0] == {"user_id": "u1", "count": 3}
+    assert merged["date_range"] == {"start": "2024-01-01", "end": "2024-02-01"}
+    assert merged["access_patterns"] == {"Granted": 3, "Denied": 3}
+
+    from services import AnalyticsService
+    import services.analytics_service as analytics_service
+
+    def no_rescan(df):
+        raise AssertionError("uploaded rows were rescanned")
+
+    monkeypatch.setattr("pages.file_upload.get_upload_summaries", store.get_summaries)
+    monkeypatch.setattr(analytics_service, "summarize_upload", no_rescan)
+    result = AnalyticsService()._process_uploaded_data_directly(store.get_all_data())
+    assert result["status"] == "success" and result["total_events"] == 6
+
+
+def test_approximate_mode_merges_sketches(tmp_path, monkeypatch):
+    from analytics.sketches import HyperLogLog, SpaceSaving
+    from services import AnalyticsService
+
+    users = [f"u{i}" for i in range(3000)] * 2 + ["vip"] * 500
+    first = HyperLogLog().update(users[:4000])
+    second = HyperLogLog.from_dict(HyperLogLog().update(users[4000:]).to_dict())
+    assert abs(first.merge(second).count() - 3001) < 3001 * 0.1
+
+    heavy = SpaceSaving(capacity=16).update(users)
+    heavy = SpaceSaving.from_dict(heavy.merge(SpaceSaving(16).update(["vip"] * 10)).to_dict())
+    assert heavy.top(1)[0][0] == "vip" and heavy.top(1)[0][1] >= 510
+
+    store = UploadedDataStore(storage_dir=tmp_path)
+    store.add_file("a.csv", upload_frame(["u1", "u2", "u1", "u3"], ["d1", "d1", "d2", "d2"], "2024-01-01"))
+    store.add_file("b.csv", upload_frame(["u1", "u4"], ["d3", "d1"], "2024-02-01"))
+    merged = merge_upload_summaries(store.get_summaries().values(), mode="approximate")
+    assert merged["summary_mode"] == "approximate"
+    assert merged["active_users"] == 4 and merged["active_doors"] == 3
+    assert merged["top_users"][0] == {"user_id": "u1", "count": 3}
+
+    frame = upload_frame(["u1", "u2"] * 50, ["d1"] * 100, "2024-03-01")
+    service = AnalyticsService(summary_mode="approximate")
+    monkeypatch.setattr(service, "_load_upload_summaries", lambda: {})
+    result = service._process_uploaded_data_directly({"c.csv": frame})
+    assert result["active_users"] == 2 and result["top_doors"] == [{"door_id": "d1", "count": 100}]
@@ -0,0 +1,100 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.anomaly_detection import AnomalyDetector
+from analytics.anomaly_detectors import (
+    AnomalyDetectorRegistry,
+    AnomalySubDetector,
+    COST_HEAVY,
+    get_detector_registry,
+)
+
+
+def sample_df(rows=400):
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2024-01-01 06:00:00")
+    return pd.DataFrame(
+        {
+            "event_id": range(rows),
+            "timestamp": start + pd.to_timedelta(np.sort(rng.integers(0, 14 * 86400, rows)), unit="s"),
+            "person_id": rng.choice([f"U{i}" for i in range(12)], rows),
+            "door_id": rng.choice([f"D{i}" for i in range(5)], rows),
+            "access_result": rng.choice(["Granted", "Denied"], rows, p=[0.85, 0.15]),
+        }
+    )
+
+
+class SlowDetector(AnomalySubDetector):
+    name = "slow_anomalies"
+    input_columns = ("timestamp",)
+    cost_class = COST_HEAVY
+
+    def detect(self, engine, df, sensitivity):
+        time.sleep(0.5)
+        return [{"type": "slow", "severity": "low", "confidence": 0.5}]
+
+
+def test_default_registry_contains_builtin_families():
+    names = get_detector_registry().names()
+    assert names == AnomalyDetector.RESULT_CATEGORIES
+
+
+def test_detectors_do_not_mutate_prepared_frame():
+    detector = AnomalyDetector()
+    prepared = detector._prepare_data(sample_df())
+    columns = list(prepared.columns)
+
+    for sub_detector in detector.get_active_detectors():
+        sub_detector.detect(detector, prepared, 0.95)
+
+    assert list(prepared.columns) == columns
+
+
+def test_parallel_matches_sequential():
+    df = sample_df()
+    parallel = AnomalyDetector(parallel=True).detect_anomalies(df)
+    sequential = AnomalyDetector(parallel=False).detect_anomalies(df)
+
+    for category in AnomalyDetector.RESULT_CATEGORIES:
+        assert len(parallel[category]) == len(sequential[category])
+    assert parallel["anomaly_summary"]["total_anomalies"] == sequential["anomaly_summary"]["total_anomalies"]
+
+
+def test_disabled_detectors_return_empty_category():
+    detector = AnomalyDetector(disabled_detectors=["machine_learning_anomalies"])
+    assert "machine_learning_anomalies" not in [d.name for d in detector.get_active_detectors()]
+
+    result = detector.detect_anomalies(sample_df())
+    assert result["machine_learning_anomalies"] == []
+
+
+def test_detector_budget_discards_slow_results(monkeypatch):
+    registry = AnomalyDetectorRegistry()
+    registry.register(get_detector_registry().get("statistical_anomalies"))
+    registry.register(SlowDetector())
+
+    detector = AnomalyDetector(registry=registry, detector_budgets={"slow_anomalies": 0.05})
+    recorded = []
+    monkeypatch.setattr(detector, "_record_detector_latency",
+                        lambda d, duration, status, rows: recorded.append((d.name, status)))
+    pool = detector._get_executor(2)
+    results = detector._run_detectors(detector._prepare_data(sample_df()), 0.95)
+
+    assert results["slow_anomalies"] == []
+    assert "statistical_anomalies" in results
+    # The stuck worker no longer holds a slot of the next run's pool
+    assert detector._executor is None
+    pool.shutdown(wait=True)
+    assert recorded.count(("slow_anomalies", "timeout")) == 1
+    assert [name for name, _ in recorded].count("slow_anomalies") == 1
+
+
+def test_sub_detectors_must_implement_detect():
+    class Incomplete(AnomalySubDetector):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,56 @@
+import pandas as pd
+
+from analytics.anomaly_detection import AnomalyDetector
+from analytics.anomaly_sink import AnomalySink
+
+
+def tailgating_df(rows=500):
+    return pd.DataFrame(
+        {
+            "event_id": range(rows),
+            "timestamp": pd.date_range("2024-01-01 08:00:00", periods=rows, freq="5s"),
+            "person_id": [f"U{i % 50}" for i in range(rows)],
+            "door_id": "LOBBY",
+            "access_result": "Granted",
+        }
+    )
+
+
+def test_sink_keeps_top_k_and_counts_remainder():
+    sink = AnomalySink(top_k=3)
+    sink.extend(
+        "security_anomalies",
+        [{"type": "t", "severity": "low", "confidence": c / 10, "user_id": f"U{c}"} for c in range(10)],
+    )
+
+    records = sink.records("security_anomalies")
+    assert [r["confidence"] for r in records] == [0.9, 0.8, 0.7]
+    assert sink.total == 10
+    assert sink.type_counts() == {"t": 10}
+    assert sink.truncated_counts() == {"t": 7}
+    assert sink.affected_counts()["user_id"] == 10
+
+
+def test_sink_ranks_severity_before_confidence():
+    sink = AnomalySink(top_k=1)
+    sink.add_frame(
+        "statistical_anomalies",
+        pd.DataFrame(
+            {"type": ["v", "v"], "severity": ["medium", "critical"], "confidence": [0.99, 0.5]}
+        ),
+    )
+    assert sink.records()[0]["severity"] == "critical"
+    assert sink.severity_counts() == {"medium": 1, "critical": 1}
+    assert sink.risk_weight_sum == 2 * 0.99 + 10 * 0.5
+
+
+def test_tailgating_is_bounded_but_fully_counted():
+    detector = AnomalyDetector(top_k=25, enabled_detectors=["security_anomalies"])
+    result = detector.detect_anomalies(tailgating_df())
+
+    tailgating = [a for a in result["security_anomalies"] if a["type"] == "potential_tailgating"]
+    summary = result["anomaly_summary"]
+    assert len(tailgating) == 25
+    assert summary["type_breakdown"]["potential_tailgating"] == 499
+    assert summary["truncated_breakdown"]["potential_tailgating"] == 474
+    assert len(summary["top_anomalies"]) == 10
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from analytics.chart_data import (
+    ChartDataConfig,
+    downsample_series,
+    histogram,
+    lttb_indices,
+    minmax_indices,
+    top_n_with_other,
+)
+from analytics.interactive_charts import SecurityChartsGenerator
+
+
+def walk(n=20000):
+    values = np.random.default_rng(0).normal(size=n).cumsum()
+    return pd.Series(values, index=pd.date_range('2020-01-01', periods=n, freq='H'))
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    series = walk()
+    index = lttb_indices(series.index, series.to_numpy(), 500)
+    assert len(index) == 500
+    assert index[0] == 0 and index[-1] == len(series) - 1
+    assert np.all(np.diff(index) > 0)
+
+
+def test_minmax_keeps_extremes():
+    series = walk()
+    reduced = downsample_series(series, 400, method='minmax')
+    assert len(reduced) <= 400
+    assert reduced.max() == series.max() and reduced.min() == series.min()
+    assert len(minmax_indices(series.to_numpy(), 10 ** 6)) == len(series)
+
+
+def test_histogram_and_top_n():
+    bins = histogram(np.arange(1000), bins=10)
+    assert bins['count'].sum() == 1000 and len(bins) == 10
+
+    counts = pd.Series({'a': 10, 'b': 7, 'c': 2, 'd': 1})
+    folded = top_n_with_other(counts, 2)
+    assert list(folded.index) == ['a', 'b', 'Other'] and folded['Other'] == 3
+
+    frame = pd.DataFrame({'events': [5, 4, 3], 'rate': [90.0, 80.0, 70.0]}, index=['x', 'y', 'z'])
+    folded = top_n_with_other(frame, 1, sort_by='events')
+    assert folded.loc['Other', 'events'] == 7 and np.isnan(folded.loc['Other', 'rate'])
+
+
+def test_generator_respects_point_budgets():
+    rng = np.random.default_rng(3)
+    n = 5000
+    df = pd.DataFrame({
+        'event_id': range(n),
+        'timestamp': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 400 * 86400, n), unit='s'),
+        'person_id': rng.choice([f'P{i}' for i in range(800)], n),
+        'door_id': rng.choice([f'D{i}' for i in range(60)], n),
+        'access_result': rng.choice(['Granted', 'Denied'], n, p=[0.9, 0.1]),
+    })
+    config = ChartDataConfig(max_points=50, top_n_categories=10, max_scatter_points=100,
+                             point_budgets={'success_trend': 30})
+    charts = SecurityChartsGenerator(config).generate_all_charts(df)
+
+    assert len(charts['security_overview']['success_trend'].data[0].x) <= 30
+    assert all(len(trace.x) <= 50 for trace in charts['temporal_analysis']['time_series'].data)
+    assert len(charts['user_activity']['user_distribution'].data[0].y) == config.histogram_bins
+    assert len(charts['user_activity']['user_behavior'].data[0].x) == 100
+    door_usage = charts['door_analysis']['door_usage'].data[0]
+    assert len(door_usage.x) == 11 and door_usage.x[-1] == 'Other'
+    assert sum(door_usage.y) == n
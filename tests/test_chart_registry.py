@@ -0,0 +1,57 @@
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from analytics.chart_registry import ChartGroup, ChartRegistry, get_chart_registry
+from analytics.interactive_charts import SecurityChartsGenerator
+
+
+def sample_df(n=200):
+    return pd.DataFrame({
+        'event_id': range(n),
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='37min'),
+        'person_id': [f'P{i % 17}' for i in range(n)],
+        'door_id': [f'DOOR00{i % 5 + 1}' for i in range(n)],
+        'access_result': ['Denied' if i % 9 == 0 else 'Granted' for i in range(n)],
+    })
+
+
+def test_default_registry_covers_all_groups():
+    registry = get_chart_registry()
+    assert registry.groups() == [
+        'onion_model', 'security_overview', 'temporal_analysis', 'user_activity',
+        'door_analysis', 'risk_dashboard', 'anomaly_visualization', 'compliance_metrics',
+    ]
+    assert 'security_overview.activity_heatmap' in registry.chart_ids()
+    with pytest.raises(KeyError):
+        registry.resolve('missing.chart')
+
+
+def test_render_chart_memoizes_groups_per_dataset():
+    calls = []
+    registry = ChartRegistry()
+    registry.register(ChartGroup('volume', ('daily',), lambda gen, df: calls.append(1) or {
+        'daily': go.Figure(go.Bar(y=df.groupby('date').size().values))
+    }))
+    generator = SecurityChartsGenerator(registry=registry)
+
+    dataset_id = generator.register_dataset(sample_df())
+    assert calls == []
+    first = generator.render_chart('volume.daily', dataset_id)
+    assert generator.render_chart('volume.daily', df=sample_df()) is first
+    assert calls == [1]
+
+    generator.render_chart('volume.daily', df=sample_df(300))
+    assert calls == [1, 1]
+
+
+def test_eviction_and_generate_all_charts():
+    generator = SecurityChartsGenerator(cache_size=1)
+    first = generator.register_dataset(sample_df())
+    generator.register_dataset(sample_df(150))
+    with pytest.raises(KeyError):
+        generator.render_chart('risk_dashboard.risk_gauge', first)
+
+    charts = generator.generate_all_charts(sample_df())
+    assert set(charts) == set(get_chart_registry().groups())
+    assert generator.render_chart('compliance_metrics.badge_compliance', df=sample_df()) is None
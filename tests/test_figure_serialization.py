@@ -0,0 +1,90 @@
+import base64
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+from core import figure_serialization
+from core.figure_serialization import (
+    FigureSerializer,
+    compact_figure,
+    encode_typed_array,
+    plotly_supports_typed_arrays,
+)
+from core.json_serialization_plugin import JsonSerializationConfig, YosaiJSONEncoder
+
+DTYPES = {'i1': np.int8, 'u1': np.uint8, 'i2': np.int16, 'u2': np.uint16,
+          'i4': np.int32, 'u4': np.uint32, 'f4': np.float32, 'f8': np.float64}
+
+
+@pytest.fixture
+def typed_arrays(monkeypatch):
+    monkeypatch.setattr(figure_serialization, 'TYPED_ARRAYS_SUPPORTED', True)
+
+
+def decode(spec):
+    values = np.frombuffer(base64.b64decode(spec['bdata']), dtype=DTYPES[spec['dtype']])
+    if 'shape' in spec:
+        values = values.reshape([int(n) for n in spec['shape'].split(',')])
+    return values
+
+
+def test_typed_arrays_round_trip_with_narrow_dtypes():
+    assert encode_typed_array(np.arange(100))['dtype'] == 'i1'
+    assert encode_typed_array(np.array([0, 70000]))['dtype'] == 'i4'
+    assert encode_typed_array(np.array([2 ** 40]))['dtype'] == 'f8'
+
+    z = np.arange(7 * 24).reshape(7, 24) * 1000
+    spec = encode_typed_array(z)
+    assert spec['shape'] == '7,24'
+    assert np.array_equal(decode(spec), z)
+
+
+def test_compact_figure_encodes_only_long_numeric_arrays(typed_arrays):
+    y = np.random.default_rng(0).normal(size=200)
+    figure = go.Figure(go.Scatter(x=[f'd{i}' for i in range(200)], y=y))
+    figure.add_trace(go.Bar(x=['a', 'b'], y=[1, 2]))
+    data = compact_figure(figure)['data']
+    assert data[0]['x'][0] == 'd0'
+    assert np.allclose(decode(data[0]['y']), y)
+    assert data[1]['y'] == [1, 2]
+
+
+def test_serializer_caches_per_figure_id(typed_arrays):
+    figure = go.Figure(go.Heatmap(z=np.ones((30, 24))))
+    serializer = FigureSerializer()
+    payload = serializer.to_json(figure, 'heatmap')
+    assert serializer.to_json(go.Figure(), 'heatmap') is payload
+    assert serializer.stats()['hits'] == 1
+    assert len(payload) < len(figure.to_json())
+    serializer.invalidate('heatmap')
+    assert serializer.stats()['cached_figures'] == 0
+
+
+def test_encoder_compact_figures_opt_in(typed_arrays):
+    figure = go.Figure(go.Scatter(y=np.arange(50)))
+    default = json.loads(json.dumps(figure, cls=YosaiJSONEncoder))
+    assert default['data'][0]['y'] == list(range(50))
+    compact = json.loads(json.dumps(figure, cls=YosaiJSONEncoder,
+                                    config=JsonSerializationConfig(compact_figures=True)))
+    assert compact['data'][0]['y']['dtype'] == 'i1'
+
+
+def test_typed_arrays_need_plotly_5_19():
+    assert not plotly_supports_typed_arrays('5.15.0')
+    assert plotly_supports_typed_arrays('5.19.0')
+    assert plotly_supports_typed_arrays('6.0.1')
+
+    root = Path(__file__).resolve().parents[1]
+    for requirements in ('requirements.txt', 'requirements_ui.txt'):
+        pinned = re.search(r'^plotly==(\S+)', (root / requirements).read_text(), re.M).group(1)
+        assert plotly_supports_typed_arrays(pinned), requirements
+
+
+def test_compact_figure_sends_lists_to_older_plotly(monkeypatch):
+    monkeypatch.setattr(figure_serialization, 'TYPED_ARRAYS_SUPPORTED', False)
+    data = compact_figure(go.Figure(go.Scatter(y=np.arange(50))))['data']
+    assert data[0]['y'] == list(range(50))
@@ -46,3 +46,25 @@ def test_oversized_file_rejected(tmp_path):
     assert result["success"] is False
 
 
+def test_csv_format_sniffed_from_sample(tmp_path):
+    from services.file_format import detect_csv_format
+
+    path = tmp_path / "export.csv"
+    rows = ['person id;device name;access result;timestamp']
+    rows += [f'EMP{i};"Café; Door {i % 3}";Access Granted;2024-01-01 10:00:{i % 60:02d}'
+             for i in range(200)]
+    path.write_bytes(("\r\n".join(rows) + "\r\n").encode("cp1252"))
+
+    fmt = detect_csv_format(str(path), sample_bytes=4096)
+    assert fmt.delimiter == ";" and fmt.has_header
+    assert fmt.encoding != "utf-8"
+    assert fmt.columns == ["person id", "device name", "access result", "timestamp"]
+
+    processor = FileProcessor(upload_folder=str(tmp_path / "uploads"), allowed_extensions={"csv"})
+    result = processor.process_file(path.read_bytes(), "export.csv")
+    assert result["success"] is True and result["rows"] == 200
+    assert result["data"]["device name"].iloc[1] == "Café; Door 1"
+
+    headerless = tmp_path / "headerless.csv"
+    headerless.write_text("1,2,3\n4,5,6\n7,8,9\n")
+    assert detect_csv_format(str(headerless)).has_header is False
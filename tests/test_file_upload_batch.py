@@ -0,0 +1,71 @@
+import base64
+
+import pandas as pd
+
+from core.job_queue import create_job_queue
+from pages.file_upload import callbacks
+from services.file_processor_service import PREVIEW_ROWS, process_upload
+
+
+def upload_contents(df: pd.DataFrame) -> str:
+    encoded = base64.b64encode(df.to_csv(index=False).encode()).decode()
+    return f"data:text/csv;base64,{encoded}"
+
+
+def test_process_upload_returns_head_slice_only():
+    df = pd.DataFrame({"person_id": [f"u{i}" for i in range(50)], "door_id": "d1"})
+    stages = []
+
+    result = process_upload(upload_contents(df), "big.csv",
+                            progress=lambda percent, stage: stages.append(stage))
+
+    assert result["success"] and result["rows"] == 50
+    assert result["columns"] == ["person_id", "door_id"]
+    assert len(result["preview"]) == PREVIEW_ROWS
+    assert stages[-1] == "Building preview"
+
+
+def test_batch_results_keep_upload_order(monkeypatch):
+    monkeypatch.setattr(callbacks, "_upload_queue",
+                        create_job_queue(executor="thread", max_workers=3))
+    files = {
+        f"file_{i}.csv": pd.DataFrame({"person_id": ["u1"] * (i + 1), "door_id": "d1"})
+        for i in range(4)
+    }
+    contents = [upload_contents(df) for df in files.values()] + ["data:text/csv;base64,AAAA"]
+    filenames = list(files) + ["bad.txt"]
+
+    _, _, _, batch, finished = callbacks.handle_file_upload_simple(contents, filenames)
+    for job in batch["jobs"]:
+        callbacks.get_upload_queue().wait(job["job_id"], timeout=10)
+    alerts, previews, file_info, finished = callbacks.upload_batch_display(batch["jobs"])
+
+    assert finished
+    assert [job["filename"] for job in batch["jobs"]] == filenames
+    assert list(file_info) == list(files)
+    assert [info["rows"] for info in file_info.values()] == [1, 2, 3, 4]
+    assert len(previews) == 4
+    assert alerts[-1].color == "danger"
+
+
+def test_batch_can_be_polled_from_another_worker(monkeypatch, tmp_path):
+    store_path = tmp_path / "upload_jobs.db"
+    owner = create_job_queue(executor="thread", store_path=store_path,
+                             keep_payloads=False, recover=False)
+    monkeypatch.setattr(callbacks, "_upload_queue", owner)
+    frames = [pd.DataFrame({"person_id": ["u1"] * n, "door_id": "d1"}) for n in (2, 3)]
+    jobs = callbacks.submit_upload_batch([upload_contents(df) for df in frames],
+                                         ["a.csv", "b.csv"])
+    for job in jobs:
+        owner.wait(job["job_id"], timeout=10)
+
+    # The next poll lands on a worker that did not run the batch
+    poller = create_job_queue(executor="thread", store_path=store_path, recover=False)
+    monkeypatch.setattr(callbacks, "_upload_queue", poller)
+    alerts, previews, file_info, finished = callbacks.upload_batch_display(jobs)
+
+    assert finished
+    assert [info["rows"] for info in file_info.values()] == [2, 3]
+    assert all(alert.color == "success" for alert in alerts)
+    owner.shutdown()
+    poller.shutdown()
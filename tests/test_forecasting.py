@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from analytics.access_trends import AccessTrendsAnalyzer
+from analytics.forecasting import SeasonalForecaster, build_series_matrix
+
+
+def weekly_matrix(series=20, days=56):
+    rng = np.random.default_rng(0)
+    t = np.arange(days)
+    values = 40 + 30 * (t % 7 < 5) + rng.normal(0, 1, (series, days))
+    return pd.DataFrame(values, columns=pd.date_range("2024-01-01", periods=days, freq="D"))
+
+
+def events_df(days=28):
+    timestamps = []
+    for day in pd.date_range("2024-01-01", periods=days, freq="D"):
+        count = 20 if day.weekday() < 5 else 4
+        timestamps.extend(day + pd.to_timedelta(np.linspace(8, 17, count), unit="h"))
+    n = len(timestamps)
+    return pd.DataFrame(
+        {
+            "event_id": range(n),
+            "timestamp": timestamps,
+            "person_id": [f"U{i % 7}" for i in range(n)],
+            "door_id": [f"D{i % 3}" for i in range(n)],
+            "access_result": "Granted",
+        }
+    )
+
+
+def test_holt_winters_follows_weekly_seasonality():
+    matrix = weekly_matrix()
+    result = SeasonalForecaster().forecast_matrix(matrix, horizon=7, freq="D")
+
+    assert result.state.method == "holt_winters"
+    assert result.mean.shape == (20, 7)
+    weekdays = result.index.weekday < 5
+    assert result.mean[:, weekdays].mean() > result.mean[:, ~weekdays].mean() + 20
+    assert np.all(result.lower <= result.mean) and np.all(result.mean <= result.upper)
+
+
+def test_fitted_state_is_cached_by_fingerprint():
+    forecaster = SeasonalForecaster()
+    matrix = weekly_matrix()
+
+    first = forecaster.fit(matrix.to_numpy(), 7)
+    assert forecaster.fit(matrix.to_numpy(), 7) is first
+
+    changed = matrix.to_numpy().copy()
+    changed[0, -1] += 1
+    assert forecaster.fit(changed, 7) is not first
+
+
+def test_short_series_fall_back():
+    forecaster = SeasonalForecaster()
+    matrix = weekly_matrix(days=10)
+    assert forecaster.forecast_matrix(matrix, 7).state.method == "seasonal_naive"
+    assert forecaster.forecast_matrix(matrix.iloc[:, :5], 7).state.method == "drift"
+
+
+def test_build_series_matrix_fills_gaps():
+    df = pd.DataFrame(
+        {"timestamp": ["2024-01-01 10:00", "2024-01-03 11:00"], "door_id": ["D1", "D2"]}
+    )
+    matrix = build_series_matrix(df, freq="D", key="door_id")
+    assert matrix.shape == (2, 3)
+    assert matrix.loc["D1"].tolist() == [1, 0, 0]
+
+
+def test_trends_analyzer_forecasts():
+    analyzer = AccessTrendsAnalyzer(forecaster=SeasonalForecaster())
+    df = analyzer._prepare_data(events_df())
+
+    forecasts = analyzer._generate_forecasts(df)
+    assert forecasts["forecast_available"]
+    assert len(forecasts["next_7_days_forecast"]) == 7
+    assert len(forecasts["next_24_hours_forecast"]) == 24
+
+    per_door = analyzer.forecast_by_entity(df, "door_id", horizon=7)
+    assert set(per_door["series_id"]) == {"D0", "D1", "D2"}
+    assert len(per_door) == 21
@@ -0,0 +1,137 @@
+import operator
+import threading
+
+import numpy as np
+import pandas as pd
+
+from analytics.analysis_jobs import analysis_job_key, run_deep_analysis
+from core.job_queue import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    Job,
+    SqliteJobStore,
+    create_job_queue,
+)
+
+
+def slow_square(value, release, progress=None):
+    progress(50, "halfway")
+    release.wait(5)
+    return value * value
+
+
+def failing_job():
+    raise RuntimeError("boom")
+
+
+def sample_events(n=500):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "timestamp": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 14 * 86400, n), unit="s"),
+        "person_id": rng.choice(["u1", "u2", "u3", "u4"], n),
+        "door_id": rng.choice(["d1", "d2"], n),
+        "access_result": rng.choice(["Granted", "Denied"], n, p=[0.8, 0.2]),
+    })
+
+
+def test_identical_jobs_coalesce_and_report_progress():
+    job_queue = create_job_queue(executor="thread", max_workers=2)
+    release = threading.Event()
+    first = job_queue.submit(slow_square, 7, release, key="square:7")
+    second = job_queue.submit(slow_square, 7, release, key="square:7")
+    assert second.job_id == first.job_id
+
+    for _ in range(100):
+        if job_queue.status(first.job_id)["progress"] == 50:
+            break
+        release.wait(0.02)
+    status = job_queue.status(first.job_id)
+    assert status["stage"] == "halfway" and "result" not in status
+
+    release.set()
+    assert job_queue.wait(first.job_id, timeout=5).status == JOB_COMPLETED
+    assert job_queue.result(first.job_id) == 49
+    assert job_queue.submit(slow_square, 7, release, key="square:7").job_id == first.job_id
+
+    failed = job_queue.submit(failing_job)
+    assert job_queue.wait(failed.job_id, timeout=5).status == JOB_FAILED
+    assert "boom" in job_queue.status(failed.job_id)["error"]
+    job_queue.shutdown()
+
+
+def test_durable_store_requeues_unfinished_jobs(tmp_path):
+    store = SqliteJobStore(tmp_path / "jobs.db")
+    store.save(Job(job_id="pending", func_path="_operator:add", key="add"), ((2, 3), {}))
+
+    job_queue = create_job_queue(executor="thread", store=SqliteJobStore(tmp_path / "jobs.db"))
+    assert job_queue.wait("pending", timeout=5).status == JOB_COMPLETED
+    assert job_queue.find("add").result == 5
+    job_queue.shutdown()
+
+    restored = {job.job_id: job for job, _ in store.load()}
+    assert restored["pending"].status == JOB_COMPLETED and restored["pending"].result == 5
+    store.close()
+
+
+def test_deep_analysis_runs_in_worker_process():
+    df = sample_events()
+    job_queue = create_job_queue(executor="process", max_workers=1)
+    job = job_queue.submit(run_deep_analysis, df, "security", key=analysis_job_key("security", df))
+    assert job_queue.submit(operator.add, 1, 2, key=analysis_job_key("security", df)) is job
+
+    finished = job_queue.wait(job.job_id, timeout=120)
+    job_queue.shutdown()
+    assert finished.status == JOB_COMPLETED, finished.error
+    result = finished.result
+    assert result["total_events"] == len(df)
+    assert result["unique_users"] == 4
+    assert result["failed_attempts"] == int((df["access_result"] == "Denied").sum())
+    assert analysis_job_key("security", df) != analysis_job_key("trends", df)
+
+
+def test_shared_store_serves_jobs_of_other_processes(tmp_path):
+    path = tmp_path / "jobs.db"
+    owner = create_job_queue(executor="thread", store_path=path, keep_payloads=False)
+    # A second web worker polling the same store, without re-queuing its jobs
+    poller = create_job_queue(executor="thread", store_path=path, recover=False)
+    release = threading.Event()
+    job = owner.submit(slow_square, 6, release)
+
+    for _ in range(100):
+        status = poller.status(job.job_id)
+        if status is not None and status["progress"] == 50:
+            break
+        release.wait(0.02)
+    assert poller.status(job.job_id)["stage"] == "halfway"
+
+    release.set()
+    owner.wait(job.job_id, timeout=5)
+    assert poller.status(job.job_id)["status"] == JOB_COMPLETED
+    assert poller.result(job.job_id) == 36
+    assert owner.store.load()[0][1] is None
+    owner.shutdown()
+    poller.shutdown()
+
+
+def test_identical_jobs_coalesce_across_processes(tmp_path):
+    path = tmp_path / "jobs.db"
+    owner = create_job_queue(executor="thread", store_path=path, keep_payloads=False)
+    other = create_job_queue(executor="thread", store_path=path,
+                             keep_payloads=False, recover=False)
+    release = threading.Event()
+    job = owner.submit(slow_square, 3, release, key="square-3")
+
+    assert other.submit(slow_square, 3, release, key="square-3").job_id == job.job_id
+    release.set()
+    owner.wait(job.job_id, timeout=5)
+    assert other.find("square-3").status == JOB_COMPLETED
+    assert other.submit(slow_square, 3, release, key="square-3").job_id == job.job_id
+
+    # A stored job that never finished is not reused once stale
+    other.stale_after = 0
+    release.clear()
+    stuck = owner.submit(slow_square, 4, release, key="square-4")
+    assert other.submit(slow_square, 4, release, key="square-4").job_id != stuck.job_id
+    release.set()
+    owner.shutdown()
+    other.shutdown()
@@ -135,6 +135,27 @@ class TestJsonSerializationPlugin(unittest.TestCase):
         self.assertIsInstance(sanitized, str)
         self.assertEqual(sanitized, str(lazy_value))
 
+    def test_sanitize_nested_values(self):
+        """Nested containers are converted to JSON-native values"""
+        import numpy as np
+        from core.json_serialization_plugin import YosaiJSONEncoder
+
+        service = JsonSerializationService(JsonSerializationConfig(max_dataframe_rows=2))
+        df = pd.DataFrame({
+            "n": [1, 2, 3],
+            "t": pd.to_datetime(["2024-01-01 10:00:00"] * 3),
+            "o": [np.int64(1), {"k": np.float64(0.5)}, None],
+        })
+        result = service.sanitize_for_transport({"frame": df, (1, 2): np.arange(2), "when": datetime(2024, 1, 1)})
+
+        frame = result["frame"]
+        self.assertEqual(frame["columns"], ["n", "t", "o"])
+        self.assertEqual(frame["data"], [[1, "2024-01-01T10:00:00", 1], [2, "2024-01-01T10:00:00", {"k": 0.5}]])
+        self.assertEqual(result["(1, 2)"], [0, 1])
+        self.assertEqual(result["when"], "2024-01-01T00:00:00")
+        self.assertEqual(json.loads(json.dumps(result)), json.loads(service.serialize(result)))
+        self.assertIn(pd.DataFrame, YosaiJSONEncoder._handler_cache)
+
 
 class TestPluginManager(unittest.TestCase):
     """Test plugin manager with JSON serialization plugin"""
@@ -1,78 +1,146 @@
 import importlib
 import json
-import io
 import sys
+import threading
+import time
 import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
+from core.jwks import create_jwks_manager
 
-def setup_auth(monkeypatch):
-    # stub jose.jwt before importing core.auth
-    jwt_stub = types.SimpleNamespace(
-        decode=lambda *a, **kw: {"decoded": True},
-        get_unverified_header=lambda token: {"kid": "testkey"},
-    )
-    jose_stub = types.SimpleNamespace(jwt=jwt_stub)
-    monkeypatch.setitem(sys.modules, "jose", jose_stub)
-    monkeypatch.setitem(sys.modules, "jose.jwt", jwt_stub)
-
-    module = importlib.import_module("core.auth")
-    importlib.reload(module)
-    return module
-
-
-class FakeResp(io.BytesIO):
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        pass
 
+class JWKSServer:
+    """Local stand-in for an issuer's ``/.well-known/jwks.json``"""
 
-def test_jwks_cached(monkeypatch):
-    auth = setup_auth(monkeypatch)
-    jwks = {"keys": [{"kid": "testkey"}]}
-    count = {"calls": 0}
+    def __init__(self, jwks, delay=0.0):
+        self.jwks = jwks
+        self.delay = delay
+        self.hits = 0
+        stand_in = self
 
-    def fake_urlopen(url):
-        count["calls"] += 1
-        return FakeResp(json.dumps(jwks).encode())
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.hits += 1
+                time.sleep(stand_in.delay)
+                body = json.dumps(stand_in.jwks).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
 
-    monkeypatch.setattr(auth, "urlopen", fake_urlopen)
-    monkeypatch.setenv("JWKS_CACHE_TTL", "100")
+            def log_message(self, *args):
+                pass
 
-    auth._jwks_cache.clear()
-    auth._decode_jwt("t", "example.com", "aud", "cid")
-    auth._decode_jwt("t", "example.com", "aud", "cid")
-    assert count["calls"] == 1
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/.well-known/jwks.json"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
 
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
 
-def test_jwks_cache_expired(monkeypatch):
-    auth = setup_auth(monkeypatch)
-    jwks = {"keys": [{"kid": "testkey"}]}
-    count = {"calls": 0}
 
-    def fake_urlopen(url):
-        count["calls"] += 1
-        return FakeResp(json.dumps(jwks).encode())
+@pytest.fixture
+def rsa_jwk():
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jose import jwk
 
-    monkeypatch.setattr(auth, "urlopen", fake_urlopen)
-    monkeypatch.setenv("JWKS_CACHE_TTL", "1")
-
-    base_time = 1000
-    current = {"t": base_time}
-
-    def fake_time():
-        return current["t"]
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = jwk.construct(pem, "RS256").public_key().to_dict()
+    return pem, {**public, "kid": "k1", "use": "sig"}
+
+
+def test_tokens_verify_with_indexed_keys_and_background_refresh(rsa_jwk):
+    from jose import jwt
+
+    pem, public = rsa_jwk
+    server = JWKSServer({"keys": [public]}, delay=0.2)
+    try:
+        manager = create_jwks_manager(server.url, ttl=0.5, refresh_ahead=1.0)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.get_key("k1")))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert server.hits == 1 and len(results) == 8
+        assert len({id(key) for key in results}) == 1
+
+        token = jwt.encode({"sub": "alice"}, pem, algorithm="RS256", headers={"kid": "k1"})
+        assert jwt.decode(token, manager.get_key("k1"), algorithms=["RS256"])["sub"] == "alice"
+
+        # Expired keys are served while one background fetch revalidates
+        time.sleep(0.6)
+        start = time.perf_counter()
+        for _ in range(5):
+            assert manager.get_key("k1") is results[0]
+        assert time.perf_counter() - start < 0.1
+        time.sleep(0.4)
+        assert server.hits == 2 and manager.get_key("k1") is not results[0]
+    finally:
+        server.close()
+
+
+def test_unknown_kid_refetch_is_rate_limited():
+    server = JWKSServer({"keys": [{"kid": "old"}]})
+    try:
+        manager = create_jwks_manager(server.url, min_refetch_interval=60,
+                                      key_builder=lambda jwk_data: jwk_data["kid"])
+        assert manager.get_key("old") == "old"
+        manager._last_attempt -= 60
+
+        server.jwks = {"keys": [{"kid": "old"}, {"kid": "rotated"}]}
+        assert manager.get_key("rotated") == "rotated"
+        for _ in range(3):
+            with pytest.raises(KeyError):
+                manager.get_key("forged")
+        assert server.hits == 2
+    finally:
+        server.close()
+
+
+def test_fetch_timeout():
+    server = JWKSServer({"keys": []}, delay=1.0)
+    try:
+        manager = create_jwks_manager(server.url, timeout=0.1)
+        start = time.perf_counter()
+        with pytest.raises(OSError):
+            manager.get_jwks()
+        assert time.perf_counter() - start < 0.8
+    finally:
+        server.close()
+
+
+def test_decode_jwt_uses_shared_manager(monkeypatch):
+    # stub jose.jwt before importing core.auth
+    jwt_stub = types.SimpleNamespace(
+        decode=lambda token, key, **kw: {"key": key},
+        get_unverified_header=lambda token: {"kid": "testkey"},
+    )
+    monkeypatch.setitem(sys.modules, "jose", types.SimpleNamespace(jwt=jwt_stub))
+    monkeypatch.setitem(sys.modules, "jose.jwt", jwt_stub)
+    auth = importlib.reload(importlib.import_module("core.auth"))
 
-    monkeypatch.setattr(auth.time, "time", fake_time)
+    calls = []
 
-    auth._jwks_cache.clear()
-    auth._decode_jwt("t", "example.com", "aud", "cid")
-    assert count["calls"] == 1
+    def fetcher(url, timeout):
+        calls.append(url)
+        return {"keys": [{"kid": "testkey"}]}
 
-    current["t"] = base_time + 2
-    auth._decode_jwt("t", "example.com", "aud", "cid")
-    assert count["calls"] == 2
+    manager = create_jwks_manager("https://example.com/.well-known/jwks.json",
+                                  fetcher=fetcher, key_builder=lambda jwk_data: "built")
+    monkeypatch.setitem(sys.modules["core.jwks"]._jwks_managers, "example.com", manager)
 
+    assert auth._decode_jwt("t", "example.com", "aud", "cid") == {"key": "built"}
+    assert auth._decode_jwt("t", "example.com", "aud", "cid") == {"key": "built"}
+    assert calls == ["https://example.com/.well-known/jwks.json"]
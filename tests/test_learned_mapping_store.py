@@ -0,0 +1,81 @@
+import json
+import threading
+
+from services.learned_mapping_store import (
+    LearnedMappingStore,
+    MinHashLSH,
+    read_learned_mappings,
+)
+
+
+def record(columns, name="file.csv"):
+    return {"filename": name, "file_stats": {"columns": columns}}
+
+
+def test_saves_append_and_other_instances_catch_up(tmp_path):
+    path = tmp_path / "learned_mappings.json"
+    first = LearnedMappingStore(path, compact_after=3)
+    second = LearnedMappingStore(path, compact_after=3)
+
+    first.save("a", record(["door_id", "user"]))
+    first.save("b", record(["door_id", "time"]))
+    assert json.loads(path.read_text()) == {"a": record(["door_id", "user"])}
+    assert len(first.log_path.read_text().splitlines()) == 1
+
+    second.refresh()
+    assert set(second.records) == {"a", "b"}
+    assert read_learned_mappings(path) == first.records
+
+    # The third save reaches compact_after and folds the log into the snapshot
+    second.save("c", record(["badge"]))
+    second.save("d", record(["badge", "reader"]))
+    assert set(json.loads(path.read_text())) == {"a", "b", "c", "d"}
+    first.refresh()
+    assert set(first.records) == {"a", "b", "c", "d"}
+
+
+def test_concurrent_writers_do_not_lose_records(tmp_path):
+    path = tmp_path / "learned_mappings.json"
+    stores = [LearnedMappingStore(path, compact_after=7) for _ in range(4)]
+
+    def write(index, store):
+        for n in range(25):
+            store.save(f"{index}-{n}", record([f"col_{n}"]))
+
+    threads = [threading.Thread(target=write, args=item) for item in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(LearnedMappingStore(path)) == 100
+
+
+def test_find_similar_uses_lsh_candidates(tmp_path):
+    store = LearnedMappingStore(tmp_path / "learned_mappings.json")
+    for n in range(300):
+        store.save(f"layout-{n}", record([f"field_{n}_{i}" for i in range(6)]))
+    store.save("target", record(["door_id", "timestamp", "user", "result", "badge"]))
+
+    assert len(store.index.query(["door_id", "timestamp", "user", "result"])) < 10
+    fingerprint, similarity = store.find_similar(["door_id", "timestamp", "user", "result"])
+    assert fingerprint == "target"
+    assert similarity == 0.8
+    assert store.find_similar(["something", "else"]) is None
+
+
+def test_minhash_signature_is_stable_across_instances():
+    columns = ["door_id", "timestamp", "user"]
+    assert (MinHashLSH().signature(columns) == MinHashLSH().signature(columns)).all()
+
+
+def test_lsh_recall_at_the_similarity_threshold():
+    index = MinHashLSH()
+    assert 1 - (1 - 0.7 ** index.rows) ** index.bands > 0.99999
+
+    # Each stored layout has 10 columns; querying 7 of them is 0.7 Jaccard
+    layouts = {f"layout-{n}": [f"col_{n}_{i}" for i in range(10)] for n in range(200)}
+    for key, columns in layouts.items():
+        index.add(key, columns)
+    missed = [key for key, columns in layouts.items() if key not in index.query(columns[:7])]
+    assert missed == []
@@ -0,0 +1,43 @@
+import threading
+
+from core.performance import MetricHistogram, MetricType, PerformanceMonitor
+
+
+def test_histogram_quantiles_and_merge():
+    values = [i / 1000 for i in range(1, 1001)]
+    left, right = MetricHistogram(), MetricHistogram()
+    for value in values[:500]:
+        left.record(value)
+    for value in values[500:]:
+        right.record(value)
+
+    merged = left.copy().merge(right)
+    assert left.count == 500 and merged.count == 1000
+    assert abs(merged.quantile(0.95) - 0.95) <= 0.95 * 0.01 + 1e-9
+    assert merged.summary()["min"] == 0.001 and merged.summary()["max"] == 1.0
+
+
+def test_monitor_summary_and_concurrent_timers():
+    monitor = PerformanceMonitor(max_series=2, background=False)
+    for value in (0.1, 0.2, 0.3):
+        monitor.record_metric("query", value, tags={"db": "main"})
+    monitor.record_metric("rows", 5, MetricType.DATABASE_QUERY)
+    monitor.record_metric("extra", 1.0)
+
+    summary = monitor.get_metrics_summary()
+    assert summary["total_metrics"] == 5
+    assert summary["execution_time"]["count"] == 4
+    assert monitor.get_histogram("query", tags={"db": "main"}).count == 3
+    assert monitor.get_histogram("__other__").count == 1
+
+    monitor = PerformanceMonitor(background=False)
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(monitor.start_timer("load")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(monitor.end_timer(token) >= 0 for token in tokens)
+    assert monitor.get_histogram("load").count == 8
+    assert "load" not in monitor.active_timers
@@ -0,0 +1,63 @@
+from config.cache_manager import CacheConfig, MemoryCacheManager
+from core.rate_limit_store import (
+    CacheRateLimitStore,
+    MemoryRateLimitStore,
+    create_rate_limit_store,
+)
+from core.security import RateLimiter
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_gcra_limits_bursts_and_sweeps_idle_clients(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("core.security.time.time", clock)
+    store = MemoryRateLimitStore(sweep_interval=3600)
+    limiter = RateLimiter(max_requests=5, window_minutes=1, store=store)
+
+    results = [limiter.is_allowed("client") for _ in range(6)]
+    assert [r["allowed"] for r in results] == [True] * 5 + [False]
+    assert results[-2]["remaining"] == 0 and results[-1]["requests_in_window"] == 5
+    assert results[-1]["retry_after"] == 12.0
+
+    clock.now += 12
+    assert limiter.is_allowed("client")["allowed"]
+    assert not limiter.is_allowed("client")["allowed"]
+
+    for i in range(100):
+        limiter.is_allowed(f"one-off-{i}")
+    clock.now += 61
+    assert store.sweep(clock.now) == 101
+    assert len(store) == 0
+
+
+def test_shared_store_limits_across_workers(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("core.security.time.time", clock)
+    cache = MemoryCacheManager(CacheConfig())
+    workers = [RateLimiter(4, 1, store=CacheRateLimitStore(cache)) for _ in range(2)]
+
+    allowed = [workers[i % 2].is_allowed("api")["allowed"] for i in range(6)]
+    assert allowed == [True] * 4 + [False, False]
+
+    for _ in range(4):
+        workers[0].is_allowed("ip-client", source_ip="10.0.0.9")
+    assert not workers[0].is_allowed("ip-client", source_ip="10.0.0.9")["allowed"]
+    blocked = workers[1].is_allowed("fresh-id", source_ip="10.0.0.9")
+    assert blocked["reason"] == "IP temporarily blocked" and blocked["retry_after"] > 0
+
+
+def test_cache_backend_requires_a_shared_cache():
+    memory_cache = MemoryCacheManager(CacheConfig())
+    assert isinstance(create_rate_limit_store("cache", cache=memory_cache), MemoryRateLimitStore)
+
+    class SharedCache:
+        redis_client = None
+
+    assert isinstance(create_rate_limit_store("cache", cache=SharedCache()), CacheRateLimitStore)
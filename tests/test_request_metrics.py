@@ -0,0 +1,73 @@
+import pytest
+from dash import Dash, Input, Output
+from dash.exceptions import PreventUpdate
+from flask import Flask
+
+from core.request_metrics import (
+    CALLBACK_METRIC,
+    OVERFLOW_LABEL,
+    REQUEST_METRIC,
+    create_request_metrics,
+    install_request_metrics,
+)
+from core.unified_callback_coordinator import UnifiedCallbackCoordinator
+
+
+def test_metrics_endpoint_exposes_route_histograms():
+    server = Flask(__name__)
+
+    @server.route("/items/<int:item_id>")
+    def item(item_id):
+        return {"id": item_id}
+
+    metrics = install_request_metrics(server, create_request_metrics(forward_to_monitor=False))
+    client = server.test_client()
+    for item_id in range(5):
+        client.get(f"/items/{item_id}")
+    client.get("/missing")
+
+    series = {tuple(sorted(s["labels"].items())): s for s in metrics.snapshot()[REQUEST_METRIC]}
+    assert series[(("method", "GET"), ("route", "/items/<int:item_id>"), ("status", "200"))]["count"] == 5
+    assert series[(("method", "GET"), ("route", "<unmatched>"), ("status", "404"))]["count"] == 1
+
+    response = client.get("/metrics")
+    body = response.get_data(as_text=True)
+    assert response.content_type.startswith("text/plain")
+    assert f"# TYPE {REQUEST_METRIC} histogram" in body
+    assert f'{REQUEST_METRIC}_bucket{{method="GET",route="/items/<int:item_id>",status="200",le="+Inf"}} 5' in body
+    assert f'{REQUEST_METRIC}_count{{method="GET",route="<unmatched>",status="404"}} 1' in body
+
+
+def test_label_cardinality_is_bounded():
+    metrics = create_request_metrics(max_series=3, forward_to_monitor=False)
+    for i in range(10):
+        metrics.record_callback(f"cb-{i}", 0.01 * i, True)
+
+    series = metrics.snapshot()[CALLBACK_METRIC]
+    assert len(series) == 4
+    other = [s for s in series if s["labels"]["callback_id"] == OVERFLOW_LABEL]
+    assert other[0]["count"] == 7 and other[0]["labels"]["outcome"] == OVERFLOW_LABEL
+    assert other[0]["buckets"][-1][1] == 7
+
+
+def test_coordinator_times_callbacks(monkeypatch):
+    metrics = create_request_metrics(forward_to_monitor=False)
+    monkeypatch.setattr("core.request_metrics._request_metrics", metrics)
+    app = Dash(__name__)
+    coord = UnifiedCallbackCoordinator(app)
+
+    @coord.register_callback(Output("out", "children"), Input("in", "value"),
+                             callback_id="echo", component_name="test")
+    def echo(value):
+        if value is None:
+            raise PreventUpdate
+        return value
+
+    callback = app.callback_map["out.children"]["callback"]
+    callback("hi", outputs_list={"id": "out", "property": "children"})
+    with pytest.raises(PreventUpdate):
+        callback(None, outputs_list={"id": "out", "property": "children"})
+
+    (series,) = metrics.snapshot()[CALLBACK_METRIC]
+    assert series["labels"] == {"callback_id": "echo", "outcome": "success"}
+    assert series["count"] == 2
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from analytics.access_trends import AccessTrendsAnalyzer
+from analytics.rolling_stats import (
+    ewma,
+    rolling_frame,
+    rolling_mean,
+    rolling_slope,
+    rolling_std,
+    rolling_zscore,
+)
+
+
+def series(n=120):
+    return np.random.default_rng(0).normal(1000, 50, n)
+
+
+def test_rolling_moments_match_pandas():
+    values = series()
+    reference = pd.Series(values).rolling(14)
+    assert np.allclose(rolling_mean(values, 14, 14), reference.mean(), equal_nan=True)
+    assert np.allclose(rolling_std(values, 14, 14), reference.std(), equal_nan=True)
+    assert np.allclose(ewma(values, span=10), pd.Series(values).ewm(span=10, adjust=False).mean())
+
+
+def test_rolling_slope_matches_polyfit():
+    values = series()
+    expected = [np.polyfit(np.arange(14), values[i - 13:i + 1], 1)[0] for i in range(13, len(values))]
+    assert np.allclose(rolling_slope(values, 14)[13:], expected)
+
+
+def test_rolling_zscore_uses_trailing_baseline():
+    values = np.concatenate([np.full(20, 100.0) + np.arange(20) % 3, [400.0]])
+    z = rolling_zscore(values, 14)
+    assert np.isnan(z[:7]).all()
+    assert z[-1] > 10
+
+    # Short series fall back to global z-scores
+    assert np.allclose(rolling_zscore([1, 2, 3], 14), [-1.2247449, 0, 1.2247449])
+
+
+def test_rolling_stats_handle_matrices():
+    matrix = np.stack([series(), series() * 2], axis=1)
+    assert rolling_mean(matrix, 7).shape == matrix.shape
+    assert np.allclose(rolling_slope(matrix, 7)[:, 1], rolling_slope(matrix[:, 1], 7), equal_nan=True)
+
+
+def test_volume_trends_expose_rolling_columns():
+    days = pd.date_range("2024-01-01", periods=40, freq="D")
+    counts = [20 + i % 3 for i in range(39)] + [200]
+    timestamps = [day + pd.Timedelta(minutes=i) for day, count in zip(days, counts) for i in range(count)]
+    df = pd.DataFrame(
+        {
+            "event_id": range(len(timestamps)),
+            "timestamp": timestamps,
+            "person_id": "U1",
+            "door_id": "D1",
+            "access_result": "Granted",
+        }
+    )
+    analyzer = AccessTrendsAnalyzer(rolling_window=14)
+    volume = analyzer._analyze_volume_trends(analyzer._prepare_data(df))
+
+    assert "rolling_zscore" in volume["daily_volumes"]
+    assert "rolling_slope" in volume["daily_volumes"]
+    assert [a["type"] for a in volume["volume_anomalies"]] == ["high"]
+    assert rolling_frame(pd.Series(counts), 14)["rolling_slope"].iloc[-1] > 0
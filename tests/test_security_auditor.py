@@ -0,0 +1,54 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+from core.audit_sink import JsonlAuditSink, SQLiteAuditSink
+from core.security import SecurityAuditor, SecurityLevel
+
+
+def test_ring_buffer_and_bucketed_summary(monkeypatch):
+    auditor = SecurityAuditor(max_events=50)
+    for i in range(120):
+        auditor.log_security_event(
+            "rate_limit_exceeded" if i % 2 else "input_validation_failed",
+            SecurityLevel.HIGH if i % 40 == 0 else SecurityLevel.LOW,
+            {"i": i}, source_ip=f"10.0.0.{i % 7}", blocked=i % 3 == 0,
+        )
+    assert len(auditor.events) == 50 and auditor.events[0].details == {"i": 70}
+
+    summary = auditor.get_security_summary()
+    assert summary["total_events"] == 120
+    assert summary["by_severity"] == {"low": 117, "medium": 0, "high": 3, "critical": 0}
+    assert summary["by_type"] == {"input_validation_failed": 60, "rate_limit_exceeded": 60}
+    assert summary["blocked_events"] == 40 and summary["unique_ips"] == 7
+    assert [e["details"]["i"] for e in summary["high_severity_events"]] == [0, 40, 80]
+
+    class Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(hours=2)
+
+    monkeypatch.setattr("core.security.datetime", Later)
+    assert auditor.get_security_summary(hours=1) == {"total_events": 0}
+    assert auditor.get_security_summary(hours=3)["total_events"] == 120
+
+def test_sinks_write_batches_off_thread(tmp_path):
+    jsonl = JsonlAuditSink(tmp_path / "audit.jsonl", batch_size=8, flush_interval=0.05)
+    sqlite_sink = SQLiteAuditSink(tmp_path / "audit.db", batch_size=8, flush_interval=0.05)
+    for sink in (jsonl, sqlite_sink):
+        auditor = SecurityAuditor(sink=sink)
+        for i in range(20):
+            auditor.log_security_event("login_failed", SecurityLevel.MEDIUM, {"attempt": i},
+                                       user_id="alice")
+        sink.close()
+        assert sink.written == 20 and sink.dropped == 0
+
+    lines = (tmp_path / "audit.jsonl").read_text().splitlines()
+    assert len(lines) == 20 and json.loads(lines[-1])["details"] == {"attempt": 19}
+    assert datetime.fromisoformat(json.loads(lines[0])["timestamp"])
+
+    with sqlite3.connect(tmp_path / "audit.db") as connection:
+        rows = connection.execute(
+            "SELECT severity, user_id, details FROM security_events"
+        ).fetchall()
+    assert len(rows) == 20 and rows[0][:2] == ("medium", "alice")
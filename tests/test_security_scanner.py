@@ -0,0 +1,68 @@
+import re
+
+import pytest
+from flask import Flask
+
+from core.security import InputValidator as CoreInputValidator
+from core.security_scanner import (
+    DEFAULT_RULES,
+    encode_html_entities,
+    get_security_scanner,
+)
+from security.input_validator import InputValidator
+from security.validation_exceptions import ValidationError
+from security.validation_middleware import ValidationMiddleware
+
+SAMPLES = [
+    "Main Entrance Door 3",
+    "1' OR 1=1 --",
+    "UNION ALL SELECT password FROM users",
+    "<SCRIPT>alert('x')</SCRIPT>",
+    "<img src=x OnError=alert(1)>",
+    "..%2F..%2Fetc/passwd",
+    "JavaScript:void(0)",
+    "Robert'); DROP TABLE students;",
+    "status: Granted & badge=valid",
+]
+
+
+def test_scan_matches_per_pattern_ignorecase_search():
+    scanner = get_security_scanner()
+    for text in SAMPLES:
+        expected = {
+            category: [p for p in patterns if re.search(p, text, re.IGNORECASE)]
+            for category, patterns in DEFAULT_RULES.items()
+        }
+        expected = {category: found for category, found in expected.items() if found}
+        assert scanner.scan(text).matches == expected, text
+
+    result = scanner.scan("<script>x</script> ../secret -- ")
+    assert result.categories == ["sql", "xss", "path"]
+    assert scanner.first_match("door 3") is None
+    assert scanner.scan("'; drop table x", categories=["xss"]).clean
+
+
+def test_validators_share_scanner_results():
+    result = CoreInputValidator().validate_input("<b>1' OR 1=1 --</b>\x00", "comment")
+    assert not result["valid"]
+    assert any(issue.startswith("Potential SQL injection detected") for issue in result["issues"])
+    assert result["sanitized"] == "&lt;b&gt;1&#x27; OR 1=1 --&lt;&#x2F;b&gt;"
+    assert encode_html_entities("a\x00&b", strip_nulls=True) == "a&amp;b"
+
+    with pytest.raises(ValidationError):
+        InputValidator(get_security_scanner()).validate("../../etc/passwd")
+    assert InputValidator().validate("../../etc/passwd") == "../../etc/passwd"
+
+
+def test_middleware_uses_configured_scanner():
+    app = Flask(__name__)
+    middleware = ValidationMiddleware(scanner=get_security_scanner())
+    app.before_request(middleware.validate_request)
+
+    @app.route("/")
+    def index():
+        return "ok"
+
+    client = app.test_client()
+    assert client.get("/?door=North+Gate").status_code == 200
+    assert client.get("/?q=1%20union%20select%20password").status_code == 400
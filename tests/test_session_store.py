@@ -0,0 +1,75 @@
+from config.cache_manager import CacheConfig, MemoryCacheManager
+from core.session_store import (
+    CacheSessionBackend,
+    SQLiteSessionBackend,
+    UserSessionStore,
+)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+USER = {"name": "Alice", "email": "alice@example.com", "roles": ["admin"]}
+
+
+def test_sessions_are_shared_between_workers(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("core.session_store.time.time", clock)
+    backends = [
+        lambda: SQLiteSessionBackend(tmp_path / "sessions.db"),
+        (lambda cache: lambda: CacheSessionBackend(cache))(MemoryCacheManager(CacheConfig())),
+    ]
+    for make_backend in backends:
+        first = UserSessionStore(make_backend(), ttl=600, local_ttl=5)
+        second = UserSessionStore(make_backend(), ttl=600, local_ttl=5)
+
+        first.save("auth0|alice", USER)
+        assert second.load("auth0|alice") == USER
+
+        # Logout in one worker is seen by the other once its LRU entry is stale
+        first.delete("auth0|alice")
+        assert second.load("auth0|alice") == USER
+        clock.now += 6
+        assert second.load("auth0|alice") is None
+
+
+def test_sliding_expiry_with_batched_touches(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("core.session_store.time.time", clock)
+    backend = SQLiteSessionBackend(tmp_path / "sessions.db")
+    writes = []
+    original = backend.touch_many
+    monkeypatch.setattr(backend, "touch_many", lambda expiries: writes.append(dict(expiries)) or original(expiries))
+    store = UserSessionStore(backend, ttl=300, local_ttl=30, touch_interval=60)
+    for i in range(5):
+        store.save(f"user-{i}", USER)
+
+    # Active users keep their sessions; one batch per touch interval
+    for _ in range(8):
+        clock.now += 50
+        for i in range(4):
+            assert store.load(f"user-{i}") == USER
+    assert len(writes) == 4 and sum(len(batch) for batch in writes) == 13
+
+    assert store.load("user-4") is None
+    assert store.sweep() == 0
+    restarted = UserSessionStore(SQLiteSessionBackend(tmp_path / "sessions.db"), ttl=300)
+    assert restarted.load("user-0") == USER
+    clock.now += 301
+    assert restarted.sweep() == 4
+
+
+def test_logout_ends_only_that_login(tmp_path):
+    store = UserSessionStore(SQLiteSessionBackend(tmp_path / "sessions.db"), ttl=600)
+    # The same user logged in from two browsers
+    store.save("session-laptop", dict(USER, user_id="auth0|alice"))
+    store.save("session-phone", dict(USER, user_id="auth0|alice"))
+
+    store.delete("session-laptop")
+    assert store.load("session-laptop") is None
+    assert store.load("session-phone")["user_id"] == "auth0|alice"
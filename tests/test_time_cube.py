@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.sketches import HyperLogLog
+from analytics.time_cube import LEVELS, TimeBucketCube, TimeCubeCache
+
+
+def events(n=20000, days=21):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        'event_id': range(n),
+        'timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, days * 86400, n), unit='s'),
+        'person_id': rng.choice([f'P{i}' for i in range(400)], n),
+        'door_id': rng.choice([f'D{i}' for i in range(12)], n),
+        'access_result': rng.choice(['Granted', 'Denied'], n, p=[0.8, 0.2]),
+    })
+
+
+def test_levels_roll_up_to_exact_counts():
+    df = events()
+    cube = TimeBucketCube.build(df)
+    floors = {'minute': 'min', 'quarter_hour': '15min', 'hour': 'H', 'day': 'D'}
+    for level, freq in floors.items():
+        expected = df.groupby(df['timestamp'].dt.floor(freq)).agg(
+            count=('event_id', 'size'),
+            granted=('access_result', lambda x: (x == 'Granted').sum()),
+            doors=('door_id', 'nunique'),
+        )
+        totals = cube.totals(level)
+        assert (totals['count'].to_numpy() == expected['count'].to_numpy()).all()
+        assert (totals['granted'].to_numpy() == expected['granted'].to_numpy()).all()
+        assert (totals['doors'].to_numpy() == expected['doors'].to_numpy()).all()
+    weeks = cube.totals('week')
+    assert (weeks.index.dayofweek == 0).all()
+    assert weeks['count'].sum() == len(df)
+
+
+def test_unique_people_estimates_are_close():
+    df = events()
+    cube = TimeBucketCube.build(df)
+    exact = df.groupby(df['timestamp'].dt.floor('D'))['person_id'].nunique()
+    estimate = cube.unique_people('day')
+    assert np.all(np.abs(estimate.to_numpy() - exact.to_numpy()) / exact.to_numpy() < 0.08)
+
+    by_door = cube.unique_people('week', by_door=True)
+    assert by_door.index.names == ['bucket', 'door_id']
+    assert (by_door <= 400 * 1.08).all()
+
+
+def test_series_fill_and_door_matrix():
+    df = events(500, days=10)
+    df = df[df['timestamp'].dt.day != 5]
+    cube = TimeBucketCube.build(df)
+    assert len(cube.series('day')) == 9
+    filled = cube.series('day', fill=True)
+    assert len(filled) == 10 and filled.iloc[4] == 0
+    matrix = cube.matrix('day')
+    assert matrix.shape == (df['door_id'].nunique(), 10)
+    assert matrix.to_numpy().sum() == len(df)
+    with pytest.raises(ValueError):
+        cube.totals('month')
+
+
+def test_cache_reuses_cube_for_equal_frames():
+    cache = TimeCubeCache(max_size=2)
+    df = events(1000)
+    cube = cache.get(df)
+    assert cache.get(df) is cube
+    assert cache.get(df.copy()) is cube
+    assert cache.get(events(999)) is not cube
+
+
+def test_hyperloglog_merge():
+    left = HyperLogLog(12).update(f'u{i}' for i in range(3000))
+    right = HyperLogLog(12).update(f'u{i}' for i in range(2000, 5000))
+    assert abs(left.merge(right).count() - 5000) < 250
+    assert set(LEVELS) == {'minute', 'quarter_hour', 'hour', 'day', 'week'}
@@ -0,0 +1,73 @@
+"""Compare figure payload size and encode time across serialization paths.
+
+Usage::
+
+    python -m tools.benchmark_figure_serialization [--repeat N]
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from core.figure_serialization import FigureSerializer, compact_figure, dumps
+from core.json_serialization_plugin import JsonSerializationConfig, YosaiJSONEncoder
+
+
+def sample_figures() -> Dict[str, go.Figure]:
+    """Figures shaped like the dashboard's heatmaps and time series"""
+    rng = np.random.default_rng(0)
+    days = pd.date_range('2021-01-01', periods=3 * 365, freq='D')
+    hourly = rng.poisson(40, size=(len(days), 24))
+    return {
+        'activity_heatmap': go.Figure(go.Heatmap(z=hourly[:7], x=list(range(24)))),
+        'day_hour_heatmap': go.Figure(go.Heatmap(z=hourly, x=list(range(24)), y=days)),
+        'time_series': go.Figure(go.Scatter(x=np.arange(50000), y=rng.normal(size=50000).cumsum())),
+        'user_scatter': go.Figure(go.Scatter(
+            x=rng.integers(1, 40, 20000), y=rng.uniform(50, 100, 20000), mode='markers',
+            marker=dict(size=rng.uniform(5, 50, 20000), color=rng.integers(1, 500, 20000)),
+        )),
+    }
+
+
+def _time(func: Callable[[], bytes], repeat: int) -> Tuple[float, int]:
+    payload = func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000, len(payload)
+
+
+def run(repeat: int = 5) -> List[Dict[str, object]]:
+    """Return one result row per (figure, encoder)"""
+    config = JsonSerializationConfig()
+    results = []
+    for name, figure in sample_figures().items():
+        cached = FigureSerializer()
+        cached.to_json(figure, name)
+        encoders = {
+            'yosai_encoder': lambda: json.dumps(figure, cls=YosaiJSONEncoder, config=config).encode(),
+            'plotly_to_json': lambda: figure.to_json().encode(),
+            'compact_bdata': lambda: dumps(compact_figure(figure)),
+            'compact_cached': lambda: cached.to_json(figure, name),
+        }
+        for encoder, func in encoders.items():
+            elapsed, size = _time(func, repeat)
+            results.append({'figure': name, 'encoder': encoder,
+                            'bytes': size, 'encode_ms': round(elapsed, 3)})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(pd.DataFrame(run(args.repeat)).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
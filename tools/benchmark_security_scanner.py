@@ -0,0 +1,93 @@
+"""Micro-benchmarks for input validation and the shared security scanner.
+
+Usage::
+
+    python -m tools.benchmark_security_scanner [--repeat N]
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from core.security import InputValidator
+from core.security_scanner import DEFAULT_RULES, encode_html_entities, get_security_scanner
+from core.security_validator import SecurityValidator
+from utils.unicode_handler import sanitize_unicode_input
+
+
+def sample_inputs() -> Dict[str, str]:
+    """Field values and request bodies of the sizes the dashboard sees"""
+    callback_body = json.dumps({
+        'output': 'analytics-display.children',
+        'inputs': [{'id': 'analytics-data-source', 'property': 'value', 'value': 'uploaded'}],
+        'changedPropIds': ['security-btn.n_clicks'],
+    })
+    return {
+        'door_name': 'Main Entrance Door 3',
+        'sentence': 'The quick brown fox jumps over the lazy dog. ' * 5,
+        'callback_json': callback_body,
+        'unicode_text': 'Zugang gewährt – Tür Nord ' * 10,
+        'attack': "1' OR 1=1 -- <script>alert(1)</script> ../../etc/passwd",
+        'large_text': 'lorem ipsum dolor sit amet consectetur ' * 2500,
+    }
+
+
+def _per_rule_ignorecase() -> Callable[[str], list]:
+    compiled = [re.compile(p, re.IGNORECASE) for patterns in DEFAULT_RULES.values() for p in patterns]
+    return lambda text: [regex.search(text) for regex in compiled]
+
+
+def _single_alternation() -> Callable[[str], list]:
+    combined = re.compile('|'.join(
+        f'(?P<r{i}>{p})' for i, p in enumerate(p for ps in DEFAULT_RULES.values() for p in ps)
+    ))
+    return lambda text: [m.lastgroup for m in combined.finditer(text.lower())]
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(repeat: int = 200) -> List[Dict[str, object]]:
+    """Return one result row per (input, operation) in microseconds"""
+    scanner = get_security_scanner()
+    input_validator = InputValidator()
+    security_validator = SecurityValidator()
+    per_rule = _per_rule_ignorecase()
+    alternation = _single_alternation()
+    results = []
+    for name, text in sample_inputs().items():
+        count = max(1, repeat * 1000 // max(len(text), 1000))
+        operations = {
+            'sanitize_unicode': lambda: sanitize_unicode_input(text),
+            'entities_translate': lambda: encode_html_entities(text),
+            'scan_per_rule_ignorecase': lambda: per_rule(text),
+            'scan_single_alternation': lambda: alternation(text),
+            'scanner.scan': lambda: scanner.scan(text),
+            'InputValidator.validate_input': lambda: input_validator.validate_input(text),
+            'SecurityValidator.validate_input': lambda: security_validator.validate_input(text),
+        }
+        for operation, func in operations.items():
+            results.append({'input': name, 'chars': len(text), 'operation': operation,
+                            'us': round(_time(func, count), 2)})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    table = pd.DataFrame(run(args.repeat))
+    print(table.pivot(index='operation', columns='input', values='us').to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,16 @@
 """Unicode sanitization utilities."""
 
+import re
+
+# ASCII control characters other than tab, newline and carriage return
+_ASCII_CONTROL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
 
 def sanitize_unicode_input(input_str: str) -> str:
     """Remove invalid surrogate/control characters and normalize Unicode."""
+    if input_str.isascii():
+        # NFKC leaves ASCII unchanged; only control characters need removing
+        return _ASCII_CONTROL.sub("", input_str)
     try:
         cleaned = input_str.encode("utf-8", errors="ignore").decode("utf-8")
         import unicodedata
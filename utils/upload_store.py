@@ -55,27 +55,43 @@ class UploadedDataStore:
         except Exception as e:  # pragma: no cover - best effort
             logger.error(f"Error loading uploaded data: {e}")
 
-    def _save_to_disk(self, filename: str, df: pd.DataFrame) -> None:
+    def _save_to_disk(self, filename: str, df: pd.DataFrame,
+                      summary: Optional[Dict[str, Any]] = None) -> None:
         with self._lock:
+            self._file_info_store[filename] = {
+                "rows": len(df),
+                "columns": len(df.columns),
+                "column_names": list(df.columns),
+                "upload_time": datetime.now().isoformat(),
+                "size_mb": round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2),
+                "summary": summary,
+            }
             try:
                 df.to_parquet(self._get_file_path(filename), index=False)
-                self._file_info_store[filename] = {
-                    "rows": len(df),
-                    "columns": len(df.columns),
-                    "column_names": list(df.columns),
-                    "upload_time": datetime.now().isoformat(),
-                    "size_mb": round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2),
-                }
-                with open(self._info_path(), "w", encoding="utf-8") as f:
-                    json.dump(self._file_info_store, f, indent=2)
+                self._write_info()
             except Exception as e:  # pragma: no cover - best effort
                 logger.error(f"Error saving uploaded data: {e}")
 
+    def _write_info(self) -> None:
+        with open(self._info_path(), "w", encoding="utf-8") as f:
+            json.dump(self._file_info_store, f, indent=2)
+
+    @staticmethod
+    def _summarize(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        from services.analytics_summary import summarize_upload
+
+        try:
+            return summarize_upload(df)
+        except Exception as e:  # pragma: no cover - best effort
+            logger.error(f"Error summarizing uploaded data: {e}")
+            return None
+
     # -- Public API ---------------------------------------------------------
     def add_file(self, filename: str, df: pd.DataFrame) -> None:
+        summary = self._summarize(df)
         with self._lock:
             self._data_store[filename] = df
-        self._save_to_disk(filename, df)
+        self._save_to_disk(filename, df, summary)
 
     def get_all_data(self) -> Dict[str, pd.DataFrame]:
         return self._data_store.copy()
@@ -86,6 +102,34 @@ class UploadedDataStore:
     def get_file_info(self) -> Dict[str, Dict[str, Any]]:
         return self._file_info_store.copy()
 
+    def get_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Per-file summaries computed at upload time.
+
+        Files stored before summaries existed (or with an outdated summary
+        version) are summarized once here and the result is persisted.
+        """
+        from services.analytics_summary import UPLOAD_SUMMARY_VERSION
+
+        summaries: Dict[str, Dict[str, Any]] = {}
+        stale = []
+        for filename, df in self._data_store.copy().items():
+            summary = self._file_info_store.get(filename, {}).get("summary")
+            if not summary or summary.get("version") != UPLOAD_SUMMARY_VERSION:
+                stale.append(filename)
+                summary = self._summarize(df)
+            if summary is not None:
+                summaries[filename] = summary
+        if stale:
+            with self._lock:
+                for filename in stale:
+                    if filename in summaries and filename in self._file_info_store:
+                        self._file_info_store[filename]["summary"] = summaries[filename]
+                try:
+                    self._write_info()
+                except Exception as e:  # pragma: no cover - best effort
+                    logger.error(f"Error saving upload summaries: {e}")
+        return summaries
+
     def clear_all(self) -> None:
         with self._lock:
             self._data_store.clear()